@@ -27,9 +27,22 @@ sns.set_palette("husl")
 class BacktestAnalyzer:
     """Analyze and visualize backtest results"""
 
-    def __init__(self):
+    # Trailing window re-analyzed per bar by the slow path (df.iloc[i-300:i+1])
+    WINDOW = 301
+
+    def __init__(self, walk_forward: bool = True, check_bars: int = 0):
+        """
+        Args:
+            walk_forward: Compute per-bar ribbon signals incrementally
+                          (WalkForwardRibbonAnalyzer) instead of re-analyzing
+                          the trailing window from scratch every bar
+            check_bars: If > 0, compare walk-forward signals against the slow
+                        path on this many sampled bars before running
+        """
         self.results = []
         self.trades_data = {}
+        self.walk_forward = walk_forward
+        self.check_bars = check_bars
 
     def run_backtest_and_analyze(self):
         """Run the complete backtest and analyze results"""
@@ -98,20 +111,45 @@ class BacktestAnalyzer:
         df = adapter.fetch_ohlcv(interval='5m', days_back=17)
         print(f"✅ Fetched {len(df)} candles")
 
+        # Ribbon signals do not depend on the iteration thresholds - compute once
+        ribbon = self._walk_forward_ribbon(df) if self.walk_forward else None
+
         # Run each iteration
         for iter_num, config in iterations.items():
             print(f"\n🧪 Running {config['name']}")
             print(f"   Parameters: {config['compression']}/{config['alignment']}/{config['confluence']}")
 
-            result = self._run_single_iteration(df, config, trading_params, iter_num)
+            result = self._run_single_iteration(df, config, trading_params, iter_num, ribbon=ribbon)
             self.results.append(result)
             print(f"   ✅ Completed: {result['num_trades']} trades, {result['return_17d']:.2f}% return")
 
         # Generate analysis
         self._generate_comprehensive_analysis()
 
-    def _run_single_iteration(self, df: pd.DataFrame, config: Dict, trading_params: Dict, iter_num: int) -> Dict:
-        """Run a single backtest iteration"""
+    def _walk_forward_ribbon(self, df: pd.DataFrame, noise_threshold: float = 0.25) -> pd.DataFrame:
+        """Per-bar latest ribbon signals for bars 200.. (same windows as the slow path)"""
+        from fourier_strategy.walk_forward_ribbon import WalkForwardRibbonAnalyzer, compare_with_slow_path
+
+        if self.check_bars > 0:
+            compare_with_slow_path(df, noise_threshold=noise_threshold, window=self.WINDOW,
+                                   start=200, sample_bars=self.check_bars)
+
+        print("⚡ Walk-forward ribbon analysis...")
+        walk_forward = WalkForwardRibbonAnalyzer(noise_threshold=noise_threshold, window=self.WINDOW)
+        return walk_forward.run(df['close'].to_numpy(dtype=float), start=200)
+
+    def _run_single_iteration(self, df: pd.DataFrame, config: Dict, trading_params: Dict, iter_num: int,
+                              ribbon: pd.DataFrame = None) -> Dict:
+        """
+        Run a single backtest iteration
+
+        Args:
+            ribbon: Optional walk-forward ribbon signals (see _walk_forward_ribbon);
+                    without it every bar re-analyzes its trailing window
+        """
+        from src.live.fibonacci_signal_generator import FibonacciSignalGenerator
+        from src.live.adaptive_kalman_filter import AdaptiveKalmanFilter
+        from src.live.signal_fusion_engine import SignalFusionEngine, Signal, SignalType
 
         # Initialize components
         fib_generator = FibonacciSignalGenerator(
@@ -143,9 +181,6 @@ class BacktestAnalyzer:
             current_time = df.index[i]
             current_price = df['close'].iloc[i]
 
-            # Get data window for Fibonacci analysis
-            df_window = df.iloc[max(0, i-300):i+1].copy()
-
             # Check exit conditions first
             if position != 0:
                 holding_periods = i - df.index.get_loc(entry_time)
@@ -206,8 +241,18 @@ class BacktestAnalyzer:
 
             # Check entry conditions if flat
             if position == 0:
-                # Generate Fibonacci signal
-                fib_signal = fib_generator.generate_signal(df_window)
+                # Generate Fibonacci signal on the trailing window
+                df_window = df.iloc[max(0, i - self.WINDOW + 1):i+1]
+                if ribbon is not None:
+                    latest = ribbon.loc[i]
+                    fib_signal = fib_generator.signal_from_ribbon(
+                        float(latest['fibonacci_compression']),
+                        float(latest['fibonacci_alignment']),
+                        float(latest['fibonacci_confluence']),
+                        df_window
+                    )
+                else:
+                    fib_signal = fib_generator.generate_signal(df_window.copy())
 
                 if fib_signal is None:
                     continue
@@ -664,5 +709,14 @@ class BacktestAnalyzer:
         print(f"\n💾 Results saved to {output_dir / 'backtest_results.json'}")
 
 if __name__ == '__main__':
-    analyzer = BacktestAnalyzer()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Comprehensive backtest analysis')
+    parser.add_argument('--slow', action='store_true',
+                        help='Re-analyze the trailing window every bar (reference path)')
+    parser.add_argument('--check', type=int, default=0, metavar='BARS',
+                        help='Compare walk-forward signals with the slow path on BARS sampled bars')
+    args = parser.parse_args()
+
+    analyzer = BacktestAnalyzer(walk_forward=not args.slow, check_bars=args.check)
     analyzer.run_backtest_and_analyze()
\ No newline at end of file
@@ -134,7 +134,26 @@ def backtest_iteration(iter_num, config, df_5m):
     }
 
 
-def main():
+def backtest_iteration_shared(iter_num, config, frames):
+    """Parallel runner entry point - backtest against the shared 5m frame"""
+    return backtest_iteration(iter_num, config, frames['5m'])
+
+
+def run_iterations_parallel(df_5m, max_workers=None):
+    """
+    Backtest all ITERATIONS in a process pool
+
+    The 5m candles are published to shared memory once and attached
+    read-only by every worker instead of being pickled per iteration.
+    """
+    from src.backtest.parallel_runner import ParallelIterationRunner
+
+    runner = ParallelIterationRunner(backtest_iteration_shared, max_workers=max_workers)
+    output = runner.run(ITERATIONS, {'5m': df_5m})
+    return [output['raw_results'][iter_num] for iter_num in sorted(ITERATIONS.keys())]
+
+
+def main(parallel=False, max_workers=None):
     print("\n" + "="*80)
     print("  🎯 BACKTEST ALL 6 HARMONIC ITERATIONS")
     print("="*80)
@@ -148,12 +167,15 @@ def main():
     print(f"✅ Fetched {len(df_5m)} candles")
 
     # Backtest each iteration
-    all_results = []
+    if parallel:
+        all_results = run_iterations_parallel(df_5m, max_workers=max_workers)
+    else:
+        all_results = []
 
-    for iter_num in sorted(ITERATIONS.keys()):
-        config = ITERATIONS[iter_num]
-        result = backtest_iteration(iter_num, config, df_5m)
-        all_results.append(result)
+        for iter_num in sorted(ITERATIONS.keys()):
+            config = ITERATIONS[iter_num]
+            result = backtest_iteration(iter_num, config, df_5m)
+            all_results.append(result)
 
     # Print comparison table
     print("\n" + "="*80)
@@ -192,4 +214,13 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backtest all 6 harmonic iterations')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run iterations in a process pool with shared-memory inputs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --parallel (default: CPU count)')
+    args = parser.parse_args()
+
+    main(parallel=args.parallel, max_workers=args.workers)
@@ -24,6 +24,7 @@ from fourier_strategy import FourierTradingStrategy
 from fourier_strategy.fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
 from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
 from src.reporting.chart_generator import ChartGenerator
+from src.indicators.fibonacci_levels import fib_proximity_series
 from scipy.fft import fft, ifft
 
 # Define all 9 harmonic iterations - PROVEN THRESHOLDS from earlier 7% success!
@@ -190,32 +191,9 @@ def apply_volume_fft(volume_series, n_harmonics=6):  # 6 → sum=6 ✓ (harmonic
 
 
 def calculate_fib_levels(df, lookback=144):  # 144 → 1+4+4=9 ✓ (Fibonacci number!)
-    """Calculate Fibonacci retracement levels"""
-    fib_levels = []
-
-    for i in range(len(df)):
-        if i < lookback:
-            fib_levels.append(0.5)
-            continue
-
-        window = df.iloc[max(0, i-lookback):i+1]
-        high = window['high'].max()
-        low = window['low'].min()
-        current_price = df['close'].iloc[i]
-
-        # Calculate distance to nearest Fibonacci level
-        levels = [0.236, 0.382, 0.5, 0.618, 0.786]
-        fib_prices = [low + (high - low) * level for level in levels]
-
-        # Find closest level
-        distances = [abs(current_price - fib_price) / (high - low + 1e-10) for fib_price in fib_prices]
-        min_distance = min(distances)
-
-        # Score: 1.0 = at level, 0.0 = far from level (harmonic multiplier)
-        fib_score = 1.0 - min(min_distance * 18, 1.0)  # 18 → 1+8=9 ✓ (was 10)
-        fib_levels.append(fib_score)
-
-    return pd.Series(fib_levels, index=df.index)
+    """Calculate Fibonacci retracement levels (proximity score per bar, vectorized)"""
+    # Score: 1.0 = at level, 0.0 = far from level (harmonic multiplier)
+    return fib_proximity_series(df, lookback=lookback, scale=18)  # 18 → 1+8=9 ✓ (was 10)
 
 
 def calculate_mtf_confluence(analysis_5m, analysis_15m, analysis_30m, df_5m, df_15m, df_30m):
@@ -308,6 +286,9 @@ def backtest_iteration(iter_num, iter_config, analysis):
     print(f"  Confluence: {iter_config['confluence']}")
 
     base_df = analysis['fourier_df'].copy()
+    intrabar = analysis.get('intrabar')
+    if intrabar is not None:
+        intrabar = intrabar.realign(base_df.index)
     compression = analysis['compression']
     alignment = analysis['alignment']
     confluence = analysis['confluence']
@@ -413,27 +394,24 @@ def backtest_iteration(iter_num, iter_config, analysis):
                 # Check TP/SL using high/low (not just close)
                 # This is more realistic - checks if price TOUCHED the level during the candle
                 if position == 1:  # Long position
-                    # Check if high touched TP
-                    if current_high >= tp_price:
-                        should_exit = True
-                        exit_reason = 'TP'
-                        current_price = tp_price  # Exit at TP price
-                    # Check if low touched SL
-                    elif current_low <= sl_price:
-                        should_exit = True
-                        exit_reason = 'SL'
-                        current_price = sl_price  # Exit at SL price
+                    tp_touched = current_high >= tp_price
+                    sl_touched = current_low <= sl_price
                 else:  # Short position
-                    # Check if low touched TP
-                    if current_low <= tp_price:
-                        should_exit = True
-                        exit_reason = 'TP'
-                        current_price = tp_price  # Exit at TP price
-                    # Check if high touched SL
-                    elif current_high >= sl_price:
-                        should_exit = True
-                        exit_reason = 'SL'
-                        current_price = sl_price  # Exit at SL price
+                    tp_touched = current_low <= tp_price
+                    sl_touched = current_high >= sl_price
+
+                # Both touched inside one candle: let the 1m candles decide
+                if tp_touched and sl_touched and intrabar is not None:
+                    tp_touched = intrabar.tp_first(i, tp_price, sl_price, position == 1)
+
+                if tp_touched:
+                    should_exit = True
+                    exit_reason = 'TP'
+                    current_price = tp_price  # Exit at TP price
+                elif sl_touched:
+                    should_exit = True
+                    exit_reason = 'SL'
+                    current_price = sl_price  # Exit at SL price
 
                 # Only check time-based exits AFTER minimum holding period
                 if not should_exit and holding_periods >= min_hold:
@@ -613,6 +591,8 @@ def backtest_iteration(iter_num, iter_config, analysis):
     print(f"     Avg Hold Time:          {avg_holding:.1f} candles ({avg_holding_minutes:.0f} min)")
     print(f"     Max Risk per Trade:     {max_risk_pct:.2f}% (SAFE ✅)" if max_risk_pct < 5 else f"     Max Risk per Trade:     {max_risk_pct:.2f}% (HIGH ⚠️)")
     print(f"     Exit Reasons:           {exit_reasons}")
+    if intrabar is not None:
+        intrabar.print_stats()
 
     return {
         'iteration': iter_num,
@@ -630,7 +610,269 @@ def backtest_iteration(iter_num, iter_config, analysis):
     }
 
 
-def main():
+def build_shared_analysis_frame(analysis):
+    """
+    Flatten a full-DSP analysis dict into one frame for the parallel runner
+
+    Volume FFT / Fib proximity are always included; backtest_iteration only
+    reads them when the iteration enables them, so one frame serves all configs.
+    """
+    frame = analysis['fourier_df'].copy()
+    frame['iter_compression'] = analysis['compression']
+    frame['iter_alignment'] = analysis['alignment']
+    frame['iter_confluence'] = analysis['confluence']
+    frame['iter_volume_momentum'] = analysis['volume_momentum']
+    frame['iter_fib_proximity'] = analysis['fib_proximity']
+    frame['iter_mtf_confluence'] = analysis['mtf_confluence']
+    return frame
+
+
+def backtest_iteration_shared(iter_num, iter_config, frames, backtest_fn=None):
+    """
+    Parallel runner entry point - rebuild the analysis dict from the shared frame
+
+    backtest_fn swaps in another script's backtest_iteration (same analysis
+    dict, different entry/exit rules); default is this module's.
+    """
+    frame = frames['5m']
+    analysis = {
+        'fourier_df': frame,
+        'compression': frame['iter_compression'],
+        'alignment': frame['iter_alignment'],
+        'confluence': frame['iter_confluence'],
+        'volume_momentum': frame['iter_volume_momentum'],
+        'fib_proximity': frame['iter_fib_proximity'],
+        'mtf_confluence': frame['iter_mtf_confluence'],
+    }
+    if '1m' in frames:
+        from src.backtest.intrabar import IntrabarResolver
+        analysis['intrabar'] = IntrabarResolver(frames['1m'], frame.index, bar_minutes=5)
+    return (backtest_fn or backtest_iteration)(iter_num, iter_config, analysis)
+
+
+def analyze_shared_5m(df_5m, tf_analyses, df_15m, df_30m, iterations=None):
+    """
+    Full-DSP 5m analysis + MTF confluence, computed once for all iterations
+
+    Volume FFT / Fib proximity are always included; backtest_iteration only
+    reads them when the iteration enables them. The ribbon settings come from
+    the last of iterations (default: ITERATIONS).
+    """
+    iterations = iterations or ITERATIONS
+    print(f"\n{'='*80}")
+    print(f"  🔬 Shared 5m analysis (computed once for all iterations)")
+    print(f"{'='*80}")
+
+    full_dsp_config = iterations[max(iterations)]
+    analysis_5m = analyze_ribbons_for_iteration(df_5m, full_dsp_config)
+    analysis_5m['mtf_confluence'] = calculate_mtf_confluence(
+        analysis_5m,
+        tf_analyses['15m'],
+        tf_analyses['30m'],
+        df_5m, df_15m, df_30m
+    )
+    return analysis_5m
+
+
+def run_iterations_parallel(df_5m, tf_analyses, df_15m, df_30m, max_workers=None, df_1m=None,
+                            iterations=None, backtest_fn=None, results_name='harmonic_iterations'):
+    """
+    Backtest all ITERATIONS in a process pool
+
+    The 5m ribbon/FFT analysis is computed ONCE and shared with workers
+    through shared memory instead of re-running analyze_ribbons_for_iteration
+    per iteration. With df_1m, workers resolve same-candle TP/SL from it.
+
+    Args:
+        iterations: Iteration configs (default: ITERATIONS)
+        backtest_fn: Module-level backtest_iteration variant (default: this module's)
+        results_name: Prefix of the results / trades CSVs in trading_data/
+    """
+    from functools import partial
+    from src.backtest.parallel_runner import ParallelIterationRunner
+
+    iterations = iterations or ITERATIONS
+    analysis_5m = analyze_shared_5m(df_5m, tf_analyses, df_15m, df_30m, iterations)
+    frames = {'5m': build_shared_analysis_frame(analysis_5m)}
+    if df_1m is not None:
+        frames['1m'] = df_1m[['high', 'low']]
+
+    task = partial(backtest_iteration_shared, backtest_fn=backtest_fn) if backtest_fn \
+        else backtest_iteration_shared
+    runner = ParallelIterationRunner(task, max_workers=max_workers)
+    output = runner.run(iterations, frames)
+
+    all_results = [output['raw_results'][iter_num] for iter_num in sorted(iterations.keys())]
+    all_trades_by_iteration = {
+        iter_num: {
+            'config': iterations[iter_num],
+            'analysis': analysis_5m,
+            'result': output['raw_results'][iter_num]
+        }
+        for iter_num in sorted(iterations.keys())
+    }
+
+    # One combined table for all iterations
+    results_file = Path(f'trading_data/{results_name}_parallel_results.csv')
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    output['results'].to_csv(results_file, index=False)
+    output['trades'].to_csv(results_file.with_name(f'{results_name}_parallel_trades.csv'), index=False)
+    print(f"✅ Results table saved to: {results_file}")
+
+    return all_results, all_trades_by_iteration
+
+
+def evaluate_configs_vectorized(analysis, configs, return_trades=False):
+    """
+    Evaluate many iteration configs in a single pass over the signal arrays
+
+    Same rules and numbers as backtest_iteration, but entry masks are
+    broadcast over all configs and exits resolved with a shared vectorized
+    first-touch routine - use it for large threshold sweeps.
+
+    Args:
+        analysis: Analysis dict with 'mtf_confluence' (see analyze_shared_5m)
+        configs: List of iteration config dicts
+        return_trades: Include per-config trade lists
+
+    Returns:
+        DataFrame with one row per config
+    """
+    from src.backtest.multi_config_evaluator import MultiConfigEvaluator
+
+    evaluator = MultiConfigEvaluator(
+        max_hold=SCALPING_PARAMS['max_holding_periods'],
+        min_hold=SCALPING_PARAMS['min_holding_periods'],
+        sl_pct=SCALPING_PARAMS['sl_pct'],
+        position_size=0.09,  # 9% position size (harmonic)
+        leverage=27
+    )
+    return evaluator.evaluate(
+        MultiConfigEvaluator.signals_from_analysis(analysis),
+        configs,
+        index=analysis['fourier_df'].index,
+        return_trades=return_trades,
+        intrabar=analysis.get('intrabar')
+    )
+
+
+def run_iterations_vectorized(df_5m, tf_analyses, df_15m, df_30m, df_1m=None):
+    """Backtest all ITERATIONS with one shared analysis and one vectorized pass"""
+    analysis_5m = analyze_shared_5m(df_5m, tf_analyses, df_15m, df_30m)
+    if df_1m is not None:
+        from src.backtest.intrabar import IntrabarResolver
+        analysis_5m['intrabar'] = IntrabarResolver(df_1m, df_5m.index, bar_minutes=5)
+
+    configs = [dict(ITERATIONS[iter_num], iteration=iter_num) for iter_num in sorted(ITERATIONS.keys())]
+    results_df = evaluate_configs_vectorized(analysis_5m, configs, return_trades=True)
+
+    all_results = []
+    all_trades_by_iteration = {}
+    for result in results_df.to_dict('records'):
+        if result['num_trades'] == 0:
+            result.pop('trades')
+        all_results.append(result)
+        all_trades_by_iteration[result['iteration']] = {
+            'config': ITERATIONS[result['iteration']],
+            'analysis': analysis_5m,
+            'result': result
+        }
+
+    return all_results, all_trades_by_iteration
+
+
+def harmonic_objective(frame, params, start, end):
+    """
+    Successive-halving objective: backtest one iteration config on bars [start, end)
+
+    Args:
+        frame: build_shared_analysis_frame() output
+        params: Overrides on the full-DSP iteration config
+                (compression, alignment, confluence, min_signal_strength, ...)
+        start, end: Bar range
+
+    Returns:
+        backtest_iteration() metrics without the trade list
+    """
+    config = dict(ITERATIONS[max(ITERATIONS)], **params)
+    config['name'] = config['description'] = '/'.join(f"{k}={v}" for k, v in params.items())
+    result = backtest_iteration_shared(0, config, {'5m': frame.iloc[start:end]})
+    result.pop('trades', None)
+    return result
+
+
+# ResultStore key: the overrides plus everything they are applied on
+harmonic_objective.store_name = 'harmonic'
+harmonic_objective.store_params = lambda params: {
+    'config': dict(ITERATIONS[max(ITERATIONS)], **params), 'scalping': SCALPING_PARAMS
+}
+
+
+def halving_iterations(analysis_5m, param_grid, min_bars=576, max_drawdown=10.0, max_workers=None,
+                       store=None):
+    """
+    Successive-halving search over iteration thresholds on the shared 5m analysis
+
+    Threshold sets start on the last 2 days of 5m data (backtest_iteration
+    needs at least a full day); the best third is promoted to 3× longer
+    slices up to the full range. Sets drawing down more than max_drawdown %
+    are stopped early.
+
+    Args:
+        analysis_5m: analyze_shared_5m() output
+        param_grid: Iteration config key → values (e.g. compression, alignment)
+        min_bars: First-rung slice length
+        max_drawdown: Early-stop drawdown in %
+        max_workers: Process pool size (default: CPU count)
+        store: Optional ResultStore reusing slices already backtested
+
+    Returns:
+        SuccessiveHalvingSearch.run() output (best_params, history, budget)
+    """
+    from src.backtest.successive_halving import SuccessiveHalvingSearch
+
+    search = SuccessiveHalvingSearch(
+        harmonic_objective,
+        metric='sharpe',
+        min_bars=min_bars,
+        max_drawdown=max_drawdown,
+        drawdown_key='max_dd',
+        max_workers=max_workers,
+        store=store
+    )
+    return search.run(build_shared_analysis_frame(analysis_5m), param_grid)
+
+
+def monte_carlo_iterations(all_results, n_paths=100000, method='block', leverage=25, position_size=0.09):
+    """
+    Monte Carlo robustness of every iteration's trade list
+
+    Resamples each iteration's trades into n_paths alternative sequences at
+    leveraged sizing and prints return / drawdown / streak / ruin percentiles.
+
+    Returns:
+        dict iteration → MonteCarloSimulator.run() summary
+    """
+    from src.backtest.monte_carlo import MonteCarloSimulator
+
+    print("\n" + "="*80)
+    print("  🎲 MONTE CARLO ROBUSTNESS")
+    print("="*80)
+
+    simulator = MonteCarloSimulator(n_paths=n_paths, method=method,
+                                    leverage=leverage, position_size=position_size)
+    summaries = {}
+    for r in all_results:
+        trades = r.get('trades') or []
+        if len(trades) < 2:
+            continue
+        print(f"\n  Iteration {r['iteration']}: {r.get('name', '')}")
+        summaries[r['iteration']] = simulator.run(trades)['summary']
+
+    return summaries
+
+
+def main(parallel=False, max_workers=None, vectorized=False, intrabar=False):
     print("\n" + "="*80)
     print("  🎯 BACKTEST ALL 9 HARMONIC ITERATIONS (3-6-9 CONVERGENCE)")
     print("="*80)
@@ -656,6 +898,14 @@ def main():
     df_30m = adapter.fetch_ohlcv(interval='30m', days_back=17, use_checkpoint=False)
     print(f"     ✅ {len(df_30m)} candles")
 
+    df_1m = None
+    if intrabar:
+        # Hyperliquid serves the latest 5000 candles: ~3.5 days of 1m.
+        # Older 5m candles keep the conservative SL-first fallback.
+        print("  ⚡ Fetching 1m data (intrabar TP/SL resolution)...")
+        df_1m = adapter.fetch_ohlcv(interval='1m', days_back=17, use_checkpoint=False)
+        print(f"     ✅ {len(df_1m)} candles")
+
     print(f"\n✅ All timeframes fetched!")
 
     # Analyze ALL timeframes
@@ -670,37 +920,50 @@ def main():
         tf_analyses[tf_name] = analysis_tf
 
     # Backtest each iteration with its specific thresholds + MTF confluence
-    all_results = []
-    all_trades_by_iteration = {}
-
-    for iter_num in sorted(ITERATIONS.keys()):
-        config = ITERATIONS[iter_num]
-
-        print(f"\n{'='*80}")
-        print(f"  🔬 Analyzing Iteration {iter_num} with MULTI-TIMEFRAME")
-        print(f"{'='*80}")
-
-        # Analyze 5m with full config (including Volume FFT + Fib for iterations 4-6)
-        analysis_5m = analyze_ribbons_for_iteration(df_5m, config)
-
-        # Add multi-timeframe confluence signals
-        # Resample 15m and 30m signals to 5m timeframe
-        analysis_5m['mtf_confluence'] = calculate_mtf_confluence(
-            analysis_5m,
-            tf_analyses['15m'],
-            tf_analyses['30m'],
-            df_5m, df_15m, df_30m
+    if vectorized:
+        all_results, all_trades_by_iteration = run_iterations_vectorized(
+            df_5m, tf_analyses, df_15m, df_30m, df_1m=df_1m
+        )
+    elif parallel:
+        all_results, all_trades_by_iteration = run_iterations_parallel(
+            df_5m, tf_analyses, df_15m, df_30m, max_workers=max_workers, df_1m=df_1m
         )
+    else:
+        all_results = []
+        all_trades_by_iteration = {}
+
+        for iter_num in sorted(ITERATIONS.keys()):
+            config = ITERATIONS[iter_num]
+
+            print(f"\n{'='*80}")
+            print(f"  🔬 Analyzing Iteration {iter_num} with MULTI-TIMEFRAME")
+            print(f"{'='*80}")
+
+            # Analyze 5m with full config (including Volume FFT + Fib for iterations 4-6)
+            analysis_5m = analyze_ribbons_for_iteration(df_5m, config)
+
+            # Add multi-timeframe confluence signals
+            # Resample 15m and 30m signals to 5m timeframe
+            analysis_5m['mtf_confluence'] = calculate_mtf_confluence(
+                analysis_5m,
+                tf_analyses['15m'],
+                tf_analyses['30m'],
+                df_5m, df_15m, df_30m
+            )
 
-        result = backtest_iteration(iter_num, config, analysis_5m)
-        all_results.append(result)
+            if df_1m is not None:
+                from src.backtest.intrabar import IntrabarResolver
+                analysis_5m['intrabar'] = IntrabarResolver(df_1m, df_5m.index, bar_minutes=5)
 
-        # Store analysis for chart generation
-        all_trades_by_iteration[iter_num] = {
-            'config': config,
-            'analysis': analysis_5m,
-            'result': result
-        }
+            result = backtest_iteration(iter_num, config, analysis_5m)
+            all_results.append(result)
+
+            # Store analysis for chart generation
+            all_trades_by_iteration[iter_num] = {
+                'config': config,
+                'analysis': analysis_5m,
+                'result': result
+            }
 
     # Print comparison table
     print("\n" + "="*80)
@@ -773,7 +1036,37 @@ def main():
 
 
 if __name__ == '__main__':
-    df_5m, results, trades_by_iter = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backtest all harmonic iterations')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run iterations in a process pool with shared-memory inputs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --parallel (default: CPU count)')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='Evaluate all iterations in one broadcast pass')
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='PATHS',
+                        help='Resample each iteration\'s trades into PATHS Monte Carlo paths (25x)')
+    parser.add_argument('--intrabar', action='store_true',
+                        help='Resolve candles touching both TP and SL from 1m data')
+    parser.add_argument('--halving', action='store_true',
+                        help='Successive-halving search over thresholds around the iterations')
+    args = parser.parse_args()
+
+    df_5m, results, trades_by_iter = main(parallel=args.parallel, max_workers=args.workers,
+                                          vectorized=args.vectorized, intrabar=args.intrabar)
+
+    if args.monte_carlo:
+        monte_carlo_iterations(results, n_paths=args.monte_carlo)
+
+    if args.halving:
+        from src.backtest.result_store import ResultStore
+        halving_iterations(trades_by_iter[max(ITERATIONS)]['analysis'], {
+            'compression': list(range(75, 91, 3)),
+            'alignment': list(range(75, 91, 3)),
+            'confluence': list(range(51, 67, 3)),
+            'min_signal_strength': [0.18, 0.27, 0.36],
+        }, max_workers=args.workers, store=ResultStore())
 
     # Generate charts for best iterations
     print("\n" + "="*80)
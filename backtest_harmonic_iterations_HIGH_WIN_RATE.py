@@ -24,6 +24,7 @@ from fourier_strategy import FourierTradingStrategy
 from fourier_strategy.fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
 from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
 from src.reporting.chart_generator import ChartGenerator
+from src.indicators.fibonacci_levels import fib_proximity_series
 from scipy.fft import fft, ifft
 
 # Define all 9 harmonic iterations - ALL with FULL DSP (MTF + Volume FFT + Fib Levels)
@@ -189,32 +190,9 @@ def apply_volume_fft(volume_series, n_harmonics=6):  # 6 → sum=6 ✓ (harmonic
 
 
 def calculate_fib_levels(df, lookback=144):  # 144 → 1+4+4=9 ✓ (Fibonacci number!)
-    """Calculate Fibonacci retracement levels"""
-    fib_levels = []
-
-    for i in range(len(df)):
-        if i < lookback:
-            fib_levels.append(0.5)
-            continue
-
-        window = df.iloc[max(0, i-lookback):i+1]
-        high = window['high'].max()
-        low = window['low'].min()
-        current_price = df['close'].iloc[i]
-
-        # Calculate distance to nearest Fibonacci level
-        levels = [0.236, 0.382, 0.5, 0.618, 0.786]
-        fib_prices = [low + (high - low) * level for level in levels]
-
-        # Find closest level
-        distances = [abs(current_price - fib_price) / (high - low + 1e-10) for fib_price in fib_prices]
-        min_distance = min(distances)
-
-        # Score: 1.0 = at level, 0.0 = far from level (harmonic multiplier)
-        fib_score = 1.0 - min(min_distance * 18, 1.0)  # 18 → 1+8=9 ✓ (was 10)
-        fib_levels.append(fib_score)
-
-    return pd.Series(fib_levels, index=df.index)
+    """Calculate Fibonacci retracement levels (proximity score per bar, vectorized)"""
+    # Score: 1.0 = at level, 0.0 = far from level (harmonic multiplier)
+    return fib_proximity_series(df, lookback=lookback, scale=18)  # 18 → 1+8=9 ✓ (was 10)
 
 
 def calculate_mtf_confluence(analysis_5m, analysis_15m, analysis_30m, df_5m, df_15m, df_30m):
@@ -597,7 +575,23 @@ def backtest_iteration(iter_num, iter_config, analysis):
     }
 
 
-def main():
+def run_iterations_parallel(df_5m, tf_analyses, df_15m, df_30m, max_workers=None):
+    """
+    Backtest this script's ITERATIONS in a process pool
+
+    Reuses the shared-analysis runner of backtest_harmonic_iterations with
+    this script's iteration configs and backtest_iteration.
+    """
+    import backtest_harmonic_iterations as harmonic
+
+    return harmonic.run_iterations_parallel(
+        df_5m, tf_analyses, df_15m, df_30m, max_workers=max_workers,
+        iterations=ITERATIONS, backtest_fn=backtest_iteration,
+        results_name='harmonic_iterations_high_win_rate'
+    )
+
+
+def main(parallel=False, max_workers=None):
     print("\n" + "="*80)
     print("  🎯 BACKTEST ALL 9 HARMONIC ITERATIONS (3-6-9 CONVERGENCE)")
     print("="*80)
@@ -637,37 +631,42 @@ def main():
         tf_analyses[tf_name] = analysis_tf
 
     # Backtest each iteration with its specific thresholds + MTF confluence
-    all_results = []
-    all_trades_by_iteration = {}
-
-    for iter_num in sorted(ITERATIONS.keys()):
-        config = ITERATIONS[iter_num]
-
-        print(f"\n{'='*80}")
-        print(f"  🔬 Analyzing Iteration {iter_num} with MULTI-TIMEFRAME")
-        print(f"{'='*80}")
-
-        # Analyze 5m with full config (including Volume FFT + Fib for iterations 4-6)
-        analysis_5m = analyze_ribbons_for_iteration(df_5m, config)
-
-        # Add multi-timeframe confluence signals
-        # Resample 15m and 30m signals to 5m timeframe
-        analysis_5m['mtf_confluence'] = calculate_mtf_confluence(
-            analysis_5m,
-            tf_analyses['15m'],
-            tf_analyses['30m'],
-            df_5m, df_15m, df_30m
+    if parallel:
+        all_results, all_trades_by_iteration = run_iterations_parallel(
+            df_5m, tf_analyses, df_15m, df_30m, max_workers=max_workers
         )
+    else:
+        all_results = []
+        all_trades_by_iteration = {}
+
+        for iter_num in sorted(ITERATIONS.keys()):
+            config = ITERATIONS[iter_num]
+
+            print(f"\n{'='*80}")
+            print(f"  🔬 Analyzing Iteration {iter_num} with MULTI-TIMEFRAME")
+            print(f"{'='*80}")
+
+            # Analyze 5m with full config (including Volume FFT + Fib for iterations 4-6)
+            analysis_5m = analyze_ribbons_for_iteration(df_5m, config)
+
+            # Add multi-timeframe confluence signals
+            # Resample 15m and 30m signals to 5m timeframe
+            analysis_5m['mtf_confluence'] = calculate_mtf_confluence(
+                analysis_5m,
+                tf_analyses['15m'],
+                tf_analyses['30m'],
+                df_5m, df_15m, df_30m
+            )
 
-        result = backtest_iteration(iter_num, config, analysis_5m)
-        all_results.append(result)
+            result = backtest_iteration(iter_num, config, analysis_5m)
+            all_results.append(result)
 
-        # Store analysis for chart generation
-        all_trades_by_iteration[iter_num] = {
-            'config': config,
-            'analysis': analysis_5m,
-            'result': result
-        }
+            # Store analysis for chart generation
+            all_trades_by_iteration[iter_num] = {
+                'config': config,
+                'analysis': analysis_5m,
+                'result': result
+            }
 
     # Print comparison table
     print("\n" + "="*80)
@@ -727,7 +726,16 @@ def main():
 
 
 if __name__ == '__main__':
-    df_5m, results, trades_by_iter = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backtest all harmonic iterations')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run iterations in a process pool with shared-memory inputs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --parallel (default: CPU count)')
+    args = parser.parse_args()
+
+    df_5m, results, trades_by_iter = main(parallel=args.parallel, max_workers=args.workers)
 
     # Generate charts for best iterations
     print("\n" + "="*80)
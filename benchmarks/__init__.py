@@ -0,0 +1,15 @@
+"""
+Benchmark Suite
+
+Seeded synthetic data and timed cases for the strategy and live hot paths.
+Run with `python -m benchmarks run` and compare result files with
+`python -m benchmarks compare`.
+"""
+
+from .cases import CASES, BenchmarkCase, benchmark, select_cases
+from .data import SIZES, make_indicator_frame, make_ohlcv, make_positions, make_ticks
+from .runner import compare, machine_info, run_suite, save_results
+
+__all__ = ['CASES', 'BenchmarkCase', 'benchmark', 'select_cases', 'SIZES', 'make_ohlcv',
+           'make_indicator_frame', 'make_positions', 'make_ticks', 'compare', 'machine_info',
+           'run_suite', 'save_results']
@@ -0,0 +1,86 @@
+"""
+Benchmark CLI
+
+Usage (from the repository root):
+    python -m benchmarks list
+    python -m benchmarks run                              # 1k, 10k, 100k, 1M
+    python -m benchmarks run --sizes 1k 10k --filter fourier signal_fusion
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks compare baseline.json benchmarks/results/<file>.json --threshold 10
+
+compare exits with status 1 when any case regressed beyond the threshold.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# src/ modules import each other both as `src.x` and as top-level `x`
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from .cases import CASES, select_cases
+from .data import SIZES, parse_size, size_label
+from .runner import compare, load_results, print_comparison, run_suite, save_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark the strategy and live hot paths')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='List benchmark cases')
+
+    run = commands.add_parser('run', help='Run benchmarks and save JSON results')
+    run.add_argument('--sizes', nargs='+', default=list(SIZES),
+                     help=f'Input sizes (default: {" ".join(SIZES)})')
+    run.add_argument('--filter', nargs='+', default=None,
+                     help='Only cases whose name contains one of these')
+    run.add_argument('--repeat', type=int, default=3, help='Timed runs per case/size (default: 3)')
+    run.add_argument('--warmup', type=int, default=1, help='Untimed runs per case/size (default: 1)')
+    run.add_argument('--max-bars', type=parse_size, default=None,
+                     help="Override every case's size cap (e.g. 1M)")
+    run.add_argument('--output', default=None,
+                     help='Results file (default: benchmarks/results/<commit>_<time>.json)')
+
+    cmp = commands.add_parser('compare', help='Compare two results files')
+    cmp.add_argument('baseline', help='Reference results JSON')
+    cmp.add_argument('current', help='New results JSON')
+    cmp.add_argument('--threshold', type=float, default=10.0,
+                     help='Slowdown in %% that counts as a regression (default: 10)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for case in CASES.values():
+            print(f"{case.name:<42} ≤{size_label(case.max_bars):>5} {case.unit:<6} {case.description}")
+        return 0
+
+    if args.command == 'run':
+        cases = select_cases(args.filter)
+        if not cases:
+            print(f"❌ No case matches {args.filter}")
+            return 2
+        sizes = sorted(parse_size(size) for size in args.sizes)
+
+        print("=" * 90)
+        print(f"BENCHMARKS: {len(cases)} cases × {', '.join(size_label(n) for n in sizes)}")
+        print("=" * 90)
+        document = run_suite(cases, sizes, repeat=args.repeat, warmup=args.warmup,
+                             max_bars=args.max_bars)
+        path = save_results(document, args.output)
+
+        if document['skipped']:
+            print(f"\n   ⏭️  {len(document['skipped'])} skipped (size cap or error; see results file)")
+        print(f"\n💾 Results saved to {path}")
+        return 0
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows, baseline, current, args.threshold)
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
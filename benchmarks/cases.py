@@ -0,0 +1,438 @@
+"""
+Benchmark Cases
+
+Each case is a setup function registered with @benchmark. It receives the
+input size, builds everything untimed, and returns the zero-argument
+callable that is timed. Setup runs again before every repeat, so cases
+that mutate their input always start from a fresh copy.
+
+max_bars caps the sizes a case runs at: the per-row loops in
+EntryDetector / BacktestEngine grow too slowly to time at 1M bars, and
+their cap documents the current cost rather than a design limit.
+"""
+
+import asyncio
+import json
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .data import DEFAULT_SEED, make_indicator_frame, make_ohlcv, make_positions, make_ticks
+
+
+@dataclass
+class BenchmarkCase:
+    """A registered benchmark"""
+    name: str
+    setup: Callable[[int], Callable[[], object]]
+    max_bars: int
+    unit: str
+    description: str
+
+
+CASES: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, max_bars: int = 1_000_000, unit: str = 'bars'):
+    """
+    Register a setup function as a benchmark case
+
+    Args:
+        name: Case name ('<component>.<method>')
+        max_bars: Largest size this case runs at
+        unit: What the size counts ('bars', 'ticks', 'calls')
+    """
+    def register(setup):
+        doc = (setup.__doc__ or '').strip().splitlines()
+        CASES[name] = BenchmarkCase(name=name, setup=setup, max_bars=max_bars,
+                                    unit=unit, description=doc[0] if doc else '')
+        return setup
+    return register
+
+
+def select_cases(patterns: List[str] = None) -> List[BenchmarkCase]:
+    """Cases whose name contains any of the patterns (all cases if none)"""
+    if not patterns:
+        return list(CASES.values())
+    return [case for name, case in CASES.items() if any(p in name for p in patterns)]
+
+
+# ============================================================================
+# Shared inputs
+# ============================================================================
+
+# Temporary directories behind the cached inputs, removed by teardown()
+_TEMP_DIRS: List[tempfile.TemporaryDirectory] = []
+
+
+def _temp_dir(prefix: str) -> Path:
+    """A temporary directory that lives until teardown()"""
+    directory = tempfile.TemporaryDirectory(prefix=prefix)
+    _TEMP_DIRS.append(directory)
+    return Path(directory.name)
+
+
+def teardown():
+    """Remove the temporary input files and drop the setups cached on them"""
+    pinned_params_file.cache_clear()
+    _indicator_files.cache_clear()
+    while _TEMP_DIRS:
+        _TEMP_DIRS.pop().cleanup()
+
+
+@lru_cache(maxsize=1)
+def pinned_params_file() -> str:
+    """
+    Strategy parameters pinned for the benchmarks
+
+    The live strategy_params.json is rewritten by the optimizers, so timing
+    against it would change with every applied iteration. This copies it
+    once per process with the three take-profit levels ExitManager expects.
+    """
+    from src.strategy.entry_detector import EntryDetector
+
+    params = EntryDetector().params
+    params['exit_strategy']['take_profit_levels'] = [1.0, 2.0, 3.0]
+    params['exit_strategy']['take_profit_sizes'] = [50, 30, 20]
+    path = _temp_dir('bench_params_') / 'strategy_params.json'
+    path.write_text(json.dumps(params, indent=2))
+    return str(path)
+
+
+@lru_cache(maxsize=2)
+def _strategy_frame(n_bars: int) -> pd.DataFrame:
+    """Indicator frame after IndicatorPipeline + RibbonAnalyzer (the scanner's input)"""
+    from src.indicators.indicator_pipeline import IndicatorPipeline
+    from src.strategy.ribbon_analyzer import RibbonAnalyzer
+
+    df = IndicatorPipeline().calculate_all(make_indicator_frame(n_bars))
+    return RibbonAnalyzer().analyze_all(df)
+
+
+def strategy_frame(n_bars: int) -> pd.DataFrame:
+    return _strategy_frame(n_bars).copy()
+
+
+def _silently(fn):
+    """Run a setup step with its progress prints suppressed"""
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+# ============================================================================
+# Strategy hot paths
+# ============================================================================
+
+@benchmark('fibonacci_ribbon.analyze', max_bars=10_000)
+def fibonacci_ribbon_analyze(n_bars: int):
+    """FibonacciRibbonAnalyzer.analyze: 11 EMAs, per-ribbon FFT, signals"""
+    from fourier_strategy.fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
+
+    df = make_ohlcv(n_bars)
+    analyzer = FibonacciRibbonAnalyzer()
+    return lambda: analyzer.analyze(df)
+
+
+@benchmark('fourier.process_signal')
+def fourier_process_signal(n_bars: int):
+    """FourierTransformProcessor.process_signal on close prices"""
+    from fourier_strategy.fourier_processor import FourierTransformProcessor
+
+    close = make_ohlcv(n_bars)['close']
+    processor = FourierTransformProcessor(n_harmonics=5, noise_threshold=0.3)
+    return lambda: processor.process_signal(close)
+
+
+@benchmark('indicator_pipeline.calculate_all', max_bars=100_000)
+def indicator_pipeline_calculate_all(n_bars: int):
+    """IndicatorPipeline.calculate_all on the fetcher's indicator layout"""
+    from src.indicators.indicator_pipeline import IndicatorPipeline
+
+    df = make_indicator_frame(n_bars)
+    pipeline = IndicatorPipeline()
+    return lambda: pipeline.calculate_all(df)
+
+
+def _thread_pool_indicators(pipeline, df: pd.DataFrame) -> pd.DataFrame:
+    """The pipeline's previous indicator step: six threads, df.copy() each, merge by prefix"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = [
+        (pipeline.rsi_calculator.calculate, lambda col: col.startswith('rsi_')),
+        (pipeline.macd_calculator.calculate, lambda col: col.startswith('macd_')),
+        (pipeline.vwap_calculator.calculate, lambda col: col.startswith('vwap')),
+        (pipeline.volume_analyzer.analyze,
+         lambda col: col.startswith('volume_') or col == 'accumulation_distribution'),
+        (pipeline.stochastic_calculator.calculate, lambda col: col.startswith('stoch_')),
+        (pipeline.bollinger_calculator.calculate, lambda col: col.startswith('bb_')),
+    ]
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [(executor.submit(calculate, df.copy()), keep) for calculate, keep in calls]
+        results = [(future.result(), keep) for future, keep in futures]
+    for result, keep in results:
+        for col in result.columns:
+            if keep(col):
+                df[col] = result[col]
+    return df
+
+
+def _indicator_step(n_bars: int, run):
+    """Setup for the indicator step on a frame that already has its EMA crossovers"""
+    from src.indicators.indicator_pipeline import IndicatorPipeline
+
+    pipeline = IndicatorPipeline()
+    df = _silently(lambda: pipeline._add_important_ema_crossovers(make_indicator_frame(n_bars)))
+    return lambda: run(pipeline, df)
+
+
+@benchmark('indicator_pipeline.indicators.threads', max_bars=100_000)
+def indicator_pipeline_threads(n_bars: int):
+    """Previous indicator step: thread pool, six frame copies, per-column merge"""
+    return _indicator_step(n_bars, _thread_pool_indicators)
+
+
+@benchmark('indicator_pipeline.indicators.serial', max_bars=100_000)
+def indicator_pipeline_serial(n_bars: int):
+    """IndicatorPipeline indicator step, mode='serial' (read-only views, one concat)"""
+    def run(pipeline, df):
+        pipeline.mode = 'serial'
+        return pipeline._calculate_parallel_indicators(df)
+    return _indicator_step(n_bars, run)
+
+
+@benchmark('indicator_pipeline.indicators.process', max_bars=100_000)
+def indicator_pipeline_process(n_bars: int):
+    """IndicatorPipeline indicator step, mode='process' (shared-memory inputs, pool start included)"""
+    def run(pipeline, df):
+        pipeline.mode = 'process'
+        return pipeline._calculate_parallel_indicators(df)
+    return _indicator_step(n_bars, run)
+
+
+@benchmark('mtf_ribbon.resample_emas')
+def mtf_ribbon_resample_emas(n_bars: int):
+    """1m → 2/8/13/21/34/55m in one pass + 35-period EMA bank per timeframe"""
+    from src.data.mtf_ribbon_fetcher import MTFRibbonFetcher
+    from src.data.multi_resolution import ema_bank, resample_ohlcv_multi
+
+    df = make_ohlcv(n_bars)
+
+    def run():
+        frames = resample_ohlcv_multi(df, [2, 8, 13, 21, 34, 55])
+        return {m: ema_bank(frame['close'].to_numpy(), MTFRibbonFetcher.EMA_PERIODS)
+                for m, frame in frames.items()}
+
+    return run
+
+
+@benchmark('hyperliquid_fetcher.ribbon')
+def hyperliquid_fetcher_ribbon(n_bars: int):
+    """EMA colors + ribbon state + crossovers on the 35-EMA (bars × periods) matrix"""
+    from src.data.hyperliquid_fetcher import HyperliquidFetcher
+
+    ohlcv = make_ohlcv(n_bars)
+    df = ohlcv.reset_index(drop=True)
+    df.insert(0, 'timestamp', ohlcv.index.asi8 // 1_000_000)
+    emas = {f'ema_{p}': df['close'].ewm(span=p, adjust=False).mean()
+            for p in HyperliquidFetcher.RIBBON_PERIODS}
+    df = pd.concat([df, pd.DataFrame(emas)], axis=1)
+
+    # The ribbon methods use no connection state: skip __init__ (API client)
+    fetcher = HyperliquidFetcher.__new__(HyperliquidFetcher)
+
+    def run():
+        out = fetcher.determine_ema_colors(df)
+        out = fetcher.analyze_ribbon_state(out)
+        return fetcher.detect_ema_crossovers(out)
+
+    return run
+
+
+@benchmark('entry_detector.scan_historical_signals', max_bars=1_000)
+def entry_detector_scan(n_bars: int):
+    """EntryDetector.scan_historical_signals (re-slices history per bar)"""
+    from src.strategy.entry_detector import EntryDetector
+
+    df = _silently(lambda: strategy_frame(n_bars))
+    detector = EntryDetector(pinned_params_file())
+    return lambda: detector.scan_historical_signals(df)
+
+
+@benchmark('backtest_engine.run_backtest', max_bars=100_000)
+def backtest_engine_run(n_bars: int):
+    """BacktestEngine.run_backtest on pre-placed entries (simulation loop only)"""
+    from src.backtest.backtest_engine import BacktestEngine
+    from src.strategy.entry_detector import EntryDetector
+    from src.strategy.exit_manager import ExitManager
+
+    df = _silently(lambda: strategy_frame(n_bars))
+
+    # Seeded entries (~1 per 100 bars) instead of the quadratic scanner
+    rng = np.random.default_rng([DEFAULT_SEED, n_bars, 3])
+    entries = rng.random(n_bars) < 0.01
+    entries[:50] = False
+    df['entry_signal'] = entries
+    df['entry_direction'] = np.where(entries, rng.choice(['long', 'short'], size=n_bars), None)
+    df['entry_confidence'] = np.where(entries, rng.uniform(0.5, 1.0, size=n_bars), 0.0)
+    df['entry_reason'] = np.where(entries, 'benchmark', '')
+
+    params_file = pinned_params_file()
+    entry_detector = EntryDetector(params_file)
+    exit_manager = ExitManager(params_file)
+    engine = BacktestEngine()
+    return lambda: engine.run_backtest(df, entry_detector, exit_manager,
+                                       verbose=False, scan_signals=False)
+
+
+@benchmark('fourier_backtester.execute_backtest')
+def fourier_backtester_execute(n_bars: int):
+    """Backtester.execute_backtest on a seeded long/flat/short position series"""
+    from fourier_strategy.backtester import Backtester
+
+    price = make_ohlcv(n_bars)['close']
+    signals = make_positions(n_bars).to_frame()
+    backtester = Backtester()
+    return lambda: backtester.execute_backtest(price, signals)
+
+
+# ============================================================================
+# Data validation and loading
+# ============================================================================
+
+def _damaged_ohlcv(n_bars: int) -> pd.DataFrame:
+    """make_ohlcv with ~0.5% of bars dropped in runs, 0.01% duplicated"""
+    df = make_ohlcv(n_bars)
+    rng = np.random.default_rng([DEFAULT_SEED, n_bars, 5])
+    drop = np.zeros(n_bars, dtype=bool)
+    for start in rng.integers(0, n_bars, max(1, n_bars // 10_000)):
+        drop[start:start + int(rng.integers(1, 100))] = True
+    kept = df[~drop]
+    return pd.concat([kept, kept.iloc[rng.integers(0, len(kept), max(1, n_bars // 10_000))]])
+
+
+@benchmark('data_validator.validate')
+def data_validator_validate(n_bars: int):
+    """CandleValidator.validate on a 1m series with gaps and duplicates"""
+    from src.data.data_validator import CandleValidator
+
+    df = _damaged_ohlcv(n_bars)
+    validator = CandleValidator('1m')
+    return lambda: validator.validate(df)
+
+
+@benchmark('data_validator.repair')
+def data_validator_repair(n_bars: int):
+    """CandleValidator.repair (sort, dedup, reindex, flat-bar fill) of the same series"""
+    from src.data.data_validator import CandleValidator
+
+    df = _damaged_ohlcv(n_bars)
+    validator = CandleValidator('1m')
+    return lambda: validator.repair(df)
+
+
+@lru_cache(maxsize=2)
+def _indicator_files(n_bars: int) -> str:
+    """The indicator frame as a *_full.csv file and as a CandleStore (written once)"""
+    from src.data.candle_store import CandleStore
+
+    directory = _temp_dir('bench_store_')
+    df = make_indicator_frame(n_bars)
+    df.to_csv(directory / 'eth_1m_full.csv', index=False)
+    CandleStore(directory / 'store').write('ETH', '1m', df)
+    return str(directory)
+
+
+@benchmark('io.read_csv', max_bars=100_000)
+def io_read_csv(n_bars: int):
+    """pd.read_csv + to_datetime of an indicator CSV (the current loaders)"""
+    path = Path(_indicator_files(n_bars)) / 'eth_1m_full.csv'
+
+    def load():
+        df = pd.read_csv(path)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    return load
+
+
+@benchmark('io.candle_store.read', max_bars=100_000)
+def io_candle_store_read(n_bars: int):
+    """CandleStore.read of the same frame (memory-mapped day partitions)"""
+    from src.data.candle_store import CandleStore
+
+    store = CandleStore(Path(_indicator_files(n_bars)) / 'store')
+    return lambda: store.read('ETH', '1m')
+
+
+@benchmark('io.candle_store.read_ohlcv', max_bars=100_000)
+def io_candle_store_read_ohlcv(n_bars: int):
+    """CandleStore.read_arrays of the OHLCV columns only"""
+    from src.data.candle_store import CandleStore
+
+    store = CandleStore(Path(_indicator_files(n_bars)) / 'store')
+    return lambda: store.read_arrays('ETH', '1m', columns=['open', 'high', 'low', 'close', 'volume'])
+
+
+# ============================================================================
+# Live hot paths
+# ============================================================================
+
+@benchmark('realtime_engine.tick_ingestion', unit='ticks')
+def realtime_tick_ingestion(n_ticks: int):
+    """RealtimeDataEngine.process_trade_message per tick + per-minute finalization"""
+    from src.live.realtime_data_engine import RealtimeDataEngine
+
+    ticks = make_ticks(n_ticks)
+    engine = RealtimeDataEngine(symbol='ETH', buffer_size=5000)
+
+    async def ingest():
+        next_minute = (ticks[0]['timestamp'] // 60_000 + 1) * 60_000
+        for message in ticks:
+            if message['timestamp'] >= next_minute:
+                engine.aggregator.finalize_candles(message['timestamp'])
+                next_minute = (message['timestamp'] // 60_000 + 1) * 60_000
+            await engine.process_trade_message(message)
+
+    return lambda: asyncio.run(ingest())
+
+
+@benchmark('signal_fusion.fuse_signals', max_bars=100_000, unit='calls')
+def signal_fusion_fuse(n_calls: int):
+    """SignalFusionEngine.fuse_signals on seeded 2-6 signal sets"""
+    from src.live.signal_fusion_engine import Signal, SignalFusionEngine, SignalType
+
+    rng = np.random.default_rng([DEFAULT_SEED, n_calls, 4])
+    timeframes = ['1m', '5m', '15m', '30m', '1h']
+    sources = ['fourier', 'kalman', 'fibonacci_fft']
+    types = [SignalType.LONG, SignalType.SHORT, SignalType.NEUTRAL]
+    regimes = ['trending', 'ranging', 'neutral']
+
+    batches = []
+    for i in range(n_calls):
+        count = int(rng.integers(2, 7))
+        bias = int(rng.integers(0, 3))
+        batches.append(([
+            Signal(signal_type=types[bias if rng.random() < 0.7 else int(rng.integers(0, 3))],
+                   strength=float(rng.random()),
+                   confidence=float(rng.uniform(0.3, 1.0)),
+                   timeframe=timeframes[int(rng.integers(0, len(timeframes)))],
+                   source=sources[int(rng.integers(0, len(sources)))],
+                   timestamp=i * 60_000)
+            for _ in range(count)
+        ], regimes[int(rng.integers(0, len(regimes)))]))
+
+    engine = SignalFusionEngine()
+
+    def fuse_all():
+        for signals, regime in batches:
+            engine.fuse_signals(signals, current_regime=regime)
+
+    return fuse_all
+
@@ -0,0 +1,173 @@
+"""
+Seeded Synthetic Market Data for Benchmarks
+
+Every generator is deterministic for a given (size, seed), so two runs on
+different machines or commits time exactly the same input:
+- make_ohlcv: 1m OHLCV random walk with volatility regimes
+- make_indicator_frame: the layout HyperliquidFetcher writes to
+  trading_data/indicators (MMA{p}_value / _color, ribbon_state, string timestamps)
+- make_ticks: trade messages as RealtimeDataEngine receives them
+"""
+
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+SIZES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '100k': 100_000,
+    '1M': 1_000_000,
+}
+
+# Same ribbon the fetcher computes
+RIBBON_PERIODS = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
+                  85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
+
+START = '2024-01-01'
+DEFAULT_SEED = 42
+
+
+def parse_size(label: str) -> int:
+    """'10k' → 10000, '1M' → 1000000, '2500' → 2500"""
+    if label in SIZES:
+        return SIZES[label]
+    text = label.strip().lower().replace('_', '')
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def size_label(n: int) -> str:
+    """Inverse of parse_size() for the standard sizes"""
+    for label, value in SIZES.items():
+        if value == n:
+            return label
+    return str(n)
+
+
+@lru_cache(maxsize=8)
+def _ohlcv(n_bars: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng([seed, n_bars])
+
+    # Volatility regimes of ~6h so trend/chop filters see both
+    regime = np.repeat(rng.choice([0.0006, 0.0012, 0.0025], size=n_bars // 360 + 1), 360)[:n_bars]
+    drift = np.repeat(rng.normal(0, 0.00005, size=n_bars // 720 + 1), 720)[:n_bars]
+    returns = drift + regime * rng.standard_normal(n_bars)
+    close = 3000.0 * np.exp(np.cumsum(returns))
+
+    open_ = np.empty(n_bars)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.standard_normal((2, n_bars))) * regime * close * 0.5
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    volume = rng.lognormal(mean=3.0, sigma=0.6, size=n_bars) * (1 + regime * 400)
+
+    index = pd.date_range(START, periods=n_bars, freq='1min', name='timestamp')
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low,
+                         'close': close, 'volume': volume}, index=index)
+
+
+def make_ohlcv(n_bars: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    1m OHLCV bars with a DatetimeIndex
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+
+    Returns:
+        Fresh copy (callers may mutate it)
+    """
+    return _ohlcv(n_bars, seed).copy()
+
+
+@lru_cache(maxsize=4)
+def _indicator_frame(n_bars: int, seed: int) -> pd.DataFrame:
+    ohlcv = _ohlcv(n_bars, seed)
+    close = ohlcv['close']
+
+    columns = {
+        'timestamp': ohlcv.index.strftime('%Y-%m-%dT%H:%M:%S'),
+        'open': ohlcv['open'].values,
+        'high': ohlcv['high'].values,
+        'low': ohlcv['low'].values,
+        'close': close.values,
+        'volume': ohlcv['volume'].values,
+        'price': close.values,
+    }
+
+    green = np.zeros(n_bars)
+    for period in RIBBON_PERIODS:
+        ema = close.ewm(span=period, adjust=False).mean().values
+        columns[f'MMA{period}_value'] = ema
+        columns[f'MMA{period}_color'] = np.where(close.values > ema, 'green',
+                                                 np.where(close.values < ema, 'red', 'neutral'))
+        green += close.values > ema
+
+    alignment = green / len(RIBBON_PERIODS)
+    columns['ribbon_state'] = np.select(
+        [alignment >= 0.85, alignment <= 0.15, alignment >= 0.65, alignment <= 0.35],
+        ['all_green', 'all_red', 'mixed_green', 'mixed_red'],
+        default='mixed'
+    )
+
+    return pd.DataFrame(columns)
+
+
+def make_indicator_frame(n_bars: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Bars in the fetcher's indicator-file layout (input to IndicatorPipeline)
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+
+    Returns:
+        Fresh copy with a RangeIndex and string timestamps
+    """
+    return _indicator_frame(n_bars, seed).copy()
+
+
+def make_positions(n_bars: int, seed: int = DEFAULT_SEED, mean_hold: int = 30) -> pd.Series:
+    """
+    Long/flat/short position series (1/0/-1) with geometric holding times
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+        mean_hold: Average bars per position
+
+    Returns:
+        Series aligned with make_ohlcv(n_bars, seed)
+    """
+    rng = np.random.default_rng([seed, n_bars, 1])
+    changes = rng.random(n_bars) < 1.0 / mean_hold
+    states = rng.choice([-1, 0, 1], size=int(changes.sum()) + 1)
+    positions = states[np.cumsum(changes)]
+    return pd.Series(positions, index=_ohlcv(n_bars, seed).index, name='position')
+
+
+def make_ticks(n_ticks: int, seed: int = DEFAULT_SEED, ticks_per_minute: int = 60) -> List[Dict]:
+    """
+    Trade messages ({'timestamp' ms, 'price', 'quantity'}) in time order
+
+    Args:
+        n_ticks: Number of trades
+        seed: Random seed
+        ticks_per_minute: Average trade rate
+
+    Returns:
+        List of message dicts as delivered by the WebSocket stream
+    """
+    rng = np.random.default_rng([seed, n_ticks, 2])
+    start_ms = int(pd.Timestamp(START).value // 1_000_000)
+    gaps = rng.exponential(60_000 / ticks_per_minute, size=n_ticks)
+    timestamps = start_ms + np.cumsum(gaps).astype(np.int64)
+    prices = 3000.0 * np.exp(np.cumsum(rng.normal(0, 0.0002, size=n_ticks)))
+    quantities = rng.lognormal(mean=-1.0, sigma=1.0, size=n_ticks)
+    return [{'timestamp': int(t), 'price': float(p), 'quantity': float(q)}
+            for t, p, q in zip(timestamps, prices, quantities)]
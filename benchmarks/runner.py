@@ -0,0 +1,262 @@
+"""
+Benchmark Runner
+
+Times registered cases, writes results as JSON with the machine they ran
+on, and compares two result files for regressions.
+
+Timing notes:
+- Setup (data generation, indicator prep) is never timed
+- Progress prints and log output of the timed code are suppressed, so
+  terminal I/O does not dominate the numbers
+- min_s is the comparison statistic: it is the least noisy estimate of
+  the code's cost on a shared machine
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cases import BenchmarkCase, teardown
+from .data import size_label
+
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def git_revision() -> Dict:
+    """Current commit and whether the tree has uncommitted changes"""
+    root = Path(__file__).parent.parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+        return {'commit': commit or None, 'dirty': bool(dirty)}
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': None, 'dirty': None}
+
+
+def machine_info() -> Dict:
+    """Platform, interpreter and library versions the numbers belong to"""
+    import numpy as np
+    import pandas as pd
+
+    info = {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+    try:
+        import scipy
+        info['scipy'] = scipy.__version__
+    except ImportError:
+        info['scipy'] = None
+    info.update(git_revision())
+    return info
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence stdout, logging and warnings of the code under test"""
+    previous = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            yield
+    finally:
+        logging.disable(previous)
+
+
+def time_case(case: BenchmarkCase, n: int, repeat: int = 3, warmup: int = 1) -> Dict:
+    """
+    Time one case at one size
+
+    Args:
+        case: Registered benchmark
+        n: Input size (bars / ticks / calls)
+        repeat: Timed runs
+        warmup: Untimed runs first (imports, caches, allocator)
+
+    Returns:
+        Result record with min/median/mean seconds and µs per unit
+    """
+    timings = []
+    with quiet():
+        for run in range(warmup + repeat):
+            fn = case.setup(n)
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            if run >= warmup:
+                timings.append(elapsed)
+
+    best = min(timings)
+    return {
+        'case': case.name,
+        'size': size_label(n),
+        'n': n,
+        'unit': case.unit,
+        'repeat': repeat,
+        'min_s': best,
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'stdev_s': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'us_per_unit': best / n * 1e6,
+    }
+
+
+def run_suite(cases: List[BenchmarkCase],
+              sizes: List[int],
+              repeat: int = 3,
+              warmup: int = 1,
+              max_bars: Optional[int] = None,
+              verbose: bool = True) -> Dict:
+    """
+    Time every case at every size it supports
+
+    Args:
+        cases: Cases to run
+        sizes: Input sizes
+        repeat: Timed runs per case/size
+        warmup: Untimed runs per case/size
+        max_bars: Override every case's own size cap
+        verbose: Print one line per result
+
+    Returns:
+        Results document: {'created_at', 'machine', 'settings', 'results', 'skipped'}
+    """
+    results, skipped = [], []
+
+    try:
+        for case in cases:
+            cap = max_bars if max_bars is not None else case.max_bars
+            for n in sizes:
+                if n > cap:
+                    skipped.append({'case': case.name, 'size': size_label(n), 'reason': f'above max_bars={cap}'})
+                    continue
+                try:
+                    record = time_case(case, n, repeat=repeat, warmup=warmup)
+                except Exception as e:
+                    skipped.append({'case': case.name, 'size': size_label(n), 'reason': f'error: {e}'})
+                    if verbose:
+                        print(f"   ❌ {case.name:<42} {size_label(n):>5}  {e}")
+                    continue
+                results.append(record)
+                if verbose:
+                    print(f"   ⏱️  {case.name:<42} {record['size']:>5}  "
+                          f"{record['min_s'] * 1000:>10.2f} ms  "
+                          f"{record['us_per_unit']:>9.3f} µs/{case.unit[:-1]}")
+    finally:
+        # Temporary input files of the cached setups
+        teardown()
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'settings': {'repeat': repeat, 'warmup': warmup,
+                     'sizes': [size_label(n) for n in sizes], 'max_bars': max_bars},
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def save_results(document: Dict, path: Optional[str] = None) -> Path:
+    """Write a results document (default: benchmarks/results/<commit>_<time>.json)"""
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        commit = document['machine'].get('commit') or 'nocommit'
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = RESULTS_DIR / f'{commit}_{stamp}.json'
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold_pct: float = 10.0) -> List[Dict]:
+    """
+    Compare two results documents case by case
+
+    Args:
+        baseline: Reference results
+        current: New results
+        threshold_pct: Slowdown (in % of baseline min_s) that counts as a regression
+
+    Returns:
+        One row per (case, size) in either document with status
+        'regression', 'improvement', 'ok', 'new' or 'missing'
+    """
+    base = {(r['case'], r['size']): r for r in baseline['results']}
+    new = {(r['case'], r['size']): r for r in current['results']}
+
+    rows = []
+    for key in list(base) + [k for k in new if k not in base]:
+        before, after = base.get(key), new.get(key)
+        row = {'case': key[0], 'size': key[1],
+               'baseline_s': before['min_s'] if before else None,
+               'current_s': after['min_s'] if after else None,
+               'change_pct': None}
+        if before is None:
+            row['status'] = 'new'
+        elif after is None:
+            row['status'] = 'missing'
+        else:
+            change = (after['min_s'] / before['min_s'] - 1) * 100 if before['min_s'] > 0 else 0.0
+            row['change_pct'] = change
+            if change > threshold_pct:
+                row['status'] = 'regression'
+            elif change < -threshold_pct:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict], baseline: Dict, current: Dict, threshold_pct: float):
+    """Print a comparison table and the machines both sides ran on"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '⚪', 'new': '🆕', 'missing': '❔'}
+
+    print("\n" + "=" * 90)
+    print(f"BENCHMARK COMPARISON (threshold ±{threshold_pct:.1f}%)")
+    print("=" * 90)
+    for label, document in (('baseline', baseline), ('current', current)):
+        machine = document['machine']
+        print(f"   {label:<9} {machine.get('commit') or '?'}{' (dirty)' if machine.get('dirty') else ''} | "
+              f"{machine.get('platform')} | {machine.get('cpu_count')} CPUs | "
+              f"py {machine.get('python')} | pandas {machine.get('pandas')}")
+    if baseline['machine'].get('platform') != current['machine'].get('platform') or \
+            baseline['machine'].get('cpu_count') != current['machine'].get('cpu_count'):
+        print("   ⚠️  Different machines: timings are not directly comparable")
+
+    print(f"\n   {'case':<42} {'size':>5} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        before = f"{row['baseline_s'] * 1000:.2f} ms" if row['baseline_s'] is not None else '-'
+        after = f"{row['current_s'] * 1000:.2f} ms" if row['current_s'] is not None else '-'
+        change = f"{row['change_pct']:+.1f}%" if row['change_pct'] is not None else '-'
+        print(f"{icons[row['status']]} {row['case']:<42} {row['size']:>5} {before:>12} {after:>12} {change:>9}")
+
+    regressions = [row for row in rows if row['status'] == 'regression']
+    improvements = [row for row in rows if row['status'] == 'improvement']
+    print(f"\n   {len(regressions)} regressions | {len(improvements)} improvements | {len(rows)} compared")
@@ -154,148 +154,194 @@ def analyze_fibonacci_ribbons_deep(df, timeframe, scalping_params):
     }
 
 
-def find_optimal_thresholds(tf_analyses):
+# Threshold grids (0.5 steps → 41 values per axis, 10× finer than the old 5-point grids)
+COMPRESSION_THRESHOLDS = np.arange(70, 90.25, 0.5)
+ALIGNMENT_THRESHOLDS = np.arange(60, 90.25, 0.5)
+CONFLUENCE_THRESHOLDS = np.arange(60, 80.25, 0.5)
+
+
+def exceed_counts(values, thresholds):
+    """
+    Number of thresholds each value is strictly above
+
+    value > thresholds[j]  ⇔  j < exceed_counts(value), so a bar qualifies
+    for a whole prefix of the (sorted) threshold grid. NaN exceeds nothing.
+    """
+    values = np.asarray(values, dtype=float)
+    counts = np.searchsorted(thresholds, values, side='left')
+    return np.where(np.isnan(values), 0, counts)
+
+
+def count_signals_cube(tf_analyses, compression_thresholds, alignment_thresholds,
+                       confluence_thresholds):
+    """
+    Long + short signal counts for every threshold triple at once
+
+    Each bar's (compression, ±alignment, confluence) is reduced to how many
+    thresholds it exceeds on each axis and histogrammed into a 3D array.
+    A reversed cumulative sum along every axis then turns "bars with exactly
+    these exceed counts" into "bars above thresholds (i, j, k)".
+
+    Returns:
+        int array (n_compression × n_alignment × n_confluence)
+    """
+    shape = (len(compression_thresholds) + 1,
+             len(alignment_thresholds) + 1,
+             len(confluence_thresholds) + 1)
+    histogram = np.zeros(int(np.prod(shape)), dtype=np.int64)
+
+    for analysis in tf_analyses.values():
+        comp_rank = exceed_counts(analysis['compression'], compression_thresholds)
+        conf_rank = exceed_counts(analysis['confluence'], confluence_thresholds)
+        alignment = np.asarray(analysis['alignment'], dtype=float)
+
+        # Long: alignment > t, short: alignment < -t  ⇔  -alignment > t
+        for align_rank in (exceed_counts(alignment, alignment_thresholds),
+                           exceed_counts(-alignment, alignment_thresholds)):
+            flat = np.ravel_multi_index((comp_rank, align_rank, conf_rank), shape)
+            histogram += np.bincount(flat, minlength=histogram.size)
+
+    cube = histogram.reshape(shape)
+    for axis in range(3):
+        cube = np.flip(np.cumsum(np.flip(cube, axis), axis=axis), axis)
+
+    # Row 0 of each axis = bars above no threshold → drop it
+    return cube[1:, 1:, 1:]
+
+
+def score_threshold_cube(signals, comp, align, conf):
+    """
+    Vectorized threshold score (NaN where the signal count is out of range)
+
+    Score: balance between selectivity and opportunity
+    - Too few signals (< 50) = missing opportunities
+    - Too many signals (> 500) = false signals
+    - Ideal range 100-300, plus a bonus for higher (more selective) thresholds
+    """
+    distance = np.abs(200 - signals)
+    score = np.where((signals >= 100) & (signals <= 300), 100 - distance / 2, 50 - distance / 4)
+    score = score + (comp + align + conf) / 30
+    return np.where((signals > 50) & (signals < 500), score, np.nan)
+
+
+def find_optimal_thresholds(tf_analyses,
+                            compression_thresholds=COMPRESSION_THRESHOLDS,
+                            alignment_thresholds=ALIGNMENT_THRESHOLDS,
+                            confluence_thresholds=CONFLUENCE_THRESHOLDS,
+                            top_k=5):
     """
     Find optimal thresholds by analyzing ribbon behavior
 
-    Tests different threshold combinations and finds the best balance:
+    Tests every threshold combination and finds the best balance:
     - High enough to avoid false signals
     - Low enough to capture opportunities
+
+    The whole (compression × alignment × confluence) cube is counted and
+    scored with array operations (see count_signals_cube), so the grids can
+    be fine without a per-combination pass over the data.
+
+    Args:
+        tf_analyses: Output of analyze_fibonacci_ribbons_deep per timeframe
+        compression_thresholds, alignment_thresholds, confluence_thresholds:
+            Sorted threshold grids
+        top_k: Number of best combinations kept as 'candidates'
+
+    Returns:
+        Best combination dict; 'candidates' holds the top_k combinations
+        (best first) for run_optimized_backtest()
     """
     print_section("🎯 FINDING OPTIMAL RIBBON THRESHOLDS")
 
     print(f"\n🔬 Testing threshold combinations...")
 
-    # Test different compression thresholds
-    compression_thresholds = [70, 75, 80, 85, 90]
-    alignment_thresholds = [60, 70, 80, 85, 90]
-    confluence_thresholds = [60, 65, 70, 75, 80]
-
-    best_combo = None
-    best_score = 0
-
-    results = []
-
-    for comp_thresh in compression_thresholds:
-        for align_thresh in alignment_thresholds:
-            for conf_thresh in confluence_thresholds:
-                # Calculate how many signals this generates across all TFs
-                total_signals = 0
-
-                for tf, analysis in tf_analyses.items():
-                    compression = analysis['compression']
-                    alignment = analysis['alignment']
-                    confluence = analysis['confluence']
-
-                    # Long signals
-                    long_signals = (
-                        (compression > comp_thresh) &
-                        (alignment > align_thresh) &
-                        (confluence > conf_thresh)
-                    ).sum()
-
-                    # Short signals
-                    short_signals = (
-                        (compression > comp_thresh) &
-                        (alignment < -align_thresh) &
-                        (confluence > conf_thresh)
-                    ).sum()
-
-                    total_signals += long_signals + short_signals
-
-                # Score: balance between selectivity and opportunity
-                # Too few signals (< 50) = missing opportunities
-                # Too many signals (> 500) = false signals
-                if 50 < total_signals < 500:
-                    # Ideal range: 100-300 signals
-                    if 100 <= total_signals <= 300:
-                        score = 100 - abs(200 - total_signals) / 2
-                    else:
-                        score = 50 - abs(200 - total_signals) / 4
-
-                    # Bonus for higher thresholds (more selective)
-                    score += (comp_thresh + align_thresh + conf_thresh) / 30
-
-                    if score > best_score:
-                        best_score = score
-                        best_combo = {
-                            'compression_threshold': comp_thresh,
-                            'alignment_threshold': align_thresh,
-                            'confluence_threshold': conf_thresh,
-                            'total_signals': total_signals,
-                            'score': score
-                        }
-
-                    results.append({
-                        'comp': comp_thresh,
-                        'align': align_thresh,
-                        'conf': conf_thresh,
-                        'signals': total_signals,
-                        'score': score
-                    })
-
-    print(f"\n✅ Tested {len(results)} threshold combinations")
+    compression_thresholds = np.sort(np.asarray(compression_thresholds, dtype=float))
+    alignment_thresholds = np.sort(np.asarray(alignment_thresholds, dtype=float))
+    confluence_thresholds = np.sort(np.asarray(confluence_thresholds, dtype=float))
+
+    signals = count_signals_cube(tf_analyses, compression_thresholds,
+                                 alignment_thresholds, confluence_thresholds)
+    comp, align, conf = np.meshgrid(compression_thresholds, alignment_thresholds,
+                                    confluence_thresholds, indexing='ij')
+    scores = score_threshold_cube(signals, comp, align, conf)
+
+    valid = np.flatnonzero(~np.isnan(scores.ravel()))
+    # Stable sort keeps grid order on ties (first combination wins, as before)
+    ranked = valid[np.argsort(-scores.ravel()[valid], kind='stable')]
+    ranked = ranked[scores.ravel()[ranked] > 0]
+
+    candidates = [{
+        'compression_threshold': float(comp.ravel()[i]),
+        'alignment_threshold': float(align.ravel()[i]),
+        'confluence_threshold': float(conf.ravel()[i]),
+        'total_signals': int(signals.ravel()[i]),
+        'score': float(scores.ravel()[i])
+    } for i in ranked[:top_k]]
+
+    print(f"\n✅ Tested {scores.size} threshold combinations ({len(valid)} in the 50-500 signal range)")
+
+    if not candidates:
+        print(f"\n⚠️  No threshold combination produced 50-500 signals")
+        return None
+
+    best_combo = {**candidates[0], 'candidates': candidates}
+
     print(f"\n🏆 OPTIMAL THRESHOLDS FOUND:")
-    print(f"   Compression:  {best_combo['compression_threshold']}+")
-    print(f"   Alignment:    {best_combo['alignment_threshold']}+")
-    print(f"   Confluence:   {best_combo['confluence_threshold']}+")
+    print(f"   Compression:  {best_combo['compression_threshold']:g}+")
+    print(f"   Alignment:    {best_combo['alignment_threshold']:g}+")
+    print(f"   Confluence:   {best_combo['confluence_threshold']:g}+")
     print(f"   Total Signals: {best_combo['total_signals']}")
     print(f"   Optimization Score: {best_combo['score']:.2f}/100")
 
-    # Show top 5 alternatives
-    top_5 = sorted(results, key=lambda x: x['score'], reverse=True)[:5]
-    print(f"\n📊 Top 5 Threshold Combinations:")
+    print(f"\n📊 Top {len(candidates)} Threshold Combinations:")
     print(f"   {'Comp':<6} {'Align':<6} {'Conf':<6} {'Signals':<8} {'Score':<8}")
     print(f"   {'-'*40}")
-    for r in top_5:
-        print(f"   {r['comp']:<6} {r['align']:<6} {r['conf']:<6} {r['signals']:<8} {r['score']:<8.2f}")
+    for r in candidates:
+        print(f"   {r['compression_threshold']:<6g} {r['alignment_threshold']:<6g} "
+              f"{r['confluence_threshold']:<6g} {r['total_signals']:<8} {r['score']:<8.2f}")
 
     return best_combo
 
 
-def run_optimized_backtest(tf_analyses, optimal_thresholds, scalping_params):
+def backtest_thresholds(base_df, compression, alignment, confluence, thresholds,
+                        max_holding_periods, lookback=50):
     """
-    Run backtest with optimized Fibonacci ribbon thresholds
-    """
-    print_section("📈 RUNNING OPTIMIZED BACKTEST")
+    Backtest one (compression, alignment, confluence) threshold triple
 
-    # Use 5m as execution timeframe
-    base_df = tf_analyses['5m']['fourier_df'].copy()
-    fib_signals_5m = tf_analyses['5m']['fib_signals']
-    fib_signals_15m = tf_analyses['15m']['fib_signals']
-    fib_signals_30m = tf_analyses['30m']['fib_signals']
+    Args:
+        base_df: Execution-timeframe DataFrame with close and composite_signal
+        compression, alignment, confluence: Ribbon signals aligned to base_df
+        thresholds: Dict with compression/alignment/confluence_threshold
+        max_holding_periods: Max candles per trade
+        lookback: Warm-up candles skipped before trading
 
-    # Align timeframes (simplified - use 5m as base)
-    compression_5m = tf_analyses['5m']['compression']
-    alignment_5m = tf_analyses['5m']['alignment']
-    confluence_5m = tf_analyses['5m']['confluence']
+    Returns:
+        List of trade dicts
+    """
+    close = base_df['close'].to_numpy()
+    fourier = base_df['composite_signal'].to_numpy()
+    comp_values = np.asarray(compression, dtype=float)
+    align_values = np.asarray(alignment, dtype=float)
+    conf_values = np.asarray(confluence, dtype=float)
 
-    print(f"\n⚡ Running backtest with optimized thresholds...")
-    print(f"   Compression threshold: {optimal_thresholds['compression_threshold']}")
-    print(f"   Alignment threshold:   {optimal_thresholds['alignment_threshold']}")
-    print(f"   Confluence threshold:  {optimal_thresholds['confluence_threshold']}")
+    comp_thresh = thresholds['compression_threshold']
+    align_thresh = thresholds['alignment_threshold']
+    conf_thresh = thresholds['confluence_threshold']
 
     capital = 10000.0
     position = 0
     trades = []
     entry_price = 0
-    entry_time = None
+    entry_idx = None
     entry_direction = None
-    lookback = 50
-
-    comp_thresh = optimal_thresholds['compression_threshold']
-    align_thresh = optimal_thresholds['alignment_threshold']
-    conf_thresh = optimal_thresholds['confluence_threshold']
 
     for i in range(lookback, len(base_df)):
-        current_time = base_df.index[i]
-        current_price = base_df['close'].iloc[i]
+        current_price = close[i]
 
         # Get Fibonacci signals
-        comp = compression_5m.iloc[i]
-        align = alignment_5m.iloc[i]
-        conf = confluence_5m.iloc[i]
-        fourier_signal = base_df['composite_signal'].iloc[i]
+        comp = comp_values[i]
+        align = align_values[i]
+        conf = conf_values[i]
+        fourier_signal = fourier[i]
 
         # Entry conditions (using optimized thresholds)
         should_enter_long = (
@@ -317,11 +363,10 @@ def run_optimized_backtest(tf_analyses, optimal_thresholds, scalping_params):
         # Exit conditions
         should_exit = False
         if position != 0:
-            holding_periods = i - base_df.index.get_loc(entry_time)
-            max_hold = scalping_params['max_holding_periods']
+            holding_periods = i - entry_idx
 
             # Exit on max holding
-            if holding_periods >= max_hold:
+            if holding_periods >= max_holding_periods:
                 should_exit = True
             # Exit on signal reversal
             elif position == 1 and fourier_signal < -0.1:
@@ -343,8 +388,8 @@ def run_optimized_backtest(tf_analyses, optimal_thresholds, scalping_params):
             capital += pnl
 
             trades.append({
-                'entry_time': entry_time,
-                'exit_time': current_time,
+                'entry_time': base_df.index[entry_idx],
+                'exit_time': base_df.index[i],
                 'direction': entry_direction,
                 'entry_price': entry_price,
                 'exit_price': current_price,
@@ -359,64 +404,131 @@ def run_optimized_backtest(tf_analyses, optimal_thresholds, scalping_params):
         if should_enter_long:
             position = 1
             entry_price = current_price
-            entry_time = current_time
+            entry_idx = i
             entry_direction = 'LONG'
         elif should_enter_short:
             position = -1
             entry_price = current_price
-            entry_time = current_time
+            entry_idx = i
             entry_direction = 'SHORT'
 
-    # Calculate metrics
-    if trades:
-        trade_df = pd.DataFrame(trades)
-        total_return = (capital - 10000) / 10000 * 100
-        winners = trade_df[trade_df['pnl_pct'] > 0]
-        win_rate = len(winners) / len(trades) * 100
-
-        returns = trade_df['pnl_pct'].values / 100
-        sharpe = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
-
-        equity_curve = [10000] + trade_df['capital'].tolist()
-        cummax = pd.Series(equity_curve).cummax()
-        drawdown = (pd.Series(equity_curve) - cummax) / cummax * 100
-        max_dd = drawdown.min()
-
-        gross_profit = winners['pnl_pct'].sum() if len(winners) > 0 else 0
-        losers = trade_df[trade_df['pnl_pct'] <= 0]
-        gross_loss = abs(losers['pnl_pct'].sum()) if len(losers) > 0 else 0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-
-        avg_holding = trade_df['holding_periods'].mean()
-        days_traded = (base_df.index[-1] - base_df.index[lookback]).days
-
-        print(f"\n✅ Optimized Backtest Results:")
-        print(f"   Return:          {total_return:>8.2f}%")
-        print(f"   Sharpe Ratio:    {sharpe:>8.2f}")
-        print(f"   Max Drawdown:    {max_dd:>8.2f}%")
-        print(f"   Win Rate:        {win_rate:>8.2f}%")
-        print(f"   Profit Factor:   {profit_factor:>8.2f}")
-        print(f"   Trades:          {len(trades):>8}")
-        print(f"   Trades/Day:      {len(trades)/days_traded:>8.2f}")
-        print(f"   Avg Holding:     {avg_holding:>8.1f} candles ({avg_holding * 5:.0f} min)")
-
-        return {
-            'trades': trade_df,
-            'metrics': {
-                'total_return_pct': total_return,
-                'sharpe_ratio': sharpe,
-                'max_drawdown_pct': max_dd,
-                'win_rate_pct': win_rate,
-                'profit_factor': profit_factor,
-                'num_trades': len(trades),
-                'trades_per_day': len(trades) / days_traded,
-                'avg_holding_periods': avg_holding
-            },
-            'base_df': base_df
-        }
-    else:
+    return trades
+
+
+def trade_metrics(trades, base_df, lookback=50):
+    """Summary metrics of a backtest_thresholds() trade list"""
+    trade_df = pd.DataFrame(trades)
+    capital = trade_df['capital'].iloc[-1]
+    total_return = (capital - 10000) / 10000 * 100
+    winners = trade_df[trade_df['pnl_pct'] > 0]
+    win_rate = len(winners) / len(trades) * 100
+
+    returns = trade_df['pnl_pct'].values / 100
+    sharpe = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
+
+    equity_curve = [10000] + trade_df['capital'].tolist()
+    cummax = pd.Series(equity_curve).cummax()
+    drawdown = (pd.Series(equity_curve) - cummax) / cummax * 100
+    max_dd = drawdown.min()
+
+    gross_profit = winners['pnl_pct'].sum() if len(winners) > 0 else 0
+    losers = trade_df[trade_df['pnl_pct'] <= 0]
+    gross_loss = abs(losers['pnl_pct'].sum()) if len(losers) > 0 else 0
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+
+    avg_holding = trade_df['holding_periods'].mean()
+    days_traded = (base_df.index[-1] - base_df.index[lookback]).days
+
+    return trade_df, {
+        'total_return_pct': total_return,
+        'sharpe_ratio': sharpe,
+        'max_drawdown_pct': max_dd,
+        'win_rate_pct': win_rate,
+        'profit_factor': profit_factor,
+        'num_trades': len(trades),
+        'trades_per_day': len(trades) / days_traded,
+        'avg_holding_periods': avg_holding
+    }
+
+
+def run_optimized_backtest(tf_analyses, optimal_thresholds, scalping_params,
+                           metric='sharpe_ratio'):
+    """
+    Run backtest with optimized Fibonacci ribbon thresholds
+
+    Every triple in optimal_thresholds['candidates'] (the top-K from
+    find_optimal_thresholds) is backtested and the best by `metric` is kept;
+    a plain threshold dict backtests just that triple.
+
+    Returns:
+        dict with trades, metrics, base_df, the chosen thresholds and a
+        per-candidate 'candidates' table
+    """
+    print_section("📈 RUNNING OPTIMIZED BACKTEST")
+
+    # Use 5m as execution timeframe
+    base_df = tf_analyses['5m']['fourier_df'].copy()
+
+    # Align timeframes (simplified - use 5m as base)
+    compression_5m = tf_analyses['5m']['compression']
+    alignment_5m = tf_analyses['5m']['alignment']
+    confluence_5m = tf_analyses['5m']['confluence']
+
+    candidates = optimal_thresholds.get('candidates') or [optimal_thresholds]
+    lookback = 50
+
+    print(f"\n⚡ Backtesting {len(candidates)} threshold combination(s)...")
+
+    rows = []
+    best = None
+    for thresholds in candidates:
+        trades = backtest_thresholds(base_df, compression_5m, alignment_5m, confluence_5m,
+                                     thresholds, scalping_params['max_holding_periods'], lookback)
+        row = {key: thresholds[key] for key in
+               ('compression_threshold', 'alignment_threshold', 'confluence_threshold')}
+        if trades:
+            trade_df, metrics = trade_metrics(trades, base_df, lookback)
+            row.update(metrics)
+            if best is None or metrics[metric] > best['metrics'][metric]:
+                best = {'trades': trade_df, 'metrics': metrics, 'thresholds': thresholds}
+        else:
+            row['num_trades'] = 0
+        rows.append(row)
+
+        print(f"   Comp {row['compression_threshold']:>5g} | Align {row['alignment_threshold']:>5g} | "
+              f"Conf {row['confluence_threshold']:>5g} → {row['num_trades']:>4} trades"
+              + (f", {metric} {row[metric]:.2f}" if metric in row else ""))
+
+    candidates_df = pd.DataFrame(rows)
+
+    if best is None:
         print(f"\n⚠️  No trades generated with these thresholds")
-        return {'trades': pd.DataFrame(), 'metrics': {}, 'base_df': base_df}
+        return {'trades': pd.DataFrame(), 'metrics': {}, 'base_df': base_df,
+                'thresholds': candidates[0], 'candidates': candidates_df}
+
+    chosen = best['thresholds']
+    metrics = best['metrics']
+    avg_holding = metrics['avg_holding_periods']
+
+    print(f"\n✅ Optimized Backtest Results:")
+    print(f"   Thresholds:      comp {chosen['compression_threshold']:g} | "
+          f"align {chosen['alignment_threshold']:g} | conf {chosen['confluence_threshold']:g}")
+    print(f"   Return:          {metrics['total_return_pct']:>8.2f}%")
+    print(f"   Sharpe Ratio:    {metrics['sharpe_ratio']:>8.2f}")
+    print(f"   Max Drawdown:    {metrics['max_drawdown_pct']:>8.2f}%")
+    print(f"   Win Rate:        {metrics['win_rate_pct']:>8.2f}%")
+    print(f"   Profit Factor:   {metrics['profit_factor']:>8.2f}")
+    print(f"   Trades:          {metrics['num_trades']:>8}")
+    print(f"   Trades/Day:      {metrics['trades_per_day']:>8.2f}")
+    print(f"   Avg Holding:     {avg_holding:>8.1f} candles ({avg_holding * 5:.0f} min)")
+
+    return {
+        'trades': best['trades'],
+        'metrics': metrics,
+        'base_df': base_df,
+        'thresholds': chosen,
+        'candidates': candidates_df
+    }
 
 
 def main():
@@ -463,13 +575,18 @@ def main():
 
     # Find optimal thresholds
     optimal_thresholds = find_optimal_thresholds(tf_analyses)
+    if optimal_thresholds is None:
+        print_section("❌ NO VALID THRESHOLDS - widen the threshold grids")
+        return {'tf_analyses': tf_analyses, 'optimal_thresholds': None, 'optimized_results': None}
 
-    # Run optimized backtest
+    # Run optimized backtest (top-K candidates, best by Sharpe is kept)
     optimized_results = run_optimized_backtest(
         tf_analyses,
         optimal_thresholds,
         scalping_params
     )
+    optimal_thresholds = {**optimized_results['thresholds'],
+                          'candidates': optimal_thresholds['candidates']}
 
     # Load baseline results for comparison
     print_section("📊 COMPARISON: Baseline vs Optimized")
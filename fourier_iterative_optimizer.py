@@ -27,6 +27,8 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from fourier_strategy import FourierTradingStrategy
 from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
 from src.reporting.chart_generator import ChartGenerator
+from src.backtest.walk_forward import WalkForwardOptimizer, FourierStrategyTarget, fourier_store_params
+from src.backtest.result_store import ResultStore, data_fingerprint, data_range
 
 
 class FourierIterativeOptimizer:
@@ -39,7 +41,8 @@ class FourierIterativeOptimizer:
     def __init__(self,
                  symbol: str = 'ETH',
                  initial_capital: float = 10000.0,
-                 iterations_dir: str = None):
+                 iterations_dir: str = None,
+                 use_store: bool = True):
         """
         Initialize optimizer
 
@@ -47,6 +50,7 @@ class FourierIterativeOptimizer:
             symbol: Trading symbol
             initial_capital: Starting capital for backtests
             iterations_dir: Directory to save iteration results
+            use_store: Record each iteration's backtest in the shared result store
         """
         self.symbol = symbol
         self.initial_capital = initial_capital
@@ -61,6 +65,8 @@ class FourierIterativeOptimizer:
         self.log_file = self.iterations_dir / 'iterations_log.json'
         self.iterations_history = self._load_iterations_log()
 
+        self.store = ResultStore() if use_store else None
+
         # Get next iteration number
         self.current_iteration = len(self.iterations_history) + 1
 
@@ -148,11 +154,38 @@ class FourierIterativeOptimizer:
             print(f"   Parameters: {json.dumps(self.current_params, indent=6)}")
 
         strategy = FourierTradingStrategy(**self.current_params)
-        results = strategy.run(df, run_backtest=True, verbose=False)
-
-        output_df = results['output_df']
-        trade_log = results['trade_log']
-        metrics = results['metrics']
+        previous = None
+        if self.store is not None:
+            data_hash = data_fingerprint(df)
+            store_params = fourier_store_params(self.current_params)
+            previous = self.store.get('fourier', data_hash, store_params, load_artifacts=True)
+            if previous is not None and (previous['trades'] is None or previous['equity'] is None):
+                previous = None  # Stored without trades / equity (e.g. by a grid search)
+
+        if previous is not None:
+            if verbose:
+                print(f"   🗄️  Identical data and parameters already backtested "
+                      f"({previous['source']}, {previous['created_at']}) - skipping the backtest")
+
+            results = strategy.run(df, run_backtest=False, verbose=False)
+            output_df = results['output_df']
+            output_df['equity'] = previous['equity']['equity']
+            output_df['returns'] = previous['equity']['returns']
+            trade_log = previous['trades']
+            metrics = previous['metrics']
+        else:
+            results = strategy.run(df, run_backtest=True, verbose=False)
+
+            output_df = results['output_df']
+            trade_log = results['trade_log']
+            metrics = results['metrics']
+
+            if self.store is not None:
+                self.store.put('fourier', data_hash, store_params, metrics,
+                               trades=trade_log,
+                               equity=results['backtest_results'][['equity', 'returns']],
+                               data_range=data_range(df),
+                               source=f'iterative_optimizer:{iteration_name}')
 
         if verbose:
             print(f"\n   ✅ Strategy completed:")
@@ -402,6 +435,37 @@ Provide your response in this EXACT JSON format (no extra text):
 
         return prompt
 
+    def validate_walk_forward(self,
+                              df: pd.DataFrame,
+                              param_grid: Dict[str, List] = None,
+                              n_folds: int = 5,
+                              anchored: bool = False,
+                              max_workers: int = None) -> Dict:
+        """
+        Check current (or candidate) parameters out-of-sample
+
+        Without a grid, the current parameters are scored on every test fold;
+        with a grid, each fold selects on its train window first.
+
+        Args:
+            df: OHLCV data
+            param_grid: Optional grid of overrides around current_params
+            n_folds: Number of train/test folds
+            anchored: Expanding train window
+            max_workers: Process pool size
+
+        Returns:
+            WalkForwardOptimizer.run() output
+        """
+        optimizer = WalkForwardOptimizer(
+            FourierStrategyTarget(base_params=self.current_params),
+            param_grid or {},
+            n_folds=n_folds,
+            anchored=anchored,
+            max_workers=max_workers
+        )
+        return optimizer.run(df)
+
     def compare_iterations(self, n: int = 5) -> pd.DataFrame:
         """
         Compare last N iterations
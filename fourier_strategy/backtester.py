@@ -281,8 +281,9 @@ class Backtester:
         # Rolling win rate
         if len(self.trades_df) > 0:
             # This is approximate - proper implementation would require trade-by-trade tracking
-            rolling_returns = returns.rolling(window=window)
-            df['rolling_win_rate'] = (rolling_returns.apply(lambda x: (x > 0).sum() / len(x) * 100))
+            # Rolling sum of a win flag; NaN returns keep their windows NaN like rolling().apply()
+            wins = (returns > 0).astype(float).where(returns.notna())
+            df['rolling_win_rate'] = wins.rolling(window=window).sum() / window * 100
 
         return df
 
@@ -335,7 +336,8 @@ Days Traded:           {metrics['days_traded']}
                     price: pd.Series,
                     trade_signals: pd.DataFrame,
                     position_size: float = 0.25,  # Default 25% of capital per trade
-                    verbose: bool = True) -> Dict:
+                    verbose: bool = True,
+                    include_rolling: bool = True) -> Dict:
         """
         Run complete backtest and return all results.
 
@@ -344,6 +346,8 @@ Days Traded:           {metrics['days_traded']}
             trade_signals: Trade signals DataFrame
             position_size: Position size fraction
             verbose: Print summary report
+            include_rolling: Calculate rolling metrics (grid searches that
+                             only need metrics skip them)
 
         Returns:
             Dictionary with backtest_results, metrics, trade_log
@@ -358,7 +362,7 @@ Days Traded:           {metrics['days_traded']}
         trade_log = self.get_trade_log()
 
         # Calculate rolling metrics
-        rolling_metrics = self.calculate_rolling_metrics(backtest_results)
+        rolling_metrics = self.calculate_rolling_metrics(backtest_results) if include_rolling else None
 
         # Print summary if verbose
         if verbose:
@@ -0,0 +1,284 @@
+"""
+Staged Grid Search for the Fourier Trading Strategy
+
+Schedules a parameter grid as a dependency tree instead of running the
+full pipeline per combination:
+- Combinations are ordered so the expensive upstream parameters
+  (FFT → EMAs → indicators) vary slowest and are grouped lazily
+- Each upstream stage is computed once per distinct parameter subset
+  (FourierTradingStrategy.compute_upstream with a shared cache)
+- Only the cheap downstream stages (correlation, signals, backtest) fan
+  out to one process pool for the whole grid, with upstream results in
+  shared memory
+- Every finished combination is appended to a JSONL file, so an
+  interrupted search resumes where it stopped
+- With a ResultStore, combinations already backtested on the same data
+  (by any optimizer) are read from it instead of recomputed
+"""
+
+import json
+import time
+from itertools import groupby, product
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from .strategy import FourierTradingStrategy
+from src.backtest.parallel_runner import ParallelIterationRunner
+from src.backtest.result_store import data_fingerprint, data_range
+from src.backtest.walk_forward import fourier_store_params
+
+
+# Upstream parameters, slowest-varying first (FFT, then EMAs, then indicators)
+UPSTREAM_PARAMS = [
+    'n_harmonics', 'noise_threshold',
+    'base_ema_period', 'ema_timeframe_multipliers',
+    'rsi_period', 'macd_fast', 'macd_slow', 'macd_signal', 'atr_period',
+]
+
+# Metrics recorded per combination
+METRICS = ['sharpe_ratio', 'total_return_pct', 'max_drawdown_pct',
+           'win_rate_pct', 'profit_factor', 'num_trades']
+
+
+def params_key(params: Dict) -> str:
+    """Stable string key of a parameter combination"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def pack_upstream(df: pd.DataFrame, upstream: Dict) -> Dict[str, pd.DataFrame]:
+    """Flatten upstream results into named DataFrames for shared memory"""
+    frames = {
+        'data': df,
+        'price_filtered': upstream['price_filtered'].to_frame('price_filtered'),
+        'indicators': upstream['indicators'],
+        'indicator_signals': upstream['indicator_signals'],
+    }
+    for name, frame in upstream['ema_results'].items():
+        frames[f'ema_{name}'] = frame
+    return frames
+
+
+def unpack_upstream(frames: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, Dict]:
+    """Inverse of pack_upstream()"""
+    upstream = {
+        'price_filtered': frames['price_filtered']['price_filtered'],
+        'ema_results': {name[4:]: frame for name, frame in frames.items() if name.startswith('ema_')},
+        'indicators': frames['indicators'],
+        'indicator_signals': frames['indicator_signals'],
+    }
+    return frames['data'], upstream
+
+
+def _downstream_task(config_id, params: Dict, frames: Dict[str, pd.DataFrame]) -> Dict:
+    """Correlation → signals → backtest for one combination (pool worker)"""
+    df, upstream = unpack_upstream(frames)
+    try:
+        strategy = FourierTradingStrategy(**params)
+        output = strategy.run_downstream(df, upstream, run_backtest=True,
+                                         verbose=False, build_output=False)
+        return {metric: output['metrics'][metric] for metric in METRICS}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+class StagedGridSearch:
+    """
+    Grid search that computes each upstream stage once
+
+    Usage:
+        search = StagedGridSearch(df, results_path='grid.jsonl')
+        results = search.run({'n_harmonics': [3, 5], 'min_signal_strength': [0.4, 0.5]})
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 base_params: Dict = None,
+                 results_path: str = None,
+                 max_workers: int = None,
+                 parallel: bool = True,
+                 store=None):
+        """
+        Initialize search.
+
+        Args:
+            df: OHLCV DataFrame
+            base_params: Strategy parameters shared by every combination
+            results_path: JSONL file results are appended to (and resumed from)
+            max_workers: Process pool size (default: CPU count)
+            parallel: Fan downstream stages out to a process pool
+            store: Optional ResultStore checked before and filled after each backtest
+        """
+        self.df = df
+        self.base_params = base_params or {}
+        self.results_path = Path(results_path) if results_path else None
+        self.max_workers = max_workers
+        self.parallel = parallel
+        self.store = store
+
+    def ordered_grid(self, param_grid: Dict[str, List]) -> Dict[str, List]:
+        """Reorder the grid so upstream parameters vary slowest"""
+        upstream = [name for name in UPSTREAM_PARAMS if name in param_grid]
+        downstream = [name for name in param_grid if name not in UPSTREAM_PARAMS]
+        return {name: param_grid[name] for name in upstream + downstream}
+
+    def iter_groups(self, param_grid: Dict[str, List]) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Yield (upstream params, combinations) groups without materializing the grid
+
+        Args:
+            param_grid: Mapping parameter → values
+
+        Yields:
+            Upstream parameter dict and the full combinations sharing it
+        """
+        grid = self.ordered_grid(param_grid)
+        names = list(grid.keys())
+        upstream_names = [name for name in names if name in UPSTREAM_PARAMS]
+
+        combos = (dict(zip(names, values)) for values in product(*grid.values()))
+        for _, group in groupby(combos, key=lambda p: params_key({n: p[n] for n in upstream_names})):
+            group = list(group)
+            yield {name: group[0][name] for name in upstream_names}, group
+
+    def load_completed(self) -> Dict[str, Dict]:
+        """
+        Results already on disk, keyed by params_key of the full parameters
+
+        A line cut short by an interrupted run is skipped (its combination
+        is backtested again) and terminated, so new results start on their
+        own line.
+        """
+        completed = {}
+        if self.results_path and self.results_path.exists():
+            with open(self.results_path, 'r+') as f:
+                text = f.read()
+                if text and not text.endswith('\n'):
+                    f.write('\n')
+                for line in text.splitlines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    completed[record['key']] = record
+        return completed
+
+    def run(self, param_grid: Dict[str, List], metric: str = 'sharpe_ratio',
+            verbose: bool = True) -> pd.DataFrame:
+        """
+        Run (or resume) the grid search.
+
+        Args:
+            param_grid: Mapping parameter → values
+            metric: Metric to sort by
+            verbose: Print progress
+
+        Returns:
+            DataFrame with one row per successful combination, sorted by metric
+        """
+        completed = self.load_completed()
+        records = []
+        total = 1
+        for values in param_grid.values():
+            total *= len(values)
+
+        if verbose:
+            print(f"Testing {total} parameter combinations...")
+            if completed:
+                print(f"Resuming: {len(completed)} already in {self.results_path}")
+            print("=" * 70)
+
+        start = time.perf_counter()
+        done = 0
+        upstream_runs = 0
+        data_hash = data_fingerprint(self.df) if self.store is not None else None
+        pending_all = {}
+
+        def batches():
+            """Per upstream group: (combinations to backtest, shared upstream frames)"""
+            nonlocal done, upstream_runs
+            cache = {}
+            current_root = None
+
+            for upstream_params, combos in self.iter_groups(param_grid):
+                full = [{**self.base_params, **combo} for combo in combos]
+                # Keyed on base_params too: a resumed run with other base params starts over
+                keys = [params_key(params) for params in full]
+
+                pending = {}
+                for combo, params, key in zip(combos, full, keys):
+                    if key in completed:
+                        records.append(completed[key])
+                        continue
+                    stored = self.store.get('fourier', data_hash, fourier_store_params(params)) \
+                        if self.store is not None else None
+                    if stored is not None:
+                        records.append({'key': key, 'params': combo,
+                                        'metrics': {name: stored['metrics'].get(name) for name in METRICS}})
+                    else:
+                        pending[key] = (combo, params)
+                done += len(combos) - len(pending)
+                if not pending:
+                    continue
+
+                # FFT parameters change → nothing cached below them can be reused
+                root = (upstream_params.get('n_harmonics'), upstream_params.get('noise_threshold'))
+                if root != current_root:
+                    cache.clear()
+                    current_root = root
+
+                strategy = FourierTradingStrategy(**next(iter(pending.values()))[1])
+                upstream = strategy.compute_upstream(self.df, cache=cache)
+                upstream_runs += 1
+                pending_all.update(pending)
+
+                if verbose:
+                    print(f"Progress: {done}/{total} ({done / total * 100:.1f}%) | "
+                          f"upstream {upstream_params}")
+
+                yield {key: params for key, (_, params) in pending.items()}, pack_upstream(self.df, upstream)
+
+        def on_result(key, result):
+            nonlocal done
+            done += 1
+            record = {'key': key, 'params': pending_all[key][0], 'metrics': result}
+            records.append(record)
+            if self.results_path:
+                with open(self.results_path, 'a') as f:
+                    f.write(json.dumps(record, default=str) + '\n')
+            if self.store is not None and 'error' not in result:
+                self.store.put('fourier', data_hash, fourier_store_params(pending_all[key][1]), result,
+                               data_range=data_range(self.df), source='grid_search')
+
+        # One pool for the whole grid: upstream groups are computed here while
+        # workers backtest the groups already submitted
+        runner = ParallelIterationRunner(_downstream_task, self.max_workers)
+        if self.parallel and total > 1:
+            runner.run_batches(batches(), on_result=on_result, verbose=False)
+        else:
+            for configs, frames in batches():
+                runner.run_sequential(configs, frames, on_result=on_result)
+
+        rows = []
+        for record in records:
+            if 'error' in record['metrics']:
+                if verbose:
+                    print(f"Error with params {record['params']}: {record['metrics']['error']}")
+                continue
+            rows.append({**record['params'], **record['metrics']})
+
+        results_df = pd.DataFrame(rows)
+        if not results_df.empty:
+            results_df = results_df.sort_values(metric, ascending=False)
+
+        if verbose:
+            print(f"\n⏱️  {time.perf_counter() - start:.1f}s | "
+                  f"{upstream_runs} upstream runs for {total} combinations")
+            if self.store is not None:
+                self.store.print_stats()
+
+        return results_df
@@ -16,6 +16,8 @@ from typing import Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.hyperliquid_fetcher import HyperliquidFetcher
+from src.data.data_validator import CandleValidator, has_fixed_grid, interval_to_ms
+from src.data.multi_resolution import resample_ohlcv_multi
 
 
 class HyperliquidDataAdapter:
@@ -27,6 +29,7 @@ class HyperliquidDataAdapter:
     - Converts to pandas DataFrame format
     - Standardizes column names
     - Handles multiple timeframes
+    - Validates gaps / duplicates / OHLC errors (optionally fills gaps)
     """
 
     def __init__(self, symbol: str = 'ETH'):
@@ -38,11 +41,13 @@ class HyperliquidDataAdapter:
         """
         self.symbol = symbol
         self.fetcher = HyperliquidFetcher(symbol=symbol)
+        self.last_validation = None
 
     def fetch_ohlcv(self,
                     interval: str = '1h',
                     days_back: int = 365,
-                    use_checkpoint: bool = True) -> pd.DataFrame:
+                    use_checkpoint: bool = True,
+                    fill_gaps: Optional[str] = None) -> pd.DataFrame:
         """
         Fetch OHLCV data from Hyperliquid and convert to DataFrame.
 
@@ -50,6 +55,9 @@ class HyperliquidDataAdapter:
             interval: Timeframe ('1m', '3m', '5m', '15m', '30m', '1h')
             days_back: Number of days to fetch
             use_checkpoint: Use checkpoint for resume capability
+            fill_gaps: Repair missing bars before returning: 'ffill' (flat
+                       bars at the previous close) or 'mask' (NaN rows);
+                       inserted bars are flagged in a 'synthetic' column
 
         Returns:
             DataFrame with OHLCV data in standard format
@@ -90,6 +98,12 @@ class HyperliquidDataAdapter:
         # Sort by index
         df.sort_index(inplace=True)
 
+        # Gaps / duplicates / OHLC errors (calendar intervals like '1M' have no bar grid)
+        self.validate_dataframe(df, interval=interval if has_fixed_grid(interval) else None)
+        if fill_gaps and self.last_validation is not None and not self.last_validation.ok:
+            df = CandleValidator(interval).repair(df, fill=fill_gaps)
+            print(f"   🩹 Filled {int(df['synthetic'].sum())} missing bars ({fill_gaps})")
+
         print(f"\n✅ Fetched {len(df)} candles")
         print(f"   Period: {df.index[0]} to {df.index[-1]}")
         print(f"   Columns: {list(df.columns)}")
@@ -133,12 +147,17 @@ class HyperliquidDataAdapter:
         # Return only last N candles
         return df.tail(limit)
 
-    def validate_dataframe(self, df: pd.DataFrame) -> bool:
+    def validate_dataframe(self, df: pd.DataFrame, interval: Optional[str] = None) -> bool:
         """
         Validate DataFrame has required columns.
 
+        With an interval, the series is also checked for missing bars,
+        duplicate / out-of-order timestamps and OHLC errors; the report is
+        kept in self.last_validation and printed when something is off.
+
         Args:
-            df: DataFrame to validate
+            df: DataFrame to validate (DatetimeIndex)
+            interval: Bar interval ('1m', '5m', '1h', ...)
 
         Returns:
             True if valid, raises ValueError if not
@@ -154,6 +173,12 @@ class HyperliquidDataAdapter:
         if df[required_cols].isnull().any().any():
             print("⚠️  Warning: DataFrame contains NaN values")
 
+        self.last_validation = None
+        if interval is not None:
+            self.last_validation = CandleValidator(interval).validate(df)
+            if not self.last_validation.ok:
+                print(self.last_validation.summary())
+
         return True
 
     def resample_timeframe(self,
@@ -169,21 +194,11 @@ class HyperliquidDataAdapter:
         Returns:
             Resampled DataFrame
         """
-        # Map interval to pandas resample rule
-        resample_rules = {
-            '1m': '1T',
-            '3m': '3T',
-            '5m': '5T',
-            '15m': '15T',
-            '30m': '30T',
-            '1h': '1H',
-            '4h': '4H',
-            '1d': '1D'
-        }
-
-        rule = resample_rules.get(target_interval)
-        if not rule:
+        # Map interval to pandas resample rule ('10m' → '10min', '1h' → '60min')
+        minutes = interval_to_ms(target_interval) // 60_000
+        if minutes <= 0:
             raise ValueError(f"Unknown interval: {target_interval}")
+        rule = f'{minutes}min'
 
         # Resample OHLCV
         resampled = df.resample(rule).agg({
@@ -199,6 +214,46 @@ class HyperliquidDataAdapter:
 
         return resampled
 
+    def resample_timeframes(self,
+                            df: pd.DataFrame,
+                            target_intervals: List[str],
+                            drop_partial: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Resample one DataFrame to several timeframes in one pass.
+
+        Same bars as resample_timeframe() per interval, computed together
+        from the source arrays (no per-interval resample / groupby).
+
+        Args:
+            df: Source DataFrame (DatetimeIndex, finer than every target)
+            target_intervals: Target intervals ('3m', '10m', '1h', ...)
+            drop_partial: Drop a leading bar that started before the source
+                          data (the exchange's bar would cover more trades)
+
+        Returns:
+            dict: {interval: resampled DataFrame}
+        """
+        widths = {}
+        for interval in target_intervals:
+            minutes = interval_to_ms(interval) // 60_000
+            if minutes <= 0:
+                raise ValueError(f"Unknown interval: {interval}")
+            widths[interval] = minutes
+
+        ohlcv = ['open', 'high', 'low', 'close', 'volume']
+        if df[ohlcv].isnull().any().any():
+            frames = {interval: self.resample_timeframe(df, interval) for interval in widths}
+        else:
+            by_width = resample_ohlcv_multi(df[ohlcv], sorted(set(widths.values())))
+            frames = {interval: by_width[minutes] for interval, minutes in widths.items()}
+
+        if drop_partial and len(df):
+            first = df.index.min().value
+            for interval, minutes in widths.items():
+                if first % (minutes * 60_000_000_000) and len(frames[interval]):
+                    frames[interval] = frames[interval].iloc[1:]
+        return frames
+
     def get_realtime_price(self) -> float:
         """
         Get current real-time price from Hyperliquid.
@@ -247,7 +302,7 @@ def example_fetch_and_validate():
     df = adapter.fetch_ohlcv(interval='1h', days_back=30)
 
     # Validate
-    adapter.validate_dataframe(df)
+    adapter.validate_dataframe(df, interval='1h')
     print("\n✅ Data validated successfully!")
 
     # Show sample
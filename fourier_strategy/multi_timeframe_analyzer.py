@@ -13,13 +13,21 @@ This creates MAXIMUM PROBABILITY setups when:
 
 Think of it as a "zoom out/zoom in" system where we only trade
 when ALL timeframes are pointing the same direction.
+
+With derive=True only the finest timeframe is fetched (or loaded from the
+local CandleStore); the others are resampled from it in one pass.
+Timeframes are analyzed concurrently in a process pool (max_workers).
 """
 
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -27,6 +35,68 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from fourier_strategy import FourierTradingStrategy
 from fourier_strategy.fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
 from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
+from src.data.candle_store import CandleStore
+from src.data.data_validator import interval_to_ms
+
+
+def analyze_timeframe_data(timeframe: str,
+                           df: pd.DataFrame,
+                           n_harmonics: int,
+                           noise_threshold: float,
+                           run_backtest: bool = False) -> Dict:
+    """
+    Fourier + Fibonacci analysis of one timeframe's data
+
+    Module-level so process-pool workers can run it (see
+    MultiTimeframeAnalyzer.analyze_all_timeframes).
+
+    Returns:
+        dict with fourier_results, fibonacci_results and current_signals
+    """
+    # 1. Fourier strategy analysis
+    fourier_strategy = FourierTradingStrategy(
+        n_harmonics=n_harmonics,
+        noise_threshold=noise_threshold,
+        base_ema_period=28,
+        correlation_threshold=0.6,
+        min_signal_strength=0.3,
+        max_holding_periods=168,
+        initial_capital=10000.0,
+        commission=0.001
+    )
+
+    fourier_results = fourier_strategy.run(df, run_backtest=run_backtest, verbose=False)
+
+    # 2. Fibonacci ribbon analysis
+    fib_analyzer = FibonacciRibbonAnalyzer(
+        n_harmonics=n_harmonics,
+        noise_threshold=noise_threshold
+    )
+
+    fib_results = fib_analyzer.analyze(df)
+
+    # Get current signals (last candle)
+    last_idx = -1
+
+    return {
+        'timeframe': timeframe,
+        'fourier_results': fourier_results,
+        'fibonacci_results': fib_results,
+        'current_signals': {
+            'fourier_signal': fourier_results['output_df']['composite_signal'].iloc[last_idx],
+            'fib_confluence': fib_results['signals']['fibonacci_confluence'].iloc[last_idx],
+            'fib_alignment': fib_results['signals']['fibonacci_alignment'].iloc[last_idx],
+            'fib_compression': fib_results['signals']['fibonacci_compression'].iloc[last_idx]
+        }
+    }
+
+
+def _analyze_timeframe_task(timeframe: str, df: pd.DataFrame, n_harmonics: int,
+                            noise_threshold: float, run_backtest: bool) -> Tuple[Dict, float]:
+    """Pool task: analysis result and its run time in the worker"""
+    start = time.perf_counter()
+    result = analyze_timeframe_data(timeframe, df, n_harmonics, noise_threshold, run_backtest)
+    return result, time.perf_counter() - start
 
 
 class MultiTimeframeAnalyzer:
@@ -74,16 +144,27 @@ class MultiTimeframeAnalyzer:
         # Data adapter
         self.adapter = HyperliquidDataAdapter(symbol=symbol)
 
-    def fetch_all_timeframes(self, days_back: int = 30) -> Dict[str, pd.DataFrame]:
+    def fetch_all_timeframes(self,
+                             days_back: int = 30,
+                             derive: bool = False,
+                             base_df: Optional[pd.DataFrame] = None,
+                             store_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
         """
         Fetch data for all timeframes
 
         Args:
             days_back: Days of historical data
+            derive: Fetch only the finest timeframe and resample the others
+                    from it (see derive_timeframes)
+            base_df: Finest-timeframe data to derive from (implies derive)
+            store_dir: CandleStore to load the finest timeframe from (implies derive)
 
         Returns:
             dict: {timeframe: DataFrame}
         """
+        if derive or base_df is not None or store_dir is not None:
+            return self.derive_timeframes(days_back=days_back, base_df=base_df, store_dir=store_dir)
+
         print("\n" + "="*80)
         print(f"📊 FETCHING MULTI-TIMEFRAME DATA FOR {self.symbol}")
         print("="*80)
@@ -104,6 +185,81 @@ class MultiTimeframeAnalyzer:
         print(f"\n✅ Fetched {len(self.data)}/{len(self.timeframes)} timeframes")
         return self.data
 
+    def derive_timeframes(self,
+                          days_back: int = 30,
+                          base_df: Optional[pd.DataFrame] = None,
+                          store_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Get the finest timeframe once and resample every other from it
+
+        The finest timeframe comes from base_df, else from the CandleStore in
+        store_dir (if it has that timeframe), else from one API fetch. The
+        others are built in one pass by the adapter's resample_timeframes,
+        so a run makes at most one series of API calls instead of one per
+        timeframe (and timeframes the API lacks, like 10m, work too).
+
+        Args:
+            days_back: Days of historical data
+            base_df: Finest-timeframe OHLCV (DatetimeIndex or 'timestamp' column)
+            store_dir: CandleStore root (e.g. 'trading_data/store')
+
+        Returns:
+            dict: {timeframe: DataFrame}
+        """
+        base_tf = min(self.timeframes, key=interval_to_ms)
+
+        print("\n" + "="*80)
+        print(f"📊 DERIVING MULTI-TIMEFRAME DATA FOR {self.symbol} FROM {base_tf}")
+        print("="*80)
+
+        if base_df is None and store_dir is not None:
+            base_df = self._load_from_store(store_dir, base_tf, days_back)
+        if base_df is None:
+            print(f"\n   Fetching {base_tf} data...")
+            base_df = self.adapter.fetch_ohlcv(
+                interval=base_tf,
+                days_back=days_back,
+                use_checkpoint=False
+            )
+
+        base_df = self._ohlcv_frame(base_df)
+        self.data[base_tf] = base_df
+        print(f"   ✅ {base_tf}: {len(base_df)} candles ({base_df.index[0]} to {base_df.index[-1]})")
+
+        targets = [tf for tf in self.timeframes if tf != base_tf]
+        base_ms = interval_to_ms(base_tf)
+        for tf in [tf for tf in targets if interval_to_ms(tf) % base_ms]:
+            print(f"   ❌ {tf}: not a multiple of {base_tf}, skipped")
+        targets = [tf for tf in targets if interval_to_ms(tf) % base_ms == 0]
+
+        start = time.perf_counter()
+        for tf, df in self.adapter.resample_timeframes(base_df, targets).items():
+            self.data[tf] = df
+            print(f"   ✅ {tf}: {len(df)} candles (from {base_tf})")
+        print(f"   ⏱️  Resampled {len(targets)} timeframes in {time.perf_counter() - start:.3f}s")
+
+        print(f"\n✅ Prepared {len(self.data)}/{len(self.timeframes)} timeframes (1 fetched)")
+        return self.data
+
+    def _load_from_store(self, store_dir: str, timeframe: str, days_back: int) -> Optional[pd.DataFrame]:
+        """Last days_back days of a timeframe from the local CandleStore (None if absent)"""
+        store = CandleStore(store_dir)
+        if not store.exists(self.symbol, timeframe):
+            return None
+        _, last = store.time_range(self.symbol, timeframe)
+        df = store.read(self.symbol, timeframe, start=last - pd.Timedelta(days=days_back),
+                        columns=['open', 'high', 'low', 'close', 'volume'])
+        print(f"   📂 Loaded {len(df)} {timeframe} candles from {store_dir}")
+        return df
+
+    @staticmethod
+    def _ohlcv_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """OHLCV columns on a sorted DatetimeIndex"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df = df.set_index(pd.DatetimeIndex(pd.to_datetime(df['timestamp']), name='datetime'))
+        df = df[['open', 'high', 'low', 'close', 'volume']]
+        return df if df.index.is_monotonic_increasing else df.sort_index()
+
     def analyze_timeframe(self,
                          timeframe: str,
                          run_backtest: bool = False) -> Dict:
@@ -124,63 +280,38 @@ class MultiTimeframeAnalyzer:
 
         print(f"\n🔬 Analyzing {timeframe}...")
 
-        # 1. Fourier strategy analysis
-        fourier_strategy = FourierTradingStrategy(
-            n_harmonics=self.n_harmonics,
-            noise_threshold=self.noise_threshold,
-            base_ema_period=28,
-            correlation_threshold=0.6,
-            min_signal_strength=0.3,
-            max_holding_periods=168,
-            initial_capital=10000.0,
-            commission=0.001
-        )
-
-        fourier_results = fourier_strategy.run(df, run_backtest=run_backtest, verbose=False)
-
-        # 2. Fibonacci ribbon analysis
-        fib_analyzer = FibonacciRibbonAnalyzer(
-            n_harmonics=self.n_harmonics,
-            noise_threshold=self.noise_threshold
-        )
-
-        fib_results = fib_analyzer.analyze(df)
-
-        # Store results
-        self.fourier_results[timeframe] = fourier_results
-        self.fibonacci_results[timeframe] = fib_results
-
-        # Get current signals (last candle)
-        last_idx = -1
-
-        fourier_signal = fourier_results['output_df']['composite_signal'].iloc[last_idx]
-        fib_confluence = fib_results['signals']['fibonacci_confluence'].iloc[last_idx]
-        fib_alignment = fib_results['signals']['fibonacci_alignment'].iloc[last_idx]
-        fib_compression = fib_results['signals']['fibonacci_compression'].iloc[last_idx]
-
-        print(f"   ✅ {timeframe} signals:")
-        print(f"      Fourier: {fourier_signal:.3f}")
-        print(f"      Fib Confluence: {fib_confluence:.1f}")
-        print(f"      Fib Alignment: {fib_alignment:.1f}")
-
-        return {
-            'timeframe': timeframe,
-            'fourier_results': fourier_results,
-            'fibonacci_results': fib_results,
-            'current_signals': {
-                'fourier_signal': fourier_signal,
-                'fib_confluence': fib_confluence,
-                'fib_alignment': fib_alignment,
-                'fib_compression': fib_compression
-            }
-        }
-
-    def analyze_all_timeframes(self, run_backtest: bool = False) -> Dict:
+        result = analyze_timeframe_data(timeframe, df, self.n_harmonics, self.noise_threshold,
+                                        run_backtest=run_backtest)
+        self._store_result(result)
+        self._print_signals(result)
+        return result
+
+    def _store_result(self, result: Dict):
+        self.fourier_results[result['timeframe']] = result['fourier_results']
+        self.fibonacci_results[result['timeframe']] = result['fibonacci_results']
+
+    @staticmethod
+    def _print_signals(result: Dict):
+        signals = result['current_signals']
+        print(f"   ✅ {result['timeframe']} signals:")
+        print(f"      Fourier: {signals['fourier_signal']:.3f}")
+        print(f"      Fib Confluence: {signals['fib_confluence']:.1f}")
+        print(f"      Fib Alignment: {signals['fib_alignment']:.1f}")
+
+    def analyze_all_timeframes(self,
+                               run_backtest: bool = False,
+                               max_workers: Optional[int] = None) -> Dict:
         """
         Analyze all timeframes
 
+        Timeframes run concurrently in a process pool, largest first; results
+        are merged back in timeframe order, so calculate_timeframe_confluence
+        sees the same analyses as a sequential run.
+
         Args:
             run_backtest: Whether to run backtests
+            max_workers: Worker processes (default: one per timeframe, up to
+                         the CPU count; 1 = sequential in this process)
 
         Returns:
             dict with all analyses
@@ -189,19 +320,75 @@ class MultiTimeframeAnalyzer:
         print("🔬 MULTI-TIMEFRAME ANALYSIS")
         print("="*80)
 
+        pending = [tf for tf in self.timeframes if tf in self.data]
+        if max_workers is None:
+            max_workers = min(len(pending), os.cpu_count() or 1)
+
         analyses = {}
+        if max_workers > 1 and len(pending) > 1:
+            # Only timeframes the pool never finished are re-run here
+            analyses, failed = self._analyze_in_pool(pending, run_backtest, max_workers)
+            pending = [tf for tf in pending if tf not in analyses and tf not in failed]
 
-        for tf in self.timeframes:
-            if tf in self.data:
-                try:
-                    analyses[tf] = self.analyze_timeframe(tf, run_backtest=run_backtest)
-                except Exception as e:
-                    print(f"   ❌ {tf}: Analysis failed - {e}")
+        for tf in pending:
+            try:
+                analyses[tf] = self.analyze_timeframe(tf, run_backtest=run_backtest)
+            except Exception as e:
+                print(f"   ❌ {tf}: Analysis failed - {e}")
 
+        analyses = {tf: analyses[tf] for tf in self.timeframes if tf in analyses}
         print(f"\n✅ Analyzed {len(analyses)}/{len(self.timeframes)} timeframes")
 
         return analyses
 
+    def _analyze_in_pool(self, timeframes: List[str], run_backtest: bool,
+                         max_workers: int) -> Tuple[Dict, List[str]]:
+        """
+        Run analyze_timeframe_data per timeframe in worker processes
+
+        Returns:
+            (analyses, failed) - finished analyses and the timeframes whose
+            analysis raised. If the pool breaks, what finished before is
+            still returned; the timeframes that never finished are in neither.
+        """
+        # Longest jobs first: the 1m series dominates the wall time
+        order = sorted(timeframes, key=lambda tf: len(self.data[tf]), reverse=True)
+        print(f"   ⚡ {len(order)} timeframes on {max_workers} workers")
+
+        analyses = {}
+        failed = []
+        busy = 0.0
+        start = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(_analyze_timeframe_task, tf, self.data[tf], self.n_harmonics,
+                                self.noise_threshold, run_backtest): tf
+                    for tf in order
+                }
+                for future in as_completed(futures):
+                    tf = futures[future]
+                    try:
+                        result, elapsed = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        print(f"   ❌ {tf}: Analysis failed - {e}")
+                        failed.append(tf)
+                        continue
+                    busy += elapsed
+                    self._store_result(result)
+                    analyses[tf] = result
+                    print(f"\n🔬 {tf} analyzed in {elapsed:.1f}s")
+                    self._print_signals(result)
+        except BrokenProcessPool as e:
+            unfinished = len(order) - len(analyses) - len(failed)
+            print(f"   ⚠️  Worker pool failed ({e}), analyzing {unfinished} unfinished timeframes sequentially")
+
+        print(f"\n   ⏱️  {time.perf_counter() - start:.1f}s wall on {max_workers} workers "
+              f"({busy:.1f}s of analysis)")
+        return analyses, failed
+
     def calculate_timeframe_confluence(self, analyses: Dict = None) -> Dict:
         """
         Calculate confluence score across all timeframes
@@ -399,7 +586,10 @@ class MultiTimeframeAnalyzer:
     def analyze_complete(self,
                         days_back: int = 30,
                         confluence_threshold: float = 75,
-                        agreement_threshold: float = 70) -> Dict:
+                        agreement_threshold: float = 70,
+                        derive: bool = False,
+                        store_dir: Optional[str] = None,
+                        max_workers: Optional[int] = None) -> Dict:
         """
         Complete multi-timeframe analysis pipeline
 
@@ -407,6 +597,9 @@ class MultiTimeframeAnalyzer:
             days_back: Days of data to fetch
             confluence_threshold: Min confluence for signal
             agreement_threshold: Min agreement for signal
+            derive: Fetch only the finest timeframe, resample the rest
+            store_dir: CandleStore to load the finest timeframe from (implies derive)
+            max_workers: Worker processes for the analysis (1 = sequential)
 
         Returns:
             dict with complete analysis
@@ -415,11 +608,11 @@ class MultiTimeframeAnalyzer:
         print("║" + " "*18 + "MULTI-TIMEFRAME ANALYSIS PIPELINE" + " "*27 + "║")
         print("╚" + "═"*78 + "╝")
 
-        # Step 1: Fetch all timeframes
-        self.fetch_all_timeframes(days_back=days_back)
+        # Step 1: Fetch all timeframes (or one, and derive the rest)
+        self.fetch_all_timeframes(days_back=days_back, derive=derive, store_dir=store_dir)
 
         # Step 2: Analyze each timeframe
-        analyses = self.analyze_all_timeframes(run_backtest=False)
+        analyses = self.analyze_all_timeframes(run_backtest=False, max_workers=max_workers)
 
         # Step 3: Calculate confluence
         confluence = self.calculate_timeframe_confluence(analyses)
@@ -465,7 +658,8 @@ if __name__ == '__main__':
     results = analyzer.analyze_complete(
         days_back=7,  # 7 days for faster testing
         confluence_threshold=70,
-        agreement_threshold=65
+        agreement_threshold=65,
+        derive=True   # One 5m fetch, 15m/30m/1h resampled locally
     )
 
     print("\n✅ Multi-timeframe analysis complete!")
@@ -35,6 +35,14 @@ class FourierTradingStrategy:
     - Visualization
     """
 
+    # Constructor parameters each upstream stage depends on
+    STAGE_PARAMS = {
+        'price': ('n_harmonics', 'noise_threshold'),
+        'ema': ('n_harmonics', 'noise_threshold', 'base_ema_period', 'ema_timeframe_multipliers'),
+        'indicators': ('n_harmonics', 'noise_threshold', 'rsi_period', 'macd_fast',
+                       'macd_slow', 'macd_signal', 'atr_period'),
+    }
+
     def __init__(self,
                  # Fourier parameters
                  n_harmonics: int = 5,
@@ -182,6 +190,40 @@ class FourierTradingStrategy:
             print("FOURIER TRADING STRATEGY - PROCESSING")
             print("=" * 70)
 
+        upstream = self.compute_upstream(df, price_col, open_col, high_col, low_col,
+                                         volume_col, verbose=verbose)
+
+        return self.run_downstream(df, upstream, price_col, run_backtest=run_backtest,
+                                   verbose=verbose)
+
+    def compute_upstream(self,
+                         df: pd.DataFrame,
+                         price_col: str = 'close',
+                         open_col: str = 'open',
+                         high_col: str = 'high',
+                         low_col: str = 'low',
+                         volume_col: str = 'volume',
+                         verbose: bool = False,
+                         cache: Dict = None) -> Dict:
+        """
+        Run the expensive Fourier stages (price filter, EMAs, indicators).
+
+        Each stage depends only on the parameters in STAGE_PARAMS, so a grid
+        search can pass the same cache dict to many strategies and compute
+        every stage once per distinct parameter subset.
+
+        Args:
+            df: OHLCV DataFrame
+            price_col, open_col, high_col, low_col, volume_col: Column names
+            verbose: Print progress messages
+            cache: Optional dict reused across calls (stage key → result)
+
+        Returns:
+            Dictionary with price_filtered, ema_results, indicators,
+            indicator_signals
+        """
+        cache = {} if cache is None else cache
+
         # Extract OHLCV
         close = df[price_col]
         open_ = df[open_col]
@@ -193,25 +235,78 @@ class FourierTradingStrategy:
         if verbose:
             print("\n[1/7] Applying Fourier Transform to price...")
 
-        price_result = self.fourier_processor.process_signal(close)
-        price_filtered = pd.Series(price_result['filtered'], index=close.index)
+        key = self.stage_key('price')
+        if key not in cache:
+            price_result = self.fourier_processor.process_signal(close)
+            cache[key] = pd.Series(price_result['filtered'], index=close.index)
+        price_filtered = cache[key]
 
         # Step 2: Multi-timeframe EMA analysis
         if verbose:
             print("[2/7] Analyzing Multi-Timeframe EMAs with Fourier...")
 
-        ema_results = self.ema_analyzer.process(close)
+        key = self.stage_key('ema')
+        if key not in cache:
+            cache[key] = self.ema_analyzer.process(close)
+        ema_results = cache[key]
 
         # Step 3: Process all indicators with Fourier
         if verbose:
             print("[3/7] Processing Technical Indicators with Fourier...")
 
-        indicators = self.indicator_processor.process_all_indicators(
-            open_, high, low, close, volume
-        )
+        key = self.stage_key('indicators')
+        if key not in cache:
+            indicators = self.indicator_processor.process_all_indicators(
+                open_, high, low, close, volume
+            )
 
-        # Get individual indicator signals
-        indicator_signals = self.indicator_processor.get_indicator_signals(indicators)
+            # Get individual indicator signals
+            indicator_signals = self.indicator_processor.get_indicator_signals(indicators)
+            cache[key] = (indicators, indicator_signals)
+        indicators, indicator_signals = cache[key]
+
+        return {
+            'price_filtered': price_filtered,
+            'ema_results': ema_results,
+            'indicators': indicators,
+            'indicator_signals': indicator_signals
+        }
+
+    def stage_key(self, stage: str) -> tuple:
+        """Hashable cache key of an upstream stage's parameters"""
+        values = []
+        for name in self.STAGE_PARAMS[stage]:
+            value = self.params[name]
+            values.append(tuple(value) if isinstance(value, list) else value)
+        return (stage,) + tuple(values)
+
+    def run_downstream(self,
+                       df: pd.DataFrame,
+                       upstream: Dict,
+                       price_col: str = 'close',
+                       run_backtest: bool = True,
+                       verbose: bool = True,
+                       build_output: bool = True) -> Dict:
+        """
+        Run the cheap stages (correlation, signals, backtest) on upstream results.
+
+        Args:
+            df: OHLCV DataFrame
+            upstream: Output of compute_upstream()
+            price_col: Column name for close price
+            run_backtest: Whether to run backtest
+            verbose: Print progress messages
+            build_output: Build the combined output DataFrame (skipped by
+                          grid searches that only need metrics)
+
+        Returns:
+            Dictionary with all results (same as run())
+        """
+        close = df[price_col]
+        price_filtered = upstream['price_filtered']
+        ema_results = upstream['ema_results']
+        indicators = upstream['indicators']
+        indicator_signals = upstream['indicator_signals']
 
         # Step 4: Correlation analysis
         if verbose:
@@ -255,7 +350,8 @@ class FourierTradingStrategy:
                 close,
                 signal_results['trades'],
                 position_size=0.25,  # 25% of capital per trade (conservative)
-                verbose=verbose
+                verbose=verbose,
+                include_rolling=build_output
             )
 
             backtest_results = backtest_output['backtest_results']
@@ -266,20 +362,23 @@ class FourierTradingStrategy:
         if verbose:
             print("[7/7] Preparing Output DataFrame...")
 
-        output_df = self._create_output_dataframe(
-            df,
-            price_filtered,
-            ema_results,
-            indicators,
-            indicator_signals,
-            signal_results,
-            correlation_score,
-            backtest_results
-        )
+        output_df = None
+        if build_output:
+            output_df = self._create_output_dataframe(
+                df,
+                price_filtered,
+                ema_results,
+                indicators,
+                indicator_signals,
+                signal_results,
+                correlation_score,
+                backtest_results
+            )
 
         # Store results
         self.results = {
             'output_df': output_df,
+            'price': close,
             'price_filtered': price_filtered,
             'ema_results': ema_results,
             'indicators': indicators,
@@ -299,6 +398,34 @@ class FourierTradingStrategy:
 
         return self.results
 
+    def backtest_window(self,
+                        start: int,
+                        end: int,
+                        position_size: float = 0.25) -> Dict:
+        """
+        Backtest a slice of the last run() without recomputing indicators.
+
+        Used by walk-forward optimization: Fourier filters, EMAs, indicators
+        and signals are computed once over the full series, then every
+        train/test fold is backtested on its own bar range.
+
+        Args:
+            start: First bar (position) of the window
+            end: End bar (exclusive)
+            position_size: Fraction of capital per trade
+
+        Returns:
+            Dictionary with backtest_results, metrics, trade_log
+        """
+        if not self.results:
+            raise ValueError("Call run() before backtest_window()")
+
+        price = self.results['price'].iloc[start:end]
+        trades = self.results['signal_results']['trades'].iloc[start:end]
+
+        return self.backtester.run_backtest(price, trades, position_size=position_size,
+                                            verbose=False, include_rolling=False)
+
     def _create_output_dataframe(self,
                                  df: pd.DataFrame,
                                  price_filtered: pd.Series,
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Fibonacci Ribbon Analysis
+
+Produces, for every bar, the same causal "latest" ribbon signals that
+FibonacciRibbonAnalyzer.analyze() returns when run on the trailing window
+df.iloc[i-window+1:i+1] - without re-analyzing the window from scratch.
+
+How the per-bar work is reused:
+- EMA state: a window EMA that starts at bar s is the full-series EMA minus
+  a decaying correction, ema_s[t] = E[t] - (1-a)^(t-s) * (E[s] - close[s]),
+  so the full EMAs are computed once.
+- Window FFT: the window EMAs are rebuilt from the full EMAs and
+  transformed with one full FFT per bar (11 × window points, cheap). A
+  sliding DFT was tried and dropped: its accumulated rounding flipped
+  noise-percentile ties and drifted from the slow path by whole ribbons.
+- Only the last 6 filtered samples are reconstructed (what compression,
+  alignment, crosses and harmony read at the latest bar).
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.fft import fft
+
+from .fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
+
+
+class WalkForwardRibbonAnalyzer:
+    """
+    Incremental per-bar Fibonacci ribbon signals (compression/alignment/confluence)
+
+    Usage:
+        wf = WalkForwardRibbonAnalyzer(noise_threshold=0.25, window=301)
+        latest = wf.run(df['close'].values, start=200)
+        latest.loc[i, 'fibonacci_confluence']
+    """
+
+    # Crosses checked by FibonacciRibbonAnalyzer.calculate_fibonacci_confluence
+    CROSS_PAIRS = [(13, 55), (21, 89), (34, 144)]
+
+    # Filtered samples needed at the latest bar (alignment uses a 6-bar slope)
+    TAIL = 6
+
+    def __init__(self,
+                 use_periods: List[int] = None,
+                 noise_threshold: float = 0.3,
+                 window: int = 301):
+        """
+        Initialize walk-forward analyzer
+
+        Args:
+            use_periods: Fibonacci EMA periods (default: all 11)
+            noise_threshold: Same meaning as FibonacciRibbonAnalyzer
+            window: Trailing window length in bars (including the current bar)
+        """
+        self.periods = use_periods if use_periods else FibonacciRibbonAnalyzer.FIBONACCI_PERIODS
+        self.noise_threshold = noise_threshold
+        self.window = window
+
+        self.alphas = np.array([2.0 / (p + 1) for p in self.periods])[:, None]
+
+    def _full_emas(self, close: np.ndarray) -> np.ndarray:
+        """Full-series EMAs (adjust=False) for every period → (periods × bars)"""
+        return np.vstack([
+            pd.Series(close).ewm(span=period, adjust=False).mean().to_numpy()
+            for period in self.periods
+        ])
+
+    def _decay(self, length: int) -> np.ndarray:
+        """(1-a)^n for n in 0..length-1 → (periods × length)"""
+        return (1 - self.alphas) ** np.arange(length)[None, :]
+
+    def _latest_from_spectrum(self, spectrum: np.ndarray, tail_basis: np.ndarray) -> Dict[str, float]:
+        """Noise-filter a (periods × window) spectrum and score the latest bar"""
+        magnitude = np.abs(spectrum)
+        threshold = np.percentile(magnitude, (1 - self.noise_threshold) * 100, axis=1)[:, None]
+        filtered = np.where(magnitude < threshold, 0, spectrum)
+        tail = (filtered @ tail_basis).real  # (periods × TAIL)
+        return self._score_tail(tail)
+
+    def _score_tail(self, tail: np.ndarray) -> Dict[str, float]:
+        """Compression / alignment / confluence at the last column of tail"""
+        latest = tail[:, -1]
+
+        # Compression = 1 - std/mean across the ribbon (pandas std, ddof=1)
+        compression = (1 - latest.std(ddof=1) / latest.mean()) * 100
+        if np.isnan(compression):
+            compression = 0.0
+
+        # Alignment: share of ribbons with a positive 6-bar slope
+        slopes = np.where((tail[:, -1] - tail[:, 0]) / self.TAIL > 0, 1, -1)
+        bullish = int((slopes > 0).sum())
+        bearish = int((slopes < 0).sum())
+        total = len(slopes)
+        alignment = (bullish / total) * 100 if bullish > bearish else -(bearish / total) * 100
+
+        # Golden/death crosses at the latest bar
+        row = {period: j for j, period in enumerate(self.periods)}
+        cross_total = 0
+        for fast, slow in self.CROSS_PAIRS:
+            if fast not in row or slow not in row:
+                continue
+            prev_fast, curr_fast = tail[row[fast], -2], tail[row[fast], -1]
+            prev_slow, curr_slow = tail[row[slow], -2], tail[row[slow], -1]
+            if (prev_fast <= prev_slow and curr_fast > curr_slow) or \
+               (prev_fast >= prev_slow and curr_fast < curr_slow):
+                cross_total += 1
+        cross_score = cross_total * 33.33
+
+        # Fractal harmony between consecutive Fibonacci levels
+        harmony = 0
+        count = 0
+        for j in range(len(self.periods) - 1):
+            v1, v2 = latest[j], latest[j + 1]
+            if v1 > 0:
+                expected_ratio = self.periods[j + 1] / self.periods[j]
+                harmony += 100 * (1 - abs(v2 / v1 - expected_ratio) / expected_ratio)
+                count += 1
+        harmony = harmony / count if count > 0 else 0
+
+        confluence = (
+            compression * 0.25 +
+            abs(alignment) * 0.25 +
+            cross_score * 0.30 +
+            harmony * 0.20
+        )
+        if np.isnan(confluence):
+            confluence = 0.0
+
+        return {
+            'fibonacci_compression': compression,
+            'fibonacci_alignment': alignment,
+            'fibonacci_confluence': confluence
+        }
+
+    @staticmethod
+    def _tail_basis(length: int, tail: int) -> np.ndarray:
+        """Inverse-DFT rows for the last `tail` samples → (length × tail)"""
+        k = np.arange(length)[:, None]
+        n = np.arange(length - tail, length)[None, :]
+        return np.exp(2j * np.pi * k * n / length) / length
+
+    def run(self, close: np.ndarray, start: int = 200) -> pd.DataFrame:
+        """
+        Latest-bar ribbon signals for every bar from `start` onwards
+
+        Bar i uses the window close[max(0, i-window+1) : i+1], exactly like
+        df.iloc[max(0, i-window+1):i+1] in the slow per-bar loop.
+
+        Args:
+            close: Close prices
+            start: First bar to evaluate
+
+        Returns:
+            DataFrame indexed by bar position with fibonacci_compression,
+            fibonacci_alignment, fibonacci_confluence
+        """
+        close = np.asarray(close, dtype=float)
+        n_bars = len(close)
+        emas = self._full_emas(close)
+        rows = []
+
+        full_decay = self._decay(self.window)
+        full_basis = self._tail_basis(self.window, self.TAIL)
+
+        for i in range(start, n_bars):
+            s = max(0, i - self.window + 1)
+            length = i - s + 1
+            correction = (emas[:, s] - close[s])[:, None]
+
+            decay = full_decay if length == self.window else self._decay(length)
+            basis = full_basis if length == self.window else self._tail_basis(length, self.TAIL)
+            window_emas = emas[:, s:i + 1] - decay * correction
+            rows.append(self._latest_from_spectrum(fft(window_emas, axis=1), basis))
+
+        return pd.DataFrame(rows, index=pd.RangeIndex(start, n_bars))
+
+
+def compare_with_slow_path(df: pd.DataFrame, noise_threshold: float = 0.3, window: int = 301,
+                           start: int = 200, sample_bars: int = 40,
+                           thresholds: Tuple[float, float, float] = (80, 80, 55)) -> Dict:
+    """
+    Reproducibility check of the walk-forward signals vs re-analyzing each window
+
+    Runs FibonacciRibbonAnalyzer.analyze() on the trailing window of a sample
+    of bars (the slow path) and compares its latest values with run().
+
+    Exact equality is not guaranteed: the window EMAs are derived from the
+    full-series EMAs instead of recomputed, and when the noise percentile
+    falls on a conjugate pair of FFT bins with equal magnitude, rounding
+    decides whether one of them is dropped. The report gives the largest
+    differences and the share of bars that differ, so a run can be checked
+    rather than assumed to agree.
+
+    Args:
+        df: OHLCV DataFrame
+        noise_threshold, window, start: Analyzer settings (see run())
+        sample_bars: Number of evenly spaced bars to check
+        thresholds: (compression, alignment, confluence) used to compare
+                    threshold decisions
+
+    Returns:
+        dict with max absolute differences per signal, the share of sampled
+        bars differing by more than 1e-3 and the share whose threshold
+        decision agrees
+    """
+    import contextlib
+    import io
+
+    walk_forward = WalkForwardRibbonAnalyzer(noise_threshold=noise_threshold, window=window)
+    fast = walk_forward.run(df['close'].to_numpy(dtype=float), start=start)
+
+    sample = np.unique(np.linspace(start, len(df) - 1, min(sample_bars, len(df) - start)).astype(int))
+    slow_rows = []
+    for i in sample:
+        analyzer = FibonacciRibbonAnalyzer(noise_threshold=noise_threshold)
+        with contextlib.redirect_stdout(io.StringIO()):
+            signals = analyzer.analyze(df.iloc[max(0, i - window + 1):i + 1].copy())['signals']
+        slow_rows.append(signals.iloc[-1][list(fast.columns)].astype(float))
+    slow = pd.DataFrame(slow_rows, index=sample)
+    fast = fast.loc[sample]
+
+    comp_t, align_t, conf_t = thresholds
+    decision = lambda x: ((x['fibonacci_compression'] > comp_t) &
+                          (x['fibonacci_alignment'].abs() > align_t) &
+                          (x['fibonacci_confluence'] > conf_t))
+
+    report = {
+        'bars_checked': len(sample),
+        'max_abs_diff': (fast - slow).abs().max().to_dict(),
+        'bars_differing_pct': float(((fast - slow).abs() > 1e-3).any(axis=1).mean() * 100),
+        'decision_agreement_pct': float((decision(fast) == decision(slow)).mean() * 100),
+    }
+
+    print(f"\n🔁 Walk-forward reproducibility check ({report['bars_checked']} bars)")
+    for column, diff in report['max_abs_diff'].items():
+        print(f"   {column:<24} max |Δ| = {diff:.2e}")
+    print(f"   Bars differing by > 1e-3: {report['bars_differing_pct']:.1f}%")
+    print(f"   Threshold decisions agree: {report['decision_agreement_pct']:.1f}%")
+
+    return report
@@ -32,6 +32,7 @@ from strategy.entry_detector_user_pattern import EntryDetector
 from strategy.exit_manager_user_pattern import ExitManager
 from notifications.telegram_bot import TelegramBot
 from exchange.hyperliquid_client import HyperliquidClient
+from data.candle_store import CandleStore
 
 
 class LiveTradingBot:
@@ -148,6 +149,11 @@ Ready to trade! 🚀
         # For now, load from files (you'll replace this with real API calls)
         data_dir = Path(__file__).parent / 'trading_data'
 
+        # Imported into the candle store: read the newest partitions only
+        store = CandleStore(data_dir / 'store')
+        if store.exists('ETH', '15m') and store.exists('ETH', '5m'):
+            return store.tail('ETH', '15m', 200), store.tail('ETH', '5m', 200)
+
         df_15m = pd.read_csv(data_dir / 'indicators' / 'eth_15m_full.csv')
         df_15m['timestamp'] = pd.to_datetime(df_15m['timestamp'])
         df_15m = df_15m.tail(200)  # Last 200 candles for context
@@ -22,6 +22,19 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from fourier_strategy import FourierTradingStrategy
 from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
 from src.reporting.chart_generator import ChartGenerator
+from src.backtest.successive_halving import SuccessiveHalvingSearch
+from src.backtest.walk_forward import FourierStrategyTarget
+
+
+# Search space for --halving (FourierTradingStrategy kwargs)
+SCALPING_GRID = {
+    'n_harmonics': [3, 5, 7],
+    'noise_threshold': [0.2, 0.25, 0.3, 0.35],
+    'base_ema_period': [14, 20, 28],
+    'correlation_threshold': [0.5, 0.55, 0.6, 0.65],
+    'min_signal_strength': [0.2, 0.25, 0.3, 0.35],
+    'max_holding_periods': [12, 24, 36, 48],
+}
 
 
 def print_header(title):
@@ -81,7 +94,35 @@ def test_scalping_config(df, config_name, params):
     }
 
 
-def main():
+def halving_scalping(df, param_grid=None, min_bars=288, max_drawdown=15.0, max_workers=None):
+    """
+    Successive-halving search over the scalping grid
+
+    Configs start on the last day of 5m data (288 candles); the best third
+    is promoted to 3× longer slices up to the full range, and configs
+    drawing down more than max_drawdown % are stopped early.
+
+    Args:
+        df: 5m OHLCV DataFrame
+        param_grid: FourierTradingStrategy kwargs → values (default: SCALPING_GRID)
+        min_bars: First-rung slice length
+        max_drawdown: Early-stop drawdown in %
+        max_workers: Process pool size (default: CPU count)
+
+    Returns:
+        SuccessiveHalvingSearch.run() output (best_params, history, budget)
+    """
+    search = SuccessiveHalvingSearch(
+        FourierStrategyTarget(base_params={'initial_capital': 10000.0, 'commission': 0.001}),
+        metric='sharpe_ratio',
+        min_bars=min_bars,
+        max_drawdown=max_drawdown,
+        max_workers=max_workers
+    )
+    return search.run(df, param_grid or SCALPING_GRID)
+
+
+def main(halving=False):
     """Main scalping optimization"""
     print_header("MANUAL SCALPING OPTIMIZATION")
 
@@ -141,6 +182,13 @@ def main():
         }
     }
 
+    if halving:
+        print_section("✂️  SUCCESSIVE HALVING OVER THE SCALPING GRID")
+        search = halving_scalping(df_5m)
+        if search['best_params']:
+            configs['Halving Best'] = {'timeframe': '5m', 'minutes_per_candle': 5,
+                                         **search['best_params']}
+
     # Test all configurations
     results = []
     for name, params in configs.items():
@@ -347,5 +395,12 @@ def main():
 
 
 if __name__ == '__main__':
-    best_config = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manual scalping optimization')
+    parser.add_argument('--halving', action='store_true',
+                        help='Also search SCALPING_GRID with successive halving and test the winner')
+    args = parser.parse_args()
+
+    best_config = main(halving=args.halving)
     print(f"\n🎉 Ready to scalp! Your optimal config is saved.\n")
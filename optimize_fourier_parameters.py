@@ -15,6 +15,10 @@ from typing import Dict, List, Tuple
 import warnings
 
 from fourier_strategy import FourierTradingStrategy
+from fourier_strategy.grid_search import StagedGridSearch
+from src.backtest.walk_forward import WalkForwardOptimizer, FourierStrategyTarget
+from src.backtest.successive_halving import HyperbandSearch, SuccessiveHalvingSearch
+from src.backtest.result_store import ResultStore, canonical_params
 
 warnings.filterwarnings('ignore')
 
@@ -39,75 +43,135 @@ class ParameterOptimizer:
     def grid_search(self,
                    param_grid: Dict[str, List],
                    metric: str = 'sharpe_ratio',
-                   verbose: bool = True) -> pd.DataFrame:
+                   verbose: bool = True,
+                   results_path: str = None,
+                   base_params: Dict = None,
+                   max_workers: int = None,
+                   parallel: bool = True,
+                   store: ResultStore = None) -> pd.DataFrame:
         """
         Perform grid search over parameter space.
 
+        Combinations sharing the expensive upstream parameters (FFT, EMAs,
+        indicators) reuse one upstream computation; only correlation,
+        signals and backtest run per combination, in a process pool.
+
         Args:
             param_grid: Dictionary of parameters to test
             metric: Metric to optimize ('sharpe_ratio', 'total_return_pct', etc.)
             verbose: Print progress
+            results_path: JSONL file to stream results to; an existing file
+                          is resumed (finished combinations are skipped)
+            base_params: Parameters shared by every combination
+            max_workers: Process pool size (default: CPU count)
+            parallel: Use the process pool
+            store: ResultStore shared across optimizers; combinations already
+                   backtested on this data are not recomputed
 
         Returns:
             DataFrame with all results
         """
-        # Generate all combinations
-        param_names = list(param_grid.keys())
-        param_values = list(param_grid.values())
-        combinations = list(product(*param_values))
+        search = StagedGridSearch(
+            self.df,
+            base_params=base_params,
+            results_path=results_path,
+            max_workers=max_workers,
+            parallel=parallel,
+            store=store
+        )
+        results_df = search.run(param_grid, metric=metric, verbose=verbose)
 
-        total_combinations = len(combinations)
+        self.results = results_df
 
-        if verbose:
-            print(f"Testing {total_combinations} parameter combinations...")
+        if verbose and not results_df.empty:
+            print("\n" + "=" * 70)
+            print(f"Grid search complete. Best {metric}: {results_df[metric].iloc[0]:.2f}")
             print("=" * 70)
 
-        results = []
-
-        for i, combo in enumerate(combinations):
-            params = dict(zip(param_names, combo))
-
-            if verbose and (i + 1) % 10 == 0:
-                print(f"Progress: {i+1}/{total_combinations} ({(i+1)/total_combinations*100:.1f}%)")
-
-            try:
-                # Create strategy with these parameters
-                strategy = FourierTradingStrategy(**params)
-
-                # Run backtest
-                output = strategy.run(self.df, run_backtest=True, verbose=False)
-
-                metrics = output['metrics']
-
-                # Store results
-                result = params.copy()
-                result['sharpe_ratio'] = metrics['sharpe_ratio']
-                result['total_return_pct'] = metrics['total_return_pct']
-                result['max_drawdown_pct'] = metrics['max_drawdown_pct']
-                result['win_rate_pct'] = metrics['win_rate_pct']
-                result['profit_factor'] = metrics['profit_factor']
-                result['num_trades'] = metrics['num_trades']
+        return results_df
 
-                results.append(result)
+    def walk_forward(self,
+                     param_grid: Dict[str, List],
+                     metric: str = 'sharpe_ratio',
+                     n_folds: int = 5,
+                     anchored: bool = False,
+                     base_params: Dict = None,
+                     max_workers: int = None,
+                     verbose: bool = True) -> Dict:
+        """
+        Walk-forward grid search: fit on each train fold, score out-of-sample.
 
-            except Exception as e:
-                if verbose:
-                    print(f"Error with params {params}: {e}")
-                continue
+        Each parameter set runs the strategy once over the full series and is
+        backtested per fold; parameter sets run in a process pool.
 
-        results_df = pd.DataFrame(results)
+        Args:
+            param_grid: Dictionary of parameters to test
+            metric: Metric to select on
+            n_folds: Number of train/test folds
+            anchored: Expanding (anchored) instead of rolling train window
+            base_params: Parameters shared by every combination
+            max_workers: Process pool size (default: CPU count)
+            verbose: Print progress
 
-        # Sort by metric
-        results_df = results_df.sort_values(metric, ascending=False)
+        Returns:
+            WalkForwardOptimizer.run() output (folds, scores, stability, best_params)
+        """
+        optimizer = WalkForwardOptimizer(
+            FourierStrategyTarget(base_params=base_params),
+            param_grid,
+            n_folds=n_folds,
+            anchored=anchored,
+            metric=metric,
+            max_workers=max_workers
+        )
+        return optimizer.run(self.df, verbose=verbose)
+
+    def hyperband(self,
+                  param_grid: Dict[str, List],
+                  metric: str = 'sharpe_ratio',
+                  eta: int = 3,
+                  min_bars: int = None,
+                  max_drawdown: float = None,
+                  brackets: bool = True,
+                  base_params: Dict = None,
+                  max_workers: int = None,
+                  store: ResultStore = None,
+                  verbose: bool = True) -> Dict:
+        """
+        Budget-aware search: many combinations on short slices, the best on the full data.
 
-        self.results = results_df
+        Every combination first runs on the most recent min_bars; the best
+        1/eta are promoted to eta× longer slices until the survivors run on
+        the full series. Hyperband brackets hedge against metrics that need
+        long slices to separate good from bad.
 
-        if verbose:
-            print("\n" + "=" * 70)
-            print(f"Grid search complete. Best {metric}: {results_df[metric].iloc[0]:.2f}")
-            print("=" * 70)
+        Args:
+            param_grid: Dictionary of parameters to test
+            metric: Metric to optimize
+            eta: Promotion factor
+            min_bars: Shortest slice (default: len(df) / eta²)
+            max_drawdown: Stop combinations whose drawdown (%) exceeds this
+            brackets: Run all Hyperband brackets (False: one successive-halving
+                      bracket, cheapest when len(df) / min_bars < eta³)
+            base_params: Parameters shared by every combination
+            max_workers: Process pool size (default: CPU count)
+            store: ResultStore; (slice, combination) runs already in it are reused
+            verbose: Print progress
 
-        return results_df
+        Returns:
+            Search output (best_params, best_metrics, history, budget)
+        """
+        search_class = HyperbandSearch if brackets else SuccessiveHalvingSearch
+        search = search_class(
+            FourierStrategyTarget(base_params=base_params),
+            metric=metric,
+            eta=eta,
+            min_bars=min_bars,
+            max_drawdown=max_drawdown,
+            max_workers=max_workers,
+            store=store
+        )
+        return search.run(self.df, param_grid, verbose=verbose)
 
     def sensitivity_analysis(self,
                             param_name: str,
@@ -126,38 +190,19 @@ class ParameterOptimizer:
         Returns:
             DataFrame with sensitivity results
         """
-        if base_params is None:
-            base_params = {}
-
         print(f"Sensitivity analysis for: {param_name}")
         print(f"Testing {len(param_values)} values: {param_values}")
         print("=" * 70)
 
-        results = []
-
-        for value in param_values:
-            params = base_params.copy()
-            params[param_name] = value
-
-            try:
-                strategy = FourierTradingStrategy(**params)
-                output = strategy.run(self.df, run_backtest=True, verbose=False)
-                metrics = output['metrics']
-
-                results.append({
-                    param_name: value,
-                    'sharpe_ratio': metrics['sharpe_ratio'],
-                    'total_return_pct': metrics['total_return_pct'],
-                    'max_drawdown_pct': metrics['max_drawdown_pct'],
-                    'win_rate_pct': metrics['win_rate_pct'],
-                    'num_trades': metrics['num_trades']
-                })
-
-            except Exception as e:
-                print(f"Error with {param_name}={value}: {e}")
-                continue
-
-        results_df = pd.DataFrame(results)
+        search = StagedGridSearch(self.df, base_params=base_params)
+        results_df = search.run({param_name: param_values}, metric=metric, verbose=False)
+        # Same rows and order as testing param_values one by one
+        position = {canonical_params({param_name: value}): i for i, value in enumerate(param_values)}
+        results_df = results_df.sort_values(
+            param_name, key=lambda values: values.map(lambda v: position[canonical_params({param_name: v})])
+        ).reset_index(drop=True)
+        results_df = results_df[[param_name, 'sharpe_ratio', 'total_return_pct', 'max_drawdown_pct',
+                                 'win_rate_pct', 'num_trades']]
 
         print(f"\nBest {metric}: {results_df[metric].max():.2f} at {param_name}={results_df.loc[results_df[metric].idxmax(), param_name]}")
 
@@ -226,17 +271,26 @@ class ParameterOptimizer:
                               param1: str,
                               param2: str,
                               metric: str = 'sharpe_ratio',
-                              save_path: str = None):
+                              save_path: str = None,
+                              param_grid: Dict[str, List] = None,
+                              base_params: Dict = None):
         """
         Plot 2D heatmap of parameter combinations.
 
         Args:
-            grid_results: Results from grid_search
+            grid_results: Results from grid_search (None: run param_grid)
             param1: First parameter name
             param2: Second parameter name
             metric: Metric to visualize
             save_path: Optional save path
+            param_grid: Values of param1/param2 to search when grid_results is None
+            base_params: Parameters shared by every combination
         """
+        if grid_results is None:
+            search = StagedGridSearch(self.df, base_params=base_params)
+            grid_results = search.run({param1: param_grid[param1], param2: param_grid[param2]},
+                                      metric=metric, verbose=False)
+
         # Pivot data
         pivot_data = grid_results.pivot_table(
             values=metric,
@@ -283,7 +337,8 @@ def example_grid_search():
     }
 
     # Run grid search
-    results = optimizer.grid_search(param_grid, metric='sharpe_ratio', verbose=True)
+    results = optimizer.grid_search(param_grid, metric='sharpe_ratio', verbose=True,
+                                    results_path='fourier_grid_search_results.jsonl')
 
     # Show top 10 results
     print("\nTop 10 Parameter Combinations:")
@@ -12,9 +12,15 @@ This script runs continuous optimization iterations:
 
 USAGE:
     python run_fourier_optimization_loop.py --iterations 10
+    python run_fourier_optimization_loop.py --iterations 5 --batch 4
+    python run_fourier_optimization_loop.py --iterations 5 --batch 4 --offline
+
+With --batch K every round asks for K candidates at once and backtests them
+in parallel while the next request is in flight; --offline replaces Claude
+with a deterministic local suggester (no API key needed).
 
 REQUIREMENTS:
-    - ANTHROPIC_API_KEY environment variable must be set
+    - ANTHROPIC_API_KEY environment variable must be set (unless --offline)
     - pip install anthropic
 """
 
@@ -25,19 +31,36 @@ import json
 import time
 from pathlib import Path
 from datetime import datetime
+from typing import Dict
 
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from fourier_iterative_optimizer import FourierIterativeOptimizer
-
-# Check for Anthropic API
+from fourier_strategy.hyperliquid_adapter import HyperliquidDataAdapter
+from src.backtest.successive_halving import TargetObjective
+from src.backtest.walk_forward import FourierStrategyTarget
+from src.optimization.candidate_batch import (
+    BatchCandidateLoop, ClaudeSuggester, LocalSuggester, PromptCache
+)
+
+# Anthropic API (not needed with --offline)
 try:
     import anthropic
 except ImportError:
-    print("\n❌ ERROR: anthropic package not installed")
-    print("   Install with: pip install anthropic")
-    sys.exit(1)
+    anthropic = None
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+# Ranges from the analysis prompt - used by the offline suggester
+FOURIER_PARAM_BOUNDS = {
+    'n_harmonics': (3, 11),
+    'noise_threshold': (0.1, 0.5),
+    'base_ema_period': (14, 50),
+    'correlation_threshold': (0.5, 0.9),
+    'min_signal_strength': (0.2, 0.8),
+    'max_holding_periods': (24, 336),
+}
 
 
 class ClaudePoweredOptimizer:
@@ -48,7 +71,8 @@ class ClaudePoweredOptimizer:
     def __init__(self,
                  symbol: str = 'ETH',
                  initial_capital: float = 10000.0,
-                 max_iterations: int = 10):
+                 max_iterations: int = 10,
+                 offline: bool = False):
         """
         Initialize Claude-powered optimizer
 
@@ -56,6 +80,7 @@ class ClaudePoweredOptimizer:
             symbol: Trading symbol
             initial_capital: Starting capital
             max_iterations: Maximum iterations to run
+            offline: Use the deterministic local suggester instead of Claude
         """
         self.symbol = symbol
         self.initial_capital = initial_capital
@@ -67,15 +92,29 @@ class ClaudePoweredOptimizer:
             initial_capital=initial_capital
         )
 
-        # Initialize Anthropic client
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        if not api_key:
-            print("\n❌ ERROR: ANTHROPIC_API_KEY environment variable not set")
-            print("   Get your API key from: https://console.anthropic.com")
-            print("   Set it with: export ANTHROPIC_API_KEY='your-key-here'")
-            sys.exit(1)
-
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.offline = offline
+        if offline:
+            self.client = None
+            self.suggester = LocalSuggester(FOURIER_PARAM_BOUNDS)
+        else:
+            if anthropic is None:
+                print("\n❌ ERROR: anthropic package not installed")
+                print("   Install with: pip install anthropic (or run with --offline)")
+                sys.exit(1)
+
+            # Initialize Anthropic client
+            api_key = os.environ.get('ANTHROPIC_API_KEY')
+            if not api_key:
+                print("\n❌ ERROR: ANTHROPIC_API_KEY environment variable not set")
+                print("   Get your API key from: https://console.anthropic.com")
+                print("   Set it with: export ANTHROPIC_API_KEY='your-key-here'")
+                sys.exit(1)
+
+            self.client = anthropic.Anthropic(api_key=api_key)
+            self.suggester = ClaudeSuggester(
+                self.client, model=MODEL, max_tokens=2048, temperature=0.7,
+                cache=PromptCache(self.optimizer.iterations_dir / 'prompt_cache')
+            )
 
         # Track best iteration
         self.best_iteration = None
@@ -91,20 +130,16 @@ class ClaudePoweredOptimizer:
         Returns:
             dict with Claude's suggestions
         """
+        if self.offline:
+            print("\n🎲 Local suggester (offline)...")
+            candidates = self.suggester.suggest(prompt, self.optimizer.current_params, 1)
+            return candidates[0] if candidates else None
+
         print("\n🤖 Asking Claude AI for optimization suggestions...")
 
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=2048,
-                temperature=0.7,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            response_text = message.content[0].text.strip()
+            # Identical prompts are answered from the on-disk prompt cache
+            response_text = self.suggester.ask(prompt).strip()
 
             # Extract JSON from response (handle markdown code blocks)
             if '```json' in response_text:
@@ -296,6 +331,66 @@ class ClaudePoweredOptimizer:
         print(f"\n📄 Summary saved to: {summary_file}")
 
 
+    def run_batch_loop(self,
+                       days_back: int = 50,
+                       candles_to_show: int = 1000,
+                       k: int = 4,
+                       pipeline: bool = True,
+                       max_workers: int = None) -> Dict:
+        """
+        Batched optimization: K candidates per round, backtested in parallel
+
+        Each round's candidates are backtested in a process pool while the
+        next round's request is in flight. The winner then gets a regular
+        iteration (charts + iterations log).
+
+        Args:
+            days_back: Days of data to fetch
+            candles_to_show: Candles to show on the winner's chart
+            k: Candidates per round
+            pipeline: Overlap the next request with the current backtests
+            max_workers: Process pool size (default: CPU count)
+
+        Returns:
+            BatchCandidateLoop.run() output
+        """
+        print(f"\n1️⃣  Fetching {days_back} days of {self.symbol} data...")
+        adapter = HyperliquidDataAdapter(symbol=self.symbol)
+        df = adapter.fetch_ohlcv(interval='1h', days_back=days_back, use_checkpoint=False)
+        print(f"   ✅ Fetched {len(df)} candles ({df.index[0]} to {df.index[-1]})")
+
+        def build_prompt(best, history):
+            self.optimizer.current_params = dict(best['params'])
+            return self.optimizer.generate_claude_analysis_prompt({'metrics': best['metrics']})
+
+        loop = BatchCandidateLoop(
+            TargetObjective(FourierStrategyTarget()),
+            self.suggester,
+            build_prompt=build_prompt,
+            metric='sharpe_ratio',
+            k=k,
+            max_change_pct=30.0,
+            bounds=FOURIER_PARAM_BOUNDS,
+            min_trades=1,
+            pipeline=pipeline,
+            max_workers=max_workers
+        )
+        output = loop.run(df, self.optimizer.current_params, rounds=self.max_iterations)
+
+        history_file = self.optimizer.iterations_dir / f"batch_loop_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        output['history'].to_csv(history_file, index=False)
+        print(f"\n💾 Candidate history saved: {history_file}")
+
+        # Full iteration (charts, log) for the winner
+        self.optimizer.current_params = dict(output['best_params'])
+        result = self.optimizer.run_iteration(days_back=days_back, candles_to_show=candles_to_show)
+        self.best_iteration = result['iteration_name']
+        self.best_sharpe = result['metrics']['sharpe_ratio']
+        self.optimizer.current_iteration += 1
+
+        return output
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -309,11 +404,19 @@ def main():
                        help='Initial capital (default: 10000)')
     parser.add_argument('--days', type=int, default=50,
                        help='Days of historical data (default: 50)')
+    parser.add_argument('--batch', type=int, default=0, metavar='K',
+                       help='Ask for K candidates per round and backtest them in parallel')
+    parser.add_argument('--offline', action='store_true',
+                       help='Deterministic local suggester instead of Claude (no API key needed)')
+    parser.add_argument('--no-pipeline', action='store_true',
+                       help='With --batch: wait for each round\'s results before the next request')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Process pool size for --batch (default: CPU count)')
 
     args = parser.parse_args()
 
     # Check API key
-    if not os.environ.get('ANTHROPIC_API_KEY'):
+    if not args.offline and not os.environ.get('ANTHROPIC_API_KEY'):
         print("\n❌ ERROR: ANTHROPIC_API_KEY not set")
         print("\nTo set your API key:")
         print("  export ANTHROPIC_API_KEY='your-api-key-here'")
@@ -324,11 +427,16 @@ def main():
     optimizer = ClaudePoweredOptimizer(
         symbol=args.symbol,
         initial_capital=args.capital,
-        max_iterations=args.iterations
+        max_iterations=args.iterations,
+        offline=args.offline
     )
 
     try:
-        optimizer.run_optimization_loop(days_back=args.days)
+        if args.batch:
+            optimizer.run_batch_loop(days_back=args.days, k=args.batch,
+                                     pipeline=not args.no_pipeline, max_workers=args.workers)
+        else:
+            optimizer.run_optimization_loop(days_back=args.days)
     except KeyboardInterrupt:
         print("\n\n⚠️  Optimization interrupted by user")
         print(f"✅ Completed {optimizer.optimizer.current_iteration - 1} iterations")
@@ -14,6 +14,7 @@ Runs complete optimization loop:
 Usage:
     python3 scripts/optimize_strategy.py --iterations 5 --timeframe 1h
     python3 scripts/optimize_strategy.py --iterations 10 --timeframe 15m --auto-apply
+    python3 scripts/optimize_strategy.py --iterations 5 --batch 4 --offline
 """
 
 import sys
@@ -23,9 +24,13 @@ import argparse
 import json
 import os
 from datetime import datetime
-import anthropic
 from dotenv import load_dotenv
 
+try:
+    import anthropic
+except ImportError:  # only needed when asking Claude (not with --offline)
+    anthropic = None
+
 # Load environment variables from .env file
 load_dotenv(Path(__file__).parent.parent / '.env')
 
@@ -37,12 +42,29 @@ from strategy.exit_manager import ExitManager
 from strategy.ribbon_analyzer import RibbonAnalyzer
 from backtest.backtest_engine import BacktestEngine
 from backtest.performance_metrics import PerformanceMetrics
+from backtest.walk_forward import WalkForwardOptimizer, BacktestEngineTarget
+from backtest.result_store import ResultStore, data_fingerprint, data_range
+from backtest.successive_halving import TargetObjective
 from analysis.optimal_trade_finder import OptimalTradeFinder
 from optimization.claude_optimizer import ClaudeOptimizer
+from optimization.candidate_batch import BatchCandidateLoop, ClaudeSuggester, LocalSuggester, PromptCache, apply_changes
 from reporting.telegram_reporter import TelegramReporter
 from reporting.chart_generator import ChartGenerator
 
 
+MODEL = "claude-sonnet-4-20250514"
+
+# Parameters the offline suggester explores (strategy_params.json keys)
+STRATEGY_PARAM_BOUNDS = {
+    'confluence_gap_min': (5.0, 40.0),
+    'confluence_score_min': (5, 40),
+    'min_quality_score': (30.0, 80.0),
+    'stop_loss_pct': (0.3, 2.0),
+    'profit_lock_pct': (0.5, 3.0),
+    'max_hold_candles': (4, 48),
+}
+
+
 class AutomatedOptimizer:
     """
     Fully automated strategy optimization with Claude AI
@@ -54,7 +76,9 @@ class AutomatedOptimizer:
         timeframe: str = '1h',
         symbol: str = 'eth',
         max_param_change_pct: float = 20.0,
-        min_improvement_pct: float = 2.0
+        min_improvement_pct: float = 2.0,
+        use_store: bool = True,
+        offline: bool = False
     ):
         """
         Initialize automated optimizer
@@ -65,8 +89,17 @@ class AutomatedOptimizer:
             symbol: Trading symbol
             max_param_change_pct: Max % change per parameter
             min_improvement_pct: Minimum improvement to accept changes
+            use_store: Reuse backtests of identical (data, params) from the result store
+            offline: Use the deterministic local suggester instead of Claude
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.offline = offline
+        if offline:
+            self.client = None
+            self.suggester = LocalSuggester(STRATEGY_PARAM_BOUNDS)
+        else:
+            self.client = anthropic.Anthropic(api_key=api_key)
+            self.suggester = ClaudeSuggester(self.client, model=MODEL, max_tokens=2000,
+                                             temperature=1.0, cache=PromptCache())
         self.timeframe = timeframe
         self.symbol = symbol
         self.max_param_change_pct = max_param_change_pct
@@ -88,6 +121,14 @@ class AutomatedOptimizer:
         self.telegram = None
         self.chart_generator = None
         self.performance_metrics = None
+        self.engine_kwargs = {
+            'initial_capital': 10000,
+            'commission_pct': 0.05,
+            'slippage_pct': 0.02,
+            'position_size_pct': 10.0,
+            'max_concurrent_trades': 3
+        }
+        self.store = ResultStore() if use_store else None
 
         # State
         self.iteration_history = []
@@ -101,13 +142,7 @@ class AutomatedOptimizer:
         self.entry_detector = EntryDetector()
         self.exit_manager = ExitManager()
         self.ribbon_analyzer = RibbonAnalyzer()
-        self.backtest_engine = BacktestEngine(
-            initial_capital=10000,
-            commission_pct=0.05,
-            slippage_pct=0.02,
-            position_size_pct=10.0,
-            max_concurrent_trades=3
-        )
+        self.backtest_engine = BacktestEngine(**self.engine_kwargs)
         self.optimal_finder = OptimalTradeFinder(min_profit_pct=1.0, max_hold_candles=24)  # 24h = 1 day for 1h timeframe
         self.optimizer = ClaudeOptimizer()
         self.telegram = TelegramReporter()
@@ -153,13 +188,7 @@ class AutomatedOptimizer:
         print("\n" + "="*80)
         print("RUNNING BACKTEST")
         print("="*80)
-        backtest_results = self.backtest_engine.run_backtest(
-            df=df,
-            entry_detector=self.entry_detector,
-            exit_manager=self.exit_manager,
-            ribbon_analyzer=None,
-            verbose=False
-        )
+        backtest_results = self.run_backtest_cached(df)
 
         # Find optimal trades
         print("\n" + "="*80)
@@ -193,6 +222,63 @@ class AutomatedOptimizer:
             'performance_comparison': performance_comparison
         }
 
+    def run_backtest_cached(self, df: pd.DataFrame) -> dict:
+        """
+        Backtest the current strategy_params.json, reusing a stored run of
+        the same data and parameters (reverted / unchanged iterations)
+
+        Returns:
+            BacktestEngine.run_backtest() output (trades, equity_curve, metrics)
+        """
+        def backtest():
+            return self.backtest_engine.run_backtest(
+                df=df,
+                entry_detector=self.entry_detector,
+                exit_manager=self.exit_manager,
+                ribbon_analyzer=None,
+                verbose=False
+            )
+
+        if self.store is None:
+            return backtest()
+
+        data_hash = data_fingerprint(df)
+        key = {'strategy_params': self.entry_detector.params, 'engine': self.engine_kwargs}
+        stored = self.store.get('backtest_engine', data_hash, key, load_artifacts=True)
+        if stored is not None:
+            print(f"   🗄️  Cache hit - identical data and parameters already backtested")
+            return {'trades': stored['trades'] or [], 'equity_curve': stored['equity'] or [],
+                    'metrics': stored['metrics']}
+
+        results = backtest()
+        self.store.put('backtest_engine', data_hash, key, results['metrics'], results['trades'],
+                       results['equity_curve'], data_range(df), source='optimize_strategy')
+        return results
+
+    def run_walk_forward(self, df: pd.DataFrame, n_folds: int = 5, anchored: bool = False) -> dict:
+        """
+        Score the current strategy_params.json out-of-sample on walk-forward folds
+
+        Entry signals are scanned once over the full data and each test fold
+        is simulated on its slice, so a change that only fits one window shows
+        up as unstable fold results.
+
+        Returns:
+            WalkForwardOptimizer.run() output
+        """
+        print("\n" + "="*80)
+        print("WALK-FORWARD VALIDATION")
+        print("="*80)
+        target = BacktestEngineTarget(engine_kwargs={
+            'initial_capital': self.backtest_engine.initial_capital,
+            'commission_pct': self.backtest_engine.commission_pct,
+            'slippage_pct': self.backtest_engine.slippage_pct,
+            'position_size_pct': self.backtest_engine.position_size_pct,
+            'max_concurrent_trades': self.backtest_engine.max_concurrent_trades
+        }, params_file=str(self.params_file))
+        optimizer = WalkForwardOptimizer(target, {}, n_folds=n_folds, anchored=anchored, metric='win_rate')
+        return optimizer.run(df)
+
     def ask_claude(self, gap_analysis: dict, current_params: dict) -> dict:
         """
         Ask Claude for optimization suggestions
@@ -207,18 +293,15 @@ class AutomatedOptimizer:
         # Generate prompt
         prompt = self.optimizer.generate_optimization_prompt(gap_analysis, current_params['entry_filters'])
 
-        # Call Claude API
+        if self.offline:
+            print("   🎲 Local suggester (offline)...")
+            candidates = self.suggester.suggest(prompt, self.flat_params(current_params), 1)
+            return candidates[0] if candidates else None
+
+        # Call Claude API (identical prompts are answered from the prompt cache)
         print("   🤖 Calling Claude API...")
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            response_text = message.content[0].text
+            response_text = self.suggester.ask(prompt)
             print(f"\n📝 Claude's Response:\n{response_text}\n")
 
             # Extract JSON from response
@@ -245,6 +328,98 @@ class AutomatedOptimizer:
             print(f"   Response: {response_text if 'response_text' in locals() else 'No response'}")
             return None
 
+    def flat_params(self, params: dict) -> dict:
+        """Tunable strategy_params.json values as flat keys (BacktestEngineTarget overrides)"""
+        flat = {}
+        for section in BacktestEngineTarget.SECTIONS:
+            for key, value in params.get(section, {}).items():
+                if not key.startswith('_'):
+                    flat.setdefault(key, value)
+        return flat
+
+    def run_batch_loop(self, df: pd.DataFrame, rounds: int, k: int = 4, auto_apply: bool = False,
+                       pipeline: bool = True, max_workers: int = None) -> dict:
+        """
+        Batched optimization: K candidates per round, backtested in parallel
+
+        Candidates are flat overrides on strategy_params.json applied in
+        memory; only the final winner is written back (with a backup).
+        Each round's backtests overlap the next round's request.
+
+        Args:
+            df: Historical data
+            rounds: Suggestion rounds
+            k: Candidates per round
+            auto_apply: Write an improved winner without confirmation
+            pipeline: Overlap the next request with the current backtests
+            max_workers: Process pool size (default: CPU count)
+
+        Returns:
+            BatchCandidateLoop.run() output
+        """
+        print("\n" + "="*80)
+        print(f"BATCH OPTIMIZATION LOOP ({rounds} rounds × {k} candidates)")
+        print("="*80)
+
+        target = BacktestEngineTarget(engine_kwargs=self.engine_kwargs, params_file=str(self.params_file))
+        base_params = EntryDetector(str(self.params_file)).params
+
+        # Optimal trades do not depend on the parameters - scan once
+        optimal_trades = self.optimal_finder.scan_all_optimal_trades(df)
+        gap_cache = {}
+
+        def build_prompt(best, history):
+            key = json.dumps(best['params'], sort_keys=True, default=str)
+            if key not in gap_cache:
+                signals_df, exit_manager = target.prepare(df, best['params'])
+                result = BacktestEngine(**self.engine_kwargs).run_backtest(
+                    signals_df, None, exit_manager, verbose=False, scan_signals=False)
+                gap_cache[key] = self.optimizer.analyze_performance_gap(result, optimal_trades)
+            entry_filters = target.apply_params(base_params, best['params'])['entry_filters']
+            return self.optimizer.generate_optimization_prompt(gap_cache[key], entry_filters)
+
+        loop = BatchCandidateLoop(
+            TargetObjective(target),
+            self.suggester,
+            build_prompt=build_prompt,
+            metric='win_rate',
+            k=k,
+            max_change_pct=self.max_param_change_pct,
+            bounds=STRATEGY_PARAM_BOUNDS,
+            min_trades=1,
+            pipeline=pipeline,
+            max_workers=max_workers
+        )
+        output = loop.run(df, self.flat_params(base_params), rounds=rounds)
+
+        history_file = Path(__file__).parent.parent / 'optimization_logs' / f'batch_history_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        output['history'].to_csv(history_file, index=False)
+        print(f"\n💾 Candidate history saved: {history_file}")
+
+        baseline_win_rate = output['baseline_metrics'].get('win_rate') or 0
+        best_win_rate = output['best_metrics'].get('win_rate') or 0
+        improvement = ((best_win_rate - baseline_win_rate) / baseline_win_rate * 100
+                       if baseline_win_rate > 0 else 0)
+
+        if output['best_round'] == 0 or improvement < self.min_improvement_pct:
+            print(f"\n⚠️  No candidate beat the baseline by {self.min_improvement_pct}% - parameters unchanged")
+            return output
+
+        print(f"\n✅ IMPROVEMENT DETECTED! Win rate {baseline_win_rate:.2f}% → {best_win_rate:.2f}% (+{improvement:.2f}%)")
+        keep = True
+        if not auto_apply:
+            response = input("\n   Apply these changes? [Y/n]: ")
+            keep = response.lower() != 'n'
+
+        if keep:
+            self.backup_params()
+            with open(self.params_file, 'w') as f:
+                json.dump(target.apply_params(base_params, output['best_params']), f, indent=2)
+            self.best_win_rate = best_win_rate
+            print(f"   ✅ Parameters updated: {self.params_file}")
+
+        return output
+
     def backup_params(self):
         """Backup current parameters"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -281,40 +456,20 @@ class AutomatedOptimizer:
         with open(self.params_file, 'r') as f:
             params = json.load(f)
 
-        old_params = params['entry_filters'].copy()
+        # Same limits and key routing as the batch loop: flat keys from any
+        # tuned section (entry filters, ribbon settings, exit strategy)
+        current = self.flat_params(params)
         suggested_changes = suggestions['suggested_changes']
+        updated = apply_changes(current, suggested_changes, self.max_param_change_pct, STRATEGY_PARAM_BOUNDS)
 
-        # Apply changes with limits
+        changes = {key: value for key, value in updated.items() if value != current[key]}
         changes_applied = []
-        for key, new_value in suggested_changes.items():
-            if key in params['entry_filters']:
-                old_value = params['entry_filters'][key]
-
-                # For numeric values, limit change
-                if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
-                    max_change = abs(old_value * (self.max_param_change_pct / 100))
-
-                    if old_value == 0:
-                        limited_value = new_value
-                    else:
-                        if new_value > old_value:
-                            limited_value = min(new_value, old_value + max_change)
-                        else:
-                            limited_value = max(new_value, old_value - max_change)
-
-                    params['entry_filters'][key] = limited_value
-                    changes_applied.append(f"{key}: {old_value} → {limited_value}")
-                    print(f"   ✅ {key}: {old_value} → {limited_value} (suggested: {new_value})")
-                else:
-                    params['entry_filters'][key] = new_value
-                    changes_applied.append(f"{key}: {old_value} → {new_value}")
-                    print(f"   ✅ {key}: {old_value} → {new_value}")
+        for key, new_value in changes.items():
+            changes_applied.append(f"{key}: {current[key]} → {new_value}")
+            print(f"   ✅ {key}: {current[key]} → {new_value} (suggested: {suggested_changes[key]})")
 
-            elif key in params['exit_strategy']:
-                old_value = params['exit_strategy'][key]
-                params['exit_strategy'][key] = new_value
-                changes_applied.append(f"{key}: {old_value} → {new_value}")
-                print(f"   ✅ {key}: {old_value} → {new_value}")
+        target = BacktestEngineTarget(params_file=str(self.params_file))
+        params = target.apply_params(params, changes)
 
         # Save updated params
         with open(self.params_file, 'w') as f:
@@ -530,11 +685,22 @@ def main():
     parser.add_argument('--auto-apply', action='store_true', help='Automatically apply improvements without confirmation')
     parser.add_argument('--max-change', type=float, default=20.0, help='Max %% change per parameter')
     parser.add_argument('--min-improvement', type=float, default=2.0, help='Minimum %% improvement to keep changes')
+    parser.add_argument('--walk-forward', type=int, default=0, metavar='FOLDS',
+                        help='Validate the final parameters on FOLDS walk-forward folds')
+    parser.add_argument('--anchored', action='store_true', help='Anchored (expanding) walk-forward train windows')
+    parser.add_argument('--no-store', action='store_true', help='Always re-run backtests (ignore the result store)')
+    parser.add_argument('--batch', type=int, default=0, metavar='K',
+                        help='Ask for K candidates per round and backtest them in parallel')
+    parser.add_argument('--offline', action='store_true',
+                        help='Deterministic local suggester instead of Claude (no API key needed)')
+    parser.add_argument('--no-pipeline', action='store_true',
+                        help="With --batch: wait for each round's results before the next request")
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size for --batch')
     args = parser.parse_args()
 
     # Get API key
     api_key = os.getenv('ANTHROPIC_API_KEY')
-    if not api_key:
+    if not api_key and not args.offline:
         print("\n❌ ANTHROPIC_API_KEY not found in environment")
         print("   Set it with: export ANTHROPIC_API_KEY='your-key-here'")
         print("   Or add to .env file")
@@ -543,7 +709,7 @@ def main():
     print("="*80)
     print("AUTOMATED STRATEGY OPTIMIZATION")
     print("="*80)
-    print(f"Using Claude AI (Sonnet 4)")
+    print("Using local suggester (offline)" if args.offline else "Using Claude AI (Sonnet 4)")
     print(f"Timeframe: {args.timeframe}")
     print(f"Iterations: {args.iterations}")
 
@@ -553,7 +719,9 @@ def main():
         timeframe=args.timeframe,
         symbol=args.symbol,
         max_param_change_pct=args.max_change,
-        min_improvement_pct=args.min_improvement
+        min_improvement_pct=args.min_improvement,
+        use_store=not args.no_store,
+        offline=args.offline
     )
 
     # Initialize components first (needed for load_data)
@@ -563,7 +731,18 @@ def main():
     df = optimizer.load_data()
 
     # Run optimization loop
-    optimizer.run_optimization_loop(df, args.iterations, args.auto_apply)
+    if args.batch:
+        optimizer.run_batch_loop(df, args.iterations, k=args.batch, auto_apply=args.auto_apply,
+                                 pipeline=not args.no_pipeline, max_workers=args.workers)
+    else:
+        optimizer.run_optimization_loop(df, args.iterations, args.auto_apply)
+
+    # Out-of-sample check of the kept parameters
+    if args.walk_forward:
+        optimizer.run_walk_forward(df, n_folds=args.walk_forward, anchored=args.anchored)
+
+    if optimizer.store is not None:
+        optimizer.store.print_stats()
 
     print("\n✅ Done! Strategy optimized.")
 
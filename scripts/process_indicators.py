@@ -4,6 +4,9 @@ Process all fetched data through the indicator pipeline
 
 Adds RSI, MACD, VWAP, Volume analysis, and important EMA crossovers
 to all timeframe data files
+
+Full recompute; also resets the state that update_from_hyperliquid.py
+uses to extend the indicator files incrementally.
 """
 
 import sys
@@ -14,7 +17,8 @@ import os
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from indicators.indicator_pipeline import IndicatorPipeline
+from indicators.incremental_pipeline import IncrementalIndicatorPipeline
+from data.candle_store import CandleStore
 
 
 def process_all_timeframes():
@@ -28,12 +32,13 @@ def process_all_timeframes():
     symbol = 'eth'
     raw_dir = 'trading_data/raw'
     output_dir = 'trading_data/indicators'
+    store = CandleStore('trading_data/store')
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
     # Initialize pipeline
-    pipeline = IndicatorPipeline()
+    pipeline = IncrementalIndicatorPipeline()
 
     for tf in timeframes:
         input_file = f'{raw_dir}/{symbol}_historical_{tf}.csv'
@@ -48,21 +53,15 @@ def process_all_timeframes():
         print(f"{'='*80}")
 
         try:
-            # Load data
-            print(f"\n📂 Loading {input_file}...")
-            df = pd.read_csv(input_file)
-            print(f"   ✅ Loaded {len(df)} rows")
-
-            # Process through pipeline
-            df = pipeline.calculate_all(df)
-
-            # Save with all indicators
-            print(f"\n💾 Saving to {output_file}...")
-            df.to_csv(output_file, index=False)
+            # Process through pipeline, save with all indicators, and write the
+            # same frame as binary day partitions for the live/backtest loaders
+            print(f"\n📂 Processing {input_file} → {output_file}...")
+            result = pipeline.recompute(input_file, output_file, store=store, symbol=symbol, timeframe=tf)
 
             file_size = os.path.getsize(output_file) / (1024 * 1024)  # MB
-            print(f"   ✅ Saved {len(df)} rows ({file_size:.1f} MB)")
-            print(f"   📊 Total columns: {len(df.columns)}")
+            print(f"   ✅ Saved {result['rows']} rows ({file_size:.1f} MB)")
+            print(f"   📊 Total columns: {len(pd.read_csv(output_file, nrows=0).columns)}")
+            print(f"   💾 Candle store: {len(store.partitions(symbol, tf))} partitions")
 
         except Exception as e:
             print(f"\n❌ Error processing {tf}: {e}")
@@ -7,8 +7,8 @@ Designed for continuous operation by live trading bot.
 
 Features:
 - Fetches missing candles since last data point
-- Appends to existing CSV files
-- Triggers indicator recalculation
+- Appends to existing CSV files (only new rows, no full rewrite)
+- Updates indicators incrementally (new bars only, in-process)
 - Optionally regenerates charts
 - Can run once or in continuous loop
 """
@@ -21,10 +21,17 @@ import requests
 from datetime import datetime, timedelta
 import time
 import subprocess
+import contextlib
+import io
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+from data.incremental_csv import IncrementalCSV
+from data.data_validator import CandleValidator, has_fixed_grid
+from data.candle_store import CandleStore
+from indicators.incremental_pipeline import IncrementalIndicatorPipeline
+
 
 class HyperliquidDataUpdater:
     """
@@ -36,12 +43,16 @@ class HyperliquidDataUpdater:
     - Timeframes: 1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 8h, 12h, 1d, 3d, 1w, 1M
     """
 
+    OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
     def __init__(
         self,
         symbol: str = 'ETH',
         timeframes: list = None,
         data_dir: str = 'trading_data/raw',
-        api_url: str = 'https://api.hyperliquid.xyz/info'
+        api_url: str = 'https://api.hyperliquid.xyz/info',
+        indicators_dir: str = 'trading_data/indicators',
+        store_dir: str = 'trading_data/store'
     ):
         """
         Initialize Hyperliquid data updater
@@ -51,11 +62,16 @@ class HyperliquidDataUpdater:
             timeframes: List of timeframes to update (default: all)
             data_dir: Directory containing raw CSV files
             api_url: Hyperliquid API endpoint
+            indicators_dir: Directory for indicator CSV files
+            store_dir: Candle store root (indicator rows are appended there too)
         """
         self.symbol = symbol.upper()
         self.timeframes = timeframes or ['1m', '3m', '5m', '15m', '30m', '1h']
         self.data_dir = Path(data_dir)
         self.api_url = api_url
+        self.indicators_dir = Path(indicators_dir)
+        self.store = CandleStore(store_dir)
+        self.indicator_pipeline = IncrementalIndicatorPipeline()
 
         print(f"🔧 Hyperliquid Data Updater")
         print(f"   Symbol: {self.symbol}")
@@ -147,30 +163,34 @@ class HyperliquidDataUpdater:
 
         return df
 
+    def _csv_file(self, timeframe: str) -> IncrementalCSV:
+        return IncrementalCSV(self.data_dir / f'{self.symbol.lower()}_historical_{timeframe}.csv')
+
     def get_last_timestamp(self, timeframe: str) -> datetime:
         """
         Get last timestamp from existing CSV file
 
+        Read from the file's sidecar (or its last line), not by parsing the
+        whole timestamp column.
+
         Args:
             timeframe: Timeframe string (1m, 5m, etc.)
 
         Returns:
             Last timestamp as datetime, or None if file doesn't exist
         """
-        csv_path = self.data_dir / f'{self.symbol.lower()}_historical_{timeframe}.csv'
+        csv_file = self._csv_file(timeframe)
 
-        if not csv_path.exists():
-            print(f"   ⚠️  File not found: {csv_path}")
+        if not csv_file.path.exists():
+            print(f"   ⚠️  File not found: {csv_file.path}")
             return None
 
         try:
-            # Read only the timestamp column from last row
-            df = pd.read_csv(csv_path, usecols=['timestamp'])
+            last_ts = csv_file.last_key()
 
-            if df.empty:
+            if last_ts is None:
                 return None
 
-            last_ts = df['timestamp'].iloc[-1]
             last_dt = pd.to_datetime(last_ts)
 
             print(f"   📅 Last timestamp in file: {last_dt}")
@@ -184,6 +204,11 @@ class HyperliquidDataUpdater:
         """
         Append new data to existing CSV file
 
+        Only candles after the file's last row are written; a candle with
+        the last row's timestamp (still forming when it was stored) replaces
+        that row in place. Files that still carry indicator columns from a
+        full fetch are rewritten to OHLCV once, as before.
+
         Args:
             new_data: DataFrame with new candles (only OHLCV columns)
             timeframe: Timeframe string
@@ -195,33 +220,41 @@ class HyperliquidDataUpdater:
             print(f"   ⚠️  No new data to append")
             return False
 
-        csv_path = self.data_dir / f'{self.symbol.lower()}_historical_{timeframe}.csv'
+        csv_file = self._csv_file(timeframe)
+        csv_path = csv_file.path
 
         try:
             # Ensure only OHLCV columns (indicators will be recalculated)
-            new_data = new_data[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            new_data = new_data[self.OHLCV_COLUMNS]
+
+            state = csv_file.state()
 
-            if csv_path.exists():
-                # Read existing data (only OHLCV columns)
-                existing_df = pd.read_csv(csv_path, usecols=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            if state is not None and state['columns'] == self.OHLCV_COLUMNS:
+                result = csv_file.append(new_data)
+
+                print(f"   ✅ Appended {result['appended']} new candles to {csv_path}"
+                      + (f" (updated last candle)" if result['replaced'] else ""))
+                print(f"   📊 Total candles: {result['rows']}")
+
+            elif state is not None:
+                # One-time conversion of a full-fetch file to OHLCV
+                existing_df = pd.read_csv(csv_path, usecols=self.OHLCV_COLUMNS)
 
-                # Combine and remove duplicates
                 combined_df = pd.concat([existing_df, new_data], ignore_index=True)
                 combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
                 combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
 
-                # Save back
-                combined_df.to_csv(csv_path, index=False)
+                csv_file.rewrite(combined_df)
 
                 new_count = len(combined_df) - len(existing_df)
-                print(f"   ✅ Appended {new_count} new candles to {csv_path}")
+                print(f"   ✅ Appended {new_count} new candles to {csv_path} (converted to OHLCV)")
                 print(f"   📊 Total candles: {len(combined_df)}")
 
             else:
                 # Create new file
-                new_data.to_csv(csv_path, index=False)
+                result = csv_file.append(new_data)
                 print(f"   ✅ Created new file: {csv_path}")
-                print(f"   📊 Total candles: {len(new_data)}")
+                print(f"   📊 Total candles: {result['rows']}")
 
             return True
 
@@ -278,11 +311,45 @@ class HyperliquidDataUpdater:
         # Convert to DataFrame
         df = self.convert_candles_to_df(candles)
 
+        # Check the batch (and its join to the file) for gaps before appending
+        self.validate_candles(df, timeframe, last_dt)
+
         # Append to CSV
         success = self.append_to_csv(df, timeframe)
 
         return success
 
+    def validate_candles(self, df: pd.DataFrame, timeframe: str, last_dt=None):
+        """
+        Report gaps, duplicates and OHLC errors in a fetched batch
+
+        Bars missing between the file's last candle and the batch (e.g. an
+        exchange outage while the updater was down) count as a gap too.
+        Nothing is dropped or filled: the batch is appended as fetched.
+
+        Args:
+            df: New candles (convert_candles_to_df output)
+            timeframe: Timeframe string
+            last_dt: Last timestamp already in the file (or None)
+
+        Returns:
+            ValidationReport of the batch (None for calendar intervals such as '1M')
+        """
+        if not has_fixed_grid(timeframe):
+            return None
+        validator = CandleValidator(timeframe)
+        report = validator.validate(df)
+        if not report.ok:
+            print(report.summary())
+
+        if last_dt is not None and report.first is not None:
+            step = validator.interval_ms
+            joined = report.first - int(pd.Timestamp(last_dt).value // 1_000_000)
+            if joined > step:
+                print(f"   ⚠️  {(joined - 1) // step} bars missing between the file "
+                      f"({last_dt}) and the new candles")
+        return report
+
     def _parse_timeframe_minutes(self, timeframe: str) -> int:
         """Convert timeframe string to minutes"""
         if timeframe.endswith('m'):
@@ -321,49 +388,48 @@ class HyperliquidDataUpdater:
 
     def recalculate_indicators(self) -> bool:
         """
-        Trigger indicator recalculation by running process_indicators.py
+        Bring the indicator files up to date, in-process
+
+        Only the bars appended since the last run are computed (from the
+        persisted indicator state); a full recompute runs when there is no
+        state yet and periodically as a consistency check.
 
         Returns:
             True if successful
         """
         print(f"\n{'='*80}")
-        print(f"📊 RECALCULATING INDICATORS")
+        print(f"📊 UPDATING INDICATORS")
         print(f"{'='*80}")
 
-        script_path = Path(__file__).parent / 'process_indicators.py'
-
-        if not script_path.exists():
-            print(f"   ❌ Script not found: {script_path}")
-            return False
-
-        try:
-            result = subprocess.run(
-                ['python3', str(script_path)],
-                cwd=Path(__file__).parent.parent,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-
-            if result.returncode == 0:
-                print(f"   ✅ Indicators recalculated successfully")
-                # Print last 20 lines of output
-                output_lines = result.stdout.split('\n')
-                for line in output_lines[-20:]:
-                    if line.strip():
-                        print(f"   {line}")
-                return True
-            else:
-                print(f"   ❌ Indicator calculation failed")
-                print(f"   Error: {result.stderr}")
-                return False
+        symbol = self.symbol.lower()
+        self.indicators_dir.mkdir(parents=True, exist_ok=True)
+        ok = True
 
-        except subprocess.TimeoutExpired:
-            print(f"   ❌ Indicator calculation timed out")
-            return False
-        except Exception as e:
-            print(f"   ❌ Error running indicator calculation: {e}")
-            return False
+        for tf in self.timeframes:
+            raw_file = self._csv_file(tf).path
+            output_file = self.indicators_dir / f'{symbol}_{tf}_full.csv'
+
+            if not raw_file.exists():
+                print(f"   ⚠️  Skipping {tf} - file not found: {raw_file}")
+                continue
+
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = self.indicator_pipeline.update(raw_file, output_file, store=self.store,
+                                                            symbol=symbol, timeframe=tf)
+                if result['mode'] == 'unchanged':
+                    print(f"   ✅ {tf}: up-to-date ({result['rows']} rows)")
+                elif result['mode'] == 'full':
+                    print(f"   🔄 {tf}: full recompute ({result['reason']}) - {result['rows']} rows")
+                else:
+                    print(f"   ✅ {tf}: +{result['appended']} rows ({result['rows']} total)")
+                self.indicator_pipeline.report_check(result['check'])
+
+            except Exception as e:
+                print(f"   ❌ Error updating {tf} indicators: {e}")
+                ok = False
+
+        return ok
 
     def regenerate_charts(self) -> bool:
         """
@@ -16,6 +16,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 from pathlib import Path
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 class OptimalTradeFinder:
@@ -88,34 +89,93 @@ class OptimalTradeFinder:
 
         # Choose direction with better profit
         if long_profit_pct >= short_profit_pct and long_profit_pct >= self.min_profit_pct:
-            direction = 'long'
-            profit_pct = long_profit_pct
-            optimal_exit_price = max_price
-
             # Find when max was hit
-            exit_idx_relative = future_candles['high'].idxmax()
-            exit_idx = df.index.get_loc(exit_idx_relative)
+            exit_idx = df.index.get_loc(future_candles['high'].idxmax())
+            return self._build_trade(
+                df, start_idx, 'long', exit_idx, long_profit_pct, max_price,
+                df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float)
+            )
 
-            # Calculate MAE (worst drawdown)
-            mae_price = future_candles.loc[:exit_idx_relative, 'low'].min()
-            mae = (mae_price - entry_price) / entry_price * 100
+        if short_profit_pct >= self.min_profit_pct:
+            # Find when min was hit
+            exit_idx = df.index.get_loc(future_candles['low'].idxmin())
+            return self._build_trade(
+                df, start_idx, 'short', exit_idx, short_profit_pct, min_price,
+                df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float)
+            )
 
-        elif short_profit_pct >= self.min_profit_pct:
-            direction = 'short'
-            profit_pct = short_profit_pct
-            optimal_exit_price = min_price
+        # Not profitable enough
+        return {'is_optimal': False}
 
-            # Find when min was hit
-            exit_idx_relative = future_candles['low'].idxmin()
-            exit_idx = df.index.get_loc(exit_idx_relative)
+    def compute_forward_extremes(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Compute forward max-high / min-low for every bar in one pass
 
-            # Calculate MAE (worst drawdown)
-            mae_price = future_candles.loc[:exit_idx_relative, 'high'].max()
-            mae = (entry_price - mae_price) / entry_price * 100
+        Uses a sliding-window view over the next ``max_hold_candles`` bars,
+        so no per-bar DataFrame slicing is needed. Row i of every array
+        describes the window df.iloc[i+1:i+1+max_hold_candles] (only bars
+        with a full window are included, same as find_optimal_entry).
+
+        Args:
+            df: Full DataFrame with 'high', 'low', 'close'
+
+        Returns:
+            dict with numpy arrays (length = len(df) - max_hold_candles):
+                - max_high / min_low: forward extremes
+                - max_offset / min_offset: 1-based offset of first extreme
+                - long_profit_pct / short_profit_pct: potential profit
+        """
+        n_bars = max(len(df) - self.max_hold_candles, 0)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)[:n_bars]
+
+        if n_bars == 0:
+            empty_f = np.empty(0)
+            empty_i = np.empty(0, dtype=np.int64)
+            return {
+                'max_high': empty_f, 'min_low': empty_f,
+                'max_offset': empty_i, 'min_offset': empty_i,
+                'long_profit_pct': empty_f, 'short_profit_pct': empty_f,
+            }
+
+        # NaN-skipping like pandas max()/min()
+        high = np.where(np.isnan(high), -np.inf, high)
+        low = np.where(np.isnan(low), np.inf, low)
+
+        # Window for bar i starts at i+1 → view over high[1:]
+        high_windows = sliding_window_view(high[1:], self.max_hold_candles)[:n_bars]
+        low_windows = sliding_window_view(low[1:], self.max_hold_candles)[:n_bars]
+
+        rows = np.arange(n_bars)
+        max_arg = high_windows.argmax(axis=1)  # first occurrence, like idxmax
+        min_arg = low_windows.argmin(axis=1)
+        max_high = high_windows[rows, max_arg]
+        min_low = low_windows[rows, min_arg]
 
+        return {
+            'max_high': max_high,
+            'min_low': min_low,
+            'max_offset': max_arg + 1,
+            'min_offset': min_arg + 1,
+            'long_profit_pct': (max_high - close) / close * 100,
+            'short_profit_pct': (close - min_low) / close * 100,
+        }
+
+    def _build_trade(self, df: pd.DataFrame, start_idx: int, direction: str,
+                     exit_idx: int, profit_pct: float, optimal_exit_price: float,
+                     high: np.ndarray, low: np.ndarray) -> Dict:
+        """Assemble an optimal trade dict (MAE + indicators at entry)"""
+        entry_candle = df.iloc[start_idx]
+        entry_price = entry_candle['close']
+
+        # MAE = worst price between entry and the optimal exit (inclusive)
+        if direction == 'long':
+            mae_price = np.nanmin(low[start_idx + 1:exit_idx + 1])
+            mae = (mae_price - entry_price) / entry_price * 100
         else:
-            # Not profitable enough
-            return {'is_optimal': False}
+            mae_price = np.nanmax(high[start_idx + 1:exit_idx + 1])
+            mae = (entry_price - mae_price) / entry_price * 100
 
         # Collect indicators at entry
         indicators_at_entry = {
@@ -153,6 +213,11 @@ class OptimalTradeFinder:
 
         IMPORTANT: Only finds NON-OVERLAPPING trades (realistic scenario)
 
+        Forward extremes for every bar are computed once up front
+        (see compute_forward_extremes); the non-overlapping greedy skip
+        is then a single cheap pass over the qualifying bars. Returns
+        the same trades as calling find_optimal_entry bar by bar.
+
         Args:
             df: Full DataFrame with indicators
 
@@ -165,20 +230,43 @@ class OptimalTradeFinder:
         print(f"   Min profit: {self.min_profit_pct}%")
         print(f"   Max hold: {self.max_hold_candles} candles")
 
+        extremes = self.compute_forward_extremes(df)
+        long_pct = extremes['long_profit_pct']
+        short_pct = extremes['short_profit_pct']
+
+        # Same direction rule as find_optimal_entry
+        is_long = (long_pct >= short_pct) & (long_pct >= self.min_profit_pct)
+        is_short = ~is_long & (short_pct >= self.min_profit_pct)
+        candidates = np.flatnonzero(is_long | is_short)
+
+        bar_idx = np.arange(len(long_pct))
+        exit_idx = np.where(is_long, bar_idx + extremes['max_offset'],
+                            bar_idx + extremes['min_offset'])
+
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+
         optimal_trades = []
         i = 50  # Start after indicators are stable
 
-        # Scan for non-overlapping trades only
-        while i < len(df) - self.max_hold_candles:
-            trade = self.find_optimal_entry(df, i)
-
-            if trade['is_optimal']:
-                optimal_trades.append(trade)
-                # Skip to after this trade exits (no overlapping trades)
-                i = trade['optimal_exit_idx'] + 1
+        # Greedy pass: jump to the next qualifying bar after each exit
+        pos = np.searchsorted(candidates, i)
+        while pos < len(candidates):
+            start = int(candidates[pos])
+            if is_long[start]:
+                trade = self._build_trade(
+                    df, start, 'long', int(exit_idx[start]), long_pct[start],
+                    extremes['max_high'][start], high, low
+                )
             else:
-                # Move to next candle
-                i += 1
+                trade = self._build_trade(
+                    df, start, 'short', int(exit_idx[start]), short_pct[start],
+                    extremes['min_low'][start], high, low
+                )
+            optimal_trades.append(trade)
+            # Skip to after this trade exits (no overlapping trades)
+            i = trade['optimal_exit_idx'] + 1
+            pos = np.searchsorted(candidates, i)
 
         print(f"\n📊 Optimal Trade Summary (Non-Overlapping):")
         print(f"   Total optimal trades: {len(optimal_trades)}")
@@ -6,5 +6,14 @@ Simulate strategy performance on historical data
 
 from .backtest_engine import BacktestEngine
 from .performance_metrics import PerformanceMetrics
+from .parallel_runner import ParallelIterationRunner
+from .multi_config_evaluator import MultiConfigEvaluator
+from .monte_carlo import MonteCarloSimulator
+from .walk_forward import WalkForwardOptimizer, FourierStrategyTarget, BacktestEngineTarget
+from .successive_halving import SuccessiveHalvingSearch, HyperbandSearch
+from .result_store import ResultStore
+from .intrabar import IntrabarResolver
 
-__all__ = ['BacktestEngine', 'PerformanceMetrics']
+__all__ = ['BacktestEngine', 'PerformanceMetrics', 'ParallelIterationRunner', 'MultiConfigEvaluator',
+           'MonteCarloSimulator', 'WalkForwardOptimizer', 'FourierStrategyTarget', 'BacktestEngineTarget',
+           'SuccessiveHalvingSearch', 'HyperbandSearch', 'ResultStore', 'IntrabarResolver']
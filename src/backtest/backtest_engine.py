@@ -164,6 +164,39 @@ class BacktestEngine:
 
         return trade
 
+    def _intrabar_tp_first(self, trade: Dict, candle: pd.Series, candle_idx: int, intrabar) -> int:
+        """
+        Deepest take-profit level touched before the stop inside this candle
+
+        Only asks the resolver when the candle's range covers the stop and a
+        pending take-profit; otherwise ExitManager's single-candle checks are
+        unambiguous. Each pending level is resolved against the stop in turn
+        (TP1, TP2, TP3) and the walk ends at the first one the stop beat.
+
+        Returns:
+            1-3 for the deepest level reached before the stop, 0 if none
+        """
+        if intrabar is None:
+            return 0
+
+        levels = trade['exit_levels']
+        exits_taken = trade.get('exits_taken', [])
+        is_long = trade['direction'] == 'long'
+        sl = levels['stop_loss']
+        if (is_long and candle['low'] > sl) or (not is_long and candle['high'] < sl):
+            return 0
+
+        reached = 0
+        for n in (1, 2, 3):
+            if f'tp{n}' in exits_taken:
+                continue
+            tp = levels[f'take_profit_{n}']
+            touched = candle['high'] >= tp if is_long else candle['low'] <= tp
+            if not (touched and intrabar.tp_first(candle_idx, tp, sl, is_long)):
+                break
+            reached = n
+        return reached
+
     def update_trade_mfe_mae(self, trade: Dict, candle: pd.Series):
         """Update Maximum Favorable/Adverse Excursion"""
         entry_price = trade['entry_price']
@@ -251,7 +284,9 @@ class BacktestEngine:
         entry_detector,
         exit_manager,
         ribbon_analyzer=None,
-        verbose: bool = True
+        verbose: bool = True,
+        scan_signals: bool = True,
+        intrabar=None
     ) -> Dict:
         """
         Run full backtest on historical data
@@ -262,6 +297,11 @@ class BacktestEngine:
             exit_manager: ExitManager instance
             ribbon_analyzer: Optional RibbonAnalyzer instance
             verbose: Print progress
+            scan_signals: If False, df already has entry_signal/entry_direction/
+                          entry_confidence columns (e.g. a walk-forward fold
+                          sliced from one full scan) and entry_detector is unused
+            intrabar: Optional IntrabarResolver (1m data) deciding whether stop or
+                      take-profit came first when one candle touches both
 
         Returns:
             dict with backtest results:
@@ -287,7 +327,9 @@ class BacktestEngine:
             df = ribbon_analyzer.analyze_all(df)
 
         # Scan for entries
-        signals_df = entry_detector.scan_historical_signals(df)
+        signals_df = entry_detector.scan_historical_signals(df) if scan_signals else df
+        if intrabar is not None:
+            intrabar = intrabar.realign(signals_df['timestamp'])
 
         # Simulate trading
         for i in range(len(signals_df)):
@@ -307,11 +349,24 @@ class BacktestEngine:
 
                 # Check exit
                 candles_held = i - trade['entry_idx']
-                exit_info = exit_manager.check_exit(trade, current_candle, candles_held)
+                tp_level = self._intrabar_tp_first(trade, current_candle, i, intrabar)
+                tp_first = tp_level > 0
+                exit_info = exit_manager.check_exit(trade, current_candle, candles_held,
+                                                    tp_first=tp_first, max_tp_level=tp_level or 3)
 
                 if exit_info['should_exit']:
                     pnl_usd, pnl_pct = self.exit_trade(trade, exit_info, current_candle, i)
 
+                    # The take-profit filled first, but the candle went on to the stop:
+                    # the rest of the position exits there on the same candle
+                    if tp_first and exit_info['exit_type'].startswith('take_profit') \
+                            and trade['remaining_size'] > 0:
+                        self.exit_trade(trade, {
+                            'exit_type': 'stop_loss',
+                            'exit_price': trade['exit_levels']['stop_loss'],
+                            'exit_size': trade['remaining_size'],
+                        }, current_candle, i)
+
                     # If fully exited, close trade
                     if trade['remaining_size'] <= 0:
                         # Calculate total P&L
@@ -376,6 +431,8 @@ class BacktestEngine:
 
         if verbose:
             self.print_summary(metrics)
+            if intrabar is not None:
+                intrabar.print_stats()
 
         return {
             'trades': self.trades,
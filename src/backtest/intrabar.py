@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Intrabar Fill Resolution - 1m Child Bars for 5m/15m Backtests
+
+When one candle's high/low touches both TP and SL, the candle alone cannot
+tell which was hit first, and the backtesters guess (TP first in the
+harmonic backtests, SL first in ExitManager). At 25x leverage that guess
+decides whole trades. IntrabarResolver answers it from the 1m series:
+- Parent bar boundaries are mapped to 1m offsets once with searchsorted,
+  so the children of bar i are child[starts[i]:ends[i]]
+- Ambiguous bars are resolved together: their child windows are gathered
+  into a (bars × children) matrix and the first TP / SL touch found with
+  argmax, exactly like first_touch() does across parent bars
+- Only bars that touch both levels reach the resolver, so a backtest costs
+  about what the single-bar check did
+
+Bars the 1m data does not cover, and bars where TP and SL fall inside the
+same 1m candle, fall back to tie_break.
+"""
+
+import copy
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def _to_ns(times) -> np.ndarray:
+    """Timestamps (DatetimeIndex, ISO strings or epoch ms) as int64 ns, UTC-naive"""
+    times = times if isinstance(times, pd.Index) else pd.Index(times)
+    if pd.api.types.is_numeric_dtype(times):
+        times = pd.to_datetime(times, unit='ms')
+    times = pd.DatetimeIndex(pd.to_datetime(times))
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    return times.values.astype('datetime64[ns]').view(np.int64)
+
+
+class IntrabarResolver:
+    """
+    Resolve TP-vs-SL ordering inside parent bars from 1m child bars
+
+    Usage:
+        resolver = IntrabarResolver(df_1m, df_5m.index)
+        tp_first = resolver.resolve(bars, tp, sl, is_long)   # vectorized
+        if resolver.tp_first(i, tp_price, sl_price, True): ...  # one bar
+    """
+
+    def __init__(self, child_df: pd.DataFrame, parent_index, bar_minutes: int = None,
+                 tie_break: str = 'sl'):
+        """
+        Initialize resolver.
+
+        Args:
+            child_df: 1m OHLC with a DatetimeIndex (or a 'timestamp' column)
+            parent_index: Open times of the backtest's bars (positions used by resolve())
+            bar_minutes: Parent bar length (default: inferred from parent_index)
+            tie_break: 'sl' (conservative) or 'tp' for bars the 1m data cannot decide
+        """
+        if tie_break not in ('sl', 'tp'):
+            raise ValueError(f"tie_break must be 'sl' or 'tp', got {tie_break!r}")
+
+        times = child_df['timestamp'] if 'timestamp' in child_df.columns else child_df.index
+        child_ns = _to_ns(times)
+        order = np.argsort(child_ns, kind='stable')
+        self.child_ns = child_ns[order]
+        self.child_high = child_df['high'].to_numpy(dtype=float)[order]
+        self.child_low = child_df['low'].to_numpy(dtype=float)[order]
+
+        self.bar_minutes = bar_minutes
+        self.tie_break = tie_break
+        self.stats = {'resolved': 0, 'tp_first': 0, 'sl_first': 0, 'unresolved': 0}
+        self._align(parent_index)
+
+    def _align(self, parent_index):
+        """Precompute child offsets for every parent bar"""
+        parent_ns = _to_ns(parent_index)
+        if self.bar_minutes is not None:
+            bar_ns = int(self.bar_minutes) * 60_000_000_000
+        elif len(parent_ns) > 1:
+            bar_ns = int(np.median(np.diff(parent_ns)))
+        else:
+            raise ValueError('bar_minutes is required for a single-bar parent index')
+
+        self.parent_ns = parent_ns
+        self.starts = np.searchsorted(self.child_ns, parent_ns, side='left')
+        self.ends = np.searchsorted(self.child_ns, parent_ns + bar_ns, side='left')
+        self.width = int((self.ends - self.starts).max()) if len(parent_ns) else 0
+
+    def realign(self, parent_index) -> 'IntrabarResolver':
+        """
+        Same 1m data, offsets for another parent index (e.g. a sliced fold)
+
+        Returns:
+            Shallow copy sharing the 1m arrays, with its own stats
+        """
+        resolver = copy.copy(self)
+        resolver.stats = {key: 0 for key in self.stats}
+        resolver._align(parent_index)
+        return resolver
+
+    def coverage(self) -> float:
+        """Fraction of parent bars with at least one 1m child"""
+        if len(self.parent_ns) == 0:
+            return 0.0
+        return float(np.mean(self.ends > self.starts))
+
+    def resolve(self, bars, tp, sl, is_long) -> np.ndarray:
+        """
+        Whether TP was touched before SL inside each parent bar
+
+        Args:
+            bars: Parent bar positions (in parent_index)
+            tp, sl: TP / SL price per bar
+            is_long: Direction per bar (bool array or scalar)
+
+        Returns:
+            bool array - True where TP came first
+        """
+        bars = np.atleast_1d(np.asarray(bars, dtype=np.int64))
+        n = len(bars)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        if self.width == 0:
+            self.stats['unresolved'] += n
+            return np.full(n, self.tie_break == 'tp')
+
+        tp = np.broadcast_to(np.asarray(tp, dtype=float), (n,))[:, None]
+        sl = np.broadcast_to(np.asarray(sl, dtype=float), (n,))[:, None]
+        is_long = np.broadcast_to(is_long, (n,))[:, None]
+
+        # Child windows, padded to the widest bar and masked past each bar's end
+        starts = self.starts[bars]
+        steps = np.arange(self.width)
+        valid = steps < (self.ends[bars] - starts)[:, None]
+        idx = np.minimum(starts[:, None] + steps, len(self.child_ns) - 1)
+        high, low = self.child_high[idx], self.child_low[idx]
+
+        tp_hit = valid & np.where(is_long, high >= tp, low <= tp)
+        sl_hit = valid & np.where(is_long, low <= sl, high >= sl)
+        first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), self.width)
+        first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), self.width)
+
+        # Same child (or no child touching either) → 1m data cannot decide
+        decided = first_tp != first_sl
+        tp_first = np.where(decided, first_tp < first_sl, self.tie_break == 'tp')
+
+        self.stats['resolved'] += int(decided.sum())
+        self.stats['unresolved'] += int(n - decided.sum())
+        self.stats['tp_first'] += int((decided & tp_first).sum())
+        self.stats['sl_first'] += int((decided & ~tp_first).sum())
+        return tp_first
+
+    def tp_first(self, bar: int, tp: float, sl: float, is_long: bool) -> bool:
+        """resolve() for a single bar (sequential backtest loops)"""
+        return bool(self.resolve([bar], [tp], [sl], is_long)[0])
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, coverage=self.coverage())
+
+    def print_stats(self):
+        """Print how the ambiguous bars were resolved"""
+        stats = self.get_stats()
+        total = stats['resolved'] + stats['unresolved']
+        print(f"   🔎 Intrabar: {total} ambiguous bars | {stats['resolved']} resolved from 1m "
+              f"({stats['tp_first']} TP first, {stats['sl_first']} SL first) | "
+              f"{stats['unresolved']} → {self.tie_break.upper()} | 1m coverage {stats['coverage']:.0%}")
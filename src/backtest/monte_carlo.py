@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Trade Resampling - Robustness Statistics
+
+One backtest gives one path. This module resamples the trade PnL table
+into many alternative paths and reports distributions instead of point
+estimates:
+- Resampling: iid bootstrap, circular block bootstrap (keeps streaks),
+  or shuffled trade order (same trades, different sequence)
+- All paths of a chunk are one (paths × trades) array operation
+- Final return, max drawdown, longest losing streak, risk of ruin
+- Leveraged sizing: equity × (1 + position_size × leverage × move),
+  a move past liquidation loses the whole margin
+- Deterministic: same seed → same numbers
+
+100k paths × a few hundred trades runs in seconds.
+"""
+
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Trade-dict keys holding the per-trade price move in % (first match wins)
+PNL_KEYS = ('pnl_pct', 'total_pnl_pct', 'profit_pct')
+
+
+def trade_returns(trades: Union[List[Dict], pd.DataFrame, Sequence[float]],
+                  column: str = None) -> np.ndarray:
+    """
+    Extract per-trade returns (fractions) from a trade table
+
+    Args:
+        trades: List of trade dicts, trades DataFrame, or returns in %
+        column: PnL column in % (default: first of PNL_KEYS present)
+
+    Returns:
+        1D float array of returns as fractions (1.5% → 0.015)
+    """
+    if isinstance(trades, pd.DataFrame):
+        column = column or next((key for key in PNL_KEYS if key in trades.columns), None)
+        if column is None:
+            raise ValueError(f"No PnL column found (expected one of {PNL_KEYS})")
+        values = trades[column].to_numpy(dtype=float)
+    elif len(trades) and isinstance(trades[0], dict):
+        column = column or next((key for key in PNL_KEYS if key in trades[0]), None)
+        if column is None:
+            raise ValueError(f"No PnL key found (expected one of {PNL_KEYS})")
+        values = np.array([trade[column] for trade in trades], dtype=float)
+    else:
+        values = np.asarray(trades, dtype=float)
+
+    return values[~np.isnan(values)] / 100
+
+
+def longest_run(mask: np.ndarray) -> np.ndarray:
+    """Longest run of consecutive True per row of a 2D bool array"""
+    counts = np.cumsum(mask, axis=1, dtype=np.int32)
+    # Count at the last False before each position → run length = counts - that
+    resets = np.maximum.accumulate(np.where(mask, 0, counts), axis=1)
+    return (counts - resets).max(axis=1) if mask.shape[1] else np.zeros(len(mask), dtype=np.int32)
+
+
+class MonteCarloSimulator:
+    """
+    Vectorized Monte Carlo resampling of trade sequences
+
+    Usage:
+        mc = MonteCarloSimulator(n_paths=100_000, method='block', seed=42)
+        output = mc.run(trades)              # list of dicts / DataFrame / % array
+        output['summary']['risk_of_ruin_pct']
+        output['paths']                      # one row per path
+    """
+
+    METHODS = ('bootstrap', 'block', 'shuffle')
+
+    def __init__(self,
+                 n_paths: int = 10000,
+                 method: str = 'bootstrap',
+                 block_size: int = 5,
+                 n_trades: int = None,
+                 position_size: float = 0.10,
+                 leverage: float = 25.0,
+                 leveraged_input: bool = False,
+                 ruin_threshold: float = 0.5,
+                 seed: int = 42,
+                 chunk_size: int = 20000):
+        """
+        Initialize simulator
+
+        Args:
+            n_paths: Number of resampled paths
+            method: 'bootstrap', 'block' (circular block bootstrap) or 'shuffle'
+            block_size: Trades per block for method='block'
+            n_trades: Trades per path (default: same as input; 'shuffle'
+                      always uses every trade once)
+            position_size: Fraction of equity committed as margin per trade
+            leverage: Leverage on the margin (25x → 4% adverse move = liquidation)
+            leveraged_input: Returns already include leverage (only
+                             position_size is applied)
+            ruin_threshold: Path is ruined once equity falls to this fraction
+                            of starting equity (0.5 → 50% drawdown from start)
+            seed: Random seed (deterministic for a given chunk_size)
+            chunk_size: Paths per array operation (bounds memory)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+
+        self.n_paths = n_paths
+        self.method = method
+        self.block_size = block_size
+        self.n_trades = n_trades
+        self.position_size = position_size
+        self.leverage = leverage
+        self.leveraged_input = leveraged_input
+        self.ruin_threshold = ruin_threshold
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def equity_multipliers(self, returns: np.ndarray) -> np.ndarray:
+        """Per-trade equity multiplier, loss capped at the committed margin"""
+        leverage = 1.0 if self.leveraged_input else self.leverage
+        return 1 + self.position_size * np.maximum(returns * leverage, -1.0)
+
+    def sample_indices(self, rng: np.random.Generator, n_paths: int, n_source: int,
+                       n_trades: int) -> np.ndarray:
+        """(paths × trades) indices into the source trade list"""
+        if self.method == 'shuffle':
+            return rng.permuted(np.tile(np.arange(n_source), (n_paths, 1)), axis=1)
+
+        if self.method == 'bootstrap':
+            return rng.integers(0, n_source, size=(n_paths, n_trades))
+
+        # Circular block bootstrap: random block starts, consecutive trades within
+        block = max(1, min(self.block_size, n_source))
+        n_blocks = -(-n_trades // block)
+        starts = rng.integers(0, n_source, size=(n_paths, n_blocks, 1))
+        indices = (starts + np.arange(block)) % n_source
+        return indices.reshape(n_paths, -1)[:, :n_trades]
+
+    def simulate_chunk(self, returns: np.ndarray, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Path statistics for one (paths × trades) index array"""
+        path_returns = returns[indices]
+        equity = np.cumprod(self.equity_multipliers(path_returns), axis=1)
+
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        max_drawdown = (1 - equity / peak).max(axis=1)
+        min_equity = np.minimum(equity.min(axis=1), 1.0)
+
+        return {
+            'final_return_pct': (equity[:, -1] - 1) * 100,
+            'max_drawdown_pct': max_drawdown * 100,
+            'longest_losing_streak': longest_run(path_returns < 0),
+            'min_equity_pct': min_equity * 100,
+            'ruined': min_equity <= self.ruin_threshold,
+        }
+
+    def run(self, trades: Union[List[Dict], pd.DataFrame, Sequence[float]],
+            column: str = None, verbose: bool = True) -> Dict:
+        """
+        Run the simulation
+
+        Args:
+            trades: Trade dicts, trades DataFrame, or per-trade returns in %
+                    (price move per trade, unleveraged unless leveraged_input)
+            column: PnL column in % (default: pnl_pct / total_pnl_pct / profit_pct)
+            verbose: Print summary
+
+        Returns:
+            dict with:
+                - paths: DataFrame, one row per path
+                - summary: dict of distribution statistics
+                - original: the same statistics for the actual trade order
+        """
+        returns = trade_returns(trades, column)
+        if len(returns) == 0:
+            raise ValueError("No trades to resample")
+
+        n_source = len(returns)
+        n_trades = n_source if self.method == 'shuffle' else (self.n_trades or n_source)
+
+        rng = np.random.default_rng(self.seed)
+        chunks = []
+        for start in range(0, self.n_paths, self.chunk_size):
+            n_paths = min(self.chunk_size, self.n_paths - start)
+            indices = self.sample_indices(rng, n_paths, n_source, n_trades)
+            chunks.append(self.simulate_chunk(returns, indices))
+
+        paths = pd.DataFrame({key: np.concatenate([chunk[key] for chunk in chunks])
+                              for key in chunks[0]})
+        original = {key: value[0].item()
+                    for key, value in self.simulate_chunk(returns, np.arange(n_source)[None, :]).items()}
+
+        summary = self.summarize(paths)
+        summary.update({'method': self.method, 'n_paths': self.n_paths,
+                        'n_trades': n_trades, 'leverage': self.leverage,
+                        'position_size': self.position_size})
+
+        if verbose:
+            self.print_summary(summary, original)
+
+        return {'paths': paths, 'summary': summary, 'original': original}
+
+    def summarize(self, paths: pd.DataFrame,
+                  percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict:
+        """Percentiles of each path statistic plus probabilities"""
+        summary = {}
+        for column in ('final_return_pct', 'max_drawdown_pct', 'longest_losing_streak'):
+            values = np.percentile(paths[column].to_numpy(), percentiles)
+            summary[column] = {f'p{int(p)}': float(v) for p, v in zip(percentiles, values)}
+            summary[column]['mean'] = float(paths[column].mean())
+
+        summary['prob_loss_pct'] = float((paths['final_return_pct'] < 0).mean() * 100)
+        summary['risk_of_ruin_pct'] = float(paths['ruined'].mean() * 100)
+        return summary
+
+    def print_summary(self, summary: Dict, original: Dict):
+        """Print distribution summary"""
+        print(f"\n🎲 Monte Carlo ({summary['method']}): {summary['n_paths']:,} paths × "
+              f"{summary['n_trades']} trades @ {summary['leverage']:g}x, "
+              f"{summary['position_size'] * 100:g}% size")
+
+        labels = {
+            'final_return_pct': ('Final return', '%'),
+            'max_drawdown_pct': ('Max drawdown', '%'),
+            'longest_losing_streak': ('Losing streak', ''),
+        }
+        for column, (label, unit) in labels.items():
+            stats = summary[column]
+            print(f"   {label:<14} p5 {stats['p5']:>9.2f}{unit} | p50 {stats['p50']:>9.2f}{unit} | "
+                  f"p95 {stats['p95']:>9.2f}{unit} | actual {original[column]:>9.2f}{unit}")
+
+        print(f"   Probability of loss: {summary['prob_loss_pct']:.2f}%")
+        print(f"   Risk of ruin (equity ≤ {self.ruin_threshold * 100:g}%): "
+              f"{summary['risk_of_ruin_pct']:.2f}%")
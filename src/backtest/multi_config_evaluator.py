@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Multi-Config Evaluator - Single-Pass Threshold Sweeps
+
+Evaluates C iteration configs over the same precomputed signal arrays at once:
+- Entry masks for all configs via broadcasting (bars × configs)
+- TP/SL first touch resolved once per bar with a shared vectorized routine
+- Time-based exits (max hold, signal reversal, compression breakdown) via
+  "next true index" lookups instead of per-bar loops
+- Non-overlapping trade chains walked for all configs in lockstep
+
+Reproduces backtest_harmonic_iterations.backtest_iteration exactly, so
+hundreds of threshold combinations run in roughly the time one took before.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Exit reason codes (index into EXIT_REASONS)
+EXIT_TP, EXIT_SL, EXIT_MAX_HOLD, EXIT_REVERSAL, EXIT_COMPRESSION = range(5)
+EXIT_REASONS = ['TP', 'SL', 'MAX_HOLD', 'SIGNAL_REVERSAL', 'COMPRESSION_BREAKDOWN']
+
+
+def first_touch(high: np.ndarray, low: np.ndarray, tp: np.ndarray, sl: np.ndarray,
+                is_long: np.ndarray, horizon: int, intrabar=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the first bar at which TP or SL is touched for an entry at every bar
+
+    For entry bar i the search covers bars i+1 .. i+horizon (entry candle is
+    never checked). TP wins when both levels are touched on the same bar,
+    matching the sequential backtesters, unless an intrabar resolver orders
+    them from 1m data.
+
+    Args:
+        high, low: Bar highs/lows (length N)
+        tp, sl: TP / SL price for an entry at each bar (length N)
+        is_long: Direction per entry bar (bool array or scalar)
+        horizon: Number of bars to search
+        intrabar: Optional IntrabarResolver aligned with these bars
+
+    Returns:
+        (offset, reason) - offset in 1..horizon, or horizon+1 if untouched;
+        reason is EXIT_TP or EXIT_SL (undefined when untouched)
+    """
+    n = len(high)
+    # NaN padding: comparisons are False past the end of data
+    pad = np.full(horizon, np.nan)
+    high_windows = sliding_window_view(np.concatenate([high[1:], pad, [np.nan]]), horizon)[:n]
+    low_windows = sliding_window_view(np.concatenate([low[1:], pad, [np.nan]]), horizon)[:n]
+
+    is_long = np.broadcast_to(is_long, (n,))[:, None]
+    tp_hit = np.where(is_long, high_windows >= tp[:, None], low_windows <= tp[:, None])
+    sl_hit = np.where(is_long, low_windows <= sl[:, None], high_windows >= sl[:, None])
+
+    no_touch = horizon + 1
+    first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1) + 1, no_touch)
+    first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1) + 1, no_touch)
+
+    offset = np.minimum(first_tp, first_sl)
+    reason = np.where(first_tp <= first_sl, EXIT_TP, EXIT_SL)
+
+    if intrabar is not None:
+        # Both levels first touched on the same bar → order them from 1m data
+        rows = np.flatnonzero((first_tp == first_sl) & (first_tp <= horizon))
+        if len(rows):
+            tp_first = intrabar.resolve(rows + first_tp[rows], tp[rows], sl[rows], is_long[rows, 0])
+            reason[rows] = np.where(tp_first, EXIT_TP, EXIT_SL)
+
+    return offset, reason
+
+
+def next_true_index(mask: np.ndarray) -> np.ndarray:
+    """
+    For every row j, the smallest row j' >= j where mask is True
+
+    Args:
+        mask: Boolean array (N,) or (N, C)
+
+    Returns:
+        int array of shape (N+1, ...) - row N and missing hits hold N
+    """
+    n = mask.shape[0]
+    rows = np.arange(n).reshape((n,) + (1,) * (mask.ndim - 1))
+    candidate = np.where(mask, rows, n)
+    out = np.full((n + 1,) + mask.shape[1:], n, dtype=np.int64)
+    out[:n] = np.minimum.accumulate(candidate[::-1], axis=0)[::-1]
+    return out
+
+
+class MultiConfigEvaluator:
+    """
+    Evaluate many harmonic iteration configs over shared signal arrays
+
+    Usage:
+        evaluator = MultiConfigEvaluator(max_hold=27, min_hold=3, sl_pct=0.0054)
+        results = evaluator.evaluate(signals, list_of_configs)
+    """
+
+    def __init__(
+        self,
+        lookback: int = 50,
+        max_hold: int = 27,
+        min_hold: int = 3,
+        sl_pct: float = 0.0054,
+        position_size: float = 0.09,
+        leverage: int = 27,
+        initial_capital: float = 10000.0,
+        volume_center: float = 0.54,
+        mtf_boost_threshold: float = 81,
+        mtf_boost: float = 1.18,
+        reversal_threshold: float = 0.27,
+        compression_breakdown: float = 45,
+        bar_minutes: int = 5,
+        chunk_size: int = 256
+    ):
+        """
+        Initialize evaluator (defaults mirror backtest_harmonic_iterations)
+
+        Args:
+            lookback: First bar eligible for entries
+            max_hold / min_hold: Holding period limits (candles)
+            sl_pct: Stop loss as price fraction; TP = SL × adaptive RR ratio
+            position_size: Fraction of capital per trade
+            leverage: Used only for the reported max risk per trade
+            initial_capital: Starting capital
+            volume_center: Volume momentum neutral level
+            mtf_boost_threshold / mtf_boost: MTF confluence signal boost
+            reversal_threshold: Enhanced signal level that closes a position
+            compression_breakdown: Compression level that closes a position
+            bar_minutes: Candle length (for average hold time)
+            chunk_size: Configs evaluated per block (bounds memory)
+        """
+        self.lookback = lookback
+        self.max_hold = max_hold
+        self.min_hold = min_hold
+        self.sl_pct = sl_pct
+        self.position_size = position_size
+        self.leverage = leverage
+        self.initial_capital = initial_capital
+        self.volume_center = volume_center
+        self.mtf_boost_threshold = mtf_boost_threshold
+        self.mtf_boost = mtf_boost
+        self.reversal_threshold = reversal_threshold
+        self.compression_breakdown = compression_breakdown
+        self.bar_minutes = bar_minutes
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def signals_from_analysis(analysis: Dict) -> Dict[str, np.ndarray]:
+        """
+        Extract the signal arrays from an analyze_ribbons_for_iteration() dict
+
+        Args:
+            analysis: Analysis dict (fourier_df, compression, alignment, ...)
+
+        Returns:
+            dict of float arrays keyed by signal name
+        """
+        base_df = analysis['fourier_df']
+        mtf = analysis.get('mtf_confluence', analysis['confluence'])
+        return {
+            'close': base_df['close'].to_numpy(dtype=float),
+            'high': base_df['high'].to_numpy(dtype=float),
+            'low': base_df['low'].to_numpy(dtype=float),
+            'composite': base_df['composite_signal'].to_numpy(dtype=float),
+            'compression': np.asarray(analysis['compression'], dtype=float),
+            'alignment': np.asarray(analysis['alignment'], dtype=float),
+            'confluence': np.asarray(analysis['confluence'], dtype=float),
+            'volume_momentum': np.asarray(analysis['volume_momentum'], dtype=float),
+            'fib_proximity': np.asarray(analysis['fib_proximity'], dtype=float),
+            'mtf_confluence': np.asarray(mtf, dtype=float),
+        }
+
+    def _touch_exits(self, signals: Dict[str, np.ndarray], intrabar=None) -> Dict[str, np.ndarray]:
+        """Config-independent TP/SL levels and first-touch offsets per direction"""
+        close = signals['close']
+        quality = (signals['compression'] + signals['alignment']) / 2
+        rr_ratio = np.select([quality >= 90, quality >= 85, quality >= 80],
+                             [4.0, 3.0, 2.0], default=1.5)
+        tp_pct = self.sl_pct * rr_ratio
+        horizon = max(self.max_hold, self.min_hold)
+
+        levels = {
+            'long_tp': close * (1 + tp_pct),
+            'long_sl': close * (1 - self.sl_pct),
+            'short_tp': close * (1 - tp_pct),
+            'short_sl': close * (1 + self.sl_pct),
+        }
+        levels['long_touch'], levels['long_reason'] = first_touch(
+            signals['high'], signals['low'], levels['long_tp'], levels['long_sl'], True, horizon, intrabar
+        )
+        levels['short_touch'], levels['short_reason'] = first_touch(
+            signals['high'], signals['low'], levels['short_tp'], levels['short_sl'], False, horizon, intrabar
+        )
+        return levels
+
+    def _evaluate_chunk(self, signals: Dict[str, np.ndarray], levels: Dict[str, np.ndarray],
+                        configs: List[Dict]) -> Dict[str, List]:
+        """Resolve all trades for one block of configs"""
+        n = len(signals['close'])
+        n_cfg = len(configs)
+        cfg = lambda key, default=0.0: np.array([c.get(key, default) for c in configs], dtype=float)
+        comp_t, align_t, conf_t = cfg('compression'), cfg('alignment'), cfg('confluence')
+        min_strength = cfg('min_signal_strength')
+        use_volume = cfg('use_volume_fft', False).astype(bool)
+        use_fib = cfg('use_fib_levels', False).astype(bool)
+        volume_weight, fib_weight = cfg('volume_weight'), cfg('fib_weight')
+
+        comp = signals['compression'][:, None]
+        align = signals['alignment'][:, None]
+        conf = signals['confluence'][:, None]
+
+        # Enhanced signal (bars × configs), same operation order as the loop
+        enhanced = np.repeat(signals['composite'][:, None], n_cfg, axis=1)
+        vol_boost = (signals['volume_momentum'][:, None] - self.volume_center) * volume_weight
+        enhanced = np.where(use_volume, enhanced + vol_boost, enhanced)
+        fib_boost = signals['fib_proximity'][:, None] * fib_weight
+        enhanced = np.where(use_fib, enhanced + fib_boost, enhanced)
+        boosted = (signals['mtf_confluence'] > self.mtf_boost_threshold)[:, None]
+        enhanced = np.where(boosted, enhanced * self.mtf_boost, enhanced)
+
+        # Entry masks for every config at once
+        base = (comp > comp_t) & (conf > conf_t)
+        enter_long = base & (align > align_t) & (enhanced > min_strength)
+        enter_short = base & (align < -align_t) & (enhanced < -min_strength)
+        enter_any = enter_long | enter_short
+        enter_any[:self.lookback] = False
+
+        # Time-based exits: first bar >= entry + min_hold meeting a condition
+        breakdown = (signals['compression'] < self.compression_breakdown)[:, None]
+        long_exit_cond = (enhanced < -self.reversal_threshold) | breakdown
+        short_exit_cond = (enhanced > self.reversal_threshold) | breakdown
+        bars = np.arange(n)[:, None]
+        first_check = np.minimum(bars + self.min_hold, n)
+        time_cap = bars + max(self.max_hold, self.min_hold)
+
+        time_long = np.minimum(np.take_along_axis(next_true_index(long_exit_cond),
+                                                  np.broadcast_to(first_check, (n, n_cfg)), axis=0),
+                               time_cap)
+        time_short = np.minimum(np.take_along_axis(next_true_index(short_exit_cond),
+                                                   np.broadcast_to(first_check, (n, n_cfg)), axis=0),
+                                time_cap)
+
+        time_exit = np.where(enter_long, time_long, time_short)
+        touch_exit = np.where(enter_long, bars + levels['long_touch'][:, None],
+                              bars + levels['short_touch'][:, None])
+        touched = touch_exit <= time_exit
+        exit_bar = np.where(touched, touch_exit, time_exit)
+
+        # Walk non-overlapping trade chains for all configs in lockstep
+        next_entry = next_true_index(enter_any)
+        cfg_idx = np.arange(n_cfg)
+        cur = next_entry[self.lookback].copy()
+        capital = np.full(n_cfg, self.initial_capital)
+        equity_peak = capital.copy()
+        max_dd = np.zeros(n_cfg)
+
+        trade_cfg, trade_entry, trade_exit, trade_pnl = [], [], [], []
+        active = cur < n
+        while active.any():
+            c = cfg_idx[active]
+            entry = cur[active]
+            exit_ = exit_bar[entry, c]
+            closed = exit_ < n  # open positions at end of data are not recorded
+            c, entry, exit_ = c[closed], entry[closed], exit_[closed]
+
+            pnl_pct = self._trade_pnl(signals, levels, entry, exit_, enter_long[entry, c],
+                                      touched[entry, c])
+            pnl = capital[c] * self.position_size * (pnl_pct / 100)
+            capital[c] += pnl
+            equity_peak[c] = np.maximum(equity_peak[c], capital[c])
+            max_dd[c] = np.minimum(max_dd[c], (capital[c] - equity_peak[c]) / equity_peak[c] * 100)
+
+            trade_cfg.append(c)
+            trade_entry.append(entry)
+            trade_exit.append(exit_)
+            trade_pnl.append(pnl_pct)
+
+            cur[:] = n
+            cur[c] = next_entry[np.minimum(exit_ + 1, n), c]
+            active = cur < n
+
+        concat = lambda parts, dtype: np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        trade_cfg = concat(trade_cfg, np.int64)
+        trade_entry = concat(trade_entry, np.int64)
+        trade_exit = concat(trade_exit, np.int64)
+
+        return {
+            'trade_cfg': trade_cfg,
+            'trade_entry': trade_entry,
+            'trade_exit': trade_exit,
+            'trade_pnl': concat(trade_pnl, float),
+            'trade_long': enter_long[trade_entry, trade_cfg],
+            'trade_touched': touched[trade_entry, trade_cfg],
+            'trade_enhanced': enhanced[trade_exit, trade_cfg],
+            'capital': capital,
+            'max_dd': max_dd,
+        }
+
+    def _trade_pnl(self, signals, levels, entry, exit_, is_long, touched) -> np.ndarray:
+        """PnL % per trade from entry close to TP/SL level or exit close"""
+        entry_price = signals['close'][entry]
+        exit_price = self._exit_price(signals, levels, entry, exit_, is_long, touched)
+        return np.where(is_long,
+                        (exit_price - entry_price) / entry_price * 100,
+                        (entry_price - exit_price) / entry_price * 100)
+
+    @staticmethod
+    def _exit_price(signals, levels, entry, exit_, is_long, touched) -> np.ndarray:
+        """TP/SL price for touch exits, close for time-based exits"""
+        reason = np.where(is_long, levels['long_reason'][entry], levels['short_reason'][entry])
+        tp = np.where(is_long, levels['long_tp'][entry], levels['short_tp'][entry])
+        sl = np.where(is_long, levels['long_sl'][entry], levels['short_sl'][entry])
+        touch_price = np.where(reason == EXIT_TP, tp, sl)
+        return np.where(touched, touch_price, signals['close'][exit_])
+
+    def _exit_reasons(self, signals, levels, chunk) -> np.ndarray:
+        """Exit reason code per trade"""
+        entry, exit_ = chunk['trade_entry'], chunk['trade_exit']
+        is_long = chunk['trade_long']
+        touch_reason = np.where(is_long, levels['long_reason'][entry], levels['short_reason'][entry])
+        reversal = np.where(is_long, chunk['trade_enhanced'] < -self.reversal_threshold,
+                            chunk['trade_enhanced'] > self.reversal_threshold)
+        time_reason = np.select([exit_ - entry >= self.max_hold, reversal],
+                                [EXIT_MAX_HOLD, EXIT_REVERSAL], default=EXIT_COMPRESSION)
+        return np.where(chunk['trade_touched'], touch_reason, time_reason)
+
+    def evaluate(self, signals: Dict[str, np.ndarray], configs: List[Dict],
+                 index: Optional[pd.Index] = None, return_trades: bool = False,
+                 intrabar=None) -> pd.DataFrame:
+        """
+        Evaluate every config over the signal arrays
+
+        Args:
+            signals: Arrays from signals_from_analysis()
+            configs: Iteration config dicts (compression, alignment, confluence,
+                     min_signal_strength, use_volume_fft, use_fib_levels,
+                     volume_weight, fib_weight; optional 'iteration', 'name')
+            index: Bar timestamps (for trade times and days tested)
+            return_trades: Attach per-config trade lists ('trades' column)
+            intrabar: Optional IntrabarResolver ordering same-bar TP/SL touches
+
+        Returns:
+            DataFrame with one row per config, same metric keys as
+            backtest_iteration (return_17d, sharpe, win_rate, max_dd, ...)
+        """
+        n = len(signals['close'])
+        if intrabar is not None and index is not None:
+            intrabar = intrabar.realign(index)
+        levels = self._touch_exits(signals, intrabar)
+        days = (index[-1] - index[0]).days if index is not None and n > 1 else max(n * self.bar_minutes // 1440, 1)
+
+        exposure = self.position_size * self.leverage
+        max_risk_pct = exposure * self.sl_pct * 100
+
+        rows = []
+        for start in range(0, len(configs), self.chunk_size):
+            block = configs[start:start + self.chunk_size]
+            chunk = self._evaluate_chunk(signals, levels, block)
+            reasons = self._exit_reasons(signals, levels, chunk)
+            order = np.argsort(chunk['trade_cfg'], kind='stable')
+            bounds = np.searchsorted(chunk['trade_cfg'][order], np.arange(len(block) + 1))
+
+            for j, config in enumerate(block):
+                sel = order[bounds[j]:bounds[j + 1]]
+                sel = sel[np.argsort(chunk['trade_entry'][sel], kind='stable')]
+                rows.append(self._config_row(start + j, config, signals, levels, chunk, reasons,
+                                             sel, days, max_risk_pct, index, return_trades))
+
+        return pd.DataFrame(rows)
+
+    def _config_row(self, position, config, signals, levels, chunk, reasons, sel, days,
+                    max_risk_pct, index, return_trades) -> Dict:
+        """Metrics dict for one config"""
+        j = position % self.chunk_size
+        thresholds = f"{config['compression']}/{config['alignment']}/{config['confluence']}"
+        row = {
+            'iteration': config.get('iteration', position),
+            'name': config.get('name', thresholds),
+            'thresholds': thresholds,
+        }
+
+        returns = chunk['trade_pnl'][sel]
+        if len(returns) == 0:
+            row.update({'return_17d': 0, 'monthly_projection': 0, 'sharpe': 0, 'win_rate': 0,
+                        'max_dd': 0, 'num_trades': 0, 'trades_per_day': 0,
+                        'max_risk_per_trade_pct': 0})
+            if return_trades:
+                row['trades'] = []
+            return row
+
+        total_return_pct = (chunk['capital'][j] - self.initial_capital) / self.initial_capital * 100
+        if len(returns) > 1 and returns.std() > 0:
+            sharpe = returns.mean() / returns.std() * np.sqrt(252)
+        else:
+            sharpe = 0
+
+        row.update({
+            'return_17d': total_return_pct,
+            'monthly_projection': total_return_pct * (30 / days),
+            'sharpe': sharpe,
+            'win_rate': (returns > 0).sum() / len(returns) * 100,
+            'max_dd': chunk['max_dd'][j],
+            'num_trades': len(returns),
+            'trades_per_day': len(returns) / days,
+            'max_risk_per_trade_pct': max_risk_pct,
+        })
+
+        if return_trades:
+            row['trades'] = self._trade_dicts(signals, levels, chunk, reasons, sel, index)
+
+        return row
+
+    def _trade_dicts(self, signals, levels, chunk, reasons, sel, index) -> List[Dict]:
+        """Trade log in backtest_iteration's format"""
+        entry, exit_ = chunk['trade_entry'][sel], chunk['trade_exit'][sel]
+        is_long = chunk['trade_long'][sel]
+        exit_price = self._exit_price(signals, levels, entry, exit_, is_long, chunk['trade_touched'][sel])
+        tp = np.where(is_long, levels['long_tp'][entry], levels['short_tp'][entry])
+        sl = np.where(is_long, levels['long_sl'][entry], levels['short_sl'][entry])
+        stamp = (lambda i: str(index[i])) if index is not None else (lambda i: int(i))
+
+        trades = []
+        capital = self.initial_capital
+        for k in range(len(sel)):
+            pnl_pct = chunk['trade_pnl'][sel[k]]
+            pnl = capital * self.position_size * (pnl_pct / 100)
+            capital += pnl
+            trades.append({
+                'entry_time': stamp(entry[k]),
+                'exit_time': stamp(exit_[k]),
+                'direction': 'LONG' if is_long[k] else 'SHORT',
+                'entry_price': float(signals['close'][entry[k]]),
+                'exit_price': float(exit_price[k]),
+                'tp_price': float(tp[k]),
+                'sl_price': float(sl[k]),
+                'pnl_pct': float(pnl_pct),
+                'pnl': float(pnl),
+                'holding_periods': int(exit_[k] - entry[k]),
+                'exit_reason': EXIT_REASONS[reasons[sel[k]]],
+                'total_pnl_pct': float(pnl_pct)
+            })
+        return trades
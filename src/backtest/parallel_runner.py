@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Parallel Iteration Runner - Shared-Memory Experiment Fan-Out
+
+Runs many iteration configs against the same datasets in a process pool:
+- Base OHLCV / ribbon arrays are published to shared memory ONCE
+- Workers attach zero-copy views instead of unpickling DataFrames per task
+- Results and trade logs are collected into single tables
+- Per-config wall time and speedup vs sequential are reported
+- run_batches() keeps one pool for batches that each bring their own
+  datasets (e.g. one per upstream stage of a grid search)
+
+The backtest callable must be a module-level function (picklable) with
+signature ``fn(config_id, config, frames) -> dict`` where ``frames`` maps
+dataset name → DataFrame. If the returned dict has a 'trades' list it is
+moved into the combined trade log.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Frames attached once per worker process (set by _init_worker)
+_WORKER_FRAMES: Dict[str, pd.DataFrame] = {}
+_WORKER_HANDLES: List[SharedMemory] = []
+
+# run_batches(): batch id → (frames, handles), most recently attached last
+_WORKER_BATCHES: Dict[int, Tuple[Dict[str, pd.DataFrame], List[SharedMemory]]] = {}
+WORKER_BATCH_CACHE = 2
+
+
+def _attach_block(name: str) -> SharedMemory:
+    """Attach to an existing block (pool workers share the owner's tracker)"""
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def share_frame(df: pd.DataFrame) -> Tuple[Dict, List[SharedMemory]]:
+    """
+    Publish a DataFrame's numeric columns to shared memory
+
+    Numeric columns go into one float64 (bars × columns) block, the index
+    into an int64 block. Non-numeric columns are small and travel with
+    the descriptor. Integer/bool columns are restored to their dtype on
+    attach.
+
+    Args:
+        df: DataFrame to share
+
+    Returns:
+        (descriptor, handles) - descriptor is picklable, handles must be
+        kept alive by the owner and released with release_frames()
+    """
+    numeric_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+    other_cols = [c for c in df.columns if c not in numeric_cols]
+
+    values = df[numeric_cols].to_numpy(dtype=np.float64)
+    values_shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=np.float64, buffer=values_shm.buf)[:] = values
+
+    handles = [values_shm]
+    descriptor = {
+        'values_name': values_shm.name,
+        'shape': values.shape,
+        'columns': numeric_cols,
+        'dtypes': {c: df[c].dtype.str for c in numeric_cols if df[c].dtype != np.float64},
+        'all_columns': list(df.columns),
+        'other': df[other_cols] if other_cols else None,
+        'index_name': df.index.name,
+        'index_kind': 'datetime' if isinstance(df.index, pd.DatetimeIndex) else 'plain',
+    }
+
+    if isinstance(df.index, pd.DatetimeIndex):
+        index_values = df.index.asi8
+        descriptor['index_tz'] = df.index.tz
+        descriptor['index_unit'] = getattr(df.index, 'unit', 'ns')
+    else:
+        index_values = df.index.to_numpy()
+        if not np.issubdtype(index_values.dtype, np.number):
+            descriptor['index_kind'] = 'pickled'
+            descriptor['index'] = df.index
+            return descriptor, handles
+
+    index_shm = SharedMemory(create=True, size=max(index_values.nbytes, 1))
+    np.ndarray(index_values.shape, dtype=index_values.dtype, buffer=index_shm.buf)[:] = index_values
+    handles.append(index_shm)
+    descriptor['index_name_shm'] = index_shm.name
+    descriptor['index_dtype'] = index_values.dtype.str
+    descriptor['index_len'] = len(index_values)
+
+    return descriptor, handles
+
+
+def attach_frame(descriptor: Dict) -> Tuple[pd.DataFrame, List[SharedMemory]]:
+    """
+    Rebuild a DataFrame from a share_frame() descriptor
+
+    Numeric columns are read-only views over the shared block (no copy).
+
+    Args:
+        descriptor: Descriptor from share_frame()
+
+    Returns:
+        (DataFrame, handles) - keep handles alive while the frame is used
+    """
+    values_shm = _attach_block(descriptor['values_name'])
+    values = np.ndarray(descriptor['shape'], dtype=np.float64, buffer=values_shm.buf)
+    values.flags.writeable = False
+    handles = [values_shm]
+
+    if descriptor['index_kind'] == 'pickled':
+        index = descriptor['index']
+    else:
+        index_shm = _attach_block(descriptor['index_name_shm'])
+        raw_index = np.ndarray((descriptor['index_len'],),
+                               dtype=np.dtype(descriptor['index_dtype']),
+                               buffer=index_shm.buf)
+        handles.append(index_shm)
+        if descriptor['index_kind'] == 'datetime':
+            index = pd.DatetimeIndex(raw_index.view(f"datetime64[{descriptor['index_unit']}]"))
+            if descriptor.get('index_tz') is not None:
+                index = index.tz_localize('UTC').tz_convert(descriptor['index_tz'])
+        else:
+            index = pd.Index(raw_index)
+    index = index.rename(descriptor['index_name'])
+
+    df = pd.DataFrame(values, index=index, columns=descriptor['columns'], copy=False)
+    for col, dtype in descriptor.get('dtypes', {}).items():
+        df[col] = df[col].to_numpy().astype(np.dtype(dtype))
+    if descriptor['other'] is not None:
+        for col in descriptor['other'].columns:
+            df[col] = descriptor['other'][col].to_numpy()
+        df = df[descriptor['all_columns']]
+
+    return df, handles
+
+
+def release_frames(handles: List[SharedMemory], unlink: bool = True):
+    """Close (and by default unlink) shared memory blocks"""
+    for shm in handles:
+        shm.close()
+        if unlink:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _init_worker(descriptors: Dict[str, Dict]):
+    """Process pool initializer: attach every shared dataset once"""
+    for name, descriptor in descriptors.items():
+        df, handles = attach_frame(descriptor)
+        _WORKER_FRAMES[name] = df
+        _WORKER_HANDLES.extend(handles)
+
+
+def _run_task(backtest_fn: Callable, config_id, config: Dict) -> Tuple[object, Dict, float]:
+    """Run one config against the worker's attached frames"""
+    start = time.perf_counter()
+    result = backtest_fn(config_id, config, _WORKER_FRAMES)
+    return config_id, result, time.perf_counter() - start
+
+
+def _run_batch_task(backtest_fn: Callable, batch_id: int, descriptors: Dict[str, Dict],
+                    config_id, config: Dict) -> Tuple[object, Dict, float]:
+    """Run one config against its batch's frames, attaching them on first use"""
+    if batch_id not in _WORKER_BATCHES:
+        while len(_WORKER_BATCHES) >= WORKER_BATCH_CACHE:
+            _, handles = _WORKER_BATCHES.pop(next(iter(_WORKER_BATCHES)))
+            try:
+                release_frames(handles, unlink=False)
+            except BufferError:
+                pass  # A view is still referenced; the mapping goes with the process
+        frames, handles = {}, []
+        for name, descriptor in descriptors.items():
+            frames[name], frame_handles = attach_frame(descriptor)
+            handles.extend(frame_handles)
+        _WORKER_BATCHES[batch_id] = (frames, handles)
+
+    start = time.perf_counter()
+    result = backtest_fn(config_id, config, _WORKER_BATCHES[batch_id][0])
+    return config_id, result, time.perf_counter() - start
+
+
+class ParallelIterationRunner:
+    """
+    Fan iteration configs out across a process pool with shared inputs
+
+    Usage:
+        runner = ParallelIterationRunner(backtest_fn, max_workers=8)
+        output = runner.run(ITERATIONS, {'5m': analysis_df})
+        output['results']   # one row per config
+        output['trades']    # combined trade log with 'config_id' column
+    """
+
+    def __init__(self, backtest_fn: Callable, max_workers: Optional[int] = None):
+        """
+        Initialize runner
+
+        Args:
+            backtest_fn: Module-level fn(config_id, config, frames) -> result dict
+            max_workers: Pool size (default: CPU count)
+        """
+        self.backtest_fn = backtest_fn
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run_sequential(self, configs: Dict, datasets: Dict[str, pd.DataFrame],
+                       on_result: Optional[Callable] = None) -> Dict:
+        """
+        Run every config in-process, one after another (reference path)
+
+        Args:
+            configs: Mapping config_id → config dict
+            datasets: Mapping dataset name → DataFrame
+            on_result: Optional fn(config_id, result) called as each config finishes
+
+        Returns:
+            Same structure as run()
+        """
+        start = time.perf_counter()
+        outputs = []
+        for config_id, config in configs.items():
+            task_start = time.perf_counter()
+            result = self.backtest_fn(config_id, config, datasets)
+            outputs.append((config_id, result, time.perf_counter() - task_start))
+            if on_result:
+                on_result(config_id, result)
+
+        return self._collect(configs, outputs, time.perf_counter() - start, mode='sequential')
+
+    def run(self, configs: Dict, datasets: Dict[str, pd.DataFrame],
+            compare_sequential: bool = False, on_result: Optional[Callable] = None,
+            verbose: bool = True) -> Dict:
+        """
+        Run every config in the process pool
+
+        Args:
+            configs: Mapping config_id → config dict
+            datasets: Mapping dataset name → DataFrame (shared once)
+            compare_sequential: Also time the sequential path and report
+                                measured (not estimated) speedup
+            on_result: Optional fn(config_id, result) called as each config
+                       finishes (e.g. to stream results to disk)
+            verbose: Print progress
+
+        Returns:
+            dict with:
+                - results: DataFrame, one row per config (+ wall_time_s)
+                - trades: DataFrame, combined trade log
+                - wall_time_s: total parallel wall time
+                - sequential_time_s: measured or summed per-config time
+                - speedup: sequential_time_s / wall_time_s
+        """
+        if verbose:
+            print(f"\n⚡ Parallel run: {len(configs)} configs × {len(datasets)} datasets "
+                  f"on {self.max_workers} workers")
+
+        descriptors = {}
+        handles = []
+        try:
+            share_start = time.perf_counter()
+            for name, df in datasets.items():
+                descriptors[name], frame_handles = share_frame(df)
+                handles.extend(frame_handles)
+            shared_mb = sum(shm.size for shm in handles) / 1e6
+            if verbose:
+                print(f"   📦 Shared {shared_mb:.1f} MB in "
+                      f"{time.perf_counter() - share_start:.3f}s")
+
+            start = time.perf_counter()
+            outputs = []
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(descriptors,)) as pool:
+                futures = [pool.submit(_run_task, self.backtest_fn, config_id, config)
+                           for config_id, config in configs.items()]
+                for future in as_completed(futures):
+                    config_id, result, elapsed = future.result()
+                    if verbose:
+                        print(f"   ✅ {config_id}: {elapsed:.2f}s")
+                    outputs.append((config_id, result, elapsed))
+                    if on_result:
+                        on_result(config_id, result)
+            wall_time = time.perf_counter() - start
+        finally:
+            release_frames(handles)
+
+        output = self._collect(configs, outputs, wall_time, mode='parallel')
+
+        if compare_sequential:
+            sequential = self.run_sequential(configs, datasets)
+            output['sequential_time_s'] = sequential['wall_time_s']
+            output['speedup'] = sequential['wall_time_s'] / max(wall_time, 1e-9)
+
+        if verbose:
+            print(f"\n⏱️  Wall time: {output['wall_time_s']:.2f}s | "
+                  f"Sequential: {output['sequential_time_s']:.2f}s"
+                  f"{'' if compare_sequential else ' (sum of per-config times)'} | "
+                  f"Speedup: {output['speedup']:.2f}x")
+
+        return output
+
+    def run_batches(self, batches: Iterable[Tuple[Dict, Dict[str, pd.DataFrame]]],
+                    on_result: Optional[Callable] = None,
+                    max_pending_batches: Optional[int] = None,
+                    verbose: bool = True) -> Dict:
+        """
+        Run batches of configs, each against its own datasets, in ONE process pool
+
+        Batches are pulled lazily, so the next batch's datasets can be built
+        in this process while workers run the previous ones. A batch's
+        datasets are shared when it is submitted and released once its last
+        config has finished.
+
+        Args:
+            batches: Iterable of (configs, datasets) pairs; config ids must be
+                     unique across batches
+            on_result: Optional fn(config_id, result) called as each config finishes
+            max_pending_batches: Batches shared at once (default: workers + 1)
+            verbose: Print progress
+
+        Returns:
+            Same structure as run(), over the configs of every batch
+        """
+        max_pending = max_pending_batches or self.max_workers + 1
+        if verbose:
+            print(f"\n⚡ Parallel run: batches on {self.max_workers} workers")
+
+        all_configs = {}
+        outputs = []
+        batch_handles = {}
+        remaining = {}
+        futures = {}
+
+        def collect(block: bool):
+            if block:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            else:
+                done = [future for future in futures if future.done()]
+            for future in done:
+                batch_id = futures.pop(future)
+                config_id, result, elapsed = future.result()
+                if verbose:
+                    print(f"   ✅ {config_id}: {elapsed:.2f}s")
+                outputs.append((config_id, result, elapsed))
+                if on_result:
+                    on_result(config_id, result)
+                remaining[batch_id] -= 1
+                if remaining[batch_id] == 0:
+                    del remaining[batch_id]
+                    release_frames(batch_handles.pop(batch_id))
+
+        start = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                for batch_id, (configs, datasets) in enumerate(batches):
+                    if not configs:
+                        continue
+                    while len(batch_handles) >= max_pending:
+                        collect(block=True)
+
+                    descriptors = {}
+                    batch_handles[batch_id] = []
+                    for name, df in datasets.items():
+                        descriptors[name], frame_handles = share_frame(df)
+                        batch_handles[batch_id].extend(frame_handles)
+
+                    remaining[batch_id] = len(configs)
+                    for config_id, config in configs.items():
+                        all_configs[config_id] = config
+                        future = pool.submit(_run_batch_task, self.backtest_fn, batch_id,
+                                             descriptors, config_id, config)
+                        futures[future] = batch_id
+                    collect(block=False)
+
+                while futures:
+                    collect(block=True)
+            wall_time = time.perf_counter() - start
+        finally:
+            for handles in batch_handles.values():
+                release_frames(handles)
+
+        output = self._collect(all_configs, outputs, wall_time, mode='parallel')
+
+        if verbose:
+            print(f"\n⏱️  Wall time: {output['wall_time_s']:.2f}s | "
+                  f"Sequential: {output['sequential_time_s']:.2f}s (sum of per-config times) | "
+                  f"Speedup: {output['speedup']:.2f}x")
+
+        return output
+
+    def _collect(self, configs: Dict, outputs: List[Tuple], wall_time: float,
+                 mode: str) -> Dict:
+        """Merge per-config results into one results table and one trade log"""
+        order = {config_id: i for i, config_id in enumerate(configs)}
+        outputs = sorted(outputs, key=lambda item: order[item[0]])
+
+        rows = []
+        trade_frames = []
+        for config_id, result, elapsed in outputs:
+            row = dict(result)
+            trades = row.pop('trades', None)
+            row['config_id'] = config_id
+            row['wall_time_s'] = elapsed
+            rows.append(row)
+            if trades:
+                trades_df = pd.DataFrame(trades)
+                trades_df.insert(0, 'config_id', config_id)
+                trade_frames.append(trades_df)
+
+        sequential_time = sum(elapsed for _, _, elapsed in outputs)
+
+        return {
+            'mode': mode,
+            'results': pd.DataFrame(rows),
+            'trades': pd.concat(trade_frames, ignore_index=True) if trade_frames else pd.DataFrame(),
+            'raw_results': {config_id: result for config_id, result, _ in outputs},
+            'wall_time_s': wall_time,
+            'sequential_time_s': sequential_time,
+            'speedup': sequential_time / max(wall_time, 1e-9),
+        }
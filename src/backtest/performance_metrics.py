@@ -8,14 +8,101 @@ Comprehensive comparison between:
 - Actual trades (live execution)
 
 Generates detailed metrics and insights for optimization
+
+Metrics run on a columnar trade table (trade_table), so 100k-trade tables
+from large sweeps cost array operations, not Python loops over dicts.
+Sums are taken left to right, so results match the old per-trade loops
+exactly.
 """
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 
+# Trade fields the metrics read
+TRADE_COLUMNS = ['entry_time', 'profit_pct', 'total_pnl_pct', 'mfe', 'mae', 'candles_held']
+
+Trades = Union[List[Dict], pd.DataFrame]
+
+
+def trade_table(trades: Optional[Trades]) -> pd.DataFrame:
+    """
+    Columnar view of a trade set
+
+    Args:
+        trades: List of trade dicts, or a DataFrame with one row per trade
+
+    Returns:
+        DataFrame with TRADE_COLUMNS (NaN where a trade lacks the field)
+    """
+    if isinstance(trades, pd.DataFrame):
+        table = trades.reindex(columns=TRADE_COLUMNS)
+    else:
+        table = pd.DataFrame.from_records(list(trades or []), columns=TRADE_COLUMNS)
+    for column in TRADE_COLUMNS[1:]:
+        if not pd.api.types.is_float_dtype(table[column]):
+            table[column] = pd.to_numeric(table[column], errors='coerce').astype(float)
+    return table
+
+
+def sequential_sum(values) -> float:
+    """Left-to-right sum (same rounding as the built-in sum(), unlike pairwise np.sum)"""
+    values = np.asarray(values, dtype=float)
+    return float(np.cumsum(values)[-1]) if len(values) else 0
+
+
+def _datetime_keys(keys: pd.Series) -> Optional[np.ndarray]:
+    """
+    Non-missing keys as UTC datetime64[ns] integers, or None if some are not dates
+
+    Timestamps, datetime64 values and date strings (in any mix) normalize
+    to the same instant; naive values are taken as UTC.
+    """
+    if pd.api.types.is_numeric_dtype(keys) or pd.api.types.is_bool_dtype(keys):
+        return None
+    try:
+        converted = pd.to_datetime(keys, errors='coerce', utc=True, format='mixed')
+    except (TypeError, ValueError):
+        return None
+    if converted.isna().any():
+        return None
+    return converted.dt.tz_localize(None).to_numpy(dtype='M8[ns]').view(np.int64)
+
+
+def _isin(values: pd.Series, pool: pd.Series) -> np.ndarray:
+    """
+    Membership of each value in pool (missing values → False)
+
+    Keys that are all dates (Timestamps, datetime64, strings, mixed) are
+    normalized to datetime64 and matched with searchsorted on the sorted
+    distinct pool; other keys with a hash join.
+
+    Args:
+        values: Keys to look up
+        pool: Keys to look up in
+
+    Returns:
+        bool array aligned with values
+    """
+    present = values.notna().to_numpy()
+    pool = pool.dropna()
+    if not present.any() or pool.empty:
+        return np.zeros(len(values), dtype=bool)
+
+    keys = _datetime_keys(values[present])
+    pool_keys = _datetime_keys(pool) if keys is not None else None
+    if pool_keys is not None:
+        sorted_pool = np.unique(pool_keys)
+        pos = np.searchsorted(sorted_pool, keys).clip(max=len(sorted_pool) - 1)
+        found = np.zeros(len(values), dtype=bool)
+        found[present] = sorted_pool[pos] == keys
+        return found
+
+    return present & values.isin(pool).to_numpy()
+
+
 class PerformanceMetrics:
     """
     Calculate comprehensive performance metrics and comparisons
@@ -27,9 +114,9 @@ class PerformanceMetrics:
 
     def compare_all_three(
         self,
-        optimal_trades: List[Dict],
-        backtest_trades: List[Dict],
-        actual_trades: List[Dict] = None
+        optimal_trades: Trades,
+        backtest_trades: Trades,
+        actual_trades: Trades = None
     ) -> Dict:
         """
         Complete 3-way comparison analysis
@@ -46,10 +133,16 @@ class PerformanceMetrics:
         print("COMPREHENSIVE 3-WAY PERFORMANCE COMPARISON")
         print("="*80)
 
+        # One columnar table per trade set, shared by every analysis below
+        has_actual = actual_trades is not None and len(actual_trades) > 0
+        optimal_trades = trade_table(optimal_trades)
+        backtest_trades = trade_table(backtest_trades)
+        actual_trades = trade_table(actual_trades) if has_actual else None
+
         # Calculate individual metrics
         optimal_metrics = self.calculate_trade_metrics(optimal_trades, "Optimal")
         backtest_metrics = self.calculate_trade_metrics(backtest_trades, "Backtest")
-        actual_metrics = self.calculate_trade_metrics(actual_trades, "Actual") if actual_trades else None
+        actual_metrics = self.calculate_trade_metrics(actual_trades, "Actual") if has_actual else None
 
         # Gap analysis
         optimal_backtest_gap = self.calculate_gap(optimal_metrics, backtest_metrics)
@@ -80,18 +173,18 @@ class PerformanceMetrics:
 
         return comparison
 
-    def calculate_trade_metrics(self, trades: List[Dict], label: str = "Trades") -> Dict:
+    def calculate_trade_metrics(self, trades: Trades, label: str = "Trades") -> Dict:
         """
         Calculate comprehensive metrics for a set of trades
 
         Args:
-            trades: List of trade dictionaries
+            trades: List of trade dictionaries (or a trade DataFrame)
             label: Label for this trade set
 
         Returns:
             dict with all metrics
         """
-        if not trades:
+        if trades is None or len(trades) == 0:
             return {
                 'label': label,
                 'count': 0,
@@ -106,48 +199,39 @@ class PerformanceMetrics:
                 'mae_avg': 0
             }
 
+        table = trade_table(trades)
+
         # Basic counts
-        count = len(trades)
-
-        # PnL calculations
-        pnls = []
-        for trade in trades:
-            if 'profit_pct' in trade:
-                pnls.append(trade['profit_pct'])
-            elif 'total_pnl_pct' in trade:
-                pnls.append(trade['total_pnl_pct'])
-            elif 'mfe' in trade:  # Optimal trades use MFE as realized profit
-                pnls.append(trade['mfe'])
-
-        total_pnl = sum(pnls)
+        count = len(table)
+
+        # PnL: profit_pct, else total_pnl_pct, else MFE (optimal trades use MFE as realized profit)
+        pnl = table['profit_pct'].fillna(table['total_pnl_pct']).fillna(table['mfe'])
+        pnls = pnl.dropna().to_numpy(dtype=float)
+
+        total_pnl = sequential_sum(pnls)
         avg_pnl = total_pnl / count if count > 0 else 0
 
         # Win rate
-        winners = [p for p in pnls if p > 0]
-        losers = [p for p in pnls if p <= 0]
+        winners = pnls[pnls > 0]
+        losers = pnls[pnls <= 0]
         win_rate = len(winners) / count * 100 if count > 0 else 0
 
         # Profit factor
-        gross_profit = sum(winners) if winners else 0
-        gross_loss = abs(sum(losers)) if losers else 0
+        gross_profit = sequential_sum(winners)
+        gross_loss = abs(sequential_sum(losers))
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else (float('inf') if gross_profit > 0 else 0)
 
         # Hold time
-        hold_times = []
-        for trade in trades:
-            if 'candles_held' in trade:
-                hold_times.append(trade['candles_held'])
-        avg_hold_time = np.mean(hold_times) if hold_times else 0
+        hold_times = table['candles_held'].dropna().to_numpy()
+        avg_hold_time = np.mean(hold_times) if len(hold_times) else 0
 
         # Max profit/loss
-        max_profit = max(pnls) if pnls else 0
-        max_loss = min(pnls) if pnls else 0
+        max_profit = pnls.max() if len(pnls) else 0
+        max_loss = pnls.min() if len(pnls) else 0
 
         # MFE/MAE
-        mfes = [trade.get('mfe', 0) for trade in trades]
-        maes = [trade.get('mae', 0) for trade in trades]
-        mfe_avg = np.mean(mfes) if mfes else 0
-        mae_avg = np.mean(maes) if maes else 0
+        mfe_avg = np.mean(table['mfe'].fillna(0).to_numpy())
+        mae_avg = np.mean(table['mae'].fillna(0).to_numpy())
 
         return {
             'label': label,
@@ -165,6 +249,40 @@ class PerformanceMetrics:
             'losers': len(losers)
         }
 
+    def monte_carlo(
+        self,
+        trades: List[Dict],
+        n_paths: int = 10000,
+        method: str = 'bootstrap',
+        leverage: float = 25.0,
+        position_size: float = 0.10,
+        seed: int = 42
+    ) -> Dict:
+        """
+        Robustness distributions for a trade set (see MonteCarloSimulator)
+
+        Args:
+            trades: Trade dicts with pnl_pct / total_pnl_pct / profit_pct
+            n_paths: Number of resampled paths
+            method: 'bootstrap', 'block' or 'shuffle'
+            leverage: Leverage applied to each trade's price move
+            position_size: Fraction of equity per trade
+            seed: Random seed
+
+        Returns:
+            dict with paths, summary, original
+        """
+        from .monte_carlo import MonteCarloSimulator
+
+        simulator = MonteCarloSimulator(
+            n_paths=n_paths,
+            method=method,
+            leverage=leverage,
+            position_size=position_size,
+            seed=seed
+        )
+        return simulator.run(trades)
+
     def calculate_gap(self, metrics1: Dict, metrics2: Dict) -> Dict:
         """
         Calculate performance gap between two metric sets
@@ -200,9 +318,9 @@ class PerformanceMetrics:
 
     def compare_entry_timing(
         self,
-        optimal_trades: List[Dict],
-        backtest_trades: List[Dict],
-        actual_trades: List[Dict] = None
+        optimal_trades: Trades,
+        backtest_trades: Trades,
+        actual_trades: Trades = None
     ) -> Dict:
         """
         Compare entry timing between trade sets
@@ -211,52 +329,45 @@ class PerformanceMetrics:
         - Missed entries (optimal but not taken)
         - False entries (taken but not optimal)
         - Perfect matches (same entry points)
-        - Early/late entries (close but different timing)
+
+        Entry times are matched with searchsorted against the other set's
+        sorted distinct entries.
         """
-        # Create entry timestamp sets
-        optimal_entries = set()
-        for trade in optimal_trades:
-            if 'entry_time' in trade:
-                optimal_entries.add(trade['entry_time'])
+        optimal = trade_table(optimal_trades)
+        backtest = trade_table(backtest_trades)
 
-        backtest_entries = set()
-        for trade in backtest_trades:
-            if 'entry_time' in trade:
-                backtest_entries.add(trade['entry_time'])
+        optimal_entries = optimal['entry_time'].dropna().drop_duplicates()
+        backtest_entries = backtest['entry_time'].dropna().drop_duplicates()
 
         # Calculate overlaps and misses
-        perfect_matches = optimal_entries & backtest_entries
-        missed_entries = optimal_entries - backtest_entries
-        false_entries = backtest_entries - optimal_entries
+        perfect_matches = int(_isin(optimal_entries, backtest_entries).sum())
+        missed_entries = len(optimal_entries) - perfect_matches
+        false_entries = len(backtest_entries) - perfect_matches
 
         # Calculate missed profit
-        missed_profit = sum(
-            trade.get('profit_pct', trade.get('mfe', 0))
-            for trade in optimal_trades
-            if trade.get('entry_time') in missed_entries
+        missed = optimal['entry_time'].notna().to_numpy() & ~_isin(optimal['entry_time'], backtest_entries)
+        missed_profit = sequential_sum(
+            optimal['profit_pct'].fillna(optimal['mfe']).fillna(0).to_numpy()[missed]
         )
 
         # Calculate false signal cost
-        false_cost = sum(
-            trade.get('total_pnl_pct', 0)
-            for trade in backtest_trades
-            if trade.get('entry_time') in false_entries
-        )
+        false = backtest['entry_time'].notna().to_numpy() & ~_isin(backtest['entry_time'], optimal_entries)
+        false_cost = sequential_sum(backtest['total_pnl_pct'].fillna(0).to_numpy()[false])
 
         return {
-            'perfect_matches': len(perfect_matches),
-            'missed_entries': len(missed_entries),
-            'false_entries': len(false_entries),
+            'perfect_matches': perfect_matches,
+            'missed_entries': missed_entries,
+            'false_entries': false_entries,
             'missed_profit': missed_profit,
             'false_cost': false_cost,
-            'match_rate': (len(perfect_matches) / len(optimal_entries) * 100) if optimal_entries else 0
+            'match_rate': (perfect_matches / len(optimal_entries) * 100) if len(optimal_entries) else 0
         }
 
     def compare_exit_quality(
         self,
-        optimal_trades: List[Dict],
-        backtest_trades: List[Dict],
-        actual_trades: List[Dict] = None
+        optimal_trades: Trades,
+        backtest_trades: Trades,
+        actual_trades: Trades = None
     ) -> Dict:
         """
         Compare exit quality
@@ -266,34 +377,23 @@ class PerformanceMetrics:
         - Late exits (held too long)
         - MFE capture rate (% of max profit captured)
         """
-        if not backtest_trades:
+        if backtest_trades is None or len(backtest_trades) == 0:
             return {}
 
-        # Calculate MFE capture for each backtest trade
-        mfe_captures = []
-        early_exits = 0
-        perfect_exits = 0
-
-        for trade in backtest_trades:
-            mfe = trade.get('mfe', 0)
-            realized = trade.get('total_pnl_pct', 0)
+        table = trade_table(backtest_trades)
+        mfe = table['mfe'].fillna(0).to_numpy(dtype=float)
+        realized = table['total_pnl_pct'].fillna(0).to_numpy(dtype=float)
 
-            if mfe > 0:
-                capture = (realized / mfe * 100)
-                mfe_captures.append(capture)
+        # MFE capture for each backtest trade with a positive MFE
+        has_mfe = mfe > 0
+        mfe_captures = realized[has_mfe] / mfe[has_mfe] * 100
+        early_exits = int((mfe_captures < 80).sum())  # Captured less than 80% of MFE
+        perfect_exits = int((mfe_captures >= 95).sum())  # Captured 95%+ of MFE
 
-                if capture < 80:  # Captured less than 80% of MFE
-                    early_exits += 1
-                elif capture >= 95:  # Captured 95%+ of MFE
-                    perfect_exits += 1
-
-        avg_mfe_capture = np.mean(mfe_captures) if mfe_captures else 0
+        avg_mfe_capture = np.mean(mfe_captures) if len(mfe_captures) else 0
 
         # Calculate profit left on table
-        profit_left = sum(
-            trade.get('mfe', 0) - trade.get('total_pnl_pct', 0)
-            for trade in backtest_trades
-        )
+        profit_left = sequential_sum(mfe - realized)
 
         return {
             'avg_mfe_capture': avg_mfe_capture,
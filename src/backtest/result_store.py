@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Backtest Result Store - Persistent Cache of (dataset, params) → results
+
+Every optimizer used to keep its own JSON/txt log and re-ran identical
+(dataset, params) backtests. This store keeps one SQLite table of runs:
+- Key: strategy name + fingerprint of the input data range + hash of the
+  canonical (sorted, JSON-normalized) parameter dict
+- Value: metrics (JSON + indexed columns for the common ones), trade
+  table and equity curve (compressed, loaded on demand)
+- Optimizers call cached()/get() before backtesting and put() after;
+  hits and misses are counted and reported
+- top() answers "top 20 by Sharpe with ≥30 trades" with an indexed query
+
+Trade tables and equity curves are pickled; only open store files you
+created yourself.
+"""
+
+import contextlib
+import hashlib
+import json
+import pickle
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_PATH = Path(__file__).parent.parent.parent / 'trading_data' / 'backtest_results.db'
+
+# Indexed metric columns → metric keys used by the different backtesters (first match wins)
+METRIC_COLUMNS = {
+    'sharpe': ('sharpe_ratio', 'sharpe'),
+    'total_return': ('total_return_pct', 'total_return', 'return_17d'),
+    'max_drawdown': ('max_drawdown_pct', 'max_drawdown', 'max_dd'),
+    'win_rate': ('win_rate_pct', 'win_rate'),
+    'num_trades': ('num_trades', 'total_trades'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    strategy TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    sharpe REAL,
+    total_return REAL,
+    max_drawdown REAL,
+    win_rate REAL,
+    num_trades INTEGER,
+    n_bars INTEGER,
+    start_time TEXT,
+    end_time TEXT,
+    trades BLOB,
+    equity BLOB,
+    source TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (strategy, data_hash, params_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_sharpe ON runs (strategy, sharpe);
+CREATE INDEX IF NOT EXISTS idx_runs_return ON runs (strategy, total_return);
+CREATE INDEX IF NOT EXISTS idx_runs_trades ON runs (num_trades);
+"""
+
+
+def _to_jsonable(value):
+    """numpy / pandas scalars and containers → plain JSON types"""
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _finite_or_none(value):
+    """Non-finite floats (inf profit factor, NaN ratios) → None, so SQLite's JSON functions can parse the row"""
+    if isinstance(value, dict):
+        return {k: _finite_or_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_finite_or_none(v) for v in value]
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def canonical_params(params: Dict) -> str:
+    """Canonical JSON of a parameter dict (sorted keys, numpy → Python, 3 == 3.0)"""
+    def normalize(value):
+        value = _to_jsonable(value)
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        return value
+
+    return json.dumps(normalize(params), sort_keys=True, default=str, separators=(',', ':'))
+
+
+def params_hash(params: Dict) -> str:
+    """Hash of the canonical parameter dict"""
+    return hashlib.sha1(canonical_params(params).encode()).hexdigest()
+
+
+def data_fingerprint(df: pd.DataFrame, start: int = None, end: int = None) -> str:
+    """
+    Hash of an input data range (index, columns and values)
+
+    Args:
+        df: Input DataFrame
+        start, end: Optional bar range [start, end)
+
+    Returns:
+        Hex digest; equal data → equal fingerprint
+    """
+    if start is not None or end is not None:
+        df = df.iloc[start:end]
+    digest = hashlib.sha1()
+    digest.update(repr((df.shape, list(map(str, df.columns)))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _pack(obj) -> Optional[bytes]:
+    """Compress a trade table / equity curve for storage"""
+    if obj is None or (hasattr(obj, '__len__') and len(obj) == 0):
+        return None
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _unpack(blob: Optional[bytes]):
+    """Inverse of _pack()"""
+    return pickle.loads(zlib.decompress(blob)) if blob is not None else None
+
+
+class ResultStore:
+    """
+    SQLite store of backtest results keyed by (strategy, data, params)
+
+    Usage:
+        store = ResultStore()
+        data_hash = data_fingerprint(df)
+        result = store.cached('fourier', data_hash, params,
+                              lambda: {'metrics': strategy.run(df)['metrics']})
+        store.top('sharpe', n=20, min_trades=30)
+        store.print_stats()
+    """
+
+    def __init__(self, path: Union[str, Path] = None):
+        """
+        Open (or create) a store
+
+        Args:
+            path: SQLite file (default: trading_data/backtest_results.db)
+        """
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Short-lived connection (commit on success, always closed)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _metric_columns(metrics: Dict) -> Dict:
+        """Indexed columns from a metrics dict"""
+        columns = {}
+        for column, keys in METRIC_COLUMNS.items():
+            value = next((metrics[k] for k in keys if k in metrics), None)
+            value = float(value) if value is not None and pd.notna(value) else None
+            columns[column] = value if value is not None and np.isfinite(value) else None
+        return columns
+
+    def get(self, strategy: str, data_hash: str, params: Dict,
+            load_artifacts: bool = False) -> Optional[Dict]:
+        """
+        Look up a run (counts a hit or a miss)
+
+        Args:
+            strategy: Backtester namespace ('fourier', 'backtest_engine', ...)
+            data_hash: data_fingerprint() of the input range
+            params: Parameter dict
+            load_artifacts: Also load trades and equity curve
+
+        Returns:
+            dict with metrics, source, created_at (+ trades, equity) or None
+        """
+        columns = 'metrics, source, created_at' + (', trades, equity' if load_artifacts else '')
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {columns} FROM runs WHERE strategy = ? AND data_hash = ? AND params_hash = ?",
+                (strategy, data_hash, params_hash(params))
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = {'metrics': json.loads(row['metrics']), 'source': row['source'],
+                  'created_at': row['created_at']}
+        if load_artifacts:
+            result['trades'] = _unpack(row['trades'])
+            result['equity'] = _unpack(row['equity'])
+        return result
+
+    def put(self, strategy: str, data_hash: str, params: Dict, metrics: Dict,
+            trades=None, equity=None, data_range: Tuple = None, source: str = None):
+        """
+        Insert or replace a run
+
+        Args:
+            strategy: Backtester namespace
+            data_hash: data_fingerprint() of the input range
+            params: Parameter dict
+            metrics: Metrics dict
+            trades: Trade list / DataFrame (optional)
+            equity: Equity curve (optional)
+            data_range: (n_bars, first timestamp, last timestamp) for queries
+            source: Script / optimizer that produced the run
+        """
+        metrics = _finite_or_none(_to_jsonable(metrics or {}))
+        n_bars, start_time, end_time = data_range or (None, None, None)
+        columns = self._metric_columns(metrics)
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO runs
+                   (strategy, data_hash, params_hash, params, metrics, sharpe, total_return,
+                    max_drawdown, win_rate, num_trades, n_bars, start_time, end_time,
+                    trades, equity, source, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (strategy, data_hash, params_hash(params), canonical_params(params),
+                 json.dumps(metrics, default=str, allow_nan=False), columns['sharpe'], columns['total_return'],
+                 columns['max_drawdown'], columns['win_rate'], columns['num_trades'],
+                 n_bars, str(start_time) if start_time is not None else None,
+                 str(end_time) if end_time is not None else None,
+                 _pack(trades), _pack(equity), source, datetime.now().isoformat())
+            )
+
+    def cached(self, strategy: str, data_hash: str, params: Dict, compute: Callable[[], Dict],
+               data_range: Tuple = None, source: str = None,
+               load_artifacts: bool = False) -> Dict:
+        """
+        Return the stored result or compute, store and return it
+
+        Args:
+            strategy, data_hash, params: Run key
+            compute: fn() -> dict with 'metrics' (+ optional 'trades', 'equity')
+            data_range, source: See put()
+            load_artifacts: Load trades/equity on a hit
+
+        Returns:
+            dict with metrics (+ trades, equity) and 'cached' (bool)
+        """
+        result = self.get(strategy, data_hash, params, load_artifacts=load_artifacts)
+        if result is not None:
+            return {**result, 'cached': True}
+
+        result = compute()
+        self.put(strategy, data_hash, params, result['metrics'], result.get('trades'),
+                 result.get('equity'), data_range, source)
+        return {**result, 'cached': False}
+
+    def top(self, metric: str = 'sharpe', n: int = 20, min_trades: int = 0,
+            strategy: str = None, data_hash: str = None, ascending: bool = False) -> pd.DataFrame:
+        """
+        Best runs by a metric
+
+        Args:
+            metric: Indexed column (sharpe, total_return, max_drawdown,
+                    win_rate, num_trades) or any key of the metrics JSON
+            n: Number of rows
+            min_trades: Minimum num_trades
+            strategy: Restrict to one backtester
+            data_hash: Restrict to one dataset
+            ascending: Lowest first
+
+        Returns:
+            DataFrame with strategy, params, the indexed metrics and metric
+        """
+        if metric in METRIC_COLUMNS:
+            expression, expression_args = metric, []
+        else:
+            expression, expression_args = "json_extract(metrics, ?)", [f'$.{metric}']
+
+        # The expression appears in SELECT and WHERE → its placeholder is bound twice
+        select_args = list(expression_args)
+        args = list(expression_args)
+        where = [f"{expression} IS NOT NULL"]
+        if min_trades:
+            where.append("num_trades >= ?")
+            args.append(min_trades)
+        if strategy:
+            where.append("strategy = ?")
+            args.append(strategy)
+        if data_hash:
+            where.append("data_hash = ?")
+            args.append(data_hash)
+
+        query = (f"SELECT id, strategy, data_hash, params, sharpe, total_return, max_drawdown, "
+                 f"win_rate, num_trades, n_bars, source, created_at, {expression} AS value "
+                 f"FROM runs WHERE {' AND '.join(where)} "
+                 f"ORDER BY value {'ASC' if ascending else 'DESC'} LIMIT ?")
+
+        with self._connect() as conn:
+            rows = conn.execute(query, select_args + args + [n]).fetchall()
+
+        table = pd.DataFrame([dict(row) for row in rows])
+        if not table.empty:
+            table['params'] = table['params'].map(json.loads)
+            table = table.rename(columns={'value': metric}) if metric not in METRIC_COLUMNS \
+                else table.drop(columns='value')
+        return table
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Hits / misses of this session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate_pct': self.hits / lookups * 100 if lookups else 0.0,
+            'stored_runs': len(self),
+        }
+
+    def print_stats(self):
+        """Print cache hits of this session"""
+        stats = self.stats()
+        print(f"🗄️  Result store: {stats['hits']} hits / {stats['misses']} misses "
+              f"({stats['hit_rate_pct']:.0f}% cached) | {stats['stored_runs']} runs in {self.path}")
+
+
+def data_range(df: pd.DataFrame) -> Tuple:
+    """(n_bars, first index, last index) of a DataFrame for ResultStore.put()"""
+    return (len(df), df.index[0], df.index[-1]) if len(df) else (0, None, None)
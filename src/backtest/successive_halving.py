@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Successive Halving / Hyperband - Budget-Aware Parameter Search
+
+A full grid backtests every parameter set on all the data, although most
+sets are obviously bad after a fraction of it. These drivers spend the
+budget (bars backtested) where it matters:
+- Successive halving: every config runs on a short slice, the best 1/eta
+  are promoted to an eta× longer slice, until the survivors run on the
+  full range
+- Hyperband: several successive-halving brackets with different
+  starting slice lengths (many configs on short slices ... few configs on
+  the full range), hedging against metrics that need long slices
+- Early stopping: a config whose drawdown exceeds max_drawdown on any
+  rung is dropped regardless of rank
+- Every rung fans out over a process pool (ParallelIterationRunner)
+- The budget used is logged against the full grid (configs × bars)
+- With a ResultStore, (slice, config) pairs evaluated before are reused
+
+Objectives map params → metrics on a data range:
+- Any picklable fn(df, params, start, end) -> metrics dict
+- Walk-forward targets (FourierStrategyTarget, BacktestEngineTarget or
+  anything with prepare / evaluate), wrapped by TargetObjective
+"""
+
+import contextlib
+import io
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .parallel_runner import ParallelIterationRunner
+from .result_store import data_fingerprint
+from .walk_forward import expand_grid
+
+
+# Metric keys holding the max drawdown in % (first match wins)
+DRAWDOWN_KEYS = ('max_drawdown_pct', 'max_drawdown', 'max_dd')
+
+
+def rung_schedule(n_configs: int, min_bars: int, max_bars: int, eta: int = 3) -> List[Tuple[int, int]]:
+    """
+    (configs, bars) per rung of one successive-halving bracket
+
+    Slices grow eta× per rung from min_bars and the last rung always runs
+    on max_bars; configs shrink to ceil(n / eta) per rung.
+
+    Args:
+        n_configs: Configs in the first rung
+        min_bars: Slice length of the first rung
+        max_bars: Slice length of the last rung
+        eta: Promotion factor
+
+    Returns:
+        List of (n_configs, bars) tuples
+    """
+    min_bars = min(min_bars, max_bars)
+    n_rungs = int(math.floor(math.log(max_bars / min_bars, eta) + 1e-9)) + 1
+
+    schedule = []
+    n = n_configs
+    for rung in range(n_rungs):
+        bars = max_bars if rung == n_rungs - 1 else int(min_bars * eta ** rung)
+        schedule.append((n, bars))
+        n = max(1, math.ceil(n / eta))
+    return schedule
+
+
+def as_configs(configs) -> Dict:
+    """Param grid, list of param dicts or {config_id: params} → {config_id: params}"""
+    if isinstance(configs, dict) and configs and all(isinstance(v, list) for v in configs.values()):
+        configs = expand_grid(configs)
+    return configs if isinstance(configs, dict) else dict(enumerate(configs))
+
+
+class TargetObjective:
+    """
+    Objective adapter for walk-forward targets
+
+    Runs target.prepare() on the slice itself, so a short rung really costs
+    a short backtest, then target.evaluate() over the whole slice.
+    """
+
+    def __init__(self, target):
+        """
+        Args:
+            target: FourierStrategyTarget, BacktestEngineTarget or any object
+                    with prepare / evaluate
+        """
+        self.target = target
+        self.default_metric = getattr(target, 'default_metric', None)
+        self.trades_key = getattr(target, 'trades_key', 'num_trades')
+        self.store_name = getattr(target, 'store_name', type(target).__name__)
+
+    def store_params(self, params: Dict) -> Dict:
+        """ResultStore key params (target settings included when the target exposes them)"""
+        store_params = getattr(self.target, 'store_params', None)
+        return store_params(params) if store_params else params
+
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Dataset-level preprocessing, run once before the search"""
+        prepare_data = getattr(self.target, 'prepare_data', None)
+        return prepare_data(df) if prepare_data else df
+
+    def __call__(self, df: pd.DataFrame, params: Dict, start: int, end: int) -> Dict:
+        """Metrics of params on bars [start, end)"""
+        window = df.iloc[start:end]
+        prepared = self.target.prepare(window, params)
+        return self.target.evaluate(prepared, 0, len(window))
+
+
+class _RungEvaluator:
+    """Picklable backtest_fn for ParallelIterationRunner: one config, one slice"""
+
+    def __init__(self, objective: Callable, start: int, end: int, quiet: bool = True):
+        self.objective = objective
+        self.start = start
+        self.end = end
+        self.quiet = quiet
+
+    def __call__(self, config_id, config: Dict, frames: Dict[str, pd.DataFrame]) -> Dict:
+        output = io.StringIO() if self.quiet else None
+        try:
+            with contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext():
+                metrics = dict(self.objective(frames['data'], config, self.start, self.end) or {})
+        except Exception as e:
+            return {'error': str(e)}
+        metrics.pop('trades', None)
+        return metrics
+
+
+class SuccessiveHalvingSearch:
+    """
+    Successive halving over a list of parameter sets
+
+    Usage:
+        search = SuccessiveHalvingSearch(FourierStrategyTarget(), eta=3,
+                                         min_bars=500, max_drawdown=20)
+        output = search.run(df, param_grid)
+        output['best_params'], output['budget']['saved_pct']
+    """
+
+    def __init__(self,
+                 objective,
+                 metric: Optional[str] = None,
+                 maximize: bool = True,
+                 eta: int = 3,
+                 min_bars: Optional[int] = None,
+                 max_bars: Optional[int] = None,
+                 min_trades: int = 1,
+                 trades_key: Optional[str] = None,
+                 max_drawdown: Optional[float] = None,
+                 drawdown_key: Optional[str] = None,
+                 anchor: str = 'end',
+                 max_workers: Optional[int] = None,
+                 store=None,
+                 store_name: Optional[str] = None):
+        """
+        Initialize search
+
+        Args:
+            objective: fn(df, params, start, end) -> metrics, or a walk-forward
+                       target (wrapped in TargetObjective)
+            metric: Metric to rank on (default: target.default_metric)
+            maximize: Higher metric is better
+            eta: Promotion factor (keep 1/eta per rung, slices grow eta×)
+            min_bars: First-rung slice length (default: max_bars / eta²)
+            max_bars: Final slice length (default: all bars)
+            min_trades: Configs with fewer trades on a rung are not promoted
+            trades_key: Trade-count metric (default: target.trades_key or num_trades)
+            max_drawdown: Early stop configs whose |drawdown| (%) exceeds this
+            drawdown_key: Drawdown metric (default: first of DRAWDOWN_KEYS present)
+            anchor: 'end' (slices end at the last bar, most recent data) or
+                    'start' (slices begin at bar 0)
+            max_workers: Process pool size (default: CPU count)
+            store: Optional ResultStore; (slice, config) pairs already in it
+                   are not re-evaluated
+            store_name: ResultStore namespace (default: target store_name or
+                        the objective's name)
+        """
+        if not callable(objective) or hasattr(objective, 'prepare'):
+            objective = TargetObjective(objective)
+        if anchor not in ('start', 'end'):
+            raise ValueError(f"anchor must be 'start' or 'end', got {anchor!r}")
+
+        self.objective = objective
+        self.metric = metric or getattr(objective, 'default_metric', None)
+        if self.metric is None:
+            raise ValueError("metric is required for plain objective functions")
+        self.maximize = maximize
+        self.eta = eta
+        self.min_bars = min_bars
+        self.max_bars = max_bars
+        self.min_trades = min_trades
+        self.trades_key = trades_key or getattr(objective, 'trades_key', 'num_trades')
+        self.max_drawdown = max_drawdown
+        self.drawdown_key = drawdown_key
+        self.anchor = anchor
+        self.max_workers = max_workers
+        self.store = store
+        self.store_name = store_name or getattr(objective, 'store_name', None) or \
+            getattr(objective, '__name__', type(objective).__name__)
+
+    def _store_params(self, params: Dict) -> Dict:
+        """ResultStore key params for a config"""
+        store_params = getattr(self.objective, 'store_params', None)
+        return store_params(params) if store_params else params
+
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Dataset-level preprocessing of the objective, if it has any"""
+        prepare_data = getattr(self.objective, 'prepare_data', None)
+        return prepare_data(df) if prepare_data else df
+
+    def bar_range(self, n_bars: int) -> Tuple[int, int]:
+        """(min_bars, max_bars) resolved against the dataset length"""
+        max_bars = min(self.max_bars or n_bars, n_bars)
+        min_bars = self.min_bars or max(1, max_bars // self.eta ** 2)
+        return min(min_bars, max_bars), max_bars
+
+    def slice_bounds(self, n_bars: int, bars: int) -> Tuple[int, int]:
+        """[start, end) of a slice of `bars` bars"""
+        return (n_bars - bars, n_bars) if self.anchor == 'end' else (0, bars)
+
+    def evaluate_rung(self, df: pd.DataFrame, configs: Dict, bars: int,
+                      parallel: bool = True) -> Dict:
+        """Metrics of every config on one slice length → {config_id: metrics}"""
+        start, end = self.slice_bounds(len(df), bars)
+
+        results = {}
+        pending = dict(configs)
+        if self.store is not None:
+            data_hash = data_fingerprint(df, start, end)
+            for config_id, config in configs.items():
+                stored = self.store.get(self.store_name, data_hash, self._store_params(config))
+                if stored is not None:
+                    results[config_id] = stored['metrics']
+                    del pending[config_id]
+
+        if pending:
+            runner = ParallelIterationRunner(_RungEvaluator(self.objective, start, end), self.max_workers)
+            if parallel and len(pending) > 1:
+                output = runner.run(pending, {'data': df}, verbose=False)
+            else:
+                output = runner.run_sequential(pending, {'data': df})
+            results.update(output['raw_results'])
+
+            if self.store is not None:
+                window = (end - start, df.index[start], df.index[end - 1])
+                for config_id in pending:
+                    if 'error' not in results[config_id]:
+                        self.store.put(self.store_name, data_hash, self._store_params(configs[config_id]),
+                                       results[config_id], data_range=window, source='successive_halving')
+
+        return {config_id: results[config_id] for config_id in configs}
+
+    def _drawdown(self, metrics: Dict) -> Optional[float]:
+        """|max drawdown| in %, if the objective reports one"""
+        key = self.drawdown_key or next((k for k in DRAWDOWN_KEYS if k in metrics), None)
+        value = metrics.get(key) if key else None
+        return abs(value) if value is not None and pd.notna(value) else None
+
+    def rank(self, results: Dict, n_keep: int) -> Tuple[List, Dict]:
+        """
+        Promote the best n_keep configs of a rung
+
+        Returns:
+            (promoted config_ids, {config_id: status}) with status 'promoted',
+            'eliminated', 'stopped_drawdown', 'too_few_trades' or 'error'
+        """
+        status = {}
+        candidates = []
+        for config_id, metrics in results.items():
+            value = metrics.get(self.metric)
+            drawdown = self._drawdown(metrics)
+            if 'error' in metrics or value is None or pd.isna(value):
+                status[config_id] = 'error'
+            elif self.max_drawdown is not None and drawdown is not None and drawdown > self.max_drawdown:
+                status[config_id] = 'stopped_drawdown'
+            elif metrics.get(self.trades_key, 0) < self.min_trades:
+                status[config_id] = 'too_few_trades'
+            else:
+                candidates.append((value, config_id))
+
+        # Stable sort → ties keep config order
+        candidates.sort(key=lambda item: -item[0] if self.maximize else item[0])
+        promoted = [config_id for _, config_id in candidates[:n_keep]]
+        for _, config_id in candidates:
+            status[config_id] = 'promoted' if config_id in promoted else 'eliminated'
+        return promoted, status
+
+    def run_bracket(self, df: pd.DataFrame, configs: Dict, min_bars: int, max_bars: int,
+                    parallel: bool = True, verbose: bool = True, bracket: int = 0) -> Dict:
+        """
+        One successive-halving bracket on an already prepared dataset
+
+        Returns:
+            dict with history (DataFrame, one row per config × rung), survivors
+            (config_ids scored on the final rung), final (their metrics) and
+            budget_bars (bars backtested)
+        """
+        schedule = rung_schedule(len(configs), min_bars, max_bars, self.eta)
+        alive = list(configs.keys())
+        rows = []
+        budget = 0
+        final = {}
+
+        for rung, (_, bars) in enumerate(schedule):
+            last = rung == len(schedule) - 1
+            rung_start = time.perf_counter()
+            results = self.evaluate_rung(df, {config_id: configs[config_id] for config_id in alive},
+                                         bars, parallel)
+            budget += len(alive) * bars
+
+            n_keep = len(alive) if last else max(1, math.ceil(len(alive) / self.eta))
+            promoted, status = self.rank(results, n_keep)
+
+            for config_id in alive:
+                rows.append({'bracket': bracket, 'rung': rung, 'bars': bars, 'config_id': config_id,
+                             'status': ('final' if last and status[config_id] == 'promoted'
+                                        else status[config_id]),
+                             **results[config_id]})
+
+            if verbose:
+                stopped = sum(1 for s in status.values() if s == 'stopped_drawdown')
+                errors = sum(1 for s in status.values() if s == 'error')
+                best = results[promoted[0]].get(self.metric) if promoted else float('nan')
+                print(f"   Rung {rung}: {len(alive):>4} configs × {bars:>6} bars → "
+                      f"{'final' if last else f'{len(promoted)} promoted'}"
+                      f"{f', {stopped} stopped (drawdown)' if stopped else ''}"
+                      f"{f', {errors} errors' if errors else ''} | "
+                      f"best {self.metric} {best:+.3f} | {time.perf_counter() - rung_start:.1f}s")
+
+            if last:
+                final = {config_id: results[config_id] for config_id in promoted}
+            alive = promoted
+            if not alive:
+                break
+
+        return {'history': pd.DataFrame(rows), 'survivors': list(final.keys()),
+                'final': final, 'budget_bars': budget}
+
+    def budget_report(self, budget_bars: int, n_configs: int, max_bars: int) -> Dict:
+        """Bars backtested vs a full grid (every config on max_bars)"""
+        full = n_configs * max_bars
+        return {
+            'budget_bars': int(budget_bars),
+            'full_grid_bars': int(full),
+            'saved_pct': float((1 - budget_bars / full) * 100) if full else 0.0,
+        }
+
+    def _best(self, final: Dict, configs: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Best (params, metrics) among configs scored on the full range"""
+        if not final:
+            return None, None
+        pick = max if self.maximize else min
+        config_id = pick(final, key=lambda c: final[c][self.metric])
+        return configs[config_id], final[config_id]
+
+    def run(self, df: pd.DataFrame, configs, parallel: bool = True, verbose: bool = True) -> Dict:
+        """
+        Run successive halving
+
+        Args:
+            df: Dataset (full series)
+            configs: Param grid (mapping parameter → values), list of param
+                     dicts, or mapping config_id → params
+            parallel: Use the process pool per rung
+            verbose: Print rung progress and the budget
+
+        Returns:
+            dict with best_params, best_metrics, history (DataFrame),
+            budget (bars used / full grid / saved %) and wall_time_s
+        """
+        start = time.perf_counter()
+        df = self.prepare_data(df)
+        configs = as_configs(configs)
+        min_bars, max_bars = self.bar_range(len(df))
+
+        if verbose:
+            print(f"\n✂️  Successive halving: {len(configs)} configs, "
+                  f"{min_bars} → {max_bars} bars, eta={self.eta}")
+
+        bracket = self.run_bracket(df, configs, min_bars, max_bars, parallel, verbose)
+        best_params, best_metrics = self._best(bracket['final'], configs)
+        budget = self.budget_report(bracket['budget_bars'], len(configs), max_bars)
+
+        if verbose:
+            self.print_summary(best_params, best_metrics, budget)
+
+        return {
+            'best_params': best_params,
+            'best_metrics': best_metrics,
+            'history': bracket['history'],
+            'budget': budget,
+            'wall_time_s': time.perf_counter() - start,
+        }
+
+    def print_summary(self, best_params: Optional[Dict], best_metrics: Optional[Dict], budget: Dict):
+        """Print winner and budget saved"""
+        print(f"\n💰 Budget: {budget['budget_bars']:,} bars backtested vs "
+              f"{budget['full_grid_bars']:,} for the full grid ({budget['saved_pct']:.1f}% saved)")
+        if self.store is not None:
+            self.store.print_stats()
+        if best_params is None:
+            print("   ⚠️  No config survived to the full range")
+            return
+        print(f"🏆 Best {self.metric}: {best_metrics[self.metric]:+.3f} | {best_params}")
+
+
+class HyperbandSearch(SuccessiveHalvingSearch):
+    """
+    Hyperband: successive-halving brackets with different first-rung lengths
+
+    Bracket s starts n_grid × (s_max + 1) / (s + 1) / eta^(s_max - s)
+    configs (sampled from the grid) on max_bars / eta^s bars: the most
+    aggressive bracket screens the whole grid on the shortest slices, the
+    last runs a few configs on the full range only. With n_grid = eta^s_max
+    this is the standard Hyperband schedule. Every bracket ends on the full
+    range, so their finalists compare directly.
+
+    The hedging costs budget: total ≈ (s_max + 1)² / eta^s_max full grids,
+    so with fewer than 4 brackets (max_bars / min_bars < eta³) Hyperband can
+    cost as much as the grid itself - use SuccessiveHalvingSearch there.
+
+    Usage:
+        search = HyperbandSearch(FourierStrategyTarget(), min_bars=300, max_drawdown=25)
+        output = search.run(df, {'n_harmonics': [3, 5, 7], 'min_signal_strength': [0.3, 0.4, 0.5]})
+    """
+
+    def __init__(self, objective, seed: int = 42, **kwargs):
+        """
+        Args:
+            objective: See SuccessiveHalvingSearch
+            seed: Config sampling seed (deterministic brackets)
+            **kwargs: SuccessiveHalvingSearch options (metric, eta, min_bars,
+                      max_bars, max_drawdown, ...)
+        """
+        super().__init__(objective, **kwargs)
+        self.seed = seed
+
+    def brackets(self, n_grid: int, min_bars: int, max_bars: int) -> List[Tuple[int, int]]:
+        """(configs, first-rung bars) per bracket, most aggressive first"""
+        s_max = int(math.floor(math.log(max_bars / min_bars, self.eta) + 1e-9))
+        brackets = []
+        for s in range(s_max, -1, -1):
+            n = math.ceil(n_grid * (s_max + 1) / (s + 1) / self.eta ** (s_max - s))
+            brackets.append((max(1, min(n, n_grid)), max(min_bars, int(max_bars / self.eta ** s))))
+        return brackets
+
+    def run(self, df: pd.DataFrame, configs, parallel: bool = True, verbose: bool = True) -> Dict:
+        """
+        Run every Hyperband bracket
+
+        Args:
+            df: Dataset (full series)
+            configs: Param grid (mapping parameter → values), list of param
+                     dicts, or mapping config_id → params
+            parallel: Use the process pool per rung
+            verbose: Print bracket/rung progress and the budget
+
+        Returns:
+            Same structure as SuccessiveHalvingSearch.run()
+        """
+        start = time.perf_counter()
+        df = self.prepare_data(df)
+        configs = as_configs(configs)
+        config_ids = list(configs.keys())
+        min_bars, max_bars = self.bar_range(len(df))
+        brackets = self.brackets(len(configs), min_bars, max_bars)
+
+        if verbose:
+            print(f"\n✂️  Hyperband: {len(configs)} configs, {len(brackets)} brackets, "
+                  f"{min_bars} → {max_bars} bars, eta={self.eta}")
+
+        rng = np.random.default_rng(self.seed)
+        histories = []
+        final = {}
+        budget_bars = 0
+        for bracket, (n, bars) in enumerate(brackets):
+            picks = sorted(rng.choice(len(config_ids), size=n, replace=False))
+            sampled = {config_ids[i]: configs[config_ids[i]] for i in picks}
+            if verbose:
+                print(f"\n   Bracket {bracket}: {n} configs from {bars} bars")
+            output = self.run_bracket(df, sampled, bars, max_bars, parallel, verbose, bracket)
+            histories.append(output['history'])
+            final.update(output['final'])
+            budget_bars += output['budget_bars']
+
+        best_params, best_metrics = self._best(final, configs)
+        budget = self.budget_report(budget_bars, len(configs), max_bars)
+
+        if verbose:
+            self.print_summary(best_params, best_metrics, budget)
+
+        return {
+            'best_params': best_params,
+            'best_metrics': best_metrics,
+            'history': pd.concat(histories, ignore_index=True) if histories else pd.DataFrame(),
+            'budget': budget,
+            'wall_time_s': time.perf_counter() - start,
+        }
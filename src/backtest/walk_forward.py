@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Optimization - Out-of-Sample Parameter Search
+
+Splits a dataset into rolling or anchored train/test folds, searches the
+parameter grid on every train fold and scores the winner on the following
+test fold:
+- Indicators/signals are computed ONCE per parameter set over the full
+  series, then every fold is backtested on its slice
+- Parameter sets fan out over a process pool (ParallelIterationRunner,
+  data shared once)
+- Stability across folds: out-of-sample mean/std, positive folds,
+  walk-forward efficiency, parameter consistency
+
+Targets plug the framework into a backtester:
+- FourierStrategyTarget → fourier_strategy.FourierTradingStrategy
+- BacktestEngineTarget → BacktestEngine + EntryDetector/ExitManager
+"""
+
+import contextlib
+import copy
+import io
+from collections import Counter
+from itertools import product
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import BacktestEngine
+from .parallel_runner import ParallelIterationRunner
+
+
+def make_folds(n_bars: int,
+               n_folds: int = 5,
+               train_bars: Optional[int] = None,
+               test_bars: Optional[int] = None,
+               anchored: bool = False) -> List[Dict]:
+    """
+    Split bar positions into consecutive train/test folds
+
+    Test windows tile the data after the first train window. Rolling folds
+    keep a fixed-length train window right before each test window; anchored
+    folds always train from bar 0.
+
+    Args:
+        n_bars: Number of bars in the dataset
+        n_folds: Number of folds
+        train_bars: Train window length (default: n_bars / (n_folds + 1))
+        test_bars: Test window length (default: remaining bars / n_folds)
+        anchored: Expanding train window starting at bar 0
+
+    Returns:
+        List of dicts with fold, train_start, train_end, test_start, test_end
+        (end exclusive)
+    """
+    if train_bars is None:
+        train_bars = n_bars // (n_folds + 1)
+    if test_bars is None:
+        test_bars = (n_bars - train_bars) // n_folds
+
+    if train_bars <= 0 or test_bars <= 0 or train_bars + n_folds * test_bars > n_bars:
+        raise ValueError(f"Cannot fit {n_folds} folds (train={train_bars}, test={test_bars}) "
+                         f"into {n_bars} bars")
+
+    folds = []
+    for fold in range(n_folds):
+        test_start = train_bars + fold * test_bars
+        folds.append({
+            'fold': fold,
+            'train_start': 0 if anchored else test_start - train_bars,
+            'train_end': test_start,
+            'test_start': test_start,
+            'test_end': test_start + test_bars,
+        })
+    return folds
+
+
+def expand_grid(param_grid: Dict[str, List]) -> List[Dict]:
+    """All parameter combinations of a grid, in itertools.product order"""
+    names = list(param_grid.keys())
+    return [dict(zip(names, combo)) for combo in product(*param_grid.values())]
+
+
+def _strategy_class(module: str, name: str):
+    """Import a strategy class whether src/ or the repo root is on sys.path"""
+    import importlib
+
+    try:
+        return getattr(importlib.import_module(f'src.strategy.{module}'), name)
+    except ImportError:
+        return getattr(importlib.import_module(f'strategy.{module}'), name)
+
+
+# Position size FourierTradingStrategy.run() backtests with
+FOURIER_POSITION_SIZE = 0.25
+
+
+def fourier_store_params(params: Dict, position_size: float = FOURIER_POSITION_SIZE) -> Dict:
+    """
+    ResultStore key params of a FourierTradingStrategy backtest
+
+    Every optimizer that stores 'fourier' runs keys them through this, so a
+    run recorded by one (grid search, walk-forward, successive halving,
+    iterative optimizer) is found by the others.
+
+    Args:
+        params: Full FourierTradingStrategy kwargs
+        position_size: Fraction of capital per trade
+
+    Returns:
+        Params with position_size
+    """
+    return {**params, 'position_size': position_size}
+
+
+class FourierStrategyTarget:
+    """
+    Walk-forward target for FourierTradingStrategy
+
+    prepare() runs the full pipeline (Fourier filters, EMAs, indicators,
+    signals) once per parameter set; evaluate() backtests one fold slice.
+    """
+
+    default_metric = 'sharpe_ratio'
+    trades_key = 'num_trades'
+    store_name = 'fourier'
+
+    def __init__(self, base_params: Dict = None, position_size: float = FOURIER_POSITION_SIZE):
+        """
+        Args:
+            base_params: FourierTradingStrategy kwargs shared by every config
+            position_size: Fraction of capital per trade
+        """
+        self.base_params = base_params or {}
+        self.position_size = position_size
+
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Dataset-level preprocessing (none needed)"""
+        return df
+
+    def prepare(self, df: pd.DataFrame, params: Dict):
+        """Run the strategy once over the full series"""
+        from fourier_strategy import FourierTradingStrategy
+
+        strategy = FourierTradingStrategy(**{**self.base_params, **params})
+        strategy.run(df, run_backtest=False, verbose=False)
+        return strategy
+
+    def evaluate(self, prepared, start: int, end: int) -> Dict:
+        """Backtest bars [start, end)"""
+        return prepared.backtest_window(start, end, position_size=self.position_size)['metrics']
+
+    def store_params(self, params: Dict) -> Dict:
+        """Everything that determines a result, for the ResultStore key"""
+        return fourier_store_params({**self.base_params, **params}, self.position_size)
+
+
+class BacktestEngineTarget:
+    """
+    Walk-forward target for BacktestEngine (EntryDetector + ExitManager)
+
+    Ribbon analysis runs once per dataset; the entry scan runs once per
+    parameter set over the full series (it only looks back, so slices stay
+    causal); each fold simulates its slice with a fresh engine.
+
+    Params are strategy_params.json keys, either flat ('min_confidence',
+    looked up in entry_filters / ribbon_settings / exit_strategy) or dotted
+    ('exit_strategy.take_profit_pct'). They are applied in memory only.
+    """
+
+    default_metric = 'total_return'
+    trades_key = 'total_trades'
+    store_name = 'backtest_engine'
+
+    SECTIONS = ('entry_filters', 'ribbon_settings', 'exit_strategy')
+
+    def __init__(self, engine_kwargs: Dict = None, params_file: str = None):
+        """
+        Args:
+            engine_kwargs: BacktestEngine kwargs (capital, commission, ...)
+            params_file: Base strategy_params.json (default: detector default)
+        """
+        self.engine_kwargs = engine_kwargs or {}
+        self.params_file = params_file
+
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add ribbon analysis once if the indicator file lacks it"""
+        if 'compression_score' not in df.columns:
+            RibbonAnalyzer = _strategy_class('ribbon_analyzer', 'RibbonAnalyzer')
+            df = RibbonAnalyzer().analyze_all(df)
+        return df
+
+    def apply_params(self, params_dict: Dict, params: Dict) -> Dict:
+        """Return a copy of a strategy params dict with overrides applied"""
+        updated = copy.deepcopy(params_dict)
+        for key, value in params.items():
+            if '.' in key:
+                section, name = key.split('.', 1)
+                updated[section][name] = value
+                continue
+            for section in self.SECTIONS:
+                if key in updated.get(section, {}):
+                    updated[section][key] = value
+                    break
+            else:
+                raise KeyError(f"Unknown strategy parameter: {key}")
+        return updated
+
+    def prepare(self, df: pd.DataFrame, params: Dict):
+        """Scan entry signals once over the full series"""
+        EntryDetector = _strategy_class('entry_detector', 'EntryDetector')
+        ExitManager = _strategy_class('exit_manager', 'ExitManager')
+
+        entry_detector = EntryDetector(self.params_file)
+        exit_manager = ExitManager(self.params_file)
+
+        strategy_params = self.apply_params(entry_detector.params, params)
+        entry_detector.params = strategy_params
+        entry_detector.entry_filters = strategy_params['entry_filters']
+        entry_detector.ribbon_settings = strategy_params['ribbon_settings']
+        exit_manager.params = strategy_params
+        exit_manager.exit_strategy = strategy_params['exit_strategy']
+
+        signals_df = entry_detector.scan_historical_signals(df.copy())
+        return signals_df, exit_manager
+
+    def evaluate(self, prepared, start: int, end: int) -> Dict:
+        """Simulate bars [start, end)"""
+        signals_df, exit_manager = prepared
+        engine = BacktestEngine(**self.engine_kwargs)
+        result = engine.run_backtest(signals_df.iloc[start:end].reset_index(drop=True),
+                                     None, exit_manager, verbose=False, scan_signals=False)
+        return result['metrics'] or {self.trades_key: 0}
+
+    def store_params(self, params: Dict) -> Dict:
+        """Full strategy params (base file + overrides) and engine kwargs, for the ResultStore key"""
+        EntryDetector = _strategy_class('entry_detector', 'EntryDetector')
+        return {'strategy_params': self.apply_params(EntryDetector(self.params_file).params, params),
+                'engine': self.engine_kwargs}
+
+
+class _FoldScorer:
+    """Picklable backtest_fn for ParallelIterationRunner: one config, every fold"""
+
+    def __init__(self, target, folds: List[Dict], quiet: bool = True):
+        self.target = target
+        self.folds = folds
+        self.quiet = quiet
+
+    def __call__(self, config_id, config: Dict, frames: Dict[str, pd.DataFrame]) -> Dict:
+        output = io.StringIO() if self.quiet else None
+        with contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext():
+            prepared = self.target.prepare(frames['data'], config)
+            scores = []
+            for fold in self.folds:
+                for phase in ('train', 'test'):
+                    metrics = self.target.evaluate(prepared, fold[f'{phase}_start'], fold[f'{phase}_end'])
+                    scores.append({'fold': fold['fold'], 'phase': phase, **metrics})
+        return {'scores': scores}
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward parameter search over any target
+
+    Usage:
+        optimizer = WalkForwardOptimizer(FourierStrategyTarget(),
+                                         {'n_harmonics': [3, 5, 7]},
+                                         n_folds=5)
+        output = optimizer.run(df)
+        output['folds']       # selected params + in/out-of-sample metric per fold
+        output['stability']   # aggregate stability metrics
+    """
+
+    def __init__(self,
+                 target,
+                 param_grid: Dict[str, List],
+                 n_folds: int = 5,
+                 train_bars: Optional[int] = None,
+                 test_bars: Optional[int] = None,
+                 anchored: bool = False,
+                 metric: Optional[str] = None,
+                 maximize: bool = True,
+                 min_trades: int = 1,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize walk-forward optimizer
+
+        Args:
+            target: FourierStrategyTarget, BacktestEngineTarget or any object
+                    with prepare_data / prepare / evaluate
+            param_grid: Mapping parameter → values to test
+            n_folds, train_bars, test_bars, anchored: See make_folds()
+            metric: Metric to select on (default: target.default_metric)
+            maximize: Higher metric is better
+            min_trades: Minimum train trades for a config to be selectable
+            max_workers: Process pool size (default: CPU count)
+        """
+        self.target = target
+        self.param_grid = param_grid
+        self.n_folds = n_folds
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.anchored = anchored
+        self.metric = metric or target.default_metric
+        self.maximize = maximize
+        self.min_trades = min_trades
+        self.max_workers = max_workers
+
+    def run(self, df: pd.DataFrame, parallel: bool = True, verbose: bool = True) -> Dict:
+        """
+        Run the walk-forward search
+
+        Args:
+            df: Dataset (full series)
+            parallel: Use the process pool (False: in-process, same results)
+            verbose: Print progress and the stability summary
+
+        Returns:
+            dict with:
+                - folds: DataFrame, one row per fold (selected params,
+                  train/test metric, test trades)
+                - scores: DataFrame, every config × fold × phase
+                - stability: dict of aggregate stability metrics
+                - best_params: params selected most often
+                - wall_time_s
+        """
+        df = self.target.prepare_data(df)
+        folds = make_folds(len(df), self.n_folds, self.train_bars, self.test_bars, self.anchored)
+        configs = {config_id: params for config_id, params in enumerate(expand_grid(self.param_grid))}
+
+        if verbose:
+            mode = 'anchored' if self.anchored else 'rolling'
+            print(f"\n🔬 Walk-forward: {len(configs)} configs × {len(folds)} {mode} folds "
+                  f"(train {folds[0]['train_end'] - folds[0]['train_start']} / "
+                  f"test {folds[0]['test_end'] - folds[0]['test_start']} bars)")
+
+        runner = ParallelIterationRunner(_FoldScorer(self.target, folds), self.max_workers)
+        output = runner.run(configs, {'data': df}) if parallel else runner.run_sequential(configs, {'data': df})
+
+        rows = []
+        for config_id, result in output['raw_results'].items():
+            for score in result['scores']:
+                rows.append({'config_id': config_id, **score})
+        scores = pd.DataFrame(rows)
+
+        fold_results = self._select(scores, configs, folds)
+        stability = self.stability(fold_results)
+
+        params_counter = Counter(repr(sorted(p.items())) for p in fold_results['params'])
+        best_key = params_counter.most_common(1)[0][0] if params_counter else None
+        best_params = next((p for p in fold_results['params'] if repr(sorted(p.items())) == best_key), None)
+
+        if verbose:
+            self.print_summary(fold_results, stability)
+
+        return {
+            'folds': fold_results,
+            'scores': scores,
+            'stability': stability,
+            'best_params': best_params,
+            'wall_time_s': output['wall_time_s'],
+        }
+
+    def _select(self, scores: pd.DataFrame, configs: Dict, folds: List[Dict]) -> pd.DataFrame:
+        """Pick the best train config per fold and attach its test metrics"""
+        metric = self.metric
+        trades_key = self.target.trades_key
+        scores = scores.copy()
+        scores[metric] = scores.get(metric, pd.Series(np.nan, index=scores.index))
+        scores[trades_key] = scores.get(trades_key, pd.Series(0, index=scores.index)).fillna(0)
+
+        train = scores[scores['phase'] == 'train'].set_index(['fold', 'config_id'])
+        test = scores[scores['phase'] == 'test'].set_index(['fold', 'config_id'])
+
+        rows = []
+        for fold in folds:
+            candidates = train.loc[fold['fold']]
+            candidates = candidates[(candidates[trades_key] >= self.min_trades) &
+                                    candidates[metric].notna()]
+            if candidates.empty:
+                continue
+            values = candidates[metric]
+            config_id = values.idxmax() if self.maximize else values.idxmin()
+            test_row = test.loc[(fold['fold'], config_id)]
+            rows.append({
+                **fold,
+                'config_id': config_id,
+                'params': configs[config_id],
+                'train_metric': float(values.loc[config_id]),
+                'test_metric': float(test_row[metric]) if pd.notna(test_row[metric]) else 0.0,
+                'test_trades': int(test_row[trades_key]),
+            })
+
+        return pd.DataFrame(rows)
+
+    def stability(self, fold_results: pd.DataFrame) -> Dict:
+        """
+        Aggregate out-of-sample stability across folds
+
+        Returns:
+            dict with oos_mean, oos_std, oos_min, positive_folds_pct,
+            efficiency (mean test / mean train metric), param_consistency_pct
+            (share of folds selecting the most common params) and per-param
+            coefficient of variation for numeric params
+        """
+        if fold_results.empty:
+            return {'folds_scored': 0}
+
+        test = fold_results['test_metric']
+        train = fold_results['train_metric']
+        train_mean = train.mean()
+
+        keys = [repr(sorted(p.items())) for p in fold_results['params']]
+        consistency = Counter(keys).most_common(1)[0][1] / len(keys) * 100
+
+        param_cv = {}
+        params_df = pd.DataFrame(list(fold_results['params']))
+        for name in params_df.columns:
+            values = pd.to_numeric(params_df[name], errors='coerce')
+            if values.notna().all() and values.mean() != 0:
+                param_cv[name] = float(values.std(ddof=0) / abs(values.mean()))
+
+        return {
+            'folds_scored': len(fold_results),
+            'oos_mean': float(test.mean()),
+            'oos_std': float(test.std(ddof=0)),
+            'oos_min': float(test.min()),
+            'positive_folds_pct': float((test > 0).mean() * 100),
+            'efficiency': float(test.mean() / train_mean) if train_mean != 0 else np.nan,
+            'param_consistency_pct': float(consistency),
+            'param_cv': param_cv,
+            'oos_trades': int(fold_results['test_trades'].sum()),
+        }
+
+    def print_summary(self, fold_results: pd.DataFrame, stability: Dict):
+        """Print per-fold selections and stability metrics"""
+        print(f"\n📋 Walk-forward folds ({self.metric}):")
+        for _, row in fold_results.iterrows():
+            print(f"   Fold {row['fold']}: train {row['train_metric']:+.3f} → "
+                  f"test {row['test_metric']:+.3f} ({row['test_trades']} trades) | {row['params']}")
+
+        if stability.get('folds_scored', 0) == 0:
+            print("   ⚠️  No fold had a config with enough train trades")
+            return
+
+        print(f"\n📈 Stability:")
+        print(f"   OOS mean/std/min: {stability['oos_mean']:+.3f} / "
+              f"{stability['oos_std']:.3f} / {stability['oos_min']:+.3f}")
+        print(f"   Positive folds: {stability['positive_folds_pct']:.0f}%")
+        print(f"   Walk-forward efficiency: {stability['efficiency']:.2f}")
+        print(f"   Param consistency: {stability['param_consistency_pct']:.0f}%")
@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+Partitioned Candle Store - Binary Day Partitions Instead of Big CSVs
+
+Every consumer of *_historical_*.csv / *_full.csv re-parses the whole
+file (string timestamps included) on every run. CandleStore keeps the
+same frames as fixed-dtype binary partitions:
+
+    trading_data/store/ETH/5m/index.json
+    trading_data/store/ETH/5m/2025-01-01.npy
+    trading_data/store/ETH/5m/2025-01-02.npy
+
+- One .npy per UTC day holding a structured array: every column is a
+  fixed-dtype field (timestamp datetime64[ns], float64, int64, bool;
+  text columns such as MMA colors / ribbon_state as int32 category codes)
+- index.json holds the schema, the category lists and each partition's
+  first/last timestamp and row count, so slicing by time opens only the
+  partitions that overlap
+- Partitions load memory-mapped: nothing is parsed, and read_arrays() on a
+  single partition returns views of the file
+
+A partition per day (not per column) keeps 1h data at 24 rows per file
+from turning into thousands of tiny column files.
+
+Usage:
+    store = CandleStore()
+    store.import_csv('trading_data/indicators/eth_5m_full.csv', 'ETH', '5m')
+    df = store.read('ETH', '5m', start='2025-06-01', end='2025-06-30')
+    df_recent = store.tail('ETH', '5m', 200)
+    store.append('ETH', '5m', new_rows)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+# Schema kinds → stored dtype
+KIND_DTYPES = {
+    'timestamp': 'M8[ns]',
+    'datetime': 'M8[ns]',
+    'float': 'f8',
+    'int': 'i8',
+    'bool': '?',
+    'category': 'i4',
+}
+
+# Largest integer magnitude float64 holds exactly
+MAX_EXACT_INT = 2 ** 53
+
+# What a column holds for rows whose frame did not carry it
+MISSING = {
+    'datetime': np.datetime64('NaT'),
+    'float': np.nan,
+    'int': 0,
+    'bool': False,
+    'category': -1,
+}
+
+
+def to_datetime_ns(values) -> np.ndarray:
+    """Timestamps (datetime, ISO strings or epoch ms) as datetime64[ns], UTC-naive"""
+    values = pd.Series(values) if not isinstance(values, (pd.Series, pd.Index)) else values
+    if pd.api.types.is_numeric_dtype(values):
+        times = pd.to_datetime(values, unit='ms')
+    else:
+        times = pd.to_datetime(values)
+    times = pd.DatetimeIndex(times)
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    return times.values.astype('M8[ns]')
+
+
+def _infer_kind(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        return 'int'
+    if pd.api.types.is_float_dtype(series):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'category'
+
+
+def _merge_kind(name: str, stored: str, values: pd.Series, stored_all_missing) -> str:
+    """
+    Kind a stored column needs so it can also hold values without loss
+
+    int widens to float (NaNs or fractions arriving), bool to int / float,
+    and a float or datetime column that holds nothing but NaN / NaT yet
+    (e.g. empty in the first CSV chunk) takes on the incoming kind.
+
+    Args:
+        name: Column name (for errors)
+        stored: Stored kind
+        values: Incoming values
+        stored_all_missing: Callable, True if every stored value is missing
+
+    Returns:
+        Kind to store the column as (stored if nothing changes)
+
+    Raises:
+        ValueError: If no kind holds both the stored and the incoming values
+    """
+    present = values.dropna()
+    if present.empty:
+        if len(values) and stored == 'int':
+            return 'float'
+        if len(values) and stored == 'bool':
+            raise ValueError(f"Column '{name}' is stored as bool but has missing values")
+        return stored
+
+    incoming = _infer_kind(values)
+    if incoming == stored or stored == 'category':
+        return stored
+
+    numbers = present.to_numpy()
+    if incoming in ('int', 'bool', 'float') and stored in ('int', 'bool', 'float'):
+        if stored == 'bool' and incoming == 'int':
+            return 'int'
+        if incoming == 'bool':
+            return stored
+        if stored == 'int' and incoming == 'float' and not values.hasnans \
+                and np.all(np.mod(numbers, 1) == 0) and np.all(np.abs(numbers) < 2 ** 63):
+            return 'int'  # integral floats cast exactly
+        if incoming == 'int' and np.any(np.abs(numbers) > MAX_EXACT_INT):
+            raise ValueError(f"Column '{name}' is stored as float; integers above 2**53 would lose precision")
+        return 'float'
+
+    if stored == 'datetime' and incoming == 'category':
+        return stored  # parsed by pd.to_datetime on encode
+    if stored in ('float', 'datetime') and stored_all_missing():
+        return incoming
+    raise ValueError(f"Column '{name}' is stored as {stored}, got {values.dtype} values")
+
+
+class CandleStore:
+    """
+    Local candle / indicator store partitioned by symbol, timeframe and day
+
+    Usage:
+        store = CandleStore('trading_data/store')
+        store.append('ETH', '1m', df)                 # add / overwrite rows
+        df = store.read('ETH', '1m', start, end)      # time-sliced DataFrame
+        arrays = store.read_arrays('ETH', '1m', columns=['close'])
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, root: str = 'trading_data/store'):
+        """
+        Initialize store.
+
+        Args:
+            root: Store directory
+        """
+        self.root = Path(root)
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.upper() / timeframe
+
+    def exists(self, symbol: str, timeframe: str) -> bool:
+        return (self._dir(symbol, timeframe) / self.INDEX_FILE).exists()
+
+    def index(self, symbol: str, timeframe: str) -> Dict:
+        """Schema, category lists and partition ranges ({} if nothing stored)"""
+        path = self._dir(symbol, timeframe) / self.INDEX_FILE
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_index(self, symbol: str, timeframe: str, index: Dict):
+        directory = self._dir(symbol, timeframe)
+        tmp = directory / (self.INDEX_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, directory / self.INDEX_FILE)
+
+    def partitions(self, symbol: str, timeframe: str) -> List[Dict]:
+        """[{'day', 'start', 'end', 'rows'}] sorted by day (start/end in ns)"""
+        index = self.index(symbol, timeframe)
+        return [dict(day=day, **info) for day, info in sorted(index.get('partitions', {}).items())]
+
+    def time_range(self, symbol: str, timeframe: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last stored timestamp"""
+        parts = self.partitions(symbol, timeframe)
+        if not parts:
+            return None
+        return pd.Timestamp(parts[0]['start']), pd.Timestamp(parts[-1]['end'])
+
+    def rows(self, symbol: str, timeframe: str) -> int:
+        return sum(part['rows'] for part in self.partitions(symbol, timeframe))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _schema_for(self, df: pd.DataFrame, index: Dict) -> Dict:
+        """Existing schema, or one inferred from the first frame written"""
+        if index.get('schema'):
+            schema = index['schema']
+            unknown = [c for c in df.columns if c != 'timestamp' and c not in schema['columns']]
+            if unknown:
+                raise ValueError(f"Columns not in the stored schema: {unknown[:10]}"
+                                 f"{' ...' if len(unknown) > 10 else ''} (use write() to replace)")
+            # Same-timestamp rows are replaced whole: a missing column would blank them
+            missing = [c for c in schema['order'] if c != 'timestamp' and c not in df.columns]
+            if missing:
+                raise ValueError(f"New rows lack stored columns {missing[:10]}"
+                                 f"{' ...' if len(missing) > 10 else ''}")
+            return schema
+
+        columns = {'timestamp': 'timestamp'}
+        for name in df.columns:
+            if name != 'timestamp':
+                columns[name] = _infer_kind(df[name])
+        order = list(df.columns) if 'timestamp' in df.columns else ['timestamp'] + list(df.columns)
+        return {'order': order, 'columns': columns, 'categories': {}}
+
+    def _stored_all_missing(self, symbol: str, timeframe: str, index: Dict, name: str) -> bool:
+        """True if a float / datetime column holds only NaN / NaT so far"""
+        directory = self._dir(symbol, timeframe)
+        dtype = self._dtype(index['schema'])
+        for day, info in index.get('partitions', {}).items():
+            values = self._open(directory / f'{day}.npy', dtype, info['rows'])[name]
+            if not np.all(np.isnan(values)):
+                return False
+        return True
+
+    def _widen(self, symbol: str, timeframe: str, index: Dict, df: pd.DataFrame):
+        """
+        Widen stored columns that cannot hold df's values as they are
+
+        Rewrites every partition with the widened dtype (a one-off, e.g. the
+        first fractional volume after integral ones). Raises instead if the
+        stored values would not survive the conversion.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            index: Current index (schema updated in place)
+            df: Incoming rows
+        """
+        schema = index['schema']
+        changes = {}
+        for name in df.columns:
+            if name == 'timestamp':
+                continue
+            stored = schema['columns'][name]
+            kind = _merge_kind(name, stored, df[name],
+                               lambda: self._stored_all_missing(symbol, timeframe, index, name))
+            if kind != stored:
+                changes[name] = kind
+        if not changes:
+            return
+
+        directory = self._dir(symbol, timeframe)
+        old_dtype = self._dtype(schema)
+        parts = {day: self._open(directory / f'{day}.npy', old_dtype, info['rows'])
+                 for day, info in index.get('partitions', {}).items()}
+        for name, kind in changes.items():
+            if schema['columns'][name] == 'int' and kind == 'float' and any(
+                    len(data) and np.abs(data[name]).max() > MAX_EXACT_INT for data in parts.values()):
+                raise ValueError(f"Column '{name}' holds integers above 2**53; cannot widen it to float")
+
+        described = ', '.join(f"{n} {schema['columns'][n]}→{k}" for n, k in changes.items())
+        print(f"   🔧 Widening {symbol.upper()}/{timeframe} columns: {described}")
+        schema['columns'].update(changes)
+        new_dtype = self._dtype(schema)
+
+        written = []
+        for day, data in parts.items():
+            widened = np.empty(len(data), dtype=new_dtype)
+            for name in schema['order']:
+                if name not in changes:
+                    widened[name] = data[name]
+                elif data.dtype[name].kind in 'biuf' and changes[name] in ('int', 'float'):
+                    widened[name] = data[name].astype(new_dtype[name])
+                else:
+                    widened[name] = MISSING[changes[name]]  # the column held only NaN / NaT
+            tmp = directory / f'{day}.tmp.npy'
+            np.save(tmp, widened, allow_pickle=False)
+            written.append((tmp, directory / f'{day}.npy'))
+        del parts
+        for tmp, path in written:
+            os.replace(tmp, path)
+        self._write_index(symbol, timeframe, index)
+
+    def _dtype(self, schema: Dict) -> np.dtype:
+        return np.dtype([(name, KIND_DTYPES[schema['columns'][name]]) for name in schema['order']])
+
+    def _encode(self, df: pd.DataFrame, schema: Dict) -> np.ndarray:
+        """Frame → structured array in schema order (extends category lists)"""
+        if 'timestamp' in df.columns:
+            timestamps = to_datetime_ns(df['timestamp'])
+        elif isinstance(df.index, pd.DatetimeIndex):
+            timestamps = to_datetime_ns(df.index)
+        else:
+            raise ValueError("Frame needs a 'timestamp' column or a DatetimeIndex")
+
+        records = np.empty(len(df), dtype=self._dtype(schema))
+        for name in schema['order']:
+            kind = schema['columns'][name]
+            if name == 'timestamp':
+                records[name] = timestamps
+                continue
+            if name not in df.columns:
+                records[name] = MISSING[kind]
+                continue
+
+            values = df[name]
+            if kind == 'category':
+                categories = schema['categories'].setdefault(name, [])
+                values = values.astype(object)
+                present = values.notna().to_numpy()
+                labels = values.astype(str).to_numpy()
+                known = pd.Index(categories)
+                new = pd.unique(labels[present & (known.get_indexer(labels) < 0)])
+                if len(new):
+                    categories.extend(new.tolist())
+                    known = pd.Index(categories)
+                records[name] = np.where(present, known.get_indexer(labels), -1)
+            elif kind == 'datetime':
+                records[name] = pd.to_datetime(values).to_numpy(dtype='M8[ns]')
+            elif kind in ('int', 'bool') and values.isna().any():
+                raise ValueError(f"Column '{name}' is stored as {kind} but has missing values")
+            else:
+                try:
+                    encoded = values.to_numpy(dtype=KIND_DTYPES[kind])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Column '{name}' is stored as {kind}, got {values.dtype} values")
+                if kind in ('int', 'bool') and values.dtype.kind not in 'iub' and \
+                        not np.array_equal(encoded, values.to_numpy(dtype=float)):
+                    raise ValueError(f"Column '{name}' is stored as {kind}; casting {values.dtype} values would lose data")
+                records[name] = encoded
+        return records
+
+    def append(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Add rows, overwriting stored rows with the same timestamp
+
+        Only the day partitions the new rows fall into are rewritten.
+
+        Args:
+            symbol: Trading symbol (e.g. 'ETH')
+            timeframe: Timeframe label (e.g. '5m')
+            df: Rows with a 'timestamp' column (or DatetimeIndex) and every
+                stored column (ValueError otherwise)
+
+        Returns:
+            Number of rows appended
+        """
+        if df is None or len(df) == 0:
+            return 0
+
+        directory = self._dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        index = self.index(symbol, timeframe)
+        schema = self._schema_for(df, index)
+        if index.get('schema'):
+            self._widen(symbol, timeframe, index, df)
+        index.setdefault('symbol', symbol.upper())
+        index.setdefault('timeframe', timeframe)
+        index['schema'] = schema
+        partitions = index.setdefault('partitions', {})
+
+        records = self._encode(df, schema)
+        records = records[np.argsort(records['timestamp'], kind='stable')]
+        days = records['timestamp'].view(np.int64) // NS_PER_DAY
+        _, starts = np.unique(days, return_index=True)
+        bounds = list(starts) + [len(records)]
+
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            chunk = records[first:last]
+            day = str(chunk['timestamp'][0].astype('M8[D]'))
+            path = directory / f'{day}.npy'
+            if day in partitions and path.exists():
+                chunk = np.concatenate([np.load(path, allow_pickle=False), chunk])
+            # Keep the last row per timestamp, sorted
+            stamps = chunk['timestamp']
+            _, last_seen = np.unique(stamps[::-1], return_index=True)
+            chunk = chunk[len(chunk) - 1 - last_seen]
+
+            tmp = directory / f'{day}.tmp.npy'
+            np.save(tmp, chunk, allow_pickle=False)
+            os.replace(tmp, path)
+            partitions[day] = {'start': int(chunk['timestamp'][0].view(np.int64)),
+                               'end': int(chunk['timestamp'][-1].view(np.int64)),
+                               'rows': int(len(chunk))}
+
+        index['updated_at'] = pd.Timestamp.now().isoformat()
+        self._write_index(symbol, timeframe, index)
+        return len(records)
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """Replace everything stored for symbol/timeframe with df"""
+        self.delete(symbol, timeframe)
+        return self.append(symbol, timeframe, df)
+
+    def delete(self, symbol: str, timeframe: str):
+        directory = self._dir(symbol, timeframe)
+        if directory.exists():
+            shutil.rmtree(directory)
+
+    def import_csv(self, path: str, symbol: str, timeframe: str,
+                   chunksize: int = 250_000, replace: bool = True) -> int:
+        """
+        One-shot import of a *_historical_*.csv / *_full.csv file
+
+        Args:
+            path: CSV file
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            chunksize: Rows parsed per chunk (bounds memory on 1m files)
+            replace: Drop what is stored first (False: merge into it)
+
+        Returns:
+            Rows imported
+        """
+        if replace:
+            self.delete(symbol, timeframe)
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            total += self.append(symbol, timeframe, chunk)
+        return total
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _select(self, symbol: str, timeframe: str, start=None, end=None) -> Tuple[Dict, List[np.ndarray]]:
+        """Index plus the (time-trimmed) partitions overlapping [start, end]"""
+        index = self.index(symbol, timeframe)
+        if not index:
+            raise FileNotFoundError(f"No {symbol.upper()} {timeframe} data in {self.root}")
+        lo = int(to_datetime_ns([start])[0].view(np.int64)) if start is not None else None
+        hi = int(to_datetime_ns([end])[0].view(np.int64)) if end is not None else None
+
+        directory = self._dir(symbol, timeframe)
+        dtype = self._dtype(index['schema'])
+        parts = []
+        for day, info in sorted(index['partitions'].items()):
+            if (lo is not None and info['end'] < lo) or (hi is not None and info['start'] > hi):
+                continue
+            data = self._open(directory / f'{day}.npy', dtype, info['rows'])
+            if (lo is not None and info['start'] < lo) or (hi is not None and info['end'] > hi):
+                stamps = data['timestamp']
+                left = np.searchsorted(stamps, np.datetime64(lo, 'ns')) if lo is not None else 0
+                right = np.searchsorted(stamps, np.datetime64(hi, 'ns'), side='right') \
+                    if hi is not None else len(data)
+                data = data[left:right]
+            parts.append(data)
+        return index, parts
+
+    @staticmethod
+    def _open(path: Path, dtype: np.dtype, rows: int) -> np.ndarray:
+        """
+        Memory-map a partition
+
+        The schema already gives the dtype, so the data offset follows from
+        the file size; parsing the .npy header of a wide record dtype costs
+        more than mapping the data.
+        """
+        offset = os.path.getsize(path) - rows * dtype.itemsize
+        if offset <= 0:
+            return np.load(path, mmap_mode='r', allow_pickle=False)
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(rows,))
+
+    def read_arrays(self, symbol: str, timeframe: str, start=None, end=None,
+                    columns: List[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Raw column arrays for a time range, without building a DataFrame
+
+        Category columns come back as int32 codes (see index()['schema']['categories']).
+        With a single partition in range the arrays are views of the memory-mapped file.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            start, end: Inclusive bounds (anything pd.to_datetime accepts; None = open)
+            columns: Columns to return (default: all); 'timestamp' is always included
+
+        Returns:
+            {column: array}
+        """
+        index, parts = self._select(symbol, timeframe, start, end)
+        names = self._columns(index, columns)
+        if len(parts) == 1:
+            return {name: parts[0][name] for name in names}
+        dtype = self._dtype(index['schema'])
+        if not parts:
+            return {name: np.empty(0, dtype=dtype[name]) for name in names}
+        return {name: np.concatenate([part[name] for part in parts]) for name in names}
+
+    def read(self, symbol: str, timeframe: str, start=None, end=None,
+             columns: List[str] = None, categorical: bool = False) -> pd.DataFrame:
+        """
+        Time-sliced DataFrame in the CSV files' column layout
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe label
+            start, end: Inclusive bounds (None = open)
+            columns: Columns to return (default: all); 'timestamp' is always included
+            categorical: Return text columns as pandas Categoricals instead of strings
+
+        Returns:
+            DataFrame with a RangeIndex and a datetime64 'timestamp' column
+        """
+        index = self.index(symbol, timeframe)
+        arrays = self.read_arrays(symbol, timeframe, start, end, columns)
+        schema = index['schema']
+
+        data = {}
+        for name, values in arrays.items():
+            if schema['columns'][name] == 'category':
+                categories = schema['categories'].get(name, [])
+                if categorical:
+                    values = pd.Categorical.from_codes(values, categories)
+                else:
+                    lookup = np.array(categories + [np.nan], dtype=object)
+                    values = lookup[values]  # code -1 → NaN (last entry)
+            else:
+                values = np.array(values)  # detach from the memory map
+            data[name] = values
+        return pd.DataFrame(data)
+
+    def tail(self, symbol: str, timeframe: str, n: int, columns: List[str] = None) -> pd.DataFrame:
+        """Last n rows, opening only the newest partitions"""
+        parts = self.partitions(symbol, timeframe)
+        if not parts:
+            raise FileNotFoundError(f"No {symbol.upper()} {timeframe} data in {self.root}")
+        rows, start = 0, None
+        for part in reversed(parts):
+            rows += part['rows']
+            start = part['start']
+            if rows >= n:
+                break
+        df = self.read(symbol, timeframe, start=pd.Timestamp(start), columns=columns)
+        return df.tail(n).reset_index(drop=True)
+
+    @staticmethod
+    def _columns(index: Dict, columns: Optional[List[str]]) -> List[str]:
+        order = index['schema']['order']
+        if columns is None:
+            return order
+        missing = [c for c in columns if c not in order]
+        if missing:
+            raise KeyError(f"Columns not stored: {missing}")
+        return ['timestamp'] + [c for c in order if c in columns and c != 'timestamp']
+
+
+def benchmark_load(csv_path: str, store: CandleStore, symbol: str, timeframe: str,
+                   repeat: int = 3) -> Dict:
+    """
+    Load time of a CSV (read_csv + to_datetime) against the store's read()
+
+    Returns:
+        {'csv_s', 'store_s', 'speedup', 'rows'} (best of repeat)
+    """
+    def best(fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    def load_csv():
+        df = pd.read_csv(csv_path)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    csv_s, df = best(load_csv)
+    store_s, _ = best(lambda: store.read(symbol, timeframe))
+    return {'csv_s': csv_s, 'store_s': store_s, 'speedup': csv_s / store_s, 'rows': len(df)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partitioned candle store')
+    parser.add_argument('--root', default='trading_data/store', help='Store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    imp = commands.add_parser('import', help='Import a CSV file')
+    imp.add_argument('csv')
+    imp.add_argument('--symbol', required=True)
+    imp.add_argument('--timeframe', required=True)
+
+    info = commands.add_parser('info', help='Show stored symbols / timeframes')
+
+    bench = commands.add_parser('bench', help='Compare load time against pd.read_csv')
+    bench.add_argument('csv')
+    bench.add_argument('--symbol', required=True)
+    bench.add_argument('--timeframe', required=True)
+    args = parser.parse_args()
+
+    store = CandleStore(args.root)
+
+    if args.command == 'import':
+        print(f"📥 Importing {args.csv} → {args.symbol.upper()}/{args.timeframe}...")
+        start = time.perf_counter()
+        rows = store.import_csv(args.csv, args.symbol, args.timeframe)
+        print(f"   ✅ {rows:,} rows in {len(store.partitions(args.symbol, args.timeframe))} partitions "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    elif args.command == 'info':
+        for symbol_dir in sorted(p for p in store.root.glob('*') if p.is_dir()):
+            for tf_dir in sorted(p for p in symbol_dir.glob('*') if p.is_dir()):
+                if not store.exists(symbol_dir.name, tf_dir.name):
+                    continue
+                first, last = store.time_range(symbol_dir.name, tf_dir.name)
+                print(f"   📊 {symbol_dir.name}/{tf_dir.name}: {store.rows(symbol_dir.name, tf_dir.name):,} rows | "
+                      f"{first} → {last}")
+
+    else:
+        if not store.exists(args.symbol, args.timeframe):
+            store.import_csv(args.csv, args.symbol, args.timeframe)
+        result = benchmark_load(args.csv, store, args.symbol, args.timeframe)
+        print(f"   ⏱️  read_csv: {result['csv_s'] * 1000:.1f} ms | store: {result['store_s'] * 1000:.1f} ms | "
+              f"{result['speedup']:.1f}x faster ({result['rows']:,} rows)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Segmented Fetch Checkpoints - Append-Only Binary Batches
+
+The fetcher used to dump the whole accumulated candle list as JSON every
+10 batches and read it all back on resume, so checkpoint I/O grew
+quadratically with the length of a fetch. A SegmentCheckpoint is a
+directory instead:
+- batch_00001.npy, batch_00002.npy, ...: one numeric segment per batch,
+  written once and never rewritten
+- manifest.json: symbol, interval, total_batches and last_batch (the last
+  contiguous batch on disk), rewritten per batch but constant in size
+
+Resuming only reads the manifest; segments are merged once, when the
+fetch finishes. Writes go through a temp file + rename, so an interrupted
+run never leaves a half-written segment that the manifest counts.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+# Numeric layout of a Hyperliquid candle ('s' / 'i' live in the manifest)
+CANDLE_DTYPE = np.dtype([('t', 'i8'), ('T', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'),
+                         ('c', 'f8'), ('v', 'f8'), ('n', 'i8')])
+PRICE_FIELDS = ('o', 'h', 'l', 'c', 'v')
+
+
+def candles_to_array(candles: List[Dict]) -> np.ndarray:
+    """Candle dicts (API wire format, string prices) → structured array"""
+    arr = np.empty(len(candles), dtype=CANDLE_DTYPE)
+    if not candles:
+        return arr
+    arr['t'] = [c['t'] for c in candles]
+    arr['T'] = [c.get('T', c['t']) for c in candles]
+    for field in PRICE_FIELDS:
+        arr[field] = np.array([c[field] for c in candles], dtype=float)
+    arr['n'] = [c.get('n', 0) for c in candles]
+    return arr
+
+
+def array_to_candles(arr: np.ndarray, symbol: str, interval: str) -> List[Dict]:
+    """Structured array → candle dicts in the API's format (prices as strings)"""
+    columns = {field: list(map(repr, arr[field].tolist())) for field in PRICE_FIELDS}
+    return [
+        {'t': t, 'T': close_time, 's': symbol, 'i': interval,
+         'o': o, 'c': c, 'h': h, 'l': l, 'v': v, 'n': n}
+        for t, close_time, o, h, l, c, v, n in zip(
+            arr['t'].tolist(), arr['T'].tolist(), columns['o'], columns['h'], columns['l'],
+            columns['c'], columns['v'], arr['n'].tolist())
+    ]
+
+
+def first_unique_sorted(times) -> np.ndarray:
+    """
+    Positions that deduplicate and sort candles by open time
+
+    The first occurrence of each timestamp wins, like the old set-based
+    dedup followed by a sort.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    _, first = np.unique(times, return_index=True)
+    return first
+
+
+def dedupe_candles(candles: List[Dict]) -> List[Dict]:
+    """Drop duplicate timestamps (first wins) and sort by open time"""
+    if not candles:
+        return []
+    times = np.fromiter((c['t'] for c in candles), dtype=np.int64, count=len(candles))
+    return [candles[i] for i in first_unique_sorted(times)]
+
+
+class SegmentCheckpoint:
+    """
+    Append-only checkpoint of one symbol/interval fetch
+
+    Usage:
+        checkpoint = SegmentCheckpoint(root, 'ETH', '1m')
+        checkpoint.begin(total_batches)
+        checkpoint.append(batch_num, candles)      # once per batch, in order
+        ...
+        candles = checkpoint.load_candles()        # on resume, once at the end
+        checkpoint.clear()
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, root, symbol: str, interval: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            root: Checkpoint directory (e.g. trading_data/.checkpoints)
+            symbol: Trading symbol
+            interval: Timeframe
+        """
+        self.root = Path(root)
+        self.symbol = symbol
+        self.interval = interval
+        self.path = self.root / f'{symbol}_{interval}'
+        self.legacy_file = self.root / f'{symbol}_{interval}_checkpoint.json'
+        self._manifest = None
+
+    def exists(self) -> bool:
+        if self.legacy_file.exists():
+            self._migrate_legacy()
+        return (self.path / self.MANIFEST).exists()
+
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            with open(self.path / self.MANIFEST) as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
+    @property
+    def last_batch(self) -> int:
+        return self.manifest()['last_batch']
+
+    @property
+    def total_batches(self) -> int:
+        return self.manifest()['total_batches']
+
+    def _segment_file(self, batch_num: int) -> Path:
+        return self.path / f'batch_{batch_num:05d}.npy'
+
+    def _write_manifest(self):
+        self._manifest['saved_at'] = datetime.now().isoformat()
+        tmp = self.path / (self.MANIFEST + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.path / self.MANIFEST)
+
+    def begin(self, total_batches: int):
+        """Start a fresh checkpoint (drops any previous one)"""
+        self.clear()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._manifest = {'symbol': self.symbol, 'interval': self.interval,
+                          'total_batches': int(total_batches), 'last_batch': 0,
+                          'candles': 0, 'format': 'npy-segments-v1'}
+        self._write_manifest()
+
+    def append(self, batch_num: int, candles):
+        """
+        Write one batch as its own segment and advance the manifest
+
+        Args:
+            batch_num: Batch number (must follow the manifest's last_batch)
+            candles: Candle dicts or a CANDLE_DTYPE array
+        """
+        arr = candles if isinstance(candles, np.ndarray) else candles_to_array(candles)
+        if len(arr):
+            tmp = self.path / f'batch_{batch_num:05d}.tmp.npy'
+            np.save(tmp, arr, allow_pickle=False)
+            os.replace(tmp, self._segment_file(batch_num))
+
+        manifest = self.manifest()
+        manifest['last_batch'] = int(batch_num)
+        manifest['candles'] += len(arr)
+        self._write_manifest()
+
+    def segments(self, up_to: int = None) -> Iterator[np.ndarray]:
+        """Segments up to batch up_to (default: last_batch), in batch order, read lazily"""
+        last = self.last_batch if up_to is None else min(up_to, self.last_batch)
+        for file in sorted(self.path.glob('batch_*.npy')):
+            stem = file.stem.split('_')[1]
+            if stem.isdigit() and int(stem) <= last:
+                yield np.load(file, allow_pickle=False)
+
+    def load_candles(self, up_to: int = None) -> List[Dict]:
+        """Segments up to batch up_to as candle dicts, in batch order (not deduplicated)"""
+        parts = list(self.segments(up_to))
+        if not parts:
+            return []
+        return array_to_candles(np.concatenate(parts), self.symbol, self.interval)
+
+    def clear(self):
+        """Remove the checkpoint"""
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        if self.legacy_file.exists():
+            self.legacy_file.unlink()
+        self._manifest = None
+
+    def _migrate_legacy(self):
+        """Turn an old single-file JSON checkpoint into one segment"""
+        with open(self.legacy_file) as f:
+            legacy = json.load(f)
+        self.begin(legacy['total_batches'])
+        self.append(legacy['last_batch'], legacy['candles'])
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Candle Validation and Gap Repair
+
+The candle paths used to check column presence and NaNs only, so bars lost
+in exchange outages flowed silently into EMAs and FFTs. CandleValidator
+checks a series in one vectorized pass over its timestamp / OHLCV arrays:
+
+- missing bars (gaps in the interval grid) and the gap ranges
+- duplicate and non-monotonic timestamps
+- timestamps off the grid of the first bar (misaligned)
+- OHLC inconsistencies: high below open/close, low above open/close,
+  high below low, non-positive prices, NaNs, negative volume
+- runs of zero-volume bars
+
+and returns a ValidationReport. repair() sorts, deduplicates and reindexes
+the series onto the full grid; missing bars are then either synthetic flat
+bars at the previous close ('ffill'), aggregated from a lower timeframe
+('lower', complete buckets only, the rest forward-filled), or left as NaN
+rows ('mask'). Inserted bars are flagged in a 'synthetic' column.
+
+A 1M-bar 1m series validates in ~50 ms and repairs in ~0.1 s (benchmarks:
+data_validator.*), cheap enough to run on every load.
+"""
+
+import time
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+FILL_METHODS = ('ffill', 'lower', 'mask')
+
+_UNIT_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+# Calendar intervals (months) have no fixed length, so no bar grid to check
+CALENDAR_UNITS = ('M',)
+
+
+def has_fixed_grid(interval) -> bool:
+    """True for fixed-length intervals ('1m' ... '1w'), False for calendar ones ('1M')"""
+    return isinstance(interval, (int, np.integer)) or interval[-1] not in CALENDAR_UNITS
+
+
+def interval_to_ms(interval) -> int:
+    """'1m' / '15m' / '1h' / '1d' (or a number of ms) → milliseconds"""
+    if isinstance(interval, (int, np.integer)):
+        return int(interval)
+    if not has_fixed_grid(interval):
+        raise ValueError(f"Calendar interval {interval} has no fixed length in ms")
+    unit = interval[-1]
+    if unit not in _UNIT_MS or not interval[:-1].isdigit():
+        raise ValueError(f"Unknown interval: {interval}")
+    return int(interval[:-1]) * _UNIT_MS[unit]
+
+
+def timestamps_ms(df: pd.DataFrame) -> np.ndarray:
+    """
+    Bar times of a frame in epoch milliseconds
+
+    Uses the 'timestamp' column (epoch ms, datetimes or ISO strings) when
+    present, else a DatetimeIndex.
+    """
+    if 'timestamp' in df.columns:
+        values = df['timestamp']
+        if values.dtype.kind in 'iu':
+            return values.to_numpy(dtype=np.int64)
+        if values.dtype.kind != 'M':
+            values = pd.to_datetime(values)
+        return values.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    raise ValueError("Frame has neither a 'timestamp' column nor a DatetimeIndex")
+
+
+def _datetimes_like(ms: np.ndarray, like: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Epoch ms → datetimes in the unit and time zone of like (naive = UTC)"""
+    return pd.to_datetime(ms, unit='ms', utc=True).tz_convert(like.tz).as_unit(like.unit)
+
+
+def _restore_timestamps(ms: np.ndarray, like: pd.Series):
+    """Epoch ms back in the representation of the original timestamp column"""
+    if like.dtype.kind in 'iu':
+        return ms
+    if like.dtype.kind == 'M':
+        return _datetimes_like(ms, pd.DatetimeIndex(like))
+    times = ms.astype('datetime64[ms]')
+    return np.datetime_as_string(times.astype('datetime64[s]'), unit='s').astype(object)
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """(start, length) of every run of True in mask"""
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    return np.column_stack((starts, np.flatnonzero(edges == -1) - starts))
+
+
+@dataclass
+class ValidationReport:
+    """Result of CandleValidator.validate (times in epoch ms)"""
+    interval_ms: int
+    rows: int
+    first: Optional[int] = None
+    last: Optional[int] = None
+    expected_bars: int = 0
+    missing_bars: int = 0
+    gaps: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=np.int64))
+    duplicates: int = 0
+    non_monotonic: int = 0
+    misaligned: int = 0
+    ohlc_errors: Dict[str, int] = field(default_factory=dict)
+    invalid_rows: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    zero_volume_runs: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the series has no gaps, duplicates, ordering or OHLC problems"""
+        return not (self.missing_bars or self.duplicates or self.non_monotonic
+                    or self.misaligned or len(self.invalid_rows))
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly summary (gap and run lists as [start, end, missing] / [row, length])"""
+        return {
+            'interval_ms': self.interval_ms,
+            'rows': self.rows,
+            'first': self.first,
+            'last': self.last,
+            'expected_bars': self.expected_bars,
+            'missing_bars': self.missing_bars,
+            'gaps': self.gaps.tolist(),
+            'duplicates': self.duplicates,
+            'non_monotonic': self.non_monotonic,
+            'misaligned': self.misaligned,
+            'ohlc_errors': dict(self.ohlc_errors),
+            'invalid_rows': len(self.invalid_rows),
+            'zero_volume_runs': self.zero_volume_runs.tolist(),
+            'elapsed_ms': round(self.elapsed_ms, 3),
+        }
+
+    def summary(self, max_gaps: int = 5) -> str:
+        """Printable gap report"""
+        if self.rows == 0:
+            return "   ⚠️  No candles"
+
+        def fmt(ms):
+            return pd.Timestamp(int(ms), unit='ms').strftime('%Y-%m-%d %H:%M')
+
+        lines = [f"   🔎 {self.rows} bars {fmt(self.first)} → {fmt(self.last)} "
+                 f"({self.expected_bars} expected, checked in {self.elapsed_ms:.1f} ms)"]
+        if self.ok and not len(self.zero_volume_runs):
+            lines.append("   ✅ No gaps, duplicates or OHLC errors")
+            return '\n'.join(lines)
+
+        if self.missing_bars:
+            lines.append(f"   ⚠️  {self.missing_bars} missing bars in {len(self.gaps)} "
+                         f"gap{'s' if len(self.gaps) != 1 else ''}")
+            largest = self.gaps[np.argsort(-self.gaps[:, 2], kind='stable')[:max_gaps]]
+            for before, after, missing in largest:
+                lines.append(f"      {fmt(before)} → {fmt(after)}: {missing} bars")
+        if self.duplicates:
+            lines.append(f"   ⚠️  {self.duplicates} duplicate timestamps")
+        if self.non_monotonic:
+            lines.append(f"   ⚠️  {self.non_monotonic} timestamps out of order")
+        if self.misaligned:
+            lines.append(f"   ⚠️  {self.misaligned} timestamps off the {self.interval_ms // 1000}s grid")
+        errors = {k: v for k, v in self.ohlc_errors.items() if v}
+        if errors:
+            lines.append(f"   ⚠️  {len(self.invalid_rows)} bars with OHLC errors: "
+                         + ', '.join(f"{k}={v}" for k, v in errors.items()))
+        if len(self.zero_volume_runs):
+            lines.append(f"   ℹ️  {len(self.zero_volume_runs)} zero-volume runs "
+                         f"(longest {int(self.zero_volume_runs[:, 1].max())} bars)")
+        return '\n'.join(lines)
+
+
+class CandleValidator:
+    """
+    Vectorized checks and gap repair for one candle series
+
+    Usage:
+        validator = CandleValidator('1m')
+        report = validator.validate(df)            # df: 'timestamp' column or DatetimeIndex
+        print(report.summary())
+        fixed = validator.repair(df, fill='ffill') # or fill='lower', lower=df_1m_for_a_5m_series
+    """
+
+    def __init__(self, interval, min_zero_volume_run: int = 3):
+        """
+        Initialize validator.
+
+        Args:
+            interval: Bar interval ('1m', '5m', '1h', ... or milliseconds)
+            min_zero_volume_run: Shortest run of zero-volume bars that is reported
+        """
+        self.interval = interval
+        self.interval_ms = interval_to_ms(interval)
+        self.min_zero_volume_run = min_zero_volume_run
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        """
+        Check a candle frame
+
+        Args:
+            df: Frame with OHLCV columns and a 'timestamp' column or DatetimeIndex
+
+        Returns:
+            ValidationReport
+        """
+        columns = {col: df[col].to_numpy(dtype=float) for col in OHLCV_COLUMNS if col in df.columns}
+        return self.validate_arrays(timestamps_ms(df), **columns)
+
+    def validate_arrays(self, times: np.ndarray, open: np.ndarray = None, high: np.ndarray = None,
+                        low: np.ndarray = None, close: np.ndarray = None,
+                        volume: np.ndarray = None) -> ValidationReport:
+        """
+        Check raw arrays (times in epoch ms; price / volume arrays optional)
+
+        Returns:
+            ValidationReport
+        """
+        started = time.perf_counter()
+        times = np.asarray(times, dtype=np.int64)
+        step = self.interval_ms
+        report = ValidationReport(interval_ms=step, rows=len(times))
+        if len(times) == 0:
+            return report
+
+        # Timestamps: ordering, duplicates, alignment, gaps
+        diffs = np.diff(times)
+        report.non_monotonic = int((diffs < 0).sum())
+        if report.non_monotonic:
+            ordered = np.sort(times, kind='stable')
+            diffs = np.diff(ordered)
+        else:
+            ordered = times
+        report.duplicates = int((diffs == 0).sum())
+        report.first, report.last = int(ordered[0]), int(ordered[-1])
+        # A series of consecutive bars is aligned by construction; skip the modulo
+        if not (diffs == step).all():
+            report.misaligned = int(((times - report.first) % step != 0).sum())
+        report.expected_bars = (report.last - report.first) // step + 1
+
+        gap_at = np.flatnonzero(diffs > step)
+        missing = (diffs[gap_at] - 1) // step
+        report.gaps = np.column_stack((ordered[gap_at], ordered[gap_at + 1], missing)).astype(np.int64)
+        report.missing_bars = int(missing.sum())
+
+        # OHLC consistency (NaN compares False, so NaN bars only count as 'nan')
+        invalid = np.zeros(len(times), dtype=bool)
+        prices = [np.asarray(a, dtype=float) for a in (open, high, low, close) if a is not None]
+        if prices:
+            # Element-wise reductions across the columns (no stacked copy)
+            checks = {'nan': reduce(np.logical_or, [np.isnan(a) for a in prices]),
+                      'non_positive_price': reduce(np.minimum, prices) <= 0}
+            if high is not None and low is not None:
+                checks['high_below_low'] = high < low
+                if open is not None and close is not None:
+                    checks['high_below_body'] = high < np.maximum(open, close)
+                    checks['low_above_body'] = low > np.minimum(open, close)
+            for name, mask in checks.items():
+                report.ohlc_errors[name] = int(mask.sum())
+                invalid |= mask
+
+        if volume is not None:
+            volume = np.asarray(volume, dtype=float)
+            nan_volume = np.isnan(volume)
+            if nan_volume.any():
+                report.ohlc_errors['nan'] = int((nan_volume | checks['nan']).sum()) if prices \
+                    else int(nan_volume.sum())
+            negative = volume < 0
+            report.ohlc_errors['negative_volume'] = int(negative.sum())
+            invalid |= negative | nan_volume
+            runs = _runs(volume == 0)
+            report.zero_volume_runs = runs[runs[:, 1] >= self.min_zero_volume_run]
+
+        report.invalid_rows = np.flatnonzero(invalid)
+        report.elapsed_ms = (time.perf_counter() - started) * 1000
+        return report
+
+    # ------------------------------------------------------------------
+    # Repair
+    # ------------------------------------------------------------------
+
+    def repair(self, df: pd.DataFrame, fill: str = 'ffill', lower: pd.DataFrame = None,
+               keep: str = 'first', fix_ohlc: bool = True,
+               flag_column: Optional[str] = 'synthetic') -> pd.DataFrame:
+        """
+        Sort, deduplicate and reindex a candle frame onto its full interval grid
+
+        Args:
+            df: Frame with OHLCV columns and a 'timestamp' column or DatetimeIndex
+            fill: How missing bars are filled:
+                  'ffill' - flat bars at the previous close, zero volume
+                  'lower' - aggregated from `lower` where it covers the whole
+                            bar; remaining bars as 'ffill'
+                  'mask'  - NaN rows
+            lower: Lower-timeframe candles of the same symbol (fill='lower')
+            keep: Which duplicate wins ('first' like the fetcher, 'last' like the updater)
+            fix_ohlc: Widen high / low to contain open and close
+            flag_column: Bool column marking inserted bars (None: no column)
+
+        Returns:
+            Repaired frame in the input's layout (extra columns NaN on inserted bars)
+        """
+        if fill not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method: {fill} (use one of {FILL_METHODS})")
+        if fill == 'lower' and lower is None:
+            raise ValueError("fill='lower' needs the lower-timeframe candles")
+        if keep not in ('first', 'last'):
+            raise ValueError(f"keep must be 'first' or 'last', got {keep}")
+
+        times = timestamps_ms(df)
+        if len(times) == 0:
+            return df.copy()
+        step = self.interval_ms
+
+        # Sort (stable, so 'first' / 'last' follow the input order) and deduplicate
+        order = np.argsort(times, kind='stable')
+        ordered = times[order]
+        unique = np.empty(len(ordered), dtype=bool)
+        if keep == 'first':
+            unique[0] = True
+            unique[1:] = ordered[1:] != ordered[:-1]
+        else:
+            unique[-1] = True
+            unique[:-1] = ordered[1:] != ordered[:-1]
+        rows, ordered = order[unique], ordered[unique]
+
+        offsets = ordered - ordered[0]
+        if (offsets % step).any():
+            raise ValueError(f"{int(((offsets % step) != 0).sum())} timestamps are off the "
+                             f"{self.interval} grid; resample the series before repairing it")
+
+        # Source row of every grid slot (-1 for missing bars)
+        n_full = int(offsets[-1] // step) + 1
+        source = np.full(n_full, -1, dtype=np.int64)
+        source[offsets // step] = rows
+        missing = source < 0
+        grid = ordered[0] + np.arange(n_full, dtype=np.int64) * step
+
+        columns = {}
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if col == 'timestamp':
+                columns[col] = _restore_timestamps(grid, df[col])
+                continue
+            if values.dtype.kind in 'iub':
+                values = values.astype(float)
+            taken = values[np.maximum(source, 0)]
+            if missing.any():
+                taken[missing] = np.nan if taken.dtype.kind == 'f' else None
+            columns[col] = taken
+
+        if fill == 'lower' and missing.any():
+            self._fill_from_lower(columns, grid, missing, lower)
+        if fill in ('ffill', 'lower') and missing.any() and 'close' in columns:
+            self._fill_flat(columns, missing)
+
+        if fix_ohlc and all(c in columns for c in ('open', 'high', 'low', 'close')):
+            body_high = np.fmax(columns['open'], columns['close'])
+            body_low = np.fmin(columns['open'], columns['close'])
+            columns['high'] = np.fmax(columns['high'], body_high)
+            columns['low'] = np.fmin(columns['low'], body_low)
+
+        if flag_column:
+            columns[flag_column] = missing
+
+        if 'timestamp' in df.columns:
+            return pd.DataFrame(columns)
+        index = _datetimes_like(grid, df.index).rename(df.index.name)
+        return pd.DataFrame(columns, index=index)
+
+    def _fill_flat(self, columns: Dict[str, np.ndarray], missing: np.ndarray):
+        """Still-empty bars → open = high = low = close = previous close, volume 0"""
+        close = columns['close']
+        empty = missing & np.isnan(close)
+        if not empty.any():
+            return
+        # Position of the last real close at or before every bar
+        known = np.where(np.isnan(close), 0, np.arange(len(close)))
+        previous = close[np.maximum.accumulate(known)]
+        for col in ('open', 'high', 'low', 'close'):
+            if col in columns:
+                columns[col][empty] = previous[empty]
+        if 'volume' in columns:
+            columns['volume'][empty] = 0.0
+
+    def _fill_from_lower(self, columns: Dict[str, np.ndarray], grid: np.ndarray,
+                         missing: np.ndarray, lower: pd.DataFrame):
+        """Missing bars whose whole span is covered by the lower timeframe → aggregated bars"""
+        lower_times = timestamps_ms(lower)
+        order = np.argsort(lower_times, kind='stable')
+        lower_times = lower_times[order]
+        keep = np.concatenate(([True], lower_times[1:] != lower_times[:-1]))
+        lower_times, order = lower_times[keep], order[keep]
+        if len(lower_times) < 2:
+            return
+
+        lower_step = int(np.median(np.diff(lower_times)))
+        if lower_step <= 0 or self.interval_ms % lower_step:
+            raise ValueError(f"Lower timeframe ({lower_step} ms) does not divide {self.interval}")
+        per_bar = self.interval_ms // lower_step
+
+        slot = (lower_times - grid[0]) // self.interval_ms
+        inside = (lower_times >= grid[0]) & (slot < len(grid))
+        inside[inside] &= missing[slot[inside]]
+        if not inside.any():
+            return
+        slot, picked = slot[inside], order[inside]
+
+        starts = np.flatnonzero(np.concatenate(([True], slot[1:] != slot[:-1])))
+        counts = np.diff(np.concatenate((starts, [len(slot)])))
+        complete = counts == per_bar
+        if not complete.any():
+            return
+        targets = slot[starts[complete]]
+
+        lower_cols = {col: lower[col].to_numpy(dtype=float)[picked] for col in OHLCV_COLUMNS
+                      if col in lower.columns and col in columns}
+        for col, values in lower_cols.items():
+            if col == 'open':
+                agg = values[starts]
+            elif col == 'high':
+                agg = np.maximum.reduceat(values, starts)
+            elif col == 'low':
+                agg = np.minimum.reduceat(values, starts)
+            elif col == 'close':
+                agg = values[starts + counts - 1]
+            else:
+                agg = np.add.reduceat(values, starts)
+            columns[col][targets] = agg[complete]
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Concurrent Candle Fetch Pipeline - Rate-Limited Historical Downloads
+
+HyperliquidFetcher used to fetch 5000-candle batches one at a time with a
+fixed 1 second sleep in between, one timeframe after the other. The
+pipeline keeps several batches in flight across all timeframes while
+staying inside the exchange's REST weight budget:
+- TokenBucket meters request weight (Hyperliquid: 1200 per minute per IP;
+  candleSnapshot costs 20 plus 1 per 60 candles returned)
+- A shared semaphore bounds in-flight requests across every timeframe
+- 429 / 5xx / connection errors are retried with jittered exponential
+  backoff; a 429 also empties the bucket so every worker backs off
+- Batches complete in any order and are handed back per timeframe in
+  batch order (for checkpoints) and as one chronological candle list
+
+HTTP calls run on a small thread pool with requests, so no async HTTP
+client is needed. Point base_url at MockCandleServer to exercise it
+offline.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+
+API_URL = 'https://api.hyperliquid.xyz'
+
+# Hyperliquid REST limits (per IP)
+WEIGHT_BUDGET = 1200           # weight per window
+BUDGET_WINDOW_SECONDS = 60.0
+INFO_REQUEST_WEIGHT = 20
+CANDLES_PER_EXTRA_WEIGHT = 60  # candleSnapshot: +1 weight per 60 candles returned
+
+Window = Tuple[int, int]  # (start_ms, end_ms)
+
+
+def candle_request_weight(n_candles: int) -> int:
+    """REST weight of a candleSnapshot request returning n_candles"""
+    return INFO_REQUEST_WEIGHT + math.ceil(max(n_candles, 0) / CANDLES_PER_EXTRA_WEIGHT)
+
+
+class TokenBucket:
+    """
+    Async token bucket over request weight
+
+    Tokens refill continuously at capacity / window_seconds. acquire()
+    waits in FIFO order until enough weight is available; settle()
+    corrects a reservation once the real cost is known (the bucket may go
+    into debt, which later callers wait out).
+    """
+
+    def __init__(self, capacity: float = WEIGHT_BUDGET, window_seconds: float = BUDGET_WINDOW_SECONDS):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / window_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: float) -> float:
+        """
+        Reserve weight, waiting for the bucket to refill if needed
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        weight = min(float(weight), self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return waited
+                delay = (weight - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def settle(self, reserved: float, actual: float):
+        """Charge the difference between the reserved and the actual weight"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - (actual - reserved))
+
+    def drain(self):
+        """Empty the bucket (the server said we are over budget)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class CandleFetchPipeline:
+    """
+    Fetch many candle windows concurrently under a shared weight budget
+
+    Usage:
+        pipeline = CandleFetchPipeline(max_in_flight=4)
+        candles = pipeline.run('ETH', {'1m': windows_1m, '5m': windows_5m})
+        pipeline.print_stats()
+    """
+
+    def __init__(self,
+                 base_url: str = API_URL,
+                 weight_budget: float = WEIGHT_BUDGET,
+                 budget_window_seconds: float = BUDGET_WINDOW_SECONDS,
+                 max_in_flight: int = 4,
+                 max_retries: int = 6,
+                 backoff_base: float = 0.5,
+                 backoff_cap: float = 30.0,
+                 timeout: float = 30.0,
+                 verbose: bool = True):
+        """
+        Initialize pipeline.
+
+        Args:
+            base_url: API root; POSTs go to {base_url}/info
+            weight_budget: Weight allowed per budget window (1200 on Hyperliquid)
+            budget_window_seconds: Length of the budget window
+            max_in_flight: Requests in flight across all timeframes
+            max_retries: Retries per batch before it is given up as empty
+            backoff_base: First retry delay in seconds (doubles per attempt)
+            backoff_cap: Longest retry delay in seconds
+            timeout: HTTP timeout per request
+            verbose: Print one line per completed batch
+        """
+        self.base_url = base_url.rstrip('/')
+        self.weight_budget = weight_budget
+        self.budget_window_seconds = budget_window_seconds
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.verbose = verbose
+
+        self._local = threading.local()
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'requests': 0, 'batches': 0, 'retries': 0, 'rate_limited': 0, 'failed': 0,
+                'candles': 0, 'weight': 0, 'wait_s': 0.0, 'elapsed_s': 0.0}
+
+    def _session(self) -> requests.Session:
+        """One HTTP session per worker thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _post(self, coin: str, interval: str, window: Window) -> requests.Response:
+        payload = {'type': 'candleSnapshot',
+                   'req': {'coin': coin, 'interval': interval,
+                           'startTime': int(window[0]), 'endTime': int(window[1])}}
+        return self._session().post(f'{self.base_url}/info', json=payload, timeout=self.timeout)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    @staticmethod
+    def expected_candles(interval_ms: int, window: Window, max_candles: int = 5000) -> int:
+        return min(max_candles, (window[1] - window[0]) // interval_ms + 1)
+
+    async def _fetch_batch(self, coin: str, interval: str, interval_ms: int, window: Window,
+                           bucket: TokenBucket, in_flight: asyncio.Semaphore,
+                           executor: ThreadPoolExecutor) -> List[Dict]:
+        """Fetch one window, retrying until it succeeds or retries run out"""
+        loop = asyncio.get_running_loop()
+        reserved = candle_request_weight(self.expected_candles(interval_ms, window))
+
+        for attempt in range(self.max_retries + 1):
+            async with in_flight:
+                self.stats['wait_s'] += await bucket.acquire(reserved)
+                self.stats['requests'] += 1
+                try:
+                    response = await loop.run_in_executor(executor, self._post, coin, interval, window)
+                except requests.RequestException as e:
+                    bucket.settle(reserved, INFO_REQUEST_WEIGHT)
+                    status, retry_after, error = None, None, str(e)
+                else:
+                    status, retry_after = response.status_code, response.headers.get('Retry-After')
+                    error = f'HTTP {status}'
+                    if status == 200:
+                        candles = response.json() or []
+                        weight = candle_request_weight(len(candles))
+                        bucket.settle(reserved, weight)
+                        self.stats['weight'] += weight
+                        self.stats['candles'] += len(candles)
+                        return candles
+                    bucket.settle(reserved, INFO_REQUEST_WEIGHT)
+                    if status == 429:
+                        self.stats['rate_limited'] += 1
+                        bucket.drain()
+                    elif status < 500:
+                        break  # bad request: retrying will not help
+                self.stats['weight'] += INFO_REQUEST_WEIGHT
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        self.stats['failed'] += 1
+        if self.verbose:
+            print(f"   ❌ {interval} batch {window[0]}-{window[1]} failed ({error}), continuing without it")
+        return []
+
+    async def run_async(self,
+                        coin: str,
+                        jobs: Dict[str, List[Window]],
+                        intervals_ms: Dict[str, int],
+                        on_batch: Optional[Callable[[str, int, List[Dict]], None]] = None
+                        ) -> Dict[str, List[Dict]]:
+        """
+        Fetch every window of every timeframe
+
+        Args:
+            coin: Coin name (e.g. 'ETH')
+            jobs: {interval: [(start_ms, end_ms), ...]} in batch order
+            intervals_ms: Candle length per interval in milliseconds
+            on_batch: Called as on_batch(interval, batch_position, candles) in
+                batch order per interval, as soon as all earlier batches are in
+
+        Returns:
+            {interval: candles} - deduplicated and sorted by open time
+        """
+        bucket = TokenBucket(self.weight_budget, self.budget_window_seconds)
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        results = {interval: [None] * len(windows) for interval, windows in jobs.items()}
+        next_ordered = {interval: 0 for interval in jobs}
+        total = sum(len(windows) for windows in jobs.values())
+
+        async def run_one(interval: str, position: int, window: Window):
+            candles = await self._fetch_batch(coin, interval, intervals_ms[interval], window,
+                                              bucket, in_flight, executor)
+            results[interval][position] = candles
+            self.stats['batches'] += 1
+            if self.verbose:
+                print(f"   ✅ {interval} batch {position + 1}/{len(jobs[interval])}: {len(candles)} candles "
+                      f"| {self.stats['batches']}/{total} done")
+
+            # Hand completed batches back in batch order
+            ordered = next_ordered[interval]
+            while ordered < len(results[interval]) and results[interval][ordered] is not None:
+                if on_batch is not None:
+                    on_batch(interval, ordered, results[interval][ordered])
+                ordered += 1
+            next_ordered[interval] = ordered
+
+        # Round-robin across timeframes so short ones finish early
+        depth = max((len(windows) for windows in jobs.values()), default=0)
+        order = [(interval, position, windows[position])
+                 for position in range(depth)
+                 for interval, windows in jobs.items() if position < len(windows)]
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            await asyncio.gather(*(run_one(*task) for task in order))
+
+        merged = {}
+        for interval, batches in results.items():
+            by_time = {}
+            for candles in batches:
+                for candle in candles:
+                    by_time.setdefault(candle['t'], candle)
+            merged[interval] = [by_time[t] for t in sorted(by_time)]
+        return merged
+
+    def run(self, coin: str, jobs: Dict[str, List[Window]], intervals_ms: Dict[str, int],
+            on_batch: Optional[Callable[[str, int, List[Dict]], None]] = None) -> Dict[str, List[Dict]]:
+        """Synchronous wrapper around run_async()"""
+        self.stats = self._empty_stats()
+        start = time.monotonic()
+        try:
+            return asyncio.run(self.run_async(coin, jobs, intervals_ms, on_batch))
+        finally:
+            self.stats['elapsed_s'] = time.monotonic() - start
+
+    def get_stats(self) -> Dict:
+        """Counters plus achieved throughput against the weight budget"""
+        stats = dict(self.stats)
+        elapsed = stats['elapsed_s'] or float('nan')
+        # A full bucket at the start plus the refill over the run
+        budget_rate = (self.weight_budget + self.weight_budget / self.budget_window_seconds * elapsed) / elapsed
+        stats['requests_per_s'] = stats['requests'] / elapsed
+        stats['weight_per_s'] = stats['weight'] / elapsed
+        stats['budget_weight_per_s'] = budget_rate
+        stats['budget_used_pct'] = stats['weight_per_s'] / budget_rate * 100
+        # Requests/s the budget allows at the average weight we actually paid
+        avg_weight = stats['weight'] / stats['requests'] if stats['requests'] else INFO_REQUEST_WEIGHT
+        stats['budget_requests_per_s'] = budget_rate / avg_weight
+        return stats
+
+    def print_stats(self):
+        """Print achieved request rate against the budget"""
+        stats = self.get_stats()
+        print(f"\n   📡 Fetch: {stats['requests']} requests for {stats['batches']} batches "
+              f"({stats['candles']:,} candles) in {stats['elapsed_s']:.1f}s")
+        print(f"   ⚡ {stats['requests_per_s']:.2f} req/s of {stats['budget_requests_per_s']:.2f} allowed | "
+              f"{stats['weight_per_s']:.1f} weight/s of {stats['budget_weight_per_s']:.1f} "
+              f"({stats['budget_used_pct']:.0f}% of budget)")
+        print(f"   🔁 {stats['retries']} retries | {stats['rate_limited']} rate-limited | "
+              f"{stats['failed']} failed | {stats['wait_s']:.1f}s waiting for budget")
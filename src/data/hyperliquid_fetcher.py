@@ -4,7 +4,6 @@ Hyperliquid Historical Data Fetcher - Enhanced Version
 Fetches 1 year of OHLCV data across 6 timeframes with resume capability
 """
 
-import json
 import os
 import time
 from datetime import datetime, timedelta
@@ -15,6 +14,11 @@ import numpy as np
 from hyperliquid.info import Info
 from dotenv import load_dotenv
 
+from .checkpoint_store import SegmentCheckpoint, candles_to_array, dedupe_candles
+from .csv_writer import write_csv
+from .data_validator import CandleValidator
+from .fetch_pipeline import API_URL, CandleFetchPipeline
+
 load_dotenv()
 
 
@@ -27,6 +31,8 @@ class HyperliquidFetcher:
     - Resume capability with checkpoints
     - Support for 6 timeframes: 1m, 3m, 5m, 15m, 30m, 1h
     - Up to 1 year of historical data
+    - Concurrent, rate-limited fetching across timeframes (fetch_timeframes)
+    - Gap / duplicate / OHLC validation of every fetched series
     - Progress tracking and error handling
     """
 
@@ -44,19 +50,45 @@ class HyperliquidFetcher:
     MAX_CANDLES_PER_REQUEST = 5000
     RATE_LIMIT_DELAY_SECONDS = 1.0  # Delay between batches
 
-    def __init__(self, symbol: str = 'ETH', checkpoint_dir: str = 'trading_data/.checkpoints'):
+    # Ribbon EMAs, including all EMAs needed for important crossovers:
+    # 8/21 (Fibonacci), 9/21 (Short-term), 12/26 (MACD), 20/50 (Intermediate), 50/200 (Golden/Death)
+    RIBBON_PERIODS = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
+                      85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
+
+    # Important crossover pairs (fast, slow)
+    CROSS_PAIRS = [
+        (5, 10),    # Fast scalping
+        (10, 20),   # Scalping/day trading
+        (8, 21),    # Fibonacci-based
+        (9, 21),    # Short-term/scalping
+        (12, 26),   # MACD default (swing trading)
+        (20, 50),   # Intermediate (swing trading)
+        (50, 100),  # Medium-term
+        (50, 200),  # Golden/Death cross (institutional)
+    ]
+
+    # EMA color codes (int8) and their CSV names, indexed by code + 1
+    COLOR_RED, COLOR_NEUTRAL, COLOR_GREEN = -1, 0, 1
+    COLOR_NAMES = np.array(['red', 'neutral', 'green'], dtype=object)
+
+    def __init__(self, symbol: str = 'ETH', checkpoint_dir: str = 'trading_data/.checkpoints',
+                 api_url: str = None):
         """
         Initialize fetcher
 
         Args:
             symbol: Trading symbol (e.g., 'ETH', 'BTC')
             checkpoint_dir: Directory for checkpoint files
+            api_url: API root (default: mainnet; e.g. a MockCandleServer url)
         """
         self.symbol = symbol
         self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
-        self.info = Info(skip_ws=True)
+        self.api_url = api_url or API_URL
+        self.info = Info(base_url=api_url, skip_ws=True)
+        self.last_fetch_stats = None
+        self.last_validation = {}   # interval → ValidationReport of the last fetch
 
     def fetch_candles(self, interval: str, start_time: int, end_time: int) -> List[Dict]:
         """
@@ -102,18 +134,19 @@ class HyperliquidFetcher:
         """
         print(f"\n🔄 Fetching {days_back} days of {interval} data...")
 
-        # Check for existing checkpoint
-        checkpoint_file = self.checkpoint_dir / f"{self.symbol}_{interval}_checkpoint.json"
-        if use_checkpoint and checkpoint_file.exists():
+        # Check for existing checkpoint (segments are only read at the end)
+        checkpoint = self.checkpoint(interval)
+        resumed = use_checkpoint and checkpoint.exists()
+        if resumed:
             print(f"   📂 Found checkpoint, resuming...")
-            checkpoint = self.load_checkpoint(checkpoint_file)
-            all_candles = checkpoint['candles']
-            start_from_batch = checkpoint['last_batch'] + 1
-            total_batches = checkpoint['total_batches']
+            start_from_batch = checkpoint.last_batch + 1
+            total_batches = checkpoint.total_batches
         else:
-            all_candles = []
             start_from_batch = 1
             total_batches = self._calculate_total_batches(interval, days_back)
+            if use_checkpoint:
+                checkpoint.begin(total_batches)
+        all_candles = []
 
         # Calculate time range
         interval_ms = self.INTERVALS_MS[interval]
@@ -149,15 +182,9 @@ class HyperliquidFetcher:
             else:
                 print(f"   ⚠️  No data for this batch")
 
-            # Save checkpoint every 10 batches
-            if batch_num % 10 == 0 and use_checkpoint:
-                self.save_checkpoint(
-                    checkpoint_file,
-                    all_candles,
-                    batch_num,
-                    total_batches
-                )
-                print(f"   💾 Checkpoint saved")
+            # Append this batch to the checkpoint
+            if use_checkpoint:
+                checkpoint.append(batch_num, candles)
 
             # Move to next batch
             current_end = current_start - interval_ms
@@ -166,22 +193,119 @@ class HyperliquidFetcher:
             # Rate limiting
             time.sleep(self.RATE_LIMIT_DELAY_SECONDS)
 
-        # Remove duplicates and sort
+        # Merge resumed segments (earlier batches first), remove duplicates and sort
+        if resumed:
+            all_candles = checkpoint.load_candles(up_to=start_from_batch - 1) + all_candles
         all_candles = self._deduplicate_candles(all_candles)
-        all_candles.sort(key=lambda x: x['t'])
 
         # Clean up checkpoint
-        if use_checkpoint and checkpoint_file.exists():
-            checkpoint_file.unlink()
+        if use_checkpoint:
+            checkpoint.clear()
 
         print(f"\n   ✅ Total candles fetched: {len(all_candles)}")
         if all_candles:
             first_time = datetime.fromtimestamp(all_candles[0]['t'] / 1000)
             last_time = datetime.fromtimestamp(all_candles[-1]['t'] / 1000)
             print(f"   📅 Range: {first_time.strftime('%Y-%m-%d')} to {last_time.strftime('%Y-%m-%d')}")
+            self.validate_candles(interval, all_candles)
 
         return all_candles
 
+    def fetch_timeframes(
+        self,
+        intervals: List[str],
+        days_back: int = 365,
+        use_checkpoint: bool = True,
+        max_in_flight: int = 4
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch several timeframes at once through the rate-limited pipeline
+
+        Same batches, checkpoints and output as fetch_historical_data() per
+        interval, but up to max_in_flight batch requests (across all
+        timeframes) run concurrently under the exchange's weight budget
+        instead of one per second.
+
+        Args:
+            intervals: Timeframes ('1m', '3m', '5m', '15m', '30m', '1h')
+            days_back: Number of days to fetch (max 365)
+            use_checkpoint: Use checkpoints for resume capability
+            max_in_flight: Concurrent batch requests across all timeframes
+
+        Returns:
+            {interval: candles} - deduplicated and sorted by open time
+        """
+        print(f"\n🔄 Fetching {days_back} days of {', '.join(intervals)} data "
+              f"({max_in_flight} requests in flight)...")
+
+        end_time = int(time.time() * 1000)
+        jobs, progress = {}, {}
+        for interval in intervals:
+            checkpoint = self.checkpoint(interval)
+            if use_checkpoint and checkpoint.exists():
+                state = {'resumed': True, 'first_batch': checkpoint.last_batch + 1,
+                         'total_batches': checkpoint.total_batches}
+                print(f"   📂 {interval}: resuming at batch {state['first_batch']}/{state['total_batches']}")
+            else:
+                state = {'resumed': False, 'first_batch': 1,
+                         'total_batches': self._calculate_total_batches(interval, days_back)}
+                if use_checkpoint:
+                    checkpoint.begin(state['total_batches'])
+            state.update(candles=[], checkpoint=checkpoint)
+            progress[interval] = state
+            jobs[interval] = self._batch_windows(interval, days_back, end_time,
+                                                 state['first_batch'], state['total_batches'])
+
+        def on_batch(interval: str, position: int, candles: List[Dict]):
+            # Called in batch order per interval, so checkpoints stay contiguous
+            state = progress[interval]
+            state['candles'].extend(candles)
+            if use_checkpoint:
+                state['checkpoint'].append(state['first_batch'] + position, candles)
+
+        pipeline = CandleFetchPipeline(base_url=self.api_url, max_in_flight=max_in_flight)
+        pipeline.run(self.symbol, jobs, self.INTERVALS_MS, on_batch=on_batch)
+        pipeline.print_stats()
+        self.last_fetch_stats = pipeline.get_stats()
+
+        results = {}
+        for interval, state in progress.items():
+            candles = state['candles']
+            if state['resumed']:
+                candles = state['checkpoint'].load_candles(up_to=state['first_batch'] - 1) + candles
+            candles = self._deduplicate_candles(candles)
+            results[interval] = candles
+
+            if use_checkpoint:
+                state['checkpoint'].clear()
+
+            print(f"   ✅ {interval}: {len(candles)} candles")
+            if candles:
+                self.validate_candles(interval, candles)
+        return results
+
+    def _batch_windows(self, interval: str, days_back: int, end_time: int,
+                       start_from_batch: int = 1, total_batches: int = None) -> List[tuple]:
+        """(start_ms, end_ms) of every batch fetch_historical_data() would request"""
+        interval_ms = self.INTERVALS_MS[interval]
+        start_time = end_time - (days_back * 24 * 60 * 60 * 1000)
+        batch_duration_ms = self.MAX_CANDLES_PER_REQUEST * interval_ms
+        if total_batches is None:
+            total_batches = self._calculate_total_batches(interval, days_back)
+
+        current_end = end_time
+        if start_from_batch > 1:
+            current_end = end_time - (start_from_batch - 1) * batch_duration_ms
+
+        windows = []
+        batch_num = start_from_batch
+        while current_end > start_time and batch_num <= total_batches:
+            current_start = max(start_time, current_end - batch_duration_ms)
+            windows.append((current_start, current_end))
+            current_end = current_start - interval_ms
+            batch_num += 1
+        return windows
+
     def _calculate_total_batches(self, interval: str, days_back: int) -> int:
         """Calculate total number of batches needed"""
         interval_ms = self.INTERVALS_MS[interval]
@@ -190,41 +314,37 @@ class HyperliquidFetcher:
         return int(np.ceil(total_duration_ms / batch_duration_ms))
 
     def _deduplicate_candles(self, candles: List[Dict]) -> List[Dict]:
-        """Remove duplicate candles based on timestamp"""
-        seen_timestamps = set()
-        unique_candles = []
+        """Remove duplicate candles based on timestamp (first wins) and sort by time"""
+        return dedupe_candles(candles)
 
-        for candle in candles:
-            t = candle['t']
-            if t not in seen_timestamps:
-                seen_timestamps.add(t)
-                unique_candles.append(candle)
+    def validate_candles(self, interval: str, candles: List[Dict]):
+        """
+        Check fetched candles for gaps, duplicates and OHLC errors
 
-        return unique_candles
+        The report is kept in last_validation[interval]; it is printed when
+        something is off (outages show up as gaps here instead of flowing
+        silently into the EMAs).
 
-    def save_checkpoint(
-        self,
-        checkpoint_file: Path,
-        candles: List[Dict],
-        last_batch: int,
-        total_batches: int
-    ):
-        """Save progress checkpoint"""
-        checkpoint = {
-            'symbol': self.symbol,
-            'candles': candles,
-            'last_batch': last_batch,
-            'total_batches': total_batches,
-            'saved_at': datetime.now().isoformat()
-        }
-
-        with open(checkpoint_file, 'w') as f:
-            json.dump(checkpoint, f)
-
-    def load_checkpoint(self, checkpoint_file: Path) -> Dict:
-        """Load progress checkpoint"""
-        with open(checkpoint_file, 'r') as f:
-            return json.load(f)
+        Args:
+            interval: Timeframe
+            candles: Deduplicated, sorted candles
+
+        Returns:
+            ValidationReport (None for calendar intervals such as '1M')
+        """
+        if not has_fixed_grid(interval):
+            return None
+        arr = candles_to_array(candles)
+        report = CandleValidator(interval).validate_arrays(
+            arr['t'], open=arr['o'], high=arr['h'], low=arr['l'], close=arr['c'], volume=arr['v'])
+        self.last_validation[interval] = report
+        if not report.ok:
+            print(report.summary())
+        return report
+
+    def checkpoint(self, interval: str) -> SegmentCheckpoint:
+        """Append-only checkpoint for one timeframe (one binary segment per batch)"""
+        return SegmentCheckpoint(self.checkpoint_dir, self.symbol, interval)
 
     def calculate_emas(
         self,
@@ -236,39 +356,51 @@ class HyperliquidFetcher:
 
         Args:
             candles: List of candle dictionaries
-            periods: List of EMA periods (default: all 28 EMAs)
+            periods: List of EMA periods (default: RIBBON_PERIODS)
 
         Returns:
             DataFrame with EMA columns
         """
         if periods is None:
-            # Include all EMAs needed for important crossovers:
-            # 8/21 (Fibonacci), 9/21 (Short-term), 12/26 (MACD), 20/50 (Intermediate), 50/200 (Golden/Death)
-            periods = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
-                      85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
+            periods = self.RIBBON_PERIODS
 
         print(f"\n📈 Calculating {len(periods)} EMAs...")
 
-        # Create DataFrame with OHLCV data
-        df = pd.DataFrame([
-            {
-                'timestamp': c['t'],
-                'open': float(c['o']),
-                'high': float(c['h']),
-                'low': float(c['l']),
-                'close': float(c['c']),
-                'volume': float(c['v'])
-            }
-            for c in candles
-        ])
-
-        # Calculate EMAs
-        for period in periods:
-            df[f'ema_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
+        # Create DataFrame with OHLCV data (columns parsed once, not per candle dict)
+        arr = candles_to_array(candles)
+        df = pd.DataFrame({
+            'timestamp': arr['t'],
+            'open': arr['o'],
+            'high': arr['h'],
+            'low': arr['l'],
+            'close': arr['c'],
+            'volume': arr['v'],
+        })
+
+        # Calculate EMAs, added as one block of columns
+        emas = {f'ema_{period}': df['close'].ewm(span=period, adjust=False).mean()
+                for period in periods}
+        df = pd.concat([df, pd.DataFrame(emas, index=df.index)], axis=1)
 
         print(f"   ✅ EMAs calculated")
         return df
 
+    def _ema_matrix(self, df: pd.DataFrame, periods: List[int]) -> np.ndarray:
+        """(bars × periods) float matrix of the ema_{p} columns"""
+        return df[[f'ema_{p}' for p in periods]].to_numpy(dtype=float)
+
+    def _color_matrix(self, df: pd.DataFrame, periods: List[int]) -> np.ndarray:
+        """(bars × periods) int8 color codes; accepts legacy 'green'/'red' string columns"""
+        codes = np.empty((len(df), len(periods)), dtype=np.int8)
+        for j, p in enumerate(periods):
+            col = df[f'ema_{p}_color']
+            if col.dtype == object:
+                values = col.to_numpy()
+                codes[:, j] = (values == 'green').astype(np.int8) - (values == 'red').astype(np.int8)
+            else:
+                codes[:, j] = col.to_numpy()
+        return codes
+
     def determine_ema_colors(
         self,
         df: pd.DataFrame,
@@ -277,9 +409,12 @@ class HyperliquidFetcher:
         """
         Determine EMA colors based on price position
 
-        GREEN: price > EMA (bullish)
-        RED: price < EMA (bearish)
-        NEUTRAL: price == EMA
+        GREEN: price > EMA (bullish)   → COLOR_GREEN (1)
+        RED: price < EMA (bearish)     → COLOR_RED (-1)
+        NEUTRAL: price == EMA          → COLOR_NEUTRAL (0)
+
+        Colors are stored as int8 codes; save_to_csv writes them as
+        'green' / 'red' / 'neutral'.
 
         Args:
             df: DataFrame with EMA columns
@@ -289,26 +424,16 @@ class HyperliquidFetcher:
             DataFrame with color columns added
         """
         if periods is None:
-            # Include all EMAs needed for important crossovers:
-            # 8/21 (Fibonacci), 9/21 (Short-term), 12/26 (MACD), 20/50 (Intermediate), 50/200 (Golden/Death)
-            periods = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
-                      85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
+            periods = self.RIBBON_PERIODS
 
-        for period in periods:
-            ema_col = f'ema_{period}'
-            color_col = f'ema_{period}_color'
-
-            df[color_col] = np.where(
-                df['close'] > df[ema_col],
-                'green',
-                np.where(
-                    df['close'] < df[ema_col],
-                    'red',
-                    'neutral'
-                )
-            )
+        close = df['close'].to_numpy(dtype=float)[:, None]
+        emas = self._ema_matrix(df, periods)
+        # NaN compares False both ways → neutral, as before
+        codes = (close > emas).astype(np.int8) - (close < emas).astype(np.int8)
 
-        return df
+        color_cols = [f'ema_{p}_color' for p in periods]
+        colors = pd.DataFrame(codes, columns=color_cols, index=df.index)
+        return pd.concat([df.drop(columns=color_cols, errors='ignore'), colors], axis=1)
 
     def analyze_ribbon_state(
         self,
@@ -333,43 +458,23 @@ class HyperliquidFetcher:
             DataFrame with ribbon_state column
         """
         if periods is None:
-            # Include all EMAs needed for important crossovers:
-            # 8/21 (Fibonacci), 9/21 (Short-term), 12/26 (MACD), 20/50 (Intermediate), 50/200 (Golden/Death)
-            periods = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
-                      85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
-
-        # Count green/red EMAs per row
-        green_counts = []
-        for idx in range(len(df)):
-            green_count = sum(
-                1 for p in periods
-                if df.loc[idx, f'ema_{p}_color'] == 'green'
-            )
-            green_counts.append(green_count)
-
-        df['green_count'] = green_counts
-        total_emas = len(periods)
-        df['alignment_pct'] = df['green_count'] / total_emas
-
-        # Determine ribbon state
-        df['ribbon_state'] = np.where(
-            df['alignment_pct'] >= 0.85,
-            'all_green',
-            np.where(
-                df['alignment_pct'] <= 0.15,
-                'all_red',
-                np.where(
-                    df['alignment_pct'] >= 0.65,
-                    'mixed_green',
-                    np.where(
-                        df['alignment_pct'] <= 0.35,
-                        'mixed_red',
-                        'mixed'
-                    )
-                )
-            )
-        )
-
+            periods = self.RIBBON_PERIODS
+
+        # Count green EMAs per row over the (bars × periods) color matrix
+        green_count = (self._color_matrix(df, periods) == self.COLOR_GREEN).sum(axis=1)
+        alignment_pct = green_count / len(periods)
+
+        # Determine ribbon state (first matching condition wins)
+        ribbon_state = np.select(
+            [alignment_pct >= 0.85, alignment_pct <= 0.15,
+             alignment_pct >= 0.65, alignment_pct <= 0.35],
+            ['all_green', 'all_red', 'mixed_green', 'mixed_red'],
+            default='mixed'
+        ).astype(object)
+
+        df['green_count'] = green_count
+        df['alignment_pct'] = alignment_pct
+        df['ribbon_state'] = ribbon_state
         return df
 
     def detect_ema_crossovers(
@@ -388,52 +493,26 @@ class HyperliquidFetcher:
             DataFrame with crossover columns
         """
         if cross_pairs is None:
-            # Important crossover pairs:
-            cross_pairs = [
-                (5, 10),    # Fast scalping
-                (10, 20),   # Scalping/day trading
-                (8, 21),    # Fibonacci-based
-                (9, 21),    # Short-term/scalping
-                (12, 26),   # MACD default (swing trading)
-                (20, 50),   # Intermediate (swing trading)
-                (50, 100),  # Medium-term
-                (50, 200),  # Golden/Death cross (institutional)
-            ]
+            cross_pairs = self.CROSS_PAIRS
 
         print(f"\n🔀 Detecting {len(cross_pairs)} EMA crossover pairs...")
 
-        for fast, slow in cross_pairs:
-            fast_col = f'ema_{fast}'
-            slow_col = f'ema_{slow}'
-            cross_col = f'ema_cross_{fast}_{slow}'
+        pairs = [(fast, slow) for fast, slow in cross_pairs
+                 if f'ema_{fast}' in df.columns and f'ema_{slow}' in df.columns]
+        if pairs:
+            fast = self._ema_matrix(df, [f for f, _ in pairs])
+            slow = self._ema_matrix(df, [s for _, s in pairs])
 
-            if fast_col not in df.columns or slow_col not in df.columns:
-                continue
+            # Position per pair: fast above slow (NaN counts as below, as before)
+            above = fast > slow
+            # Crossovers are changes of position; the first bar has no previous one
+            codes = np.zeros(above.shape, dtype=np.int8)
+            codes[1:] = above[1:].astype(np.int8) - above[:-1].astype(np.int8)
 
-            # Determine position
-            df[f'_pos_{fast}_{slow}'] = np.where(
-                df[fast_col] > df[slow_col],
-                'above',
-                'below'
-            )
-
-            # Detect crossovers
-            prev_pos = df[f'_pos_{fast}_{slow}'].shift(1)
-
-            df[cross_col] = 'none'
-            # Golden cross: fast crosses above slow
-            df.loc[
-                (df[f'_pos_{fast}_{slow}'] == 'above') & (prev_pos == 'below'),
-                cross_col
-            ] = 'golden_cross'
-            # Death cross: fast crosses below slow
-            df.loc[
-                (df[f'_pos_{fast}_{slow}'] == 'below') & (prev_pos == 'above'),
-                cross_col
-            ] = 'death_cross'
-
-            # Clean up temp column
-            df.drop(columns=[f'_pos_{fast}_{slow}'], inplace=True)
+            names = np.array(['death_cross', 'none', 'golden_cross'], dtype=object)[codes + 1]
+            cross_cols = [f'ema_cross_{f}_{s}' for f, s in pairs]
+            crosses = pd.DataFrame(names, columns=cross_cols, index=df.index)
+            df = pd.concat([df.drop(columns=cross_cols, errors='ignore'), crosses], axis=1)
 
         print(f"   ✅ Crossovers detected")
         return df
@@ -453,59 +532,47 @@ class HyperliquidFetcher:
             periods: List of EMA periods
         """
         if periods is None:
-            # Include all EMAs needed for important crossovers:
-            # 8/21 (Fibonacci), 9/21 (Short-term), 12/26 (MACD), 20/50 (Intermediate), 50/200 (Golden/Death)
-            periods = [5, 8, 9, 10, 12, 15, 20, 21, 25, 26, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
-                      85, 90, 95, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 200]
+            periods = self.RIBBON_PERIODS
 
         print(f"\n💾 Saving to {output_file}...")
 
         # Create output directory
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-        # Prepare output DataFrame
-        output_df = df.copy()
-
-        # Convert timestamp to ISO format
-        output_df['timestamp'] = pd.to_datetime(
-            output_df['timestamp'],
-            unit='ms'
-        ).dt.strftime('%Y-%m-%dT%H:%M:%S')
-
-        # Add price column (same as close)
-        output_df['price'] = output_df['close']
-
-        # Rename EMA columns to MMA format (for compatibility)
-        rename_dict = {}
+        # Build the output frame column by column in its final order (no copy + rename)
+        # Timestamp in ISO format (whole seconds)
+        timestamps = np.datetime_as_string(
+            df['timestamp'].to_numpy(dtype=np.int64).astype('datetime64[ms]').astype('datetime64[s]'),
+            unit='s'
+        ).astype(object)
+        columns = {'timestamp': timestamps}
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            if col in df.columns:
+                columns[col] = df[col]
+        if 'close' in df.columns:
+            columns['price'] = df['close']  # same as close
+        if 'ribbon_state' in df.columns:
+            columns['ribbon_state'] = df['ribbon_state']
+
+        # EMA columns in MMA format (for compatibility); color codes become strings here
+        colored = [p for p in periods if f'ema_{p}_color' in df.columns]
+        names = self.COLOR_NAMES[self._color_matrix(df, colored) + 1] if colored else None
+        normal = np.full(len(df), 'normal', dtype=object)  # intensity placeholder
         for period in periods:
-            rename_dict[f'ema_{period}'] = f'MMA{period}_value'
-            rename_dict[f'ema_{period}_color'] = f'MMA{period}_color'
-            # Add intensity column (placeholder for now)
-            output_df[f'MMA{period}_intensity'] = 'normal'
+            if f'ema_{period}' in df.columns:
+                columns[f'MMA{period}_value'] = df[f'ema_{period}']
+            if period in colored:
+                columns[f'MMA{period}_color'] = names[:, colored.index(period)]
+            columns[f'MMA{period}_intensity'] = normal
 
-        output_df.rename(columns=rename_dict, inplace=True)
+        for col in df.columns:
+            if col.startswith('ema_cross_'):
+                columns[col] = df[col]
 
-        # Select columns in correct order
-        base_cols = ['timestamp', 'open', 'high', 'low', 'close', 'volume',
-                     'price', 'ribbon_state']
+        output_df = pd.DataFrame(columns, index=df.index)
 
-        ema_cols = []
-        for period in periods:
-            ema_cols.extend([
-                f'MMA{period}_value',
-                f'MMA{period}_color',
-                f'MMA{period}_intensity'
-            ])
-
-        cross_cols = [col for col in output_df.columns if col.startswith('ema_cross_')]
-
-        all_cols = base_cols + ema_cols + cross_cols
-
-        # Filter to only existing columns
-        final_cols = [col for col in all_cols if col in output_df.columns]
-
-        # Save CSV
-        output_df[final_cols].to_csv(output_file, index=False)
+        # Save CSV (same bytes as to_csv, formatted in row blocks)
+        write_csv(output_df, output_file)
 
         print(f"   ✅ Saved {len(output_df)} rows")
         print(f"   📅 First: {output_df['timestamp'].iloc[0]}")
@@ -522,6 +589,7 @@ def main():
     symbol = os.getenv('SYMBOL', 'ETH')
     days_back = int(os.getenv('DAYS_BACK', '365'))  # 1 year
     timeframes = os.getenv('TIMEFRAMES', '1m,3m,5m,15m,30m,1h').split(',')
+    max_in_flight = int(os.getenv('FETCH_MAX_IN_FLIGHT', '4'))
 
     print(f"\n📊 Symbol: {symbol}")
     print(f"📅 History: {days_back} days")
@@ -534,6 +602,14 @@ def main():
     ema_periods = [5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80,
                    85, 90, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145]
 
+    # Fetch all timeframes concurrently (rate-limited), then process each
+    all_candles = fetcher.fetch_timeframes(
+        timeframes,
+        days_back=days_back,
+        use_checkpoint=True,
+        max_in_flight=max_in_flight
+    )
+
     # Process each timeframe
     for interval in timeframes:
         print(f"\n{'=' * 80}")
@@ -541,12 +617,7 @@ def main():
         print(f"{'=' * 80}")
 
         try:
-            # Fetch candles
-            candles = fetcher.fetch_historical_data(
-                interval=interval,
-                days_back=days_back,
-                use_checkpoint=True
-            )
+            candles = all_candles.get(interval, [])
 
             if not candles:
                 print(f"   ⚠️  No candles fetched for {interval}, skipping...")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Incremental CSV Appends - O(new rows) Updates of Time-Sorted CSV Files
+
+The updater used to read a whole *_historical_*.csv, concatenate, dedup,
+sort and rewrite it every cycle to add a handful of candles. IncrementalCSV
+keeps a small sidecar next to the file instead:
+
+    eth_historical_1m.csv
+    eth_historical_1m.csv.tail.json   # header, size, last row (offset, text, key)
+
+- New rows after the last key are appended at the end of the file
+- A row with the last key (the candle that was still forming) replaces the
+  last row in place: the file is truncated at its offset and rewritten
+- Rows before the last key are already stored and skipped
+
+The sidecar is the commit record and is replaced atomically (temp file +
+rename). Before touching the data file it is marked 'pending'; after the
+data is flushed it is replaced with the new state. If a run dies in
+between, the next call finds the pending mark, truncates the file back to
+the last row's offset and restores that row from the sidecar. Creating or
+rewriting the whole file also goes through a temp file + rename.
+
+If the sidecar is missing, or the file was rewritten by something else
+(size / mtime differ and no write was pending), it is rebuilt once from
+the file's header and last line (read from the end, not parsed from the
+start).
+"""
+
+import csv
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+class IncrementalCSV:
+    """
+    Append-only writer for a CSV sorted by a key column
+
+    Usage:
+        csv_file = IncrementalCSV('trading_data/raw/eth_historical_1m.csv')
+        last = csv_file.last_key()              # '2025-01-01T12:34:00' or None
+        result = csv_file.append(new_rows_df)   # {'appended', 'replaced', 'skipped', 'rows'}
+    """
+
+    TAIL_BLOCK = 64 * 1024
+
+    def __init__(self, path, key: str = 'timestamp'):
+        """
+        Initialize writer.
+
+        Args:
+            path: CSV file
+            key: Sorted key column (ISO timestamps compare correctly as text)
+        """
+        self.path = Path(path)
+        self.key = key
+        self.sidecar = self.path.with_name(self.path.name + '.tail.json')
+
+    # ------------------------------------------------------------------
+    # Sidecar
+    # ------------------------------------------------------------------
+
+    def _write_sidecar(self, state: Dict):
+        tmp = self.sidecar.with_name(self.sidecar.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.sidecar)
+
+    def _read_header(self) -> List[str]:
+        with open(self.path, newline='') as f:
+            return next(csv.reader(f), [])
+
+    def _row_key(self, row_text: str, columns: List[str]) -> str:
+        values = next(csv.reader(io.StringIO(row_text)))
+        return values[columns.index(self.key)]
+
+    def _scan_tail(self) -> Optional[Dict]:
+        """Rebuild the sidecar state from the header and the file's last line"""
+        if not self.path.exists():
+            return None
+        columns = self._read_header()
+        size = self.path.stat().st_size
+
+        with open(self.path, 'rb') as f:
+            # Row count: one pass over raw bytes, no parsing (only when rebuilding)
+            rows = -1
+            for block in iter(lambda: f.read(1 << 20), b''):
+                rows += block.count(b'\n')
+
+            # Last line: read backwards from the end
+            end = size
+            f.seek(max(0, end - 1))
+            if size and f.read(1) == b'\n':
+                end -= 1
+            start, chunk = end, b''
+            while start > 0:
+                step = min(self.TAIL_BLOCK, start)
+                start -= step
+                f.seek(start)
+                chunk = f.read(step) + chunk
+                newline = chunk.rfind(b'\n', 0, end - start)
+                if newline >= 0:
+                    start += newline + 1
+                    break
+            f.seek(start)
+            last_row = f.read(size - start).decode()
+
+        if rows <= 0 or not columns:
+            return {'columns': columns, 'size': size, 'rows': 0,
+                    'last_row_offset': size, 'last_row': '', 'last_key': None}
+        return {'columns': columns, 'size': size, 'rows': rows, 'last_row_offset': start,
+                'last_row': last_row, 'last_key': self._row_key(last_row, columns)}
+
+    def state(self) -> Optional[Dict]:
+        """Sidecar state, repaired after an interrupted write (None if no file)"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.sidecar) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+
+        if state is not None and state.pop('pending', False):
+            # Interrupted append / rewrite of the last row: roll back to the sidecar
+            with open(self.path, 'r+b') as f:
+                f.truncate(state['last_row_offset'])
+                f.seek(state['last_row_offset'])
+                f.write(state['last_row'].encode())
+                f.flush()
+                os.fsync(f.fileno())
+            self._commit(state)
+        elif state is not None:
+            stat = self.path.stat()
+            if stat.st_size != state['size'] or stat.st_mtime_ns != state.get('mtime_ns'):
+                state = None  # file rewritten by something else: rebuild
+
+        if state is None:
+            state = self._scan_tail()
+            self._commit(state)
+        return state
+
+    def _commit(self, state: Dict):
+        """Record the file's current size / mtime and write the sidecar"""
+        stat = self.path.stat()
+        state['size'] = stat.st_size
+        state['mtime_ns'] = stat.st_mtime_ns
+        self._write_sidecar(state)
+
+    def last_key(self) -> Optional[str]:
+        state = self.state()
+        return state['last_key'] if state else None
+
+    def rows(self) -> int:
+        state = self.state()
+        return state['rows'] if state else 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def rewrite(self, df: pd.DataFrame):
+        """Replace the whole file (atomically) and its sidecar"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, self.path)
+        if self.sidecar.exists():
+            self.sidecar.unlink()
+        self.state()
+
+    def append(self, df: pd.DataFrame) -> Dict:
+        """
+        Append rows newer than the file's last row
+
+        Args:
+            df: Rows with the file's columns (any order, may overlap the file)
+
+        Returns:
+            {'appended': new rows, 'replaced': 1 if the last row was rewritten,
+             'skipped': rows already stored, 'rows': rows in the file}
+        """
+        state = self.state()
+        if state is None or not state['columns']:
+            df = df.drop_duplicates(subset=[self.key], keep='last').sort_values(self.key)
+            self.rewrite(df)
+            return {'appended': len(df), 'replaced': 0, 'skipped': 0, 'rows': len(df)}
+
+        columns = state['columns']
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"{self.path.name}: new rows lack columns {missing}")
+
+        new = df[columns].copy()
+        new[self.key] = new[self.key].astype(str)
+        new = new.drop_duplicates(subset=[self.key], keep='last').sort_values(self.key)
+
+        last = state['last_key']
+        if last is not None:
+            skipped = int((new[self.key] < last).sum())
+            new = new[new[self.key] >= last]
+        else:
+            skipped = 0
+        if new.empty:
+            return {'appended': 0, 'replaced': 0, 'skipped': skipped, 'rows': state['rows']}
+
+        replaced = int(last is not None and new[self.key].iloc[0] == last)
+        text = new.to_csv(header=False, index=False)
+        data = text.encode()
+        write_at = state['last_row_offset'] if replaced else state['size']
+
+        self._write_sidecar({**state, 'pending': True})
+        with open(self.path, 'r+b') as f:
+            f.seek(write_at)
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Last line of what was written (text ends with a line terminator)
+        body = text.rstrip('\r\n')
+        last_line_start = max(body.rfind('\n'), -1) + 1
+        last_row = text[last_line_start:]
+        rows = state['rows'] + len(new) - replaced
+        self._commit({
+            'columns': columns,
+            'rows': rows,
+            'last_row_offset': write_at + len(text[:last_line_start].encode()),
+            'last_row': last_row,
+            'last_key': new[self.key].iloc[-1],
+        })
+        return {'appended': len(new) - replaced, 'replaced': replaced, 'skipped': skipped, 'rows': rows}
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Mock Hyperliquid Candle Server - Offline Target for the Fetch Pipeline
+
+Serves POST /info candleSnapshot requests on localhost with deterministic
+synthetic candles, and meters request weight the way the exchange does
+(20 per request + 1 per 60 candles, 1200 per minute by default). Requests
+over budget get HTTP 429, so rate limiting, retries and reassembly of
+CandleFetchPipeline can be exercised without touching the network.
+
+Usage:
+    with MockCandleServer(weight_budget=600, latency=0.05) as server:
+        pipeline = CandleFetchPipeline(base_url=server.url)
+        ...
+        print(server.stats)
+
+    python src/data/mock_candle_server.py --port 8765   # standalone
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+try:
+    from .fetch_pipeline import BUDGET_WINDOW_SECONDS, WEIGHT_BUDGET, candle_request_weight
+except ImportError:
+    from fetch_pipeline import BUDGET_WINDOW_SECONDS, WEIGHT_BUDGET, candle_request_weight
+
+
+INTERVALS_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000,
+    '30m': 1_800_000, '1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000,
+}
+
+
+def synthetic_candles(coin: str, interval: str, start_ms: int, end_ms: int,
+                      max_candles: int = 5000) -> List[Dict]:
+    """Deterministic candles (Hyperliquid wire format) opening in [start_ms, end_ms]"""
+    step = INTERVALS_MS[interval]
+    first = -(-start_ms // step) * step
+    candles = []
+    for t in range(first, end_ms + 1, step):
+        if len(candles) >= max_candles:
+            break
+        phase = t / 3_600_000
+        open_ = 2000 + 80 * math.sin(phase / 24) + 15 * math.sin(phase)
+        close = 2000 + 80 * math.sin((phase + step / 3_600_000) / 24) + 15 * math.sin(phase + step / 3_600_000)
+        wick = 0.5 + abs(math.sin(phase * 7)) * 2
+        candles.append({
+            't': t, 'T': t + step - 1, 's': coin, 'i': interval,
+            'o': f'{open_:.2f}', 'c': f'{close:.2f}',
+            'h': f'{max(open_, close) + wick:.2f}', 'l': f'{min(open_, close) - wick:.2f}',
+            'v': f'{100 + 50 * abs(math.sin(phase * 3)):.4f}', 'n': 10,
+        })
+    return candles
+
+
+class MockCandleServer:
+    """
+    Threaded local HTTP server imitating Hyperliquid's /info candle endpoint
+
+    Stats (server.stats): requests, served, rate_limited, injected_errors,
+    weight, peak_in_flight.
+    """
+
+    def __init__(self,
+                 port: int = 0,
+                 weight_budget: float = WEIGHT_BUDGET,
+                 budget_window_seconds: float = BUDGET_WINDOW_SECONDS,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 history_days: int = None,
+                 seed: int = 0):
+        """
+        Initialize server.
+
+        Args:
+            port: Port to bind on 127.0.0.1 (0 = any free port)
+            weight_budget: Weight allowed per window before answering 429
+            budget_window_seconds: Length of the budget window
+            latency: Seconds each request takes
+            error_rate: Fraction of requests answered with a random 429/500
+            history_days: Only serve candles this many days back (None = all)
+            seed: Seed for injected errors
+        """
+        self.port = port
+        self.weight_budget = float(weight_budget)
+        self.rate = self.weight_budget / budget_window_seconds
+        self.latency = latency
+        self.error_rate = error_rate
+        self.history_days = history_days
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = self.weight_budget
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._server = None
+        self._thread = None
+        self.stats = {'requests': 0, 'served': 0, 'rate_limited': 0, 'injected_errors': 0,
+                      'weight': 0, 'peak_in_flight': 0}
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def _charge(self, weight: float) -> bool:
+        """Take weight from the server-side bucket; False if over budget"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.weight_budget, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < weight:
+                return False
+            self._tokens -= weight
+            self.stats['weight'] += weight
+            return True
+
+    def _handle(self, body: Dict):
+        """Returns (status, payload)"""
+        # SDK startup (Info() loads meta / spotMeta) is served unmetered
+        kind = body.get('type')
+        if kind == 'meta':
+            return 200, {'universe': [{'name': 'ETH', 'szDecimals': 4}, {'name': 'BTC', 'szDecimals': 5}]}
+        if kind == 'spotMeta':
+            return 200, {'universe': [], 'tokens': []}
+        if kind != 'candleSnapshot':
+            return 422, {'error': f'unsupported type {kind!r}'}
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self._in_flight += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+            inject = self._rng.random() < self.error_rate
+            injected_status = self._rng.choice((429, 500))
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if inject:
+                with self._lock:
+                    self.stats['injected_errors'] += 1
+                return injected_status, None
+
+            req = body['req']
+            start, end = int(req['startTime']), int(req['endTime'])
+            if self.history_days is not None:
+                start = max(start, int(time.time() * 1000) - self.history_days * 86_400_000)
+            candles = synthetic_candles(req['coin'], req['interval'], start, end)
+            if not self._charge(candle_request_weight(len(candles))):
+                with self._lock:
+                    self.stats['rate_limited'] += 1
+                return 429, None
+            with self._lock:
+                self.stats['served'] += 1
+            return 200, candles
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def start(self) -> 'MockCandleServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                    status, payload = server._handle(body)
+                except (ValueError, KeyError) as e:
+                    status, payload = 400, {'error': str(e)}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockCandleServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Hyperliquid candle server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--weight-budget', type=float, default=WEIGHT_BUDGET)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockCandleServer(port=args.port, weight_budget=args.weight_budget,
+                              latency=args.latency, error_rate=args.error_rate).start()
+    print(f"🧪 Mock candle server on {server.url} (budget {args.weight_budget:.0f}/min) - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"\n📊 {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from data.hyperliquid_fetcher import HyperliquidFetcher
+from data.multi_resolution import ema_bank, resample_ohlcv_multi
 
 
 class MTFRibbonFetcher:
@@ -26,8 +27,9 @@ class MTFRibbonFetcher:
     Strategy:
     - Fetch 1min data from Hyperliquid API
     - Resample to create custom timeframes (2m, 8m, 13m, 21m, 34m, 55m)
+      in one pass over the 1m arrays
     - Use native 3m and 5m data for accuracy
-    - Calculate 35-period EMA ribbon on each timeframe
+    - Calculate 35-period EMA ribbon on each timeframe (one EMA bank per timeframe)
     """
 
     # Target timeframes in minutes
@@ -95,19 +97,20 @@ class MTFRibbonFetcher:
                 timeframe_data[5] = data_5m
                 print(f"   ✅ 5min: {len(data_5m)} candles")
 
-        # Step 4: Resample 1m data to create custom timeframes
+        # Step 4: Resample 1m data to create custom timeframes (all in one pass)
         print("\n🔄 Resampling to custom timeframes...")
-        custom_timeframes = [2, 8, 13, 21, 34, 55]
+        custom_timeframes = [tf for tf in [2, 8, 13, 21, 34, 55] if tf in self.TIMEFRAMES]
+
+        print(f"   Resampling {custom_timeframes} min from 1min base...")
+        resampled_all = self._resample_ohlcv_multi(data_1m, custom_timeframes)
 
         for tf_minutes in custom_timeframes:
-            if tf_minutes in self.TIMEFRAMES:
-                print(f"   Resampling {tf_minutes}min from 1min base...")
-                resampled = self._resample_ohlcv(data_1m.copy(), f'{tf_minutes}T')
-                if resampled is not None and not resampled.empty:
-                    timeframe_data[tf_minutes] = resampled
-                    print(f"   ✅ {tf_minutes}min: {len(resampled)} candles")
-                else:
-                    print(f"   ❌ Failed to resample {tf_minutes}min")
+            resampled = resampled_all.get(tf_minutes)
+            if resampled is not None and not resampled.empty:
+                timeframe_data[tf_minutes] = resampled
+                print(f"   ✅ {tf_minutes}min: {len(resampled)} candles")
+            else:
+                print(f"   ❌ Failed to resample {tf_minutes}min")
 
         print(f"\n{'='*70}")
         print(f"✅ Successfully fetched {len(timeframe_data)} timeframes")
@@ -178,13 +181,34 @@ class MTFRibbonFetcher:
             print(f"   ❌ Error fetching {interval} data: {e}")
             return None
 
+    def _resample_ohlcv_multi(self, df: pd.DataFrame, minutes: List[int]) -> Dict[int, pd.DataFrame]:
+        """
+        Resample 1m OHLCV data to several timeframes at once
+
+        Args:
+            df: 1m DataFrame with OHLCV data (timestamp index)
+            minutes: Target timeframes in minutes
+
+        Returns:
+            Dictionary mapping timeframe (in minutes) to resampled DataFrame
+        """
+        try:
+            if df.isna().any().any():
+                # reduceat would carry NaNs into the bars; pandas skips them
+                return {m: self._resample_ohlcv(df, f'{m}min') for m in minutes}
+            return resample_ohlcv_multi(df, minutes)
+
+        except Exception as e:
+            print(f"   ❌ Resampling error: {e}")
+            return {}
+
     def _resample_ohlcv(self, df: pd.DataFrame, resample_rule: str) -> pd.DataFrame:
         """
         Resample OHLCV data to a different timeframe
 
         Args:
             df: DataFrame with OHLCV data (timestamp index)
-            resample_rule: Pandas resample rule (e.g., '2T' for 2 minutes)
+            resample_rule: Pandas resample rule (e.g., '2min' for 2 minutes)
 
         Returns:
             Resampled DataFrame
@@ -224,34 +248,29 @@ class MTFRibbonFetcher:
         print(f"{'='*70}\n")
 
         enriched_data = {}
+        colors = np.array(['red', 'green'], dtype=object)
 
         for tf_minutes, df in timeframe_data.items():
             print(f"⚙️  Calculating EMAs for {tf_minutes}min timeframe...")
 
-            # Make a copy to avoid modifying original
-            df_with_emas = df.copy()
-
-            # Calculate each EMA period
-            for period in self.EMA_PERIODS:
-                ema_col = f'MMA{period}'
-                df_with_emas[ema_col] = df_with_emas['close'].ewm(
-                    span=period,
-                    adjust=False
-                ).mean()
-
-            # Calculate EMA colors (green if price > EMA, red if price < EMA)
-            for period in self.EMA_PERIODS:
-                ema_col = f'MMA{period}'
-                color_col = f'MMA{period}_color'
-
-                df_with_emas[color_col] = np.where(
-                    df_with_emas['close'] > df_with_emas[ema_col],
-                    'green',
-                    'red'
-                )
-
-            # Remove NaN rows (from EMA calculations)
-            df_with_emas = df_with_emas.dropna()
+            # All periods in one 2D filter (n × 35)
+            close = df['close'].to_numpy(dtype=float)
+            emas = ema_bank(close, self.EMA_PERIODS)
+
+            # EMA colors (green if price > EMA, red if price <= EMA)
+            above = close[:, None] > emas
+
+            columns = {f'MMA{period}': emas[:, j] for j, period in enumerate(self.EMA_PERIODS)}
+            columns.update({f'MMA{period}_color': colors[above[:, j].astype(np.intp)]
+                            for j, period in enumerate(self.EMA_PERIODS)})
+
+            # New columns added in one block (original frame is not modified)
+            df_with_emas = pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+            # Remove NaN rows (from EMA calculations); colors are never NaN
+            valid = df.notna().all(axis=1).to_numpy() & ~np.isnan(emas).any(axis=1)
+            if not valid.all():
+                df_with_emas = df_with_emas[valid]
 
             enriched_data[tf_minutes] = df_with_emas
 
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Multi-Resolution Resampling and EMA Bank
+
+Two array kernels for the multi-timeframe ribbon:
+
+- resample_ohlcv_multi: every target resolution (2m, 8m, 13m, ...) from one
+  set of 1m arrays. Bars are bucketed by integer division of their offset
+  from midnight of the first day (pandas' 'start_day' origin), and each
+  resolution is reduced with np.maximum/minimum.reduceat over the bucket
+  starts - no per-resolution DataFrame copy, no groupby. Volume uses the
+  same Kahan-compensated sum as pandas, stepped over bucket positions
+  (at most m steps for an m-minute resolution) across all buckets at once.
+- ema_bank: all ribbon periods at once as one 2D recursive filter. The
+  series is cut into blocks of BLOCK bars; within a block every period's
+  zero-state response is one matrix product, and block boundaries are
+  carried with the (1-a)^k decay.
+
+Resampled bars equal resample().agg() + dropna() exactly; EMAs match
+ewm(span, adjust=False) up to float rounding.
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Bars per block of the EMA bank (matrix work grows with BLOCK, carry loop with n / BLOCK)
+BLOCK = 32
+
+
+def _bucket_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Kahan-compensated sum of values[start:end+1] per bucket (pandas' groupby sum)"""
+    lengths = ends - starts + 1
+    total = np.zeros(len(starts))
+    compensation = np.zeros(len(starts))
+    for offset in range(int(lengths.max()) if len(lengths) else 0):
+        active = np.flatnonzero(lengths > offset)
+        y = values[starts[active] + offset] - compensation[active]
+        t = total[active] + y
+        compensation[active] = t - total[active] - y
+        total[active] = t
+    return total
+
+
+def resample_ohlcv_multi(df: pd.DataFrame, minutes: Iterable[int]) -> Dict[int, pd.DataFrame]:
+    """
+    Resample a 1m OHLCV frame to several minute resolutions
+
+    Same bars as df.resample(f'{m}min').agg(first/max/min/last/sum).dropna()
+    for NaN-free input: buckets start at midnight of the first day, are
+    labelled by their left edge, and empty buckets are skipped.
+
+    Args:
+        df: OHLCV frame with a sorted DatetimeIndex and no NaNs
+        minutes: Target resolutions in minutes
+
+    Returns:
+        Dictionary mapping minutes to resampled DataFrame
+    """
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    times = df.index.asi8
+    if len(times) == 0:
+        return {m: df.iloc[:0] for m in minutes}
+
+    origin = times[0] - times[0] % NS_PER_DAY
+    elapsed = times - origin
+    columns = {col: df[col].to_numpy(dtype=float) for col in OHLCV_COLUMNS if col in df.columns}
+
+    out = {}
+    for m in minutes:
+        width = m * NS_PER_MINUTE
+        bucket = elapsed // width
+        starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+        ends = np.concatenate((starts[1:], [len(bucket)])) - 1
+
+        data = {}
+        for col, values in columns.items():
+            if col == 'open':
+                data[col] = values[starts]
+            elif col == 'high':
+                data[col] = np.maximum.reduceat(values, starts)
+            elif col == 'low':
+                data[col] = np.minimum.reduceat(values, starts)
+            elif col == 'close':
+                data[col] = values[ends]
+            else:
+                data[col] = _bucket_sums(values, starts, ends)
+
+        index = pd.DatetimeIndex(origin + bucket[starts] * width, name=df.index.name)
+        out[m] = pd.DataFrame(data, index=index)
+    return out
+
+
+def ema_bank(close: np.ndarray, periods: List[int], block: int = BLOCK) -> np.ndarray:
+    """
+    EMAs (span=period, adjust=False) for all periods in one pass
+
+    Args:
+        close: Price series (n,)
+        periods: EMA spans (p,)
+        block: Bars per block
+
+    Returns:
+        (n, p) array; column j is the EMA for periods[j]
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    if n == 0:
+        return np.empty((0, len(periods)))
+
+    alpha = 2.0 / (np.asarray(periods, dtype=float) + 1.0)   # (p,)
+    decay = 1.0 - alpha
+    p = len(alpha)
+
+    # Zero-state response within a block: y[k] = sum_{j<=k} a (1-a)^(k-j) x[j]
+    k = np.arange(block)
+    lag = k[:, None] - k[None, :]
+    kernel = np.where(lag >= 0, alpha[:, None, None] * decay[:, None, None] ** np.maximum(lag, 0), 0.0)
+
+    blocks = -(-n // block)
+    padded = np.empty(blocks * block)
+    padded[:n] = close
+    padded[n:] = close[-1]
+    response = (padded.reshape(blocks, block) @ kernel.transpose(2, 0, 1).reshape(block, p * block))
+    response = response.reshape(blocks, p, block)
+
+    # Carry: each block continues from the previous block's last value
+    carry_decay = decay[:, None] ** (k + 1)[None, :]          # (p, block)
+    block_decay = carry_decay[:, -1]
+    block_end = response[:, :, -1]
+    initial = np.empty((blocks, p))
+    prev = np.full(p, close[0])                               # pandas seeds with the first value
+    for b in range(blocks):
+        initial[b] = prev
+        prev = block_end[b] + block_decay * prev
+
+    emas = response + carry_decay[None] * initial[:, :, None]
+    emas = emas.transpose(0, 2, 1).reshape(blocks * block, p)[:n]
+
+    # pandas holds the EMA exactly at the price on the first bar and on flat
+    # stretches; snap values within rounding of the close to it
+    tolerance = 8 * np.spacing(np.abs(close))[:, None]
+    return np.where(np.abs(emas - close[:, None]) <= tolerance, close[:, None], emas)
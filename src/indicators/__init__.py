@@ -10,6 +10,7 @@ from .vwap_calculator import VWAPCalculator, calculate_vwap
 from .volume_analyzer import VolumeAnalyzer, analyze_volume
 from .stochastic_calculator import StochasticCalculator
 from .bollinger_calculator import BollingerCalculator
+from .fibonacci_levels import FibonacciLevelTracker, fib_proximity_series
 
 __all__ = [
     'RSICalculator',
@@ -18,8 +19,10 @@ __all__ = [
     'VolumeAnalyzer',
     'StochasticCalculator',
     'BollingerCalculator',
+    'FibonacciLevelTracker',
     'calculate_rsi',
     'calculate_macd',
     'calculate_vwap',
     'analyze_volume',
+    'fib_proximity_series',
 ]
@@ -16,9 +16,16 @@ For day trading with 2-3 trades per day:
 - Set stop-loss at opposite band
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+try:
+    from .column_views import column_views, labels, series
+except ImportError:
+    from column_views import column_views, labels, series
+
 
 class BollingerCalculator:
     """
@@ -38,6 +45,9 @@ class BollingerCalculator:
     - Breakout signals: Price crossing outside bands during expansion
     """
 
+    # Input arrays columns() reads
+    INPUTS = ('close',)
+
     def __init__(self, period: int = 20, std_dev: int = 2):
         """
         Initialize Bollinger Bands calculator
@@ -68,56 +78,81 @@ class BollingerCalculator:
         """
         print(f"\n📊 Calculating Bollinger Bands ({self.period}-period, {self.std_dev} std dev)...")
 
-        # Calculate middle band (SMA)
-        df['bb_middle'] = df['close'].rolling(window=self.period).mean()
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
+
+        print(f"   ✅ Bollinger Bands calculated")
+        print(f"   📊 Current price: {df['close'].iloc[-1]:.2f}")
+        print(f"   📊 Upper band: {df['bb_upper'].iloc[-1]:.2f}")
+        print(f"   📊 Middle band: {df['bb_middle'].iloc[-1]:.2f}")
+        print(f"   📊 Lower band: {df['bb_lower'].iloc[-1]:.2f}")
+        print(f"   📊 Width: {df['bb_width'].iloc[-1]:.2f}%")
+        print(f"   📊 Position: {df['bb_position'].iloc[-1]}")
+
+        return df
+
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Bollinger Band columns from read-only input arrays
+
+        Args:
+            data: Mapping with a 'close' array
+
+        Returns:
+            bb_middle, bb_upper, bb_lower, bb_width, bb_percent, bb_position,
+            bb_squeeze, bb_expanding, bb_distance_upper, bb_distance_lower
+        """
+        close = data['close']
+        rolling = series(close).rolling(window=self.period)
 
-        # Calculate standard deviation
-        rolling_std = df['close'].rolling(window=self.period).std()
+        # Calculate middle band (SMA) and standard deviation
+        middle = rolling.mean().to_numpy()
+        rolling_std = rolling.std().to_numpy()
 
         # Calculate upper and lower bands
-        df['bb_upper'] = df['bb_middle'] + (rolling_std * self.std_dev)
-        df['bb_lower'] = df['bb_middle'] - (rolling_std * self.std_dev)
+        upper = middle + (rolling_std * self.std_dev)
+        lower = middle - (rolling_std * self.std_dev)
 
-        # Calculate bandwidth (% of middle band)
-        df['bb_width'] = ((df['bb_upper'] - df['bb_lower']) / df['bb_middle']) * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Calculate bandwidth (% of middle band)
+            width = ((upper - lower) / middle) * 100
 
-        # Calculate price position within bands (0 = lower band, 1 = upper band)
-        band_range = df['bb_upper'] - df['bb_lower']
-        df['bb_percent'] = np.where(
-            band_range > 0,
-            (df['close'] - df['bb_lower']) / band_range,
-            0.5
-        )
+            # Calculate price position within bands (0 = lower band, 1 = upper band)
+            band_range = upper - lower
+            percent = np.where(band_range > 0, (close - lower) / band_range, 0.5)
+
+            # Calculate distance from bands (for stop-loss placement)
+            distance_upper = ((upper - close) / close) * 100
+            distance_lower = ((close - lower) / close) * 100
 
         # Classify price position
-        df['bb_position'] = 'middle'
-        df.loc[df['close'] > df['bb_upper'], 'bb_position'] = 'above'  # Breakout above
-        df.loc[df['close'] < df['bb_lower'], 'bb_position'] = 'below'  # Breakout below
-        df.loc[(df['close'] <= df['bb_upper']) & (df['bb_percent'] > 0.7), 'bb_position'] = 'upper'
-        df.loc[(df['close'] >= df['bb_lower']) & (df['bb_percent'] < 0.3), 'bb_position'] = 'lower'
+        position = labels(len(close), 'middle', [
+            (close > upper, 'above'),  # Breakout above
+            (close < lower, 'below'),  # Breakout below
+            ((close <= upper) & (percent > 0.7), 'upper'),
+            ((close >= lower) & (percent < 0.3), 'lower'),
+        ])
 
         # Detect squeeze (contracting bands = consolidation)
         # Squeeze = bandwidth < 75% of its 20-period average
-        avg_width = df['bb_width'].rolling(window=20).mean()
-        df['bb_squeeze'] = df['bb_width'] < (avg_width * 0.75)
+        width_series = series(width)
+        avg_width = width_series.rolling(window=20).mean().to_numpy()
 
         # Detect expansion (expanding bands = volatility increase)
-        width_change = df['bb_width'].pct_change(periods=3)
-        df['bb_expanding'] = width_change > 0.10  # 10% width increase over 3 periods
-
-        # Calculate distance from bands (for stop-loss placement)
-        df['bb_distance_upper'] = ((df['bb_upper'] - df['close']) / df['close']) * 100
-        df['bb_distance_lower'] = ((df['close'] - df['bb_lower']) / df['close']) * 100
-
-        print(f"   ✅ Bollinger Bands calculated")
-        print(f"   📊 Current price: {df['close'].iloc[-1]:.2f}")
-        print(f"   📊 Upper band: {df['bb_upper'].iloc[-1]:.2f}")
-        print(f"   📊 Middle band: {df['bb_middle'].iloc[-1]:.2f}")
-        print(f"   📊 Lower band: {df['bb_lower'].iloc[-1]:.2f}")
-        print(f"   📊 Width: {df['bb_width'].iloc[-1]:.2f}%")
-        print(f"   📊 Position: {df['bb_position'].iloc[-1]}")
-
-        return df
+        width_change = width_series.pct_change(periods=3).to_numpy()
+
+        return {
+            'bb_middle': middle,
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'bb_width': width,
+            'bb_percent': percent,
+            'bb_position': position,
+            'bb_squeeze': width < (avg_width * 0.75),
+            'bb_expanding': width_change > 0.10,  # 10% width increase over 3 periods
+            'bb_distance_upper': distance_upper,
+            'bb_distance_lower': distance_lower,
+        }
 
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Column Views - Read-Only Inputs and Column-Only Outputs for Calculators
+
+Every calculator exposes ``columns(data) -> Dict[str, np.ndarray]``:
+``data`` maps input names ('open', 'high', 'low', 'close', 'volume',
+optionally 'timestamp') to 1-D read-only arrays, and the result holds only
+the calculator's new columns, in the order calculate() adds them.
+
+The inputs are views of the caller's frame (or of a shared memory block in
+a pool worker), never copies, and a calculator cannot write into them.
+share_columns() / attach_columns() move the input arrays into one shared
+memory block for process pools: one copy in, zero-copy views in every
+worker.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def read_only(values: np.ndarray) -> np.ndarray:
+    """A non-writeable view of values (no copy)"""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+def column_views(df: pd.DataFrame, columns: Iterable[str] = OHLCV_COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    Read-only numpy views of df's columns
+
+    Columns that are not in df are skipped. Numeric columns of a
+    consolidated frame come back as views of its block; object columns
+    (e.g. ISO timestamps) as views of their own array.
+
+    Args:
+        df: Source frame
+        columns: Column names to expose
+
+    Returns:
+        Dictionary mapping column name to read-only array
+    """
+    return {col: read_only(df[col].to_numpy()) for col in columns if col in df.columns}
+
+
+def series(values: np.ndarray) -> pd.Series:
+    """Wrap an array in a Series without copying it (RangeIndex)"""
+    return pd.Series(values, copy=False)
+
+
+def labels(n: int, default, rules: Sequence[Tuple[np.ndarray, str]]) -> np.ndarray:
+    """
+    Object array of string labels
+
+    Rules are applied in order, so a later mask overrides an earlier one
+    (the same as successive ``series[mask] = label`` assignments).
+
+    Args:
+        n: Length
+        default: Value of rows no rule matches (a label or np.nan)
+        rules: (mask, label) pairs
+
+    Returns:
+        Object array of labels
+    """
+    # Label codes first (int8), then one gather from the label table
+    codes = np.zeros(n, dtype=np.int8)
+    for code, (mask, _) in enumerate(rules, start=1):
+        codes[mask] = code
+    table = np.array([default] + [label for _, label in rules], dtype=object)
+    return table[codes]
+
+
+def crossings(above: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bars where a condition turns on / off
+
+    The bar before the first counts as False (``shift(1).fillna(False)``).
+
+    Args:
+        above: Boolean array (e.g. fast > slow)
+
+    Returns:
+        (turned_on, turned_off) boolean arrays
+    """
+    above = np.asarray(above, dtype=bool)
+    prev = np.concatenate(([False], above))[:len(above)]
+    return above & ~prev, ~above & prev
+
+
+def _attach_block(name: str) -> SharedMemory:
+    """Attach to an existing block (pool workers share the owner's tracker)"""
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def share_columns(data: Dict[str, np.ndarray]) -> Tuple[Dict, SharedMemory]:
+    """
+    Copy input arrays into one shared memory block
+
+    Numeric arrays keep their dtype and are laid out back to back (8-byte
+    aligned), each contiguous. Other arrays (e.g. ISO timestamp strings)
+    travel with the descriptor.
+
+    Args:
+        data: Mapping of column name to 1-D array
+
+    Returns:
+        (descriptor, handle) - descriptor is picklable, the handle must be
+        kept alive by the owner and released with release_columns()
+    """
+    layout = {}
+    other = {}
+    offset = 0
+    for col, values in data.items():
+        if values.dtype.kind not in 'fiub':
+            other[col] = values
+            continue
+        layout[col] = (offset, values.dtype.str, len(values))
+        offset += -(-values.nbytes // 8) * 8
+
+    shm = SharedMemory(create=True, size=max(offset, 1))
+    for col, (start, dtype, n) in layout.items():
+        np.ndarray(n, dtype=np.dtype(dtype), buffer=shm.buf, offset=start)[:] = data[col]
+
+    return {'name': shm.name, 'layout': layout, 'other': other, 'nbytes': offset}, shm
+
+
+def attach_columns(descriptor: Dict) -> Tuple[Dict[str, np.ndarray], SharedMemory]:
+    """
+    Read-only views of the arrays in a share_columns() block
+
+    Args:
+        descriptor: Descriptor from share_columns()
+
+    Returns:
+        (data, handle) - keep the handle alive while the views are used
+    """
+    shm = _attach_block(descriptor['name'])
+    data = {}
+    for col, (start, dtype, n) in descriptor['layout'].items():
+        data[col] = read_only(np.ndarray(n, dtype=np.dtype(dtype), buffer=shm.buf, offset=start))
+    for col, values in descriptor['other'].items():
+        data[col] = read_only(values)
+    return data, shm
+
+
+def release_columns(shm: SharedMemory):
+    """Close and unlink a share_columns() block"""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Fibonacci Price Levels - Vectorized + Streaming
+
+Shared implementation of Fibonacci retracement/extension levels and
+price-to-level proximity scores:
+- Rolling swing high/low in O(N) (van Herk / Gil-Werman block algorithm)
+- All level prices and distances as one (bars × levels) broadcast
+- FibonacciLevelTracker: O(1) amortized per-bar update for live use
+  (monotonic deques), same numbers as the vectorized path
+
+Used by the harmonic iteration backtesters (calculate_fib_levels) and the
+live FibonacciSignalGenerator.
+"""
+
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Fibonacci retracement levels
+FIB_RETRACEMENT = (0.236, 0.382, 0.5, 0.618, 0.786)
+
+# Fibonacci extension levels
+FIB_EXTENSION = (1.272, 1.618, 2.618)
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling max over [i-window+1, i], NaN-skipping like pandas
+
+    Rows before a full window use the expanding max.
+
+    Args:
+        values: 1D array
+        window: Window length (bars, including the current bar)
+
+    Returns:
+        Array of the same length
+    """
+    return _rolling_extreme(np.asarray(values, dtype=float), window, np.fmax)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling min, see rolling_max"""
+    return _rolling_extreme(np.asarray(values, dtype=float), window, np.fmin)
+
+
+def _rolling_extreme(values: np.ndarray, window: int, op: np.ufunc) -> np.ndarray:
+    """Block prefix/suffix scans: out[i] = op(suffix[i-w+1], prefix[i])"""
+    n = len(values)
+    out = op.accumulate(values) if n else values.copy()
+    if window <= 1 or n < window:
+        return values.copy() if window <= 1 else out
+
+    pad = (-n) % window
+    blocks = np.concatenate([values, np.full(pad, np.nan)]).reshape(-1, window)
+    prefix = op.accumulate(blocks, axis=1).ravel()
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    out[window - 1:] = op(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def level_prices(swing_high: np.ndarray, swing_low: np.ndarray,
+                 retracements: Sequence[float] = FIB_RETRACEMENT,
+                 extensions: Sequence[float] = (),
+                 anchor: str = 'low') -> np.ndarray:
+    """
+    Fibonacci level prices for every bar as a (bars × levels) array
+
+    Args:
+        swing_high, swing_low: Swing extremes per bar (arrays or scalars)
+        retracements: Retracement ratios
+        extensions: Extension ratios (projected below the swing low:
+                    low - range × (ratio - 1))
+        anchor: 'low'  → retracement = low + range × ratio (iteration backtests)
+                'high' → retracement = high - range × ratio (live generator)
+
+    Returns:
+        2D array, retracement columns first, then extensions
+    """
+    swing_high = np.atleast_1d(np.asarray(swing_high, dtype=float))[:, None]
+    swing_low = np.atleast_1d(np.asarray(swing_low, dtype=float))[:, None]
+    swing_range = swing_high - swing_low
+
+    retracements = np.asarray(retracements, dtype=float)
+    if anchor == 'high':
+        retracement_prices = swing_high - swing_range * retracements
+    else:
+        retracement_prices = swing_low + swing_range * retracements
+
+    extensions = np.asarray(extensions, dtype=float)
+    extension_prices = swing_low - swing_range * (extensions - 1.0)
+
+    return np.concatenate([retracement_prices, extension_prices], axis=1)
+
+
+def nearest_level_distance(price: np.ndarray, swing_high: np.ndarray, swing_low: np.ndarray,
+                           retracements: Sequence[float] = FIB_RETRACEMENT,
+                           extensions: Sequence[float] = (),
+                           anchor: str = 'low', eps: float = 1e-10) -> np.ndarray:
+    """
+    Distance from price to the nearest level, normalized by swing range
+
+    Args:
+        price: Price per bar
+        swing_high, swing_low: Swing extremes per bar
+        retracements, extensions, anchor: See level_prices()
+        eps: Added to the range to avoid division by zero
+
+    Returns:
+        1D array of normalized distances
+    """
+    prices = level_prices(swing_high, swing_low, retracements, extensions, anchor)
+    price = np.atleast_1d(np.asarray(price, dtype=float))
+    swing_range = (np.atleast_1d(np.asarray(swing_high, dtype=float)) -
+                   np.atleast_1d(np.asarray(swing_low, dtype=float)))
+    return np.abs(price[:, None] - prices).min(axis=1) / (swing_range + eps)
+
+
+def proximity_score(distance: np.ndarray, scale: float) -> np.ndarray:
+    """Score 1.0 at a level, falling linearly to 0.0 at distance 1/scale"""
+    return 1.0 - np.minimum(distance * scale, 1.0)
+
+
+def fib_proximity_series(df: pd.DataFrame, lookback: int = 144, scale: float = 18.0,
+                         retracements: Sequence[float] = FIB_RETRACEMENT,
+                         warmup_value: float = 0.5) -> pd.Series:
+    """
+    Fibonacci proximity score for every bar (vectorized)
+
+    Swing high/low come from the last lookback+1 bars of high/low
+    (inclusive of the current bar); levels are measured up from the low.
+
+    Args:
+        df: DataFrame with 'high', 'low', 'close'
+        lookback: Swing lookback (bars before the current one)
+        scale: Distance multiplier (score hits 0 at distance 1/scale)
+        retracements: Retracement ratios
+        warmup_value: Score for bars before a full lookback
+
+    Returns:
+        Series aligned with df.index
+    """
+    window = lookback + 1
+    swing_high = rolling_max(df['high'].to_numpy(dtype=float), window)
+    swing_low = rolling_min(df['low'].to_numpy(dtype=float), window)
+
+    distance = nearest_level_distance(df['close'].to_numpy(dtype=float), swing_high, swing_low,
+                                      retracements=retracements)
+    scores = proximity_score(distance, scale)
+    scores[:lookback] = warmup_value
+
+    return pd.Series(scores, index=df.index)
+
+
+class FibonacciLevelTracker:
+    """
+    Streaming swing high/low and Fibonacci proximity for live candles
+
+    Each update is O(1) amortized (monotonic deques), so the live loop does
+    not rescan the lookback window every bar.
+
+    Usage:
+        tracker = FibonacciLevelTracker(window=145)
+        for candle in stream:
+            score = tracker.update(candle['high'], candle['low'], candle['close'])
+    """
+
+    def __init__(self, window: int = 145, scale: float = 18.0,
+                 retracements: Sequence[float] = FIB_RETRACEMENT,
+                 extensions: Sequence[float] = (), anchor: str = 'low',
+                 eps: float = 1e-10):
+        """
+        Initialize tracker
+
+        Args:
+            window: Swing window length in bars (including the current bar)
+            scale, retracements, extensions, anchor, eps: See module functions
+        """
+        self.window = window
+        self.scale = scale
+        self.retracements = tuple(retracements)
+        self.extensions = tuple(extensions)
+        self.anchor = anchor
+        self.eps = eps
+
+        self._count = 0
+        self._max_queue: deque = deque()  # (bar, value), values decreasing
+        self._min_queue: deque = deque()  # (bar, value), values increasing
+        self.last_close: Optional[float] = None
+
+    @property
+    def swing(self) -> Tuple[float, float]:
+        """Current (swing_high, swing_low)"""
+        if not self._max_queue:
+            return np.nan, np.nan
+        return self._max_queue[0][1], self._min_queue[0][1]
+
+    @property
+    def ready(self) -> bool:
+        """True once a full window has been seen"""
+        return self._count >= self.window
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Add one closed candle and return its proximity score
+
+        Args:
+            high, low, close: Candle prices
+
+        Returns:
+            Proximity score 0.0-1.0
+        """
+        bar = self._count
+        self._count += 1
+        self.last_close = close
+
+        if not np.isnan(high):
+            while self._max_queue and self._max_queue[-1][1] <= high:
+                self._max_queue.pop()
+            self._max_queue.append((bar, high))
+        if not np.isnan(low):
+            while self._min_queue and self._min_queue[-1][1] >= low:
+                self._min_queue.pop()
+            self._min_queue.append((bar, low))
+
+        oldest = bar - self.window + 1
+        while self._max_queue and self._max_queue[0][0] < oldest:
+            self._max_queue.popleft()
+        while self._min_queue and self._min_queue[0][0] < oldest:
+            self._min_queue.popleft()
+
+        return self.proximity(close)
+
+    def proximity(self, price: float) -> float:
+        """Proximity score of price to the current levels"""
+        swing_high, swing_low = self.swing
+        distance = nearest_level_distance(price, swing_high, swing_low, self.retracements,
+                                          self.extensions, self.anchor, self.eps)
+        return float(proximity_score(distance, self.scale)[0])
+
+    def levels(self) -> Dict:
+        """Current level prices in FibonacciSignalGenerator's format"""
+        swing_high, swing_low = self.swing
+        prices = level_prices(swing_high, swing_low, self.retracements,
+                              self.extensions, self.anchor)[0]
+        n_retracements = len(self.retracements)
+        return {
+            'retracement_levels': prices[:n_retracements].tolist(),
+            'extension_levels': prices[n_retracements:].tolist(),
+            'swing_high': swing_high,
+            'swing_low': swing_low,
+            'swing_range': swing_high - swing_low
+        }
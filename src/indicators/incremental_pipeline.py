@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Incremental Indicator Pipeline
+
+Extends an indicator file (trading_data/indicators/<symbol>_<tf>_full.csv)
+by the bars the updater just appended to the raw file, instead of
+recomputing every indicator over the full history.
+
+Every indicator in the pipeline is either recursive or windowed:
+- Recursive: RSI average gain/loss (EMA), MACD fast/slow/signal EMAs,
+  volume EMA, VWAP cumulative sums. Their values at the last committed bar
+  are kept in a state file and continued from there.
+- Windowed: stochastic, Bollinger Bands (incl. squeeze/expansion), volume
+  trend, crossovers. The last CONTEXT_BARS input rows are kept in the state
+  file and recomputed together with the new bars.
+
+The state describes the bar *before* the file's last row, so a re-fetched
+last candle (still forming when it was stored) is recomputed and rewritten
+in place on the next update. Output rows match calculate_all() over the
+full history (rolling windows up to float rounding).
+
+Every check_every updates the full history is recomputed instead, and the
+previous file is compared against it as a consistency check.
+
+State file: <output>.state.json (written atomically after the output).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .column_views import column_views
+from .indicator_pipeline import IndicatorPipeline
+
+try:
+    from src.data.incremental_csv import IncrementalCSV
+except ImportError:  # scripts that put src/ itself on sys.path
+    from data.incremental_csv import IncrementalCSV
+
+
+STATE_VERSION = 1
+
+# Longest lookback of the windowed indicators: BB squeeze = 20-bar average of
+# a 20-bar width (39 closes) plus pct_change(3) / shifts, with some slack
+CONTEXT_BARS = 64
+
+
+def _ema(values: pd.Series, span: int, prev: Optional[float] = None) -> pd.Series:
+    """EMA (adjust=False), continued from prev (placed one row before values)"""
+    if prev is not None:
+        values = pd.concat([pd.Series([prev], index=[values.index[0] - 1]), values])
+    return values.ewm(span=span, adjust=False).mean()
+
+
+def _cumsum(values: pd.Series, prev: Optional[float] = None) -> pd.Series:
+    """Cumulative sum, continued from prev (placed one row before values)"""
+    if prev is not None:
+        values = pd.concat([pd.Series([prev], index=[values.index[0] - 1]), values])
+    return values.cumsum()
+
+
+class IncrementalIndicatorPipeline(IndicatorPipeline):
+    """
+    IndicatorPipeline that appends only new bars to its output file
+
+    Usage:
+        pipeline = IncrementalIndicatorPipeline()
+        result = pipeline.update('trading_data/raw/eth_historical_1m.csv',
+                                 'trading_data/indicators/eth_1m_full.csv')
+        # result['mode']: 'incremental', 'full' or 'unchanged'
+    """
+
+    def __init__(self, check_every: int = 100, context_bars: int = CONTEXT_BARS):
+        """
+        Initialize incremental pipeline
+
+        Args:
+            check_every: Incremental updates between full-recompute consistency checks
+            context_bars: Input rows kept for the windowed indicators
+        """
+        super().__init__()
+        self.check_every = check_every
+        self.context_bars = context_bars
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _state_file(output_file) -> Path:
+        output_file = Path(output_file)
+        return output_file.with_name(output_file.name + '.state.json')
+
+    def _load_state(self, output_file) -> Optional[Dict]:
+        try:
+            with open(self._state_file(output_file)) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state.get('version') == STATE_VERSION else None
+
+    def _save_state(self, output_file, state: Dict):
+        path = self._state_file(output_file)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def _recursive_series(self, frame: pd.DataFrame, start: int, seed: Dict) -> Dict[str, pd.Series]:
+        """
+        Recursive series behind RSI, MACD, volume EMA and VWAP
+
+        Computed for frame rows start.. (continued from seed, whose values
+        sit at row start - 1); with start=0 and no seed, over the full frame.
+        """
+        new = frame.iloc[start:]
+        series = {}
+
+        delta = frame['close'].diff().iloc[start:]
+        gain = delta.where(delta > 0, 0)
+        loss = -delta.where(delta < 0, 0)
+        for period in self.rsi_calculator.periods:
+            series[f'rsi_{period}_avg_gain'] = _ema(gain, period, seed.get(f'rsi_{period}_avg_gain'))
+            series[f'rsi_{period}_avg_loss'] = _ema(loss, period, seed.get(f'rsi_{period}_avg_loss'))
+
+        for prefix, config in (('macd_fast', self.macd_calculator.fast_config),
+                               ('macd_std', self.macd_calculator.standard_config)):
+            fast = _ema(new['close'], config['fast'], seed.get(f'{prefix}_fast_ema'))
+            slow = _ema(new['close'], config['slow'], seed.get(f'{prefix}_slow_ema'))
+            series[f'{prefix}_fast_ema'] = fast
+            series[f'{prefix}_slow_ema'] = slow
+            macd_line = (fast - slow).loc[new.index]
+            series[f'{prefix}_signal_ema'] = _ema(macd_line, config['signal'], seed.get(f'{prefix}_signal_ema'))
+
+        series['volume_ema'] = _ema(new['volume'], self.volume_analyzer.ema_period, seed.get('volume_ema'))
+
+        tp_volume = (new['high'] + new['low'] + new['close']) / 3 * new['volume']
+        series['vwap_tp_volume'] = _cumsum(tp_volume, seed.get('vwap_tp_volume'))
+        series['vwap_volume'] = _cumsum(new['volume'], seed.get('vwap_volume'))
+
+        return series
+
+    def _snapshot(self, frame: pd.DataFrame, series: Dict[str, pd.Series],
+                  input_columns) -> Dict:
+        """Recursive values and input context at the second-to-last bar"""
+        at = frame.index[-2]
+        context = frame.loc[:at, input_columns].iloc[-self.context_bars:]
+        return {
+            'recursive': {name: float(values.loc[at]) for name, values in series.items()},
+            'context': context.to_dict(orient='list'),
+        }
+
+    # ------------------------------------------------------------------
+    # Tail calculation
+    # ------------------------------------------------------------------
+
+    def calculate_tail(self, context: pd.DataFrame, new: pd.DataFrame, seed: Dict):
+        """
+        Calculate all indicators for new bars
+
+        Args:
+            context: Input rows before the new bars (CONTEXT_BARS, from the state)
+            new: New input rows (the re-fetched last bar first)
+            seed: Recursive values at the last context row
+
+        Returns:
+            (indicator rows for new, frame of context + new with indicators, recursive series)
+        """
+        frame = pd.concat([context, new], ignore_index=True)
+        start = len(context)
+        series = {name: values.reindex(frame.index)
+                  for name, values in self._recursive_series(frame, start, seed).items()}
+
+        frame = self._add_important_ema_crossovers(frame)
+        ohlcv = column_views(frame)
+
+        # RSI
+        for period in self.rsi_calculator.periods:
+            rs = series[f'rsi_{period}_avg_gain'] / series[f'rsi_{period}_avg_loss']
+            frame[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+            frame[f'rsi_{period}_zone'] = self.rsi_calculator._classify_zones(frame[f'rsi_{period}'])
+
+        # MACD
+        for prefix in ('macd_fast', 'macd_std'):
+            macd_line = series[f'{prefix}_fast_ema'] - series[f'{prefix}_slow_ema']
+            signal_line = series[f'{prefix}_signal_ema']
+            histogram = macd_line - signal_line
+            frame[f'{prefix}_line'] = macd_line
+            frame[f'{prefix}_signal'] = signal_line
+            frame[f'{prefix}_histogram'] = histogram
+            frame[f'{prefix}_crossover'] = self.macd_calculator._detect_crossovers(macd_line, signal_line)
+            frame[f'{prefix}_trend'] = self.macd_calculator._determine_trend(macd_line, signal_line, histogram)
+
+        # VWAP (continuous)
+        frame['vwap'] = series['vwap_tp_volume'] / series['vwap_volume']
+        frame['vwap_distance'] = frame['close'] - frame['vwap']
+        frame['vwap_distance_pct'] = (frame['vwap_distance'] / frame['vwap']) * 100
+        frame['vwap_position'] = self.vwap_calculator._classify_position(frame)
+        frame['vwap_bounce'] = self.vwap_calculator._detect_bounces(frame)
+
+        # Volume
+        frame['volume_ema'] = series['volume_ema']
+        frame['volume_ratio'] = frame['volume'] / frame['volume_ema']
+        frame['volume_status'] = self.volume_analyzer._classify_volume(frame)
+        frame['volume_trend'] = self.volume_analyzer._calculate_volume_trend(frame)
+        frame['accumulation_distribution'] = self.volume_analyzer._detect_accumulation_distribution(frame)
+
+        # Windowed indicators: recomputed over context + new
+        for calculator in (self.stochastic_calculator, self.bollinger_calculator):
+            for col, values in calculator.columns(ohlcv).items():
+                frame[col] = values
+
+        frame = self._calculate_confluence_score(frame)
+        return frame.iloc[start:], frame, series
+
+    # ------------------------------------------------------------------
+    # File updates
+    # ------------------------------------------------------------------
+
+    def recompute(self, raw_file, output_file, store=None, symbol: str = None,
+                  timeframe: str = None, check: bool = False, reason: str = 'requested') -> Dict:
+        """
+        Recompute the full history and reset the incremental state
+
+        Args:
+            raw_file: Raw OHLCV CSV
+            output_file: Indicator CSV to write
+            store: Optional CandleStore to write the same frame to
+            symbol: Store symbol
+            timeframe: Store timeframe
+            check: Compare the previous output against the recomputed one
+            reason: Why the full recompute runs (reported back)
+
+        Returns:
+            {'mode': 'full', 'reason', 'rows', 'appended', 'check'}
+        """
+        raw = IncrementalCSV(raw_file)
+        out = IncrementalCSV(output_file)
+        raw_state = raw.state()
+
+        df = pd.read_csv(raw_file)
+        input_columns = list(df.columns)
+        previous_rows = out.rows() if out.path.exists() else 0
+
+        result = self.calculate_all(df.copy())
+
+        mismatched = None
+        if check and out.path.exists():
+            mismatched = self._compare(pd.read_csv(output_file), result)
+
+        out.rewrite(result)
+        if store is not None:
+            store.write(symbol, timeframe, result)
+
+        if len(df) >= 2:
+            frame = df.reset_index(drop=True)
+            state = self._snapshot(frame, self._recursive_series(frame, 0, {}), input_columns)
+            state.update({
+                'version': STATE_VERSION,
+                'input_columns': input_columns,
+                'last_timestamp': str(df['timestamp'].iloc[-1]),
+                'raw_offset': raw_state['last_row_offset'],
+                'raw_size': raw_state['size'],
+                'raw_mtime_ns': raw_state['mtime_ns'],
+                'updates_since_check': 0,
+            })
+            self._save_state(output_file, state)
+
+        return {'mode': 'full', 'reason': reason, 'rows': len(result),
+                'appended': max(0, len(result) - previous_rows), 'check': mismatched}
+
+    def update(self, raw_file, output_file, store=None, symbol: str = None,
+               timeframe: str = None) -> Dict:
+        """
+        Bring the indicator file up to date with the raw file
+
+        Args:
+            raw_file: Raw OHLCV CSV (appended to by the updater)
+            output_file: Indicator CSV
+            store: Optional CandleStore to append the same rows to
+            symbol: Store symbol
+            timeframe: Store timeframe
+
+        Returns:
+            {'mode': 'incremental' | 'full' | 'unchanged', 'reason', 'rows', 'appended', 'check'}
+            ('check' is a consistency-check result for report_check(), or None)
+        """
+        raw = IncrementalCSV(raw_file)
+        out = IncrementalCSV(output_file)
+        state = self._load_state(output_file)
+        raw_state = raw.state()
+
+        reason = None
+        if state is None or not out.path.exists():
+            reason = 'no state'
+        elif self.vwap_calculator.session_reset:
+            reason = 'session VWAP'
+        elif raw_state['columns'] != state['input_columns']:
+            reason = 'raw columns changed'
+        elif out.last_key() != state['last_timestamp']:
+            reason = 'output changed'
+        elif raw_state['size'] < state['raw_offset'] + 1:
+            reason = 'raw file shrank'
+        elif state['updates_since_check'] >= self.check_every:
+            return self.recompute(raw_file, output_file, store, symbol, timeframe,
+                                  check=True, reason='consistency check')
+
+        if reason is None and (raw_state['size'], raw_state['mtime_ns']) == (state['raw_size'], state['raw_mtime_ns']):
+            return {'mode': 'unchanged', 'reason': None, 'rows': out.rows(), 'appended': 0, 'check': None}
+
+        new = None
+        if reason is None:
+            # Raw rows from the last processed bar on (it may have been re-fetched)
+            with open(raw_file, 'rb') as f:
+                f.seek(state['raw_offset'])
+                new = pd.read_csv(f, header=None, names=state['input_columns'])
+            if new.empty or str(new['timestamp'].iloc[0]) != state['last_timestamp']:
+                reason = 'raw file rewritten'
+
+        if reason is not None:
+            return self.recompute(raw_file, output_file, store, symbol, timeframe, reason=reason)
+
+        context = pd.DataFrame(state['context'])
+        tail, frame, series = self.calculate_tail(context, new, state['recursive'])
+
+        columns = out.state()['columns']
+        if set(columns) != set(tail.columns):
+            return self.recompute(raw_file, output_file, store, symbol, timeframe,
+                                  reason='indicator columns changed')
+
+        written = out.append(tail[columns])
+        if store is not None:
+            store.append(symbol, timeframe, tail[columns])
+
+        raw_state = raw.state()
+        if len(frame) >= 2:
+            state.update(self._snapshot(frame, series, state['input_columns']))
+        state.update({
+            'last_timestamp': str(tail['timestamp'].iloc[-1]),
+            'raw_offset': raw_state['last_row_offset'],
+            'raw_size': raw_state['size'],
+            'raw_mtime_ns': raw_state['mtime_ns'],
+            'updates_since_check': state['updates_since_check'] + 1,
+        })
+        self._save_state(output_file, state)
+
+        return {'mode': 'incremental', 'reason': None, 'rows': written['rows'],
+                'appended': written['appended'], 'check': None}
+
+    # ------------------------------------------------------------------
+    # Consistency check
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _compare(previous: pd.DataFrame, recomputed: pd.DataFrame, rtol: float = 1e-9) -> Dict:
+        """Columns where the previous output differs from a full recompute"""
+        previous = previous.set_index(previous['timestamp'].astype(str))
+        recomputed = recomputed.set_index(recomputed['timestamp'].astype(str))
+        common = previous.index.intersection(recomputed.index)
+        mismatched = []
+        for col in recomputed.columns:
+            if col not in previous.columns:
+                mismatched.append(col)
+                continue
+            old = previous.loc[common, col]
+            new = recomputed.loc[common, col]
+            if pd.api.types.is_numeric_dtype(new) and pd.api.types.is_numeric_dtype(old) \
+                    and not pd.api.types.is_bool_dtype(new):
+                same = np.isclose(old.to_numpy(float), new.to_numpy(float), rtol=rtol, equal_nan=True)
+            else:
+                same = (old.astype(str).str.replace('nan', '') == new.astype(str).str.replace('nan', '')).to_numpy()
+            if not same.all():
+                mismatched.append(col)
+        return {'rows': len(common), 'mismatched_columns': mismatched}
+
+    @staticmethod
+    def report_check(check: Optional[Dict]):
+        """Print a consistency-check result (no-op for None)"""
+        if check is None:
+            return
+        if check['mismatched_columns']:
+            print(f"   ⚠️  Incremental output drifted in {len(check['mismatched_columns'])} columns "
+                  f"over {check['rows']} rows: {check['mismatched_columns'][:10]} (replaced by full recompute)")
+        else:
+            print(f"   ✅ Incremental output matches full recompute ({check['rows']} rows)")
@@ -4,13 +4,25 @@ Indicator Pipeline
 
 Orchestrates calculation of all technical indicators
 Ensures proper dependency order and efficient processing
+
+The independent indicators read read-only views of the OHLCV columns and
+return only their new columns (see column_views.py), which are added to
+the frame in one concat. Small frames (live updates) run them one after
+another in this thread; large frames can fan them out to a process pool
+that attaches the OHLCV arrays from shared memory.
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pandas as pd
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+from .column_views import (attach_columns, column_views, crossings, labels,
+                           release_columns, share_columns)
 from .rsi_calculator import RSICalculator
 from .macd_calculator import MACDCalculator
 from .vwap_calculator import VWAPCalculator
@@ -19,6 +31,26 @@ from .stochastic_calculator import StochasticCalculator
 from .bollinger_calculator import BollingerCalculator
 
 
+# Frames with at least this many bars use the process pool in 'auto' mode
+PROCESS_MIN_BARS = 200_000
+
+# Input arrays attached once per worker process (set by _init_worker)
+_WORKER_DATA: Dict[str, np.ndarray] = {}
+_WORKER_HANDLES: List = []
+
+
+def _init_worker(descriptor: Dict):
+    """Process pool initializer: attach the shared input arrays once"""
+    data, handle = attach_columns(descriptor)
+    _WORKER_DATA.update(data)
+    _WORKER_HANDLES.append(handle)
+
+
+def _columns_task(calculator) -> Dict[str, np.ndarray]:
+    """Run one calculator against the worker's attached arrays"""
+    return calculator.columns(_WORKER_DATA)
+
+
 class IndicatorPipeline:
     """
     Orchestrate all indicator calculations
@@ -26,7 +58,8 @@ class IndicatorPipeline:
     Processing order:
     1. EMAs (already calculated by data fetcher)
     2. Additional important EMA crossovers
-    3. Independent indicators in parallel (RSI, MACD, VWAP, Volume)
+    3. Independent indicators (RSI, MACD, VWAP, Volume, Stochastic, Bollinger),
+       serially or in a process pool
     4. Confluence scoring
     """
 
@@ -39,8 +72,24 @@ class IndicatorPipeline:
         (50, 200),  # Golden/Death cross (long-term)
     ]
 
-    def __init__(self):
-        """Initialize indicator pipeline"""
+    MODES = ('auto', 'serial', 'process')
+
+    def __init__(self, mode: str = 'auto', max_workers: Optional[int] = None):
+        """
+        Initialize indicator pipeline
+
+        Args:
+            mode: 'serial' (one thread, no copies), 'process' (pool over
+                  shared-memory inputs) or 'auto' (pool for frames of
+                  PROCESS_MIN_BARS bars or more on multi-core machines)
+            max_workers: Pool size (default: one per calculator, at most the CPU count)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, got {mode!r}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.last_run: Dict = {}
+
         self.rsi_calculator = RSICalculator(periods=[7, 14])
         self.macd_calculator = MACDCalculator()
         self.vwap_calculator = VWAPCalculator(session_reset=False)  # Continuous VWAP
@@ -109,24 +158,40 @@ class IndicatorPipeline:
                 print(f"   ⚠️  Skipping {fast}/{slow} - EMAs not found (looking for {fast_col}, {slow_col})")
                 continue
 
-            # Determine position
-            above = df[fast_col] > df[slow_col]
-            prev_above = above.shift(1).fillna(False)
-
-            # Detect crossovers
-            df[cross_col] = 'none'
-            df.loc[above & ~prev_above, cross_col] = 'golden_cross'
-            df.loc[~above & prev_above, cross_col] = 'death_cross'
+            # Determine position and detect crossovers
+            golden, death = crossings(df[fast_col].to_numpy() > df[slow_col].to_numpy())
+            df[cross_col] = labels(len(df), 'none', [(golden, 'golden_cross'), (death, 'death_cross')])
 
             print(f"   ✅ Added {fast}/{slow} crossover")
 
         return df
 
+    def _calculators(self) -> List:
+        """Independent calculators, in the order their columns are added"""
+        return [
+            self.rsi_calculator,
+            self.macd_calculator,
+            self.vwap_calculator,
+            self.volume_analyzer,
+            self.stochastic_calculator,
+            self.bollinger_calculator,
+        ]
+
+    def _resolve_mode(self, n_bars: int) -> str:
+        """Pick 'serial' or 'process' for a frame of n_bars"""
+        if self.mode != 'auto':
+            return self.mode
+        if n_bars >= PROCESS_MIN_BARS and (os.cpu_count() or 1) > 1:
+            return 'process'
+        return 'serial'
+
     def _calculate_parallel_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Calculate independent indicators in parallel
+        Calculate independent indicators
 
-        These don't depend on each other, so can run simultaneously
+        These don't depend on each other: each reads read-only views of
+        the OHLCV columns and returns only its new columns, serially or
+        in a process pool (see mode).
 
         Args:
             df: DataFrame with OHLCV data
@@ -134,75 +199,72 @@ class IndicatorPipeline:
         Returns:
             DataFrame with all indicators added
         """
-        print("\n⚡ Calculating indicators in parallel...")
-
-        # Calculate in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=6) as executor:
-            # Submit all calculations
-            rsi_future = executor.submit(self.rsi_calculator.calculate, df.copy())
-            macd_future = executor.submit(self.macd_calculator.calculate, df.copy())
-            vwap_future = executor.submit(self.vwap_calculator.calculate, df.copy())
-            volume_future = executor.submit(self.volume_analyzer.analyze, df.copy())
-            stochastic_future = executor.submit(self.stochastic_calculator.calculate, df.copy())
-            bollinger_future = executor.submit(self.bollinger_calculator.calculate, df.copy())
-
-            # Wait for all to complete and merge results
-            rsi_df = rsi_future.result()
-            macd_df = macd_future.result()
-            vwap_df = vwap_future.result()
-            volume_df = volume_future.result()
-            stochastic_df = stochastic_future.result()
-            bollinger_df = bollinger_future.result()
-
-        # Merge all indicator columns back to main dataframe
-        indicator_columns = []
-
-        # RSI columns
-        rsi_cols = [col for col in rsi_df.columns if col.startswith('rsi_')]
-        indicator_columns.extend(rsi_cols)
-
-        # MACD columns
-        macd_cols = [col for col in macd_df.columns if col.startswith('macd_')]
-        indicator_columns.extend(macd_cols)
-
-        # VWAP columns
-        vwap_cols = [col for col in vwap_df.columns if col.startswith('vwap')]
-        indicator_columns.extend(vwap_cols)
-
-        # Volume columns
-        volume_cols = [col for col in volume_df.columns if col.startswith('volume_') or col == 'accumulation_distribution']
-        indicator_columns.extend(volume_cols)
-
-        # Stochastic columns
-        stochastic_cols = [col for col in stochastic_df.columns if col.startswith('stoch_')]
-        indicator_columns.extend(stochastic_cols)
-
-        # Bollinger columns
-        bollinger_cols = [col for col in bollinger_df.columns if col.startswith('bb_')]
-        indicator_columns.extend(bollinger_cols)
-
-        # Add all indicator columns to main dataframe
-        for col in indicator_columns:
-            if col == 'rsi_7':
-                df[col] = rsi_df[col]
-            elif col == 'rsi_14':
-                df[col] = rsi_df[col]
-            elif col.startswith('rsi_'):
-                df[col] = rsi_df[col]
-            elif col.startswith('macd_'):
-                df[col] = macd_df[col]
-            elif col.startswith('vwap'):
-                df[col] = vwap_df[col]
-            elif col in volume_cols:
-                df[col] = volume_df[col]
-            elif col.startswith('stoch_'):
-                df[col] = stochastic_df[col]
-            elif col.startswith('bb_'):
-                df[col] = bollinger_df[col]
-
-        print(f"   ✅ Parallel calculation complete ({len(indicator_columns)} columns added)")
+        calculators = self._calculators()
+        inputs = list(dict.fromkeys(col for calculator in calculators for col in calculator.INPUTS))
+        data = column_views(df, inputs)
+        mode = self._resolve_mode(len(df))
+
+        print(f"\n⚡ Calculating indicators ({mode})...")
+        start = time.perf_counter()
+
+        copied = 0
+        if mode == 'process':
+            results, copied = self._columns_in_pool(calculators, data)
+            if results is None:
+                mode = 'serial'
+        if mode == 'serial':
+            results = [calculator.columns(data) for calculator in calculators]
+
+        new_columns = {}
+        for columns in results:
+            new_columns.update(columns)
+
+        # Columns already in the frame are replaced in place, the rest added in one concat
+        for col in [col for col in new_columns if col in df.columns]:
+            df[col] = new_columns.pop(col)
+        df = pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
+
+        self.last_run = {
+            'mode': mode,
+            'bars': len(df),
+            'columns': sum(len(columns) for columns in results),
+            'input_bytes_copied': copied,
+            'seconds': time.perf_counter() - start,
+        }
+        print(f"   ✅ Indicator calculation complete ({self.last_run['columns']} columns added, "
+              f"{copied / 1e6:.1f} MB of inputs copied, {self.last_run['seconds']:.2f}s)")
         return df
 
+    def _columns_in_pool(self, calculators: List, data: Dict[str, np.ndarray]):
+        """
+        Run the calculators in a process pool over shared-memory inputs
+
+        The input arrays are copied into one shared block once; workers
+        attach read-only views in their initializer and only the new
+        columns travel back.
+
+        Args:
+            calculators: Calculators to run
+            data: Input arrays
+
+        Returns:
+            (list of column dicts in calculator order, bytes copied into
+            shared memory), or (None, 0) if the pool could not run
+        """
+        workers = self.max_workers or min(len(calculators), os.cpu_count() or 1)
+        descriptor, handle = share_columns(data)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(descriptor,)) as executor:
+                futures = [executor.submit(_columns_task, calculator) for calculator in calculators]
+                results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            print(f"   ⚠️  Process pool unavailable ({e}), calculating serially")
+            return None, 0
+        finally:
+            release_columns(handle)
+        return results, descriptor['nbytes']
+
     def _calculate_confluence_score(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate confluence score (0-100)
@@ -7,9 +7,13 @@ Calculates MACD in two configurations:
 - Standard MACD (12/26/9) for confirmation
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+from .column_views import column_views, crossings, labels, series
+
 
 class MACDCalculator:
     """
@@ -22,6 +26,9 @@ class MACDCalculator:
     - Histogram: MACD Line - Signal Line
     """
 
+    # Input arrays columns() reads
+    INPUTS = ('close',)
+
     def __init__(
         self,
         fast_config={'fast': 5, 'slow': 13, 'signal': 5},
@@ -49,73 +56,90 @@ class MACDCalculator:
         """
         print(f"\n📈 Calculating MACD (Fast & Standard)...")
 
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
+
+        print(f"   ✅ Fast MACD ({self.fast_config['fast']}/{self.fast_config['slow']}/{self.fast_config['signal']})")
+        print(f"   ✅ Standard MACD ({self.standard_config['fast']}/{self.standard_config['slow']}/{self.standard_config['signal']})")
+
+        return df
+
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Fast and Standard MACD columns from read-only input arrays
+
+        Args:
+            data: Mapping with a 'close' array
+
+        Returns:
+            macd_fast_* and macd_std_* columns
+        """
+        close = series(data['close'])
+        out = {}
+
         # Fast MACD (for scalping)
-        df = self._calculate_macd(
-            df,
+        out.update(self._calculate_macd(
+            close,
             self.fast_config['fast'],
             self.fast_config['slow'],
             self.fast_config['signal'],
             prefix='macd_fast'
-        )
+        ))
 
         # Standard MACD (for confirmation)
-        df = self._calculate_macd(
-            df,
+        out.update(self._calculate_macd(
+            close,
             self.standard_config['fast'],
             self.standard_config['slow'],
             self.standard_config['signal'],
             prefix='macd_std'
-        )
+        ))
 
-        print(f"   ✅ Fast MACD ({self.fast_config['fast']}/{self.fast_config['slow']}/{self.fast_config['signal']})")
-        print(f"   ✅ Standard MACD ({self.standard_config['fast']}/{self.standard_config['slow']}/{self.standard_config['signal']})")
-
-        return df
+        return out
 
     def _calculate_macd(
         self,
-        df: pd.DataFrame,
+        close: pd.Series,
         fast_period: int,
         slow_period: int,
         signal_period: int,
         prefix: str
-    ) -> pd.DataFrame:
+    ) -> Dict[str, np.ndarray]:
         """
         Calculate MACD for specific parameters
 
         Args:
-            df: DataFrame with 'close' column
+            close: Close prices
             fast_period: Fast EMA period
             slow_period: Slow EMA period
             signal_period: Signal line EMA period
             prefix: Column name prefix (e.g., 'macd_fast', 'macd_std')
 
         Returns:
-            DataFrame with MACD columns added
+            Dictionary of MACD columns
         """
         # Calculate Fast and Slow EMAs
-        fast_ema = df['close'].ewm(span=fast_period, adjust=False).mean()
-        slow_ema = df['close'].ewm(span=slow_period, adjust=False).mean()
+        fast_ema = close.ewm(span=fast_period, adjust=False).mean()
+        slow_ema = close.ewm(span=slow_period, adjust=False).mean()
 
         # MACD Line = Fast EMA - Slow EMA
         macd_line = fast_ema - slow_ema
-        df[f'{prefix}_line'] = macd_line
 
         # Signal Line = EMA of MACD Line
         signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-        df[f'{prefix}_signal'] = signal_line
 
         # Histogram = MACD Line - Signal Line
+        macd_line = macd_line.to_numpy()
+        signal_line = signal_line.to_numpy()
         histogram = macd_line - signal_line
-        df[f'{prefix}_histogram'] = histogram
 
-        # Detect crossovers
-        df[f'{prefix}_crossover'] = self._detect_crossovers(macd_line, signal_line)
-
-        # Determine trend
-        df[f'{prefix}_trend'] = self._determine_trend(macd_line, signal_line, histogram)
-
-        return df
+        return {
+            f'{prefix}_line': macd_line,
+            f'{prefix}_signal': signal_line,
+            f'{prefix}_histogram': histogram,
+            f'{prefix}_crossover': self._crossover_labels(macd_line, signal_line),
+            f'{prefix}_trend': self._trend_labels(macd_line, signal_line, histogram),
+        }
 
     def _detect_crossovers(
         self,
@@ -132,21 +156,16 @@ class MACDCalculator:
         Returns:
             Crossover signals ('bullish', 'bearish', 'none')
         """
-        # Current and previous positions (convert to boolean explicitly)
-        above = (macd_line > signal_line).astype(bool)
-        prev_above = above.shift(1).fillna(False).astype(bool)
-
-        crossover = pd.Series('none', index=macd_line.index)
-
-        # Bullish crossover: MACD crosses above signal
-        bullish = above & ~prev_above
-        crossover[bullish] = 'bullish'
-
-        # Bearish crossover: MACD crosses below signal
-        bearish = ~above & prev_above
-        crossover[bearish] = 'bearish'
+        return pd.Series(
+            self._crossover_labels(macd_line.to_numpy(), signal_line.to_numpy()),
+            index=macd_line.index
+        )
 
-        return crossover
+    def _crossover_labels(self, macd_line: np.ndarray, signal_line: np.ndarray) -> np.ndarray:
+        """Crossover labels for MACD / signal arrays"""
+        # Bullish: MACD crosses above signal, bearish: crosses below
+        bullish, bearish = crossings(macd_line > signal_line)
+        return labels(len(macd_line), 'none', [(bullish, 'bullish'), (bearish, 'bearish')])
 
     def _determine_trend(
         self,
@@ -169,25 +188,28 @@ class MACDCalculator:
         Returns:
             Trend classification
         """
-        trend = pd.Series('neutral', index=macd_line.index)
-
-        # Strong bullish: MACD > Signal AND Histogram > 0
-        strong_bullish = (macd_line > signal_line) & (histogram > 0)
-        trend[strong_bullish] = 'strong_bullish'
-
-        # Strong bearish: MACD < Signal AND Histogram < 0
-        strong_bearish = (macd_line < signal_line) & (histogram < 0)
-        trend[strong_bearish] = 'strong_bearish'
-
-        # Weak bullish: MACD > Signal BUT Histogram < 0 (divergence)
-        weak_bullish = (macd_line > signal_line) & (histogram < 0)
-        trend[weak_bullish] = 'weak_bullish'
-
-        # Weak bearish: MACD < Signal BUT Histogram > 0 (divergence)
-        weak_bearish = (macd_line < signal_line) & (histogram > 0)
-        trend[weak_bearish] = 'weak_bearish'
+        return pd.Series(
+            self._trend_labels(macd_line.to_numpy(), signal_line.to_numpy(), histogram.to_numpy()),
+            index=macd_line.index
+        )
 
-        return trend
+    def _trend_labels(
+        self,
+        macd_line: np.ndarray,
+        signal_line: np.ndarray,
+        histogram: np.ndarray
+    ) -> np.ndarray:
+        """Trend labels for MACD / signal / histogram arrays"""
+        return labels(len(macd_line), 'neutral', [
+            # Strong bullish: MACD > Signal AND Histogram > 0
+            ((macd_line > signal_line) & (histogram > 0), 'strong_bullish'),
+            # Strong bearish: MACD < Signal AND Histogram < 0
+            ((macd_line < signal_line) & (histogram < 0), 'strong_bearish'),
+            # Weak bullish: MACD > Signal BUT Histogram < 0 (divergence)
+            ((macd_line > signal_line) & (histogram < 0), 'weak_bullish'),
+            # Weak bearish: MACD < Signal BUT Histogram > 0 (divergence)
+            ((macd_line < signal_line) & (histogram > 0), 'weak_bearish'),
+        ])
 
 
 def calculate_macd(
@@ -5,9 +5,13 @@ RSI (Relative Strength Index) Calculator
 Calculates RSI for multiple periods with zone classification
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+from .column_views import column_views, labels, series
+
 
 class RSICalculator:
     """
@@ -18,6 +22,9 @@ class RSICalculator:
     where RS = Average Gain / Average Loss
     """
 
+    # Input arrays columns() reads
+    INPUTS = ('close',)
+
     def __init__(self, periods=[7, 14]):
         """
         Initialize RSI calculator
@@ -39,20 +46,30 @@ class RSICalculator:
         """
         print(f"\n📊 Calculating RSI ({len(self.periods)} periods)...")
 
-        for period in self.periods:
-            rsi_col = f'rsi_{period}'
-            df[rsi_col] = self._calculate_rsi(df['close'], period)
-
-            # Classify zones
-            zone_col = f'rsi_{period}_zone'
-            df[zone_col] = self._classify_zones(df[rsi_col])
-
-            # Divergence detection (optional - for future use)
-            # df[f'rsi_{period}_divergence'] = self._detect_divergence(df, rsi_col)
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
 
         print(f"   ✅ RSI calculated for periods: {self.periods}")
         return df
 
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        RSI columns from read-only input arrays
+
+        Args:
+            data: Mapping with a 'close' array
+
+        Returns:
+            rsi_{period} and rsi_{period}_zone for every period
+        """
+        close = series(data['close'])
+        out = {}
+        for period in self.periods:
+            rsi = self._calculate_rsi(close, period).to_numpy()
+            out[f'rsi_{period}'] = rsi
+            out[f'rsi_{period}_zone'] = self._zone_labels(rsi)
+        return out
+
     def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
         """
         Calculate RSI for a specific period
@@ -97,14 +114,16 @@ class RSICalculator:
         Returns:
             Zone classifications
         """
-        zones = pd.Series(index=rsi.index, dtype=str)
-
-        zones[rsi > 70] = 'overbought'
-        zones[rsi < 30] = 'oversold'
-        zones[(rsi >= 50) & (rsi <= 70)] = 'neutral_high'
-        zones[(rsi >= 30) & (rsi < 50)] = 'neutral_low'
-
-        return zones
+        return pd.Series(self._zone_labels(rsi.to_numpy()), index=rsi.index)
+
+    def _zone_labels(self, rsi: np.ndarray) -> np.ndarray:
+        """Zone labels for an RSI array (NaN where RSI is undefined)"""
+        return labels(len(rsi), np.nan, [
+            (rsi > 70, 'overbought'),
+            (rsi < 30, 'oversold'),
+            ((rsi >= 50) & (rsi <= 70), 'neutral_high'),
+            ((rsi >= 30) & (rsi < 50), 'neutral_low'),
+        ])
 
     def _detect_divergence(self, df: pd.DataFrame, rsi_col: str) -> pd.Series:
         """
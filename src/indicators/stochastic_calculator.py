@@ -14,9 +14,16 @@ For day trading with 2-3 trades per day:
 - Best entries: Crossovers exiting extreme zones
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+try:
+    from .column_views import column_views, crossings, labels, series
+except ImportError:
+    from column_views import column_views, crossings, labels, series
+
 
 class StochasticCalculator:
     """
@@ -32,6 +39,9 @@ class StochasticCalculator:
     - Crossover: %K crossing above %D = bullish, below = bearish
     """
 
+    # Input arrays columns() reads
+    INPUTS = ('high', 'low', 'close')
+
     def __init__(self, k_period: int = 5, d_period: int = 3, smooth_period: int = 3):
         """
         Initialize Stochastic calculator
@@ -61,45 +71,56 @@ class StochasticCalculator:
         """
         print(f"\n📊 Calculating Stochastic Oscillator ({self.k_period}-{self.d_period}-{self.smooth_period})...")
 
-        # Calculate %K (Fast Stochastic)
-        # %K = (Current Close - Lowest Low) / (Highest High - Lowest Low) * 100
-        low_min = df['low'].rolling(window=self.k_period).min()
-        high_max = df['high'].rolling(window=self.k_period).max()
-
-        # Raw stochastic
-        stoch_raw = 100 * (df['close'] - low_min) / (high_max - low_min)
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
 
-        # Smooth %K
-        df['stoch_k'] = stoch_raw.rolling(window=self.smooth_period).mean()
-
-        # Calculate %D (Slow Stochastic - SMA of %K)
-        df['stoch_d'] = df['stoch_k'].rolling(window=self.d_period).mean()
+        print(f"   ✅ Stochastic calculated")
+        print(f"   📊 Current %K: {df['stoch_k'].iloc[-1]:.1f}")
+        print(f"   📊 Current %D: {df['stoch_d'].iloc[-1]:.1f}")
+        print(f"   📊 Signal: {df['stoch_signal'].iloc[-1]}")
 
-        # Identify zones
-        df['stoch_signal'] = 'neutral'
-        df.loc[df['stoch_k'] > 80, 'stoch_signal'] = 'overbought'
-        df.loc[df['stoch_k'] < 20, 'stoch_signal'] = 'oversold'
+        return df
 
-        # Detect crossovers
-        df['stoch_crossover'] = 'none'
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Stochastic columns from read-only input arrays
 
-        # Bullish crossover: %K crosses above %D
-        k_above_d = df['stoch_k'] > df['stoch_d']
-        k_above_d_prev = k_above_d.shift(1).fillna(False)
-        df.loc[k_above_d & ~k_above_d_prev, 'stoch_crossover'] = 'bullish'
+        Args:
+            data: Mapping with 'high', 'low', 'close' arrays
 
-        # Bearish crossover: %K crosses below %D
-        df.loc[~k_above_d & k_above_d_prev, 'stoch_crossover'] = 'bearish'
+        Returns:
+            stoch_k, stoch_d, stoch_signal, stoch_crossover, stoch_momentum
+        """
+        # Calculate %K (Fast Stochastic)
+        # %K = (Current Close - Lowest Low) / (Highest High - Lowest Low) * 100
+        low_min = series(data['low']).rolling(window=self.k_period).min()
+        high_max = series(data['high']).rolling(window=self.k_period).max()
 
-        # Calculate momentum strength
-        df['stoch_momentum'] = df['stoch_k'] - df['stoch_d']
+        # Raw stochastic
+        stoch_raw = 100 * (series(data['close']) - low_min) / (high_max - low_min)
 
-        print(f"   ✅ Stochastic calculated")
-        print(f"   📊 Current %K: {df['stoch_k'].iloc[-1]:.1f}")
-        print(f"   📊 Current %D: {df['stoch_d'].iloc[-1]:.1f}")
-        print(f"   📊 Signal: {df['stoch_signal'].iloc[-1]}")
+        # Smooth %K
+        stoch_k = stoch_raw.rolling(window=self.smooth_period).mean()
 
-        return df
+        # Calculate %D (Slow Stochastic - SMA of %K)
+        stoch_d = stoch_k.rolling(window=self.d_period).mean().to_numpy()
+        stoch_k = stoch_k.to_numpy()
+
+        # Detect crossovers: %K crosses above %D = bullish, below = bearish
+        bullish, bearish = crossings(stoch_k > stoch_d)
+
+        return {
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            # Identify zones
+            'stoch_signal': labels(len(stoch_k), 'neutral', [
+                (stoch_k > 80, 'overbought'),
+                (stoch_k < 20, 'oversold'),
+            ]),
+            'stoch_crossover': labels(len(stoch_k), 'none', [(bullish, 'bullish'), (bearish, 'bearish')]),
+            # Calculate momentum strength
+            'stoch_momentum': stoch_k - stoch_d,
+        }
 
 
 if __name__ == '__main__':
@@ -5,9 +5,13 @@ Volume Analyzer
 Analyzes volume patterns, spikes, and trends
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+from .column_views import column_views, labels, series
+
 
 class VolumeAnalyzer:
     """
@@ -20,6 +24,9 @@ class VolumeAnalyzer:
     - Accumulation/Distribution detection
     """
 
+    # Input arrays columns() reads
+    INPUTS = ('close', 'volume')
+
     def __init__(self, ema_period=20, spike_threshold=2.0, elevated_threshold=1.5):
         """
         Initialize volume analyzer
@@ -45,23 +52,42 @@ class VolumeAnalyzer:
         """
         print(f"\n📊 Analyzing Volume...")
 
-        # Calculate volume EMA (average volume)
-        df['volume_ema'] = df['volume'].ewm(span=self.ema_period, adjust=False).mean()
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
 
-        # Calculate volume ratio (current vs average)
-        df['volume_ratio'] = df['volume'] / df['volume_ema']
+        print(f"   ✅ Volume analyzed (EMA: {self.ema_period}, Spike threshold: {self.spike_threshold}×)")
+        return df
 
-        # Detect spikes and classify volume
-        df['volume_status'] = self._classify_volume(df)
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Volume analysis columns from read-only input arrays
 
-        # Calculate volume trend (is volume increasing or decreasing?)
-        df['volume_trend'] = self._calculate_volume_trend(df)
+        Args:
+            data: Mapping with 'close' and 'volume' arrays
 
-        # Detect accumulation/distribution
-        df['accumulation_distribution'] = self._detect_accumulation_distribution(df)
+        Returns:
+            volume_ema, volume_ratio, volume_status, volume_trend,
+            accumulation_distribution
+        """
+        volume = data['volume']
 
-        print(f"   ✅ Volume analyzed (EMA: {self.ema_period}, Spike threshold: {self.spike_threshold}×)")
-        return df
+        # Calculate volume EMA (average volume)
+        volume_ema = series(volume).ewm(span=self.ema_period, adjust=False).mean().to_numpy()
+
+        # Calculate volume ratio (current vs average)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = volume / volume_ema
+
+        return {
+            'volume_ema': volume_ema,
+            'volume_ratio': volume_ratio,
+            # Detect spikes and classify volume
+            'volume_status': self._status_labels(volume_ratio),
+            # Calculate volume trend (is volume increasing or decreasing?)
+            'volume_trend': self._trend_labels(volume),
+            # Detect accumulation/distribution
+            'accumulation_distribution': self._accumulation_labels(data['close'], volume_ratio),
+        }
 
     def _classify_volume(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -79,16 +105,15 @@ class VolumeAnalyzer:
         Returns:
             Volume status classifications
         """
-        status = pd.Series('normal', index=df.index)
-
-        status[df['volume_ratio'] >= self.spike_threshold] = 'spike'
-        status[
-            (df['volume_ratio'] >= self.elevated_threshold) &
-            (df['volume_ratio'] < self.spike_threshold)
-        ] = 'elevated'
-        status[df['volume_ratio'] < 0.5] = 'low'
+        return pd.Series(self._status_labels(df['volume_ratio'].to_numpy()), index=df.index)
 
-        return status
+    def _status_labels(self, volume_ratio: np.ndarray) -> np.ndarray:
+        """Volume status labels for a volume ratio array"""
+        return labels(len(volume_ratio), 'normal', [
+            (volume_ratio >= self.spike_threshold, 'spike'),
+            ((volume_ratio >= self.elevated_threshold) & (volume_ratio < self.spike_threshold), 'elevated'),
+            (volume_ratio < 0.5, 'low'),
+        ])
 
     def _calculate_volume_trend(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -102,16 +127,18 @@ class VolumeAnalyzer:
         Returns:
             Trend direction ('increasing', 'decreasing', 'stable')
         """
+        return pd.Series(self._trend_labels(df['volume'].to_numpy()), index=df.index)
+
+    def _trend_labels(self, volume: np.ndarray) -> np.ndarray:
+        """Volume trend labels for a volume array"""
         # Short-term volume average (last 5 periods)
-        short_vol_avg = df['volume'].rolling(window=5).mean()
+        short_vol_avg = series(volume).rolling(window=5).mean().to_numpy()
 
         # Compare current to short-term average
-        trend = pd.Series('stable', index=df.index)
-
-        trend[df['volume'] > short_vol_avg * 1.1] = 'increasing'
-        trend[df['volume'] < short_vol_avg * 0.9] = 'decreasing'
-
-        return trend
+        return labels(len(volume), 'stable', [
+            (volume > short_vol_avg * 1.1, 'increasing'),
+            (volume < short_vol_avg * 0.9, 'decreasing'),
+        ])
 
     def _detect_accumulation_distribution(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -128,24 +155,27 @@ class VolumeAnalyzer:
         Returns:
             Accumulation/Distribution signal
         """
-        ad_signal = pd.Series('neutral', index=df.index)
+        return pd.Series(
+            self._accumulation_labels(df['close'].to_numpy(), df['volume_ratio'].to_numpy()),
+            index=df.index
+        )
 
+    def _accumulation_labels(self, close: np.ndarray, volume_ratio: np.ndarray) -> np.ndarray:
+        """Accumulation/Distribution labels for close and volume ratio arrays"""
         # Price direction
-        price_up = df['close'] > df['close'].shift(1)
-        price_down = df['close'] < df['close'].shift(1)
+        prev_close = np.concatenate(([np.nan], close))[:len(close)]
+        price_up = close > prev_close
+        price_down = close < prev_close
 
         # Volume status
-        high_volume = df['volume_ratio'] >= self.elevated_threshold
-
-        # Accumulation: High volume on up moves
-        accumulation = price_up & high_volume
-        ad_signal[accumulation] = 'accumulation'
-
-        # Distribution: High volume on down moves
-        distribution = price_down & high_volume
-        ad_signal[distribution] = 'distribution'
-
-        return ad_signal
+        high_volume = volume_ratio >= self.elevated_threshold
+
+        return labels(len(close), 'neutral', [
+            # Accumulation: High volume on up moves
+            (price_up & high_volume, 'accumulation'),
+            # Distribution: High volume on down moves
+            (price_down & high_volume, 'distribution'),
+        ])
 
 
 def analyze_volume(
@@ -5,9 +5,13 @@ VWAP (Volume Weighted Average Price) Calculator
 Calculates VWAP and related metrics
 """
 
+from typing import Dict
+
 import pandas as pd
 import numpy as np
 
+from .column_views import column_views, labels, series
+
 
 class VWAPCalculator:
     """
@@ -19,6 +23,9 @@ class VWAPCalculator:
     VWAP shows where institutional traders are positioned
     """
 
+    # Input arrays columns() always reads
+    BASE_INPUTS = ('high', 'low', 'close', 'volume')
+
     def __init__(self, session_reset=False):
         """
         Initialize VWAP calculator
@@ -29,6 +36,11 @@ class VWAPCalculator:
         """
         self.session_reset = session_reset
 
+    @property
+    def INPUTS(self) -> tuple:
+        """Input arrays columns() reads ('timestamp' too with session_reset)"""
+        return self.BASE_INPUTS + (('timestamp',) if self.session_reset else ())
+
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate VWAP and related metrics
@@ -42,60 +54,80 @@ class VWAPCalculator:
         """
         print(f"\n💰 Calculating VWAP...")
 
-        # Calculate typical price
-        df['typical_price'] = (df['high'] + df['low'] + df['close']) / 3
-
-        # Calculate cumulative volume-weighted price
-        df['tp_volume'] = df['typical_price'] * df['volume']
-
-        if self.session_reset:
-            # Reset VWAP daily (requires timestamp column)
-            df = self._calculate_session_vwap(df)
-        else:
-            # Continuous VWAP
-            df['vwap'] = df['tp_volume'].cumsum() / df['volume'].cumsum()
-
-        # Calculate distance from VWAP
-        df['vwap_distance'] = df['close'] - df['vwap']
-        df['vwap_distance_pct'] = (df['vwap_distance'] / df['vwap']) * 100
-
-        # Classify position relative to VWAP
-        df['vwap_position'] = self._classify_position(df)
-
-        # Detect bounces off VWAP
-        df['vwap_bounce'] = self._detect_bounces(df)
-
-        # Clean up temporary columns
-        df.drop(columns=['typical_price', 'tp_volume'], inplace=True)
+        for col, values in self.columns(column_views(df, self.INPUTS)).items():
+            df[col] = values
 
         print(f"   ✅ VWAP calculated ({'session' if self.session_reset else 'continuous'})")
         return df
 
-    def _calculate_session_vwap(self, df: pd.DataFrame) -> pd.DataFrame:
+    def columns(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
-        Calculate VWAP with daily session resets
+        VWAP columns from read-only input arrays
 
         Args:
-            df: DataFrame with timestamp column
+            data: Mapping with 'high', 'low', 'close', 'volume' arrays
+                  (and 'timestamp' for session resets)
 
         Returns:
-            DataFrame with session VWAP
+            vwap, vwap_distance, vwap_distance_pct, vwap_position, vwap_bounce
         """
-        # Convert timestamp to date for grouping
-        if 'timestamp' in df.columns:
-            df['date'] = pd.to_datetime(df['timestamp']).dt.date
-
-            # Calculate VWAP per session
-            df['vwap'] = df.groupby('date').apply(
-                lambda x: (x['tp_volume'].cumsum() / x['volume'].cumsum())
-            ).reset_index(level=0, drop=True)
+        close = data['close']
+        volume = data['volume']
+
+        # Calculate typical price and cumulative volume-weighted price
+        typical_price = (data['high'] + data['low'] + close) / 3
+        tp_volume = typical_price * volume
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.session_reset and 'timestamp' in data:
+                # Reset VWAP daily
+                vwap = self._calculate_session_vwap(tp_volume, volume, data['timestamp'])
+            else:
+                # Continuous VWAP (or no timestamp to detect sessions)
+                vwap = series(tp_volume).cumsum().to_numpy() / series(volume).cumsum().to_numpy()
+
+            # Calculate distance from VWAP
+            distance = close - vwap
+            distance_pct = (distance / vwap) * 100
+
+        return {
+            'vwap': vwap,
+            'vwap_distance': distance,
+            'vwap_distance_pct': distance_pct,
+            # Classify position relative to VWAP
+            'vwap_position': self._position_labels(distance_pct),
+            # Detect bounces off VWAP
+            'vwap_bounce': self._bounce_labels(distance_pct, close),
+        }
+
+    def _calculate_session_vwap(
+        self,
+        tp_volume: np.ndarray,
+        volume: np.ndarray,
+        timestamp: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate VWAP with daily session resets
 
-            df.drop(columns=['date'], inplace=True)
-        else:
-            # Fallback to continuous if no timestamp
-            df['vwap'] = df['tp_volume'].cumsum() / df['volume'].cumsum()
+        Args:
+            tp_volume: Typical price × volume
+            volume: Volume
+            timestamp: Bar timestamps
 
-        return df
+        Returns:
+            Session VWAP
+        """
+        # Rows of each calendar date, in order (rows without a date stay NaN)
+        codes, _ = pd.factorize(pd.to_datetime(series(timestamp)).dt.date)
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+
+        # Plain cumulative sums per session (as Series.cumsum per group)
+        vwap = np.full(len(codes), np.nan)
+        for rows in np.split(order, bounds):
+            vwap[rows] = np.cumsum(tp_volume[rows]) / np.cumsum(volume[rows])
+        return vwap
 
     def _classify_position(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -114,15 +146,17 @@ class VWAPCalculator:
         Returns:
             Position classifications
         """
-        position = pd.Series('at_vwap', index=df.index)
-
-        position[df['vwap_distance_pct'] > 0.5] = 'strong_above'
-        position[(df['vwap_distance_pct'] > 0.1) & (df['vwap_distance_pct'] <= 0.5)] = 'above'
-        position[(df['vwap_distance_pct'] >= -0.1) & (df['vwap_distance_pct'] <= 0.1)] = 'at_vwap'
-        position[(df['vwap_distance_pct'] < -0.1) & (df['vwap_distance_pct'] >= -0.5)] = 'below'
-        position[df['vwap_distance_pct'] < -0.5] = 'strong_below'
-
-        return position
+        return pd.Series(self._position_labels(df['vwap_distance_pct'].to_numpy()), index=df.index)
+
+    def _position_labels(self, distance_pct: np.ndarray) -> np.ndarray:
+        """Position labels for a VWAP distance (%) array"""
+        return labels(len(distance_pct), 'at_vwap', [
+            (distance_pct > 0.5, 'strong_above'),
+            ((distance_pct > 0.1) & (distance_pct <= 0.5), 'above'),
+            ((distance_pct >= -0.1) & (distance_pct <= 0.1), 'at_vwap'),
+            ((distance_pct < -0.1) & (distance_pct >= -0.5), 'below'),
+            (distance_pct < -0.5, 'strong_below'),
+        ])
 
     def _detect_bounces(self, df: pd.DataFrame) -> pd.Series:
         """
@@ -138,24 +172,26 @@ class VWAPCalculator:
         Returns:
             Bounce signals ('bullish_bounce', 'bearish_bounce', 'none')
         """
-        bounce = pd.Series('none', index=df.index)
+        return pd.Series(
+            self._bounce_labels(df['vwap_distance_pct'].to_numpy(), df['close'].to_numpy()),
+            index=df.index
+        )
 
+    def _bounce_labels(self, distance_pct: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """Bounce labels for VWAP distance (%) and close arrays"""
         # Check if price is near VWAP
-        near_vwap = abs(df['vwap_distance_pct']) < 0.2
+        near_vwap = np.abs(distance_pct) < 0.2
 
         # Calculate price direction change
-        price_change = df['close'].diff()
-        prev_price_change = price_change.shift(1)
-
-        # Bullish bounce: Was falling, now rising
-        bullish = near_vwap & (prev_price_change < 0) & (price_change > 0)
-        bounce[bullish] = 'bullish_bounce'
-
-        # Bearish bounce: Was rising, now falling
-        bearish = near_vwap & (prev_price_change > 0) & (price_change < 0)
-        bounce[bearish] = 'bearish_bounce'
-
-        return bounce
+        price_change = series(close).diff().to_numpy()
+        prev_price_change = np.concatenate(([np.nan], price_change))[:len(price_change)]
+
+        return labels(len(close), 'none', [
+            # Bullish bounce: Was falling, now rising
+            (near_vwap & (prev_price_change < 0) & (price_change > 0), 'bullish_bounce'),
+            # Bearish bounce: Was rising, now falling
+            (near_vwap & (prev_price_change > 0) & (price_change < 0), 'bearish_bounce'),
+        ])
 
 
 def calculate_vwap(df: pd.DataFrame, session_reset=False) -> pd.DataFrame:
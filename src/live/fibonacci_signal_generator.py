@@ -27,6 +27,7 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'fourier_strategy'))
 
 from fourier_strategy.fibonacci_ribbon_analyzer import FibonacciRibbonAnalyzer
+from src.indicators.fibonacci_levels import level_prices, proximity_score as fib_proximity_score
 
 logger = logging.getLogger(__name__)
 
@@ -146,116 +147,136 @@ class FibonacciSignalGenerator:
             latest_alignment = float(signals['fibonacci_alignment'].iloc[-1])
             latest_confluence = float(signals['fibonacci_confluence'].iloc[-1])
 
-            # Check thresholds for signal generation
-            compression_met = latest_compression > self.compression_threshold
-            alignment_met = abs(latest_alignment) > self.alignment_threshold
-            confluence_met = latest_confluence > self.confluence_threshold
-
-            # ENHANCED: Add Volume FFT and Fibonacci levels analysis
-            volume_momentum = 0.5
-            fib_proximity = 0.5
-            fib_levels = {}
-
-            if self.use_volume_fft and 'volume' in df.columns:
-                try:
-                    volume_data = df['volume'].values
-                    _, volume_momentum = self._apply_fft_to_volume(volume_data)
-                    logger.debug(f"Volume momentum: {volume_momentum:.2f}")
-                except Exception as e:
-                    logger.error(f"Volume FFT error: {e}")
-
-            if self.use_fib_levels:
-                try:
-                    fib_levels = self._calculate_fibonacci_levels(df)
-                    if fib_levels:
-                        current_price = float(df['close'].iloc[-1])
-                        fib_proximity = self._check_fib_level_proximity(current_price, fib_levels)
-                        logger.debug(f"Fib level proximity: {fib_proximity:.2f}")
-                except Exception as e:
-                    logger.error(f"Fibonacci levels error: {e}")
-
-            # Determine signal direction
-            if compression_met and alignment_met and confluence_met:
-                if latest_alignment > 0:
-                    signal_type = 'LONG'
-                else:
-                    signal_type = 'SHORT'
-
-                # Calculate BASE strength (normalized to 0-1)
-                base_strength = (
-                    (latest_compression / 100) * 0.4 +
-                    (abs(latest_alignment) / 100) * 0.4 +
-                    (latest_confluence / 100) * 0.2
-                )
-
-                # ENHANCE strength with volume and fib levels
-                volume_boost = (volume_momentum - 0.5) * self.volume_confirmation_weight
-                fib_boost = (fib_proximity - 0.5) * self.fib_level_weight
-
-                strength = min(base_strength + volume_boost + fib_boost, 1.0)
-
-                # Calculate confidence based on how far above thresholds we are
-                compression_margin = (latest_compression - self.compression_threshold) / (100 - self.compression_threshold)
-                alignment_margin = (abs(latest_alignment) - self.alignment_threshold) / (100 - self.alignment_threshold)
-                confluence_margin = (latest_confluence - self.confluence_threshold) / (100 - self.confluence_threshold)
-
-                base_confidence = (
-                    compression_margin * 0.3 +
-                    alignment_margin * 0.4 +
-                    confluence_margin * 0.3
-                )
-
-                # ENHANCE confidence with volume and fib confirmations
-                confidence = min(base_confidence + volume_boost + fib_boost, 1.0)
-
-                logger.info(
-                    f"🎯 ENHANCED Fibonacci Signal Generated:\n"
-                    f"  Type: {signal_type}\n"
-                    f"  Strength: {strength:.2f} (base={base_strength:.2f}, vol_boost={volume_boost:+.2f}, fib_boost={fib_boost:+.2f})\n"
-                    f"  Confidence: {confidence:.2f}\n"
-                    f"  Compression: {latest_compression:.1f} (threshold: {self.compression_threshold})\n"
-                    f"  Alignment: {latest_alignment:.1f} (threshold: {self.alignment_threshold})\n"
-                    f"  Confluence: {latest_confluence:.1f} (threshold: {self.confluence_threshold})\n"
-                    f"  Volume Momentum: {volume_momentum:.2f}\n"
-                    f"  Fib Level Proximity: {fib_proximity:.2f}"
-                )
-
-                return {
-                    'signal': signal_type,
-                    'strength': max(strength, self.min_signal_strength),
-                    'confidence': confidence,
-                    'compression': latest_compression,
-                    'alignment': latest_alignment,
-                    'confluence': latest_confluence,
-                    'volume_momentum': volume_momentum,
-                    'fib_proximity': fib_proximity,
-                    'fib_levels': fib_levels,
-                    'source': 'fibonacci_fft_enhanced',
-                    'thresholds_met': {
-                        'compression': compression_met,
-                        'alignment': alignment_met,
-                        'confluence': confluence_met
-                    },
-                    'enhancements': {
-                        'volume_fft_enabled': self.use_volume_fft,
-                        'fib_levels_enabled': self.use_fib_levels,
-                        'volume_boost': volume_boost,
-                        'fib_boost': fib_boost
-                    }
-                }
-            else:
-                logger.debug(
-                    f"Thresholds not met - "
-                    f"Compression: {latest_compression:.1f}/{self.compression_threshold} "
-                    f"Alignment: {abs(latest_alignment):.1f}/{self.alignment_threshold} "
-                    f"Confluence: {latest_confluence:.1f}/{self.confluence_threshold}"
-                )
-                return None
+            return self.signal_from_ribbon(latest_compression, latest_alignment,
+                                           latest_confluence, df)
 
         except Exception as e:
             logger.error(f"Error generating Fibonacci signal: {e}", exc_info=True)
             return None
 
+    def signal_from_ribbon(self, latest_compression: float, latest_alignment: float,
+                           latest_confluence: float, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        Build the signal from already computed latest ribbon values
+
+        Lets callers that compute the ribbon incrementally (walk-forward
+        backtests) reuse the threshold / enhancement logic of generate_signal.
+
+        Args:
+            latest_compression: Ribbon compression at the latest bar
+            latest_alignment: Ribbon alignment at the latest bar
+            latest_confluence: Ribbon confluence at the latest bar
+            df: Price data ending at the latest bar (volume FFT / fib levels)
+
+        Returns:
+            Signal dict (see generate_signal) or None
+        """
+        # Check thresholds for signal generation
+        compression_met = latest_compression > self.compression_threshold
+        alignment_met = abs(latest_alignment) > self.alignment_threshold
+        confluence_met = latest_confluence > self.confluence_threshold
+
+        # ENHANCED: Add Volume FFT and Fibonacci levels analysis
+        volume_momentum = 0.5
+        fib_proximity = 0.5
+        fib_levels = {}
+
+        if self.use_volume_fft and 'volume' in df.columns:
+            try:
+                volume_data = df['volume'].values
+                _, volume_momentum = self._apply_fft_to_volume(volume_data)
+                logger.debug(f"Volume momentum: {volume_momentum:.2f}")
+            except Exception as e:
+                logger.error(f"Volume FFT error: {e}")
+
+        if self.use_fib_levels:
+            try:
+                fib_levels = self._calculate_fibonacci_levels(df)
+                if fib_levels:
+                    current_price = float(df['close'].iloc[-1])
+                    fib_proximity = self._check_fib_level_proximity(current_price, fib_levels)
+                    logger.debug(f"Fib level proximity: {fib_proximity:.2f}")
+            except Exception as e:
+                logger.error(f"Fibonacci levels error: {e}")
+
+        # Determine signal direction
+        if compression_met and alignment_met and confluence_met:
+            if latest_alignment > 0:
+                signal_type = 'LONG'
+            else:
+                signal_type = 'SHORT'
+
+            # Calculate BASE strength (normalized to 0-1)
+            base_strength = (
+                (latest_compression / 100) * 0.4 +
+                (abs(latest_alignment) / 100) * 0.4 +
+                (latest_confluence / 100) * 0.2
+            )
+
+            # ENHANCE strength with volume and fib levels
+            volume_boost = (volume_momentum - 0.5) * self.volume_confirmation_weight
+            fib_boost = (fib_proximity - 0.5) * self.fib_level_weight
+
+            strength = min(base_strength + volume_boost + fib_boost, 1.0)
+
+            # Calculate confidence based on how far above thresholds we are
+            compression_margin = (latest_compression - self.compression_threshold) / (100 - self.compression_threshold)
+            alignment_margin = (abs(latest_alignment) - self.alignment_threshold) / (100 - self.alignment_threshold)
+            confluence_margin = (latest_confluence - self.confluence_threshold) / (100 - self.confluence_threshold)
+
+            base_confidence = (
+                compression_margin * 0.3 +
+                alignment_margin * 0.4 +
+                confluence_margin * 0.3
+            )
+
+            # ENHANCE confidence with volume and fib confirmations
+            confidence = min(base_confidence + volume_boost + fib_boost, 1.0)
+
+            logger.info(
+                f"🎯 ENHANCED Fibonacci Signal Generated:\n"
+                f"  Type: {signal_type}\n"
+                f"  Strength: {strength:.2f} (base={base_strength:.2f}, vol_boost={volume_boost:+.2f}, fib_boost={fib_boost:+.2f})\n"
+                f"  Confidence: {confidence:.2f}\n"
+                f"  Compression: {latest_compression:.1f} (threshold: {self.compression_threshold})\n"
+                f"  Alignment: {latest_alignment:.1f} (threshold: {self.alignment_threshold})\n"
+                f"  Confluence: {latest_confluence:.1f} (threshold: {self.confluence_threshold})\n"
+                f"  Volume Momentum: {volume_momentum:.2f}\n"
+                f"  Fib Level Proximity: {fib_proximity:.2f}"
+            )
+
+            return {
+                'signal': signal_type,
+                'strength': max(strength, self.min_signal_strength),
+                'confidence': confidence,
+                'compression': latest_compression,
+                'alignment': latest_alignment,
+                'confluence': latest_confluence,
+                'volume_momentum': volume_momentum,
+                'fib_proximity': fib_proximity,
+                'fib_levels': fib_levels,
+                'source': 'fibonacci_fft_enhanced',
+                'thresholds_met': {
+                    'compression': compression_met,
+                    'alignment': alignment_met,
+                    'confluence': confluence_met
+                },
+                'enhancements': {
+                    'volume_fft_enabled': self.use_volume_fft,
+                    'fib_levels_enabled': self.use_fib_levels,
+                    'volume_boost': volume_boost,
+                    'fib_boost': fib_boost
+                }
+            }
+        else:
+            logger.debug(
+                f"Thresholds not met - "
+                f"Compression: {latest_compression:.1f}/{self.compression_threshold} "
+                f"Alignment: {abs(latest_alignment):.1f}/{self.alignment_threshold} "
+                f"Confluence: {latest_confluence:.1f}/{self.confluence_threshold}"
+            )
+            return None
+
     def _apply_fft_to_volume(self, volume: np.ndarray) -> Tuple[np.ndarray, float]:
         """
         Apply FFT to volume data to detect patterns
@@ -323,17 +344,11 @@ class FibonacciSignalGenerator:
             if swing_range == 0:
                 return {}
 
-            # Calculate retracement levels (from high to low)
-            retracement_levels = [
-                swing_high - (swing_range * level)
-                for level in self.FIB_RETRACEMENT
-            ]
-
-            # Calculate extension levels (beyond the range)
-            extension_levels = [
-                swing_low - (swing_range * (level - 1.0))
-                for level in self.FIB_EXTENSION
-            ]
+            # Retracements from high to low, extensions beyond the range
+            prices = level_prices(swing_high, swing_low, self.FIB_RETRACEMENT,
+                                  self.FIB_EXTENSION, anchor='high')[0]
+            retracement_levels = prices[:len(self.FIB_RETRACEMENT)].tolist()
+            extension_levels = prices[len(self.FIB_RETRACEMENT):].tolist()
 
             return {
                 'retracement_levels': retracement_levels,
@@ -359,16 +374,13 @@ class FibonacciSignalGenerator:
             if not fib_levels or 'retracement_levels' not in fib_levels:
                 return 0.5
 
-            all_levels = (
+            all_levels = np.array(
                 fib_levels['retracement_levels'] +
                 fib_levels['extension_levels']
             )
 
-            # Find closest level
-            distances = [abs(current_price - level) for level in all_levels]
-            min_distance = min(distances)
-
-            # Normalize by swing range
+            # Find closest level, normalized by swing range
+            min_distance = np.abs(current_price - all_levels).min()
             swing_range = fib_levels.get('swing_range', 1.0)
             if swing_range > 0:
                 normalized_distance = min_distance / swing_range
@@ -377,7 +389,7 @@ class FibonacciSignalGenerator:
 
             # Convert to proximity score (closer = higher score)
             # Within 2% of range = strong proximity
-            proximity_score = max(0.0, 1.0 - (normalized_distance / 0.02))
+            proximity_score = float(fib_proximity_score(normalized_distance, 1 / 0.02))
 
             return proximity_score
 
@@ -276,21 +276,30 @@ class RealtimeDataEngine:
 
         logger.info(f"Initialized RealtimeDataEngine for {symbol}")
 
-    def bootstrap_from_historical_data(self, data_dir: str = 'trading_data/indicators'):
+    def bootstrap_from_historical_data(self, data_dir: str = 'trading_data/indicators',
+                                       store_dir: str = 'trading_data/store'):
         """
         Bootstrap the data engine with historical data from CSV files
 
         This pre-loads historical candles so the bot doesn't need to wait
-        17 hours to accumulate 200 5m candles.
+        17 hours to accumulate 200 5m candles. Timeframes imported into the
+        CandleStore are read from its binary partitions instead of the CSVs.
 
         Args:
             data_dir: Directory containing historical CSV files
+            store_dir: CandleStore directory (checked first)
         """
         from pathlib import Path
 
         data_path = Path(data_dir)
         logger.info(f"🔄 Bootstrapping historical data from {data_path}...")
 
+        try:
+            from src.data.candle_store import CandleStore
+            store = CandleStore(store_dir)
+        except ImportError:
+            store = None
+
         timeframe_files = {
             '1m': 'eth_1m_full.csv',
             '5m': 'eth_5m_full.csv',
@@ -301,21 +310,27 @@ class RealtimeDataEngine:
 
         for tf, filename in timeframe_files.items():
             file_path = data_path / filename
+            in_store = store is not None and store.exists(self.symbol, tf)
 
-            if not file_path.exists():
+            if not in_store and not file_path.exists():
                 logger.warning(f"⚠️  Historical data not found: {file_path}")
                 continue
 
             try:
-                # Read CSV
-                df = pd.read_csv(file_path)
-
-                # Convert timestamp to datetime if needed
-                if 'timestamp' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-                # Take last 1000 candles (enough for analysis, not too much memory)
-                df = df.tail(1000)
+                if in_store:
+                    # Last 1000 candles from the newest partitions, no text parsing
+                    df = store.tail(self.symbol, tf, 1000,
+                                    columns=['open', 'high', 'low', 'close', 'volume'])
+                else:
+                    # Read CSV
+                    df = pd.read_csv(file_path)
+
+                    # Convert timestamp to datetime if needed
+                    if 'timestamp' in df.columns:
+                        df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+                    # Take last 1000 candles (enough for analysis, not too much memory)
+                    df = df.tail(1000)
 
                 # Convert to Candle objects and add to buffer
                 for _, row in df.iterrows():
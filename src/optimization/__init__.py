@@ -5,5 +5,6 @@ Claude LLM-powered continuous strategy improvement
 """
 
 from .claude_optimizer import ClaudeOptimizer
+from .candidate_batch import BatchCandidateLoop, ClaudeSuggester, LocalSuggester, PromptCache
 
-__all__ = ['ClaudeOptimizer']
+__all__ = ['ClaudeOptimizer', 'BatchCandidateLoop', 'ClaudeSuggester', 'LocalSuggester', 'PromptCache']
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Batched Candidate Evaluation for the LLM Optimization Loops
+
+The LLM loops used to ask for ONE suggestion, backtest it, then ask again,
+so network wait and CPU work strictly alternated. This module pipelines
+them:
+- Suggesters return K candidate parameter sets per round
+  (ClaudeSuggester: one request asking for K candidates,
+  LocalSuggester: deterministic perturbations around the best params)
+- The K candidates are backtested together in a process pool
+  (ParallelIterationRunner, data in shared memory)
+- The next round's request runs in a background thread while the current
+  batch backtests; its prompt is built from the results known at that
+  point (one round behind), unless pipelining is turned off
+- Prompt → response pairs are memoized on disk (PromptCache), so a
+  re-run replays identical requests without calling the API
+
+With LocalSuggester the whole loop runs offline and deterministically,
+which makes it benchmarkable without an API key.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.backtest.parallel_runner import ParallelIterationRunner
+    from src.backtest.result_store import canonical_params
+    from src.backtest.successive_halving import _RungEvaluator
+except ImportError:  # scripts that put src/ itself on sys.path
+    from backtest.parallel_runner import ParallelIterationRunner
+    from backtest.result_store import canonical_params
+    from backtest.successive_halving import _RungEvaluator
+
+
+# Appended to a single-suggestion prompt when K > 1 candidates are wanted
+BATCH_INSTRUCTIONS = """
+
+## Candidates
+
+Instead of a single suggestion, propose {k} DIFFERENT candidate parameter sets.
+They are backtested in parallel, so spread them over distinct hypotheses
+rather than small variations of one idea. Respond with JSON only:
+
+```json
+{{
+  "candidates": [
+    {{"suggested_changes": {{"<param>": <value>}}, "reasoning": "<one sentence>"}}
+  ]
+}}
+```
+"""
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def extract_json(text: str):
+    """
+    Parse the JSON payload of an LLM response
+
+    Handles ```json fenced blocks, bare ``` blocks and raw JSON.
+
+    Returns:
+        Parsed object or None
+    """
+    if not text:
+        return None
+    match = re.search(r'```(?:json)?\s*(.*?)```', text, re.DOTALL)
+    payload = match.group(1) if match else text
+    try:
+        return json.loads(payload.strip())
+    except json.JSONDecodeError:
+        # Last resort: outermost {...} in free text
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            return None
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+
+
+def apply_changes(params: Dict, changes: Dict, max_change_pct: Optional[float] = None,
+                  bounds: Dict[str, Tuple[float, float]] = None) -> Dict:
+    """
+    Candidate params: suggested changes applied on params with safety limits
+
+    Keys not in params are ignored, as are changes of the wrong type.
+    Numeric changes are limited to ±max_change_pct of the current value
+    (when it is non-zero) and clipped to bounds; integer parameters stay
+    integers.
+
+    Args:
+        params: Current parameters
+        changes: Suggested {param: value}
+        max_change_pct: Max % change per numeric parameter (None = unlimited)
+        bounds: Optional {param: (low, high)}
+
+    Returns:
+        New parameter dict
+    """
+    bounds = bounds or {}
+    updated = dict(params)
+    for key, value in (changes or {}).items():
+        if key not in params:
+            continue
+        old = params[key]
+        if _is_number(old) != _is_number(value):
+            continue
+        if _is_number(old):
+            if max_change_pct is not None and old != 0:
+                limit = abs(old) * max_change_pct / 100
+                value = min(max(value, old - limit), old + limit)
+            if key in bounds:
+                low, high = bounds[key]
+                value = min(max(value, low), high)
+            value = int(round(value)) if isinstance(old, (int, np.integer)) else float(value)
+        updated[key] = value
+    return updated
+
+
+class PromptCache:
+    """
+    On-disk memo of prompt → response pairs
+
+    One JSON file per (model, settings, prompt) hash, so identical requests
+    (re-runs, resumed loops, offline replays) never hit the API twice.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        """
+        Args:
+            cache_dir: Directory of cached responses
+                       (default: optimization_logs/prompt_cache)
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent.parent / 'optimization_logs' / 'prompt_cache'
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model: str, prompt: str, **settings) -> str:
+        """Hash of everything that determines the response"""
+        payload = json.dumps({'model': model, 'prompt': prompt, **settings}, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def get(self, model: str, prompt: str, **settings) -> Optional[str]:
+        """Cached response text or None (counts a hit or a miss)"""
+        path = self.cache_dir / f"{self.key(model, prompt, **settings)}.json"
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        with open(path) as f:
+            return json.load(f)['response']
+
+    def put(self, model: str, prompt: str, response: str, **settings):
+        """Store a response (written atomically)"""
+        path = self.cache_dir / f"{self.key(model, prompt, **settings)}.json"
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'model': model, 'settings': settings, 'prompt': prompt,
+                       'response': response, 'created_at': datetime.now().isoformat()}, f, indent=2)
+        tmp.replace(path)
+
+
+class ClaudeSuggester:
+    """
+    Candidate suggestions from the Anthropic API
+
+    One request per round asks for K candidates; responses are memoized in
+    a PromptCache.
+    """
+
+    name = 'claude'
+
+    def __init__(self,
+                 client,
+                 model: str = "claude-sonnet-4-5-20250929",
+                 max_tokens: int = 4096,
+                 temperature: float = 0.7,
+                 cache: Optional[PromptCache] = None):
+        """
+        Args:
+            client: anthropic.Anthropic client
+            model: Model name
+            max_tokens: Response token limit
+            temperature: Sampling temperature
+            cache: PromptCache (None = always call the API)
+        """
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.cache = cache
+
+    def ask(self, prompt: str) -> str:
+        """Response text for a prompt (from the cache when possible)"""
+        settings = {'max_tokens': self.max_tokens, 'temperature': self.temperature}
+        if self.cache is not None:
+            cached = self.cache.get(self.model, prompt, **settings)
+            if cached is not None:
+                return cached
+
+        message = self.client.messages.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            **settings
+        )
+        response = message.content[0].text
+
+        if self.cache is not None:
+            self.cache.put(self.model, prompt, response, **settings)
+        return response
+
+    def suggest(self, prompt: str, best_params: Dict, k: int) -> List[Dict]:
+        """
+        Ask for k candidates
+
+        Args:
+            prompt: Single-suggestion analysis prompt
+            best_params: Parameters the suggestions should start from (unused,
+                         the prompt already contains them)
+            k: Number of candidates
+
+        Returns:
+            Up to k dicts with 'suggested_changes' and 'reasoning'
+        """
+        if k > 1:
+            prompt = prompt + BATCH_INSTRUCTIONS.format(k=k)
+        parsed = extract_json(self.ask(prompt))
+
+        if isinstance(parsed, dict):
+            parsed = parsed.get('candidates', [parsed])
+        if not isinstance(parsed, list):
+            return []
+        return [c for c in parsed if isinstance(c, dict) and isinstance(c.get('suggested_changes'), dict)][:k]
+
+
+class LocalSuggester:
+    """
+    Deterministic offline stand-in for the LLM
+
+    Every candidate moves a random subset of the tuned parameters around
+    the best params by a normal step of `scale` × their range (× their
+    value without bounds). The random stream is seeded by (seed, call
+    number), so a loop is reproducible run to run.
+    """
+
+    name = 'local'
+
+    def __init__(self,
+                 bounds: Dict[str, Tuple[float, float]] = None,
+                 keys: List[str] = None,
+                 scale: float = 0.15,
+                 seed: int = 42):
+        """
+        Args:
+            bounds: {param: (low, high)}; also the tuned keys if keys is None
+            keys: Parameters to perturb (default: bounds keys, else every
+                  numeric parameter)
+            scale: Step size as a fraction of the range / value
+            seed: Random seed
+        """
+        self.bounds = bounds or {}
+        self.keys = keys
+        self.scale = scale
+        self.seed = seed
+        self.calls = 0
+
+    def suggest(self, prompt: str, best_params: Dict, k: int) -> List[Dict]:
+        """k perturbations of best_params (prompt is ignored)"""
+        rng = np.random.default_rng([self.seed, self.calls])
+        self.calls += 1
+
+        keys = self.keys or list(self.bounds) or list(best_params)
+        keys = [key for key in keys if _is_number(best_params.get(key))]
+        if not keys:
+            return []
+
+        candidates = []
+        for _ in range(k):
+            moved = rng.random(len(keys)) < 0.5
+            if not moved.any():
+                moved[rng.integers(len(keys))] = True
+
+            changes = {}
+            for key in np.array(keys)[moved]:
+                value = best_params[key]
+                if key in self.bounds:
+                    low, high = self.bounds[key]
+                    step = self.scale * (high - low)
+                else:
+                    low, high = -np.inf, np.inf
+                    step = self.scale * (abs(value) or 1.0)
+                new_value = float(np.clip(value + rng.normal() * step, low, high))
+                changes[key] = int(round(new_value)) if isinstance(value, (int, np.integer)) else round(new_value, 6)
+
+            candidates.append({
+                'suggested_changes': changes,
+                'reasoning': f"local perturbation of {', '.join(changes)}"
+            })
+        return candidates
+
+
+class BatchCandidateLoop:
+    """
+    Suggest K candidates per round, backtest them in parallel, keep the best
+
+    Usage:
+        loop = BatchCandidateLoop(TargetObjective(FourierStrategyTarget()),
+                                  LocalSuggester(bounds), k=4)
+        output = loop.run(df, initial_params, rounds=5)
+        output['best_params'], output['timing']
+    """
+
+    def __init__(self,
+                 objective,
+                 suggester,
+                 build_prompt: Callable[[Dict, List[Dict]], str] = None,
+                 metric: Optional[str] = None,
+                 maximize: bool = True,
+                 k: int = 4,
+                 max_change_pct: Optional[float] = None,
+                 bounds: Dict[str, Tuple[float, float]] = None,
+                 min_trades: int = 0,
+                 pipeline: bool = True,
+                 max_workers: Optional[int] = None,
+                 parallel: bool = True):
+        """
+        Initialize loop.
+
+        Args:
+            objective: fn(df, params, start, end) -> metrics, e.g. a
+                       TargetObjective (picklable)
+            suggester: ClaudeSuggester, LocalSuggester or anything with
+                       suggest(prompt, best_params, k)
+            build_prompt: fn(best, history) -> prompt; best has 'params' and
+                          'metrics', history is the list of evaluated rows
+            metric: Metric to optimize (default: objective.default_metric)
+            maximize: Higher metric is better
+            k: Candidates per round
+            max_change_pct: Max % change per numeric parameter per round
+            bounds: Optional {param: (low, high)}
+            min_trades: Candidates with fewer trades are not eligible as best
+            pipeline: Request the next round while the current one backtests
+            max_workers: Process pool size (default: CPU count)
+            parallel: Backtest candidates in a process pool
+        """
+        self.objective = objective
+        self.suggester = suggester
+        self.build_prompt = build_prompt
+        self.metric = metric or getattr(objective, 'default_metric', None) or 'sharpe_ratio'
+        self.maximize = maximize
+        self.k = k
+        self.max_change_pct = max_change_pct
+        self.bounds = bounds
+        self.min_trades = min_trades
+        self.trades_key = getattr(objective, 'trades_key', 'num_trades')
+        self.pipeline = pipeline
+        self.max_workers = max_workers
+        self.parallel = parallel
+
+    def evaluate(self, df: pd.DataFrame, candidates: Dict) -> Dict:
+        """Metrics of every candidate on the full range → {candidate_id: metrics}"""
+        runner = ParallelIterationRunner(_RungEvaluator(self.objective, 0, len(df)), self.max_workers)
+        if self.parallel and len(candidates) > 1:
+            output = runner.run(candidates, {'data': df}, verbose=False)
+        else:
+            output = runner.run_sequential(candidates, {'data': df})
+        return output['raw_results']
+
+    def score(self, metrics: Dict) -> Optional[float]:
+        """Comparable score (higher is better) or None if not eligible"""
+        value = metrics.get(self.metric)
+        if 'error' in metrics or value is None or pd.isna(value):
+            return None
+        if metrics.get(self.trades_key, self.min_trades) < self.min_trades:
+            return None
+        return float(value) if self.maximize else -float(value)
+
+    def _suggest(self, prompt: str, best_params: Dict) -> Tuple[List[Dict], Dict, float]:
+        """Suggestions (thread worker) → (suggestions, params they start from, seconds)"""
+        start = time.perf_counter()
+        try:
+            suggestions = self.suggester.suggest(prompt, best_params, self.k)
+        except Exception as e:
+            print(f"   ⚠️  Suggestion request failed: {e}")
+            suggestions = []
+        return suggestions, best_params, time.perf_counter() - start
+
+    def _prompt(self, best: Dict, history: List[Dict]) -> str:
+        return self.build_prompt(best, history) if self.build_prompt else ''
+
+    def _submit(self, requests: ThreadPoolExecutor, best: Dict, history: List[Dict]):
+        """Start the next suggestion request on a snapshot of best (it runs in a thread)"""
+        best = copy.deepcopy(best)
+        return requests.submit(self._suggest, self._prompt(best, list(history)), best['params'])
+
+    def run(self, df: pd.DataFrame, initial_params: Dict, rounds: int = 5,
+            verbose: bool = True) -> Dict:
+        """
+        Run the loop.
+
+        Args:
+            df: Data the objective is evaluated on
+            initial_params: Starting (baseline) parameters
+            rounds: Suggestion rounds
+            verbose: Print per-round progress
+
+        Returns:
+            dict with best_params, best_metrics, best_round, history
+            (DataFrame) and timing
+        """
+        prepare_data = getattr(self.objective, 'prepare_data', None)
+        if prepare_data:
+            df = prepare_data(df)
+
+        wall_start = time.perf_counter()
+        timing = {'suggest_s': 0.0, 'suggest_wait_s': 0.0, 'backtest_s': 0.0}
+
+        start = time.perf_counter()
+        baseline = self.evaluate(df, {'baseline': initial_params})['baseline']
+        timing['backtest_s'] += time.perf_counter() - start
+
+        best = {'params': dict(initial_params), 'metrics': baseline,
+                'score': self.score(baseline), 'round': 0, 'candidate': 'baseline'}
+        history = [self._row(0, 'baseline', initial_params, baseline, 'baseline')]
+        seen = {canonical_params(initial_params)}
+
+        if verbose:
+            print(f"\n🔁 Batch loop: {rounds} rounds × {self.k} candidates "
+                  f"({getattr(self.suggester, 'name', type(self.suggester).__name__)} suggester, "
+                  f"{'pipelined' if self.pipeline else 'sequential'} requests)")
+            print(f"   Baseline {self.metric}: {baseline.get(self.metric)}")
+
+        with ThreadPoolExecutor(max_workers=1) as requests:
+            pending = self._submit(requests, best, history)
+
+            for round_num in range(1, rounds + 1):
+                start = time.perf_counter()
+                suggestions, base_params, seconds = pending.result()
+                timing['suggest_wait_s'] += time.perf_counter() - start
+                timing['suggest_s'] += seconds
+
+                candidates, reasons = {}, {}
+                for i, suggestion in enumerate(suggestions):
+                    params = apply_changes(base_params, suggestion.get('suggested_changes'),
+                                           self.max_change_pct, self.bounds)
+                    key = canonical_params(params)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    candidate_id = f"r{round_num}c{i}"
+                    candidates[candidate_id] = params
+                    reasons[candidate_id] = suggestion.get('reasoning', '')
+
+                # Pipelined: the next request overlaps this round's backtests
+                if self.pipeline and round_num < rounds:
+                    pending = self._submit(requests, best, history)
+
+                results = {}
+                if candidates:
+                    start = time.perf_counter()
+                    results = self.evaluate(df, candidates)
+                    timing['backtest_s'] += time.perf_counter() - start
+
+                improved = False
+                for candidate_id, params in candidates.items():
+                    metrics = results[candidate_id]
+                    history.append(self._row(round_num, candidate_id, params, metrics, reasons[candidate_id]))
+                    score = self.score(metrics)
+                    if score is not None and (best['score'] is None or score > best['score']):
+                        best = {'params': params, 'metrics': metrics, 'score': score,
+                                'round': round_num, 'candidate': candidate_id}
+                        improved = True
+
+                if verbose:
+                    values = [results[c].get(self.metric) for c in candidates if 'error' not in results[c]]
+                    values = [v for v in values if v is not None and pd.notna(v)]
+                    round_best = (max(values) if self.maximize else min(values)) if values else None
+                    print(f"   Round {round_num}/{rounds}: {len(candidates)}/{len(suggestions)} new candidates | "
+                          f"round best {self.metric}: {round_best} | "
+                          f"{'🏆 new best ' + best['candidate'] if improved else 'no improvement'}")
+
+                if not self.pipeline and round_num < rounds:
+                    pending = self._submit(requests, best, history)
+
+        timing['wall_s'] = time.perf_counter() - wall_start
+        timing['overlap_s'] = max(0.0, timing['suggest_s'] - timing['suggest_wait_s'])
+
+        output = {
+            'best_params': best['params'],
+            'best_metrics': best['metrics'],
+            'best_round': best['round'],
+            'baseline_metrics': baseline,
+            'history': pd.DataFrame(history),
+            'timing': timing
+        }
+        if verbose:
+            self.print_summary(output)
+        return output
+
+    def _row(self, round_num: int, candidate_id: str, params: Dict, metrics: Dict, reasoning: str) -> Dict:
+        return {
+            'round': round_num,
+            'candidate': candidate_id,
+            self.metric: metrics.get(self.metric),
+            self.trades_key: metrics.get(self.trades_key),
+            'error': metrics.get('error'),
+            'params': canonical_params(params),
+            'reasoning': reasoning
+        }
+
+    def print_summary(self, output: Dict):
+        """Best candidate and where the time went"""
+        timing = output['timing']
+        print("\n" + "=" * 80)
+        print("BATCH LOOP SUMMARY")
+        print("=" * 80)
+        print(f"   Baseline {self.metric}: {output['baseline_metrics'].get(self.metric)}")
+        print(f"   Best {self.metric}: {output['best_metrics'].get(self.metric)} (round {output['best_round']})")
+        print(f"   Evaluated: {len(output['history'])} parameter sets")
+        print(f"\n⏱️  Wall {timing['wall_s']:.1f}s | backtests {timing['backtest_s']:.1f}s | "
+              f"suggestions {timing['suggest_s']:.1f}s ({timing['suggest_wait_s']:.1f}s waited, "
+              f"{timing['overlap_s']:.1f}s hidden behind backtests)")
+        cache = getattr(self.suggester, 'cache', None)
+        if cache is not None:
+            print(f"🗂️  Prompt cache: {cache.hits} hits / {cache.misses} misses ({cache.cache_dir})")
@@ -21,6 +21,7 @@ Production-ready:
 - Multi-metric optimization
 """
 
+import asyncio
 import json
 import numpy as np
 import pandas as pd
@@ -32,6 +33,8 @@ import logging
 import os
 from anthropic import Anthropic
 
+from .candidate_batch import ClaudeSuggester, PromptCache, apply_changes
+
 logger = logging.getLogger(__name__)
 
 
@@ -88,7 +91,9 @@ class ClaudeIterationOptimizer:
         self,
         anthropic_api_key: Optional[str] = None,
         results_dir: str = 'live_trading_results',
-        min_trades_for_analysis: int = 10
+        min_trades_for_analysis: int = 10,
+        suggester=None,
+        cache_prompts: bool = True
     ):
         """
         Initialize Claude optimization system
@@ -97,6 +102,9 @@ class ClaudeIterationOptimizer:
             anthropic_api_key: Anthropic API key
             results_dir: Directory to store results
             min_trades_for_analysis: Minimum trades before optimization
+            suggester: Candidate suggester for get_candidate_params()
+                       (default: Claude; e.g. LocalSuggester to run offline)
+            cache_prompts: Memoize prompt → response pairs in results_dir/prompt_cache
         """
         self.api_key = anthropic_api_key or os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
@@ -106,6 +114,10 @@ class ClaudeIterationOptimizer:
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(exist_ok=True)
         self.min_trades = min_trades_for_analysis
+        self.prompt_cache = PromptCache(self.results_dir / 'prompt_cache') if cache_prompts else None
+        self.suggester = suggester or (
+            ClaudeSuggester(self.client, max_tokens=4096, cache=self.prompt_cache) if self.client else None
+        )
 
         self.iterations = []
 
@@ -413,16 +425,10 @@ Please structure your response as:
         try:
             logger.info(f"Sending optimization request to Claude ({model})...")
 
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=16000,
-                messages=[{
-                    "role": "user",
-                    "content": optimization_prompt
-                }]
-            )
-
-            recommendations = response.content[0].text
+            # Cached, and off the event loop so callers can backtest meanwhile
+            suggester = ClaudeSuggester(self.client, model=model, max_tokens=16000,
+                                        temperature=1.0, cache=self.prompt_cache)
+            recommendations = await asyncio.to_thread(suggester.ask, optimization_prompt)
 
             logger.info(f"Received recommendations ({len(recommendations)} chars)")
 
@@ -432,6 +438,49 @@ Please structure your response as:
             logger.error(f"Error getting Claude recommendations: {e}")
             return f"Error: {e}"
 
+    async def get_candidate_params(
+        self,
+        optimization_prompt: str,
+        current_params: Dict,
+        k: int = 4,
+        max_change_pct: Optional[float] = None,
+        bounds: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Ask for k candidate parameter sets in one request
+
+        The candidates are meant to be backtested together (e.g. with
+        BatchCandidateLoop) instead of one suggestion per iteration.
+
+        Args:
+            optimization_prompt: Generated optimization prompt
+            current_params: Current strategy parameters
+            k: Number of candidates
+            max_change_pct: Max % change per numeric parameter
+            bounds: Optional {param: (low, high)}
+
+        Returns:
+            Distinct full parameter dicts (current_params with changes applied)
+        """
+        if self.suggester is None:
+            logger.error("No suggester - API key missing and none passed in")
+            return []
+
+        try:
+            suggestions = await asyncio.to_thread(self.suggester.suggest, optimization_prompt, current_params, k)
+        except Exception as e:
+            logger.error(f"Error getting candidate parameters: {e}")
+            return []
+
+        candidates = []
+        for suggestion in suggestions:
+            params = apply_changes(current_params, suggestion['suggested_changes'], max_change_pct, bounds)
+            if params != current_params and params not in candidates:
+                candidates.append(params)
+
+        logger.info(f"Received {len(candidates)} distinct candidates ({len(suggestions)} suggested)")
+        return candidates
+
     def _parse_trade(self, trade_dict: Dict) -> TradeAnalysis:
         """Parse trade dictionary into TradeAnalysis"""
         return TradeAnalysis(
@@ -118,7 +118,8 @@ class ExitManager:
             'tp_levels': tp_levels
         }
 
-    def check_exit(self, trade: Dict, current_candle: pd.Series, candles_held: int = 0) -> Dict:
+    def check_exit(self, trade: Dict, current_candle: pd.Series, candles_held: int = 0,
+                   tp_first: bool = False, max_tp_level: int = 3) -> Dict:
         """
         Check if trade should exit on current candle
 
@@ -126,6 +127,12 @@ class ExitManager:
             trade: Trade dict with entry_price, direction, remaining_size, exits_taken
             current_candle: Current candle data
             candles_held: Number of candles since entry
+            tp_first: The candle touched stop and take-profit, and 1m data shows
+                      the take-profit came first - return the take-profit exit;
+                      the caller then closes the remainder at the stop on the
+                      same candle (BacktestEngine.run_backtest does)
+            max_tp_level: Deepest take-profit (1-3) this candle may fill; with
+                          tp_first, the deepest level reached before the stop
 
         Returns:
             dict with:
@@ -174,10 +181,10 @@ class ExitManager:
 
         result['profit_pct'] = profit_pct
 
-        # CHECK 1: Stop Loss
+        # CHECK 1: Stop Loss (unless a take-profit was touched first inside this candle)
         stop_loss = exit_levels['stop_loss']
         if direction == 'long':
-            if low <= stop_loss:
+            if low <= stop_loss and not tp_first:
                 result['should_exit'] = True
                 result['exit_type'] = 'stop_loss'
                 result['exit_price'] = stop_loss
@@ -186,7 +193,7 @@ class ExitManager:
                 result['reason'] = f'Stop loss hit: {low:.2f} <= {stop_loss:.2f}'
                 return result
         else:
-            if high >= stop_loss:
+            if high >= stop_loss and not tp_first:
                 result['should_exit'] = True
                 result['exit_type'] = 'stop_loss'
                 result['exit_price'] = stop_loss
@@ -202,7 +209,7 @@ class ExitManager:
         tp_sizes = exit_levels['tp_sizes']
 
         # TP3 (3% target - 20% position)
-        if 'tp3' not in exits_taken:
+        if 'tp3' not in exits_taken and max_tp_level >= 3:
             tp3 = exit_levels['take_profit_3']
             if direction == 'long':
                 if high >= tp3:
@@ -224,7 +231,7 @@ class ExitManager:
                     return result
 
         # TP2 (2% target - 30% position)
-        if 'tp2' not in exits_taken:
+        if 'tp2' not in exits_taken and max_tp_level >= 2:
             tp2 = exit_levels['take_profit_2']
             if direction == 'long':
                 if high >= tp2:
@@ -256,7 +263,7 @@ class ExitManager:
                     return result
 
         # TP1 (1% target - 50% position)
-        if 'tp1' not in exits_taken:
+        if 'tp1' not in exits_taken and max_tp_level >= 1:
             tp1 = exit_levels['take_profit_1']
             if direction == 'long':
                 if high >= tp1: